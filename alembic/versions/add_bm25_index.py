@@ -0,0 +1,58 @@
+"""Add persistent BM25 inverted index tables
+
+Revision ID: add_bm25_index
+Revises: add_hybrid_search_tsv
+Create Date: 2025-02-12
+
+Adds bm25_documents (per-chunk length and source) and bm25_postings
+(term frequencies per chunk), both cascading from data_embeddings so any
+chunk delete also removes its postings. Existing chunks are indexed lazily
+by PGVectorStore.bm25_search() on the first search of each notebook.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_bm25_index'
+down_revision: Union[str, Sequence[str], None] = 'add_hybrid_search_tsv'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create BM25 document and posting tables."""
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS bm25_documents (
+            node_id BIGINT PRIMARY KEY
+                REFERENCES data_embeddings(id) ON DELETE CASCADE,
+            notebook_id TEXT NOT NULL,
+            source_id TEXT,
+            doc_len INTEGER NOT NULL
+        )
+    """)
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS idx_bm25_documents_notebook
+        ON bm25_documents (notebook_id)
+    """)
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS bm25_postings (
+            notebook_id TEXT NOT NULL,
+            term TEXT NOT NULL,
+            node_id BIGINT NOT NULL
+                REFERENCES bm25_documents(node_id) ON DELETE CASCADE,
+            tf INTEGER NOT NULL,
+            PRIMARY KEY (notebook_id, term, node_id)
+        )
+    """)
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS idx_bm25_postings_node
+        ON bm25_postings (node_id)
+    """)
+
+
+def downgrade() -> None:
+    """Drop BM25 tables."""
+    op.execute("DROP TABLE IF EXISTS bm25_postings")
+    op.execute("DROP TABLE IF EXISTS bm25_documents")
@@ -0,0 +1,38 @@
+"""Add content-addressed embedding cache table
+
+Revision ID: add_embedding_cache
+Revises: add_bm25_index
+Create Date: 2025-02-14
+
+Stores embeddings keyed by (embedding model name, md5 of text) as raw
+little-endian float32 bytes, so identical text embedded by ingestion,
+transformations or RAPTOR is computed once per model.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_embedding_cache'
+down_revision: Union[str, Sequence[str], None] = 'add_bm25_index'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create embedding_cache table."""
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS embedding_cache (
+            model_name TEXT NOT NULL,
+            text_hash CHAR(32) NOT NULL,
+            embedding BYTEA NOT NULL,
+            created_at TIMESTAMP NOT NULL DEFAULT NOW(),
+            PRIMARY KEY (model_name, text_hash)
+        )
+    """)
+
+
+def downgrade() -> None:
+    """Drop embedding_cache table."""
+    op.execute("DROP TABLE IF EXISTS embedding_cache")
@@ -0,0 +1,41 @@
+"""Add stored full-text column for few-shot hybrid search
+
+Revision ID: add_few_shot_search_tsv
+Revises: add_llm_response_cache
+Create Date: 2025-02-26
+
+Hybrid few-shot retrieval used to compute to_tsvector() for every row on
+each query. search_tsv is a generated (stored) tsvector with a GIN index,
+so full-text candidates come from an index scan.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_few_shot_search_tsv'
+down_revision: Union[str, Sequence[str], None] = 'add_llm_response_cache'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add search_tsv generated column and GIN index."""
+    op.execute("""
+        ALTER TABLE sql_few_shot_examples
+        ADD COLUMN IF NOT EXISTS search_tsv tsvector
+        GENERATED ALWAYS AS (
+            to_tsvector('english', sql_prompt || ' ' || COALESCE(sql_query, ''))
+        ) STORED
+    """)
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS idx_few_shot_search_tsv
+        ON sql_few_shot_examples USING GIN (search_tsv)
+    """)
+
+
+def downgrade() -> None:
+    """Drop search_tsv column and index."""
+    op.execute("DROP INDEX IF EXISTS idx_few_shot_search_tsv")
+    op.execute("ALTER TABLE sql_few_shot_examples DROP COLUMN IF EXISTS search_tsv")
@@ -0,0 +1,54 @@
+"""Add full-text search column for server-side hybrid retrieval
+
+Revision ID: add_hybrid_search_tsv
+Revises: add_quiz_extended_fields
+Create Date: 2025-02-10
+
+Adds a stored generated tsvector column (text_search_tsv) to data_embeddings
+with a GIN index, used by PGVectorStore.hybrid_search() for ts_rank_cd
+full-text ranking alongside HNSW ANN. The column name matches the one
+LlamaIndex uses for its own hybrid mode.
+
+The text search configuration comes from
+retrieval.server_side.text_search_config, the same setting query-side
+parsing uses, so tsvector and tsquery always match. Changing the setting
+later requires dropping and re-adding the column.
+"""
+import re
+from typing import Sequence, Union
+
+from alembic import op
+
+from dbnotebook.core.config import get_config_value
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_hybrid_search_tsv'
+down_revision: Union[str, Sequence[str], None] = 'add_quiz_extended_fields'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _text_search_config() -> str:
+    """Configured text search config (validated as PGVectorStore does)."""
+    ts_config = get_config_value("retrieval", "server_side", "text_search_config", default="english")
+    return ts_config if re.fullmatch(r"[a-z_]+", ts_config or "") else "english"
+
+
+def upgrade() -> None:
+    """Add generated tsvector column and GIN index."""
+    op.execute(f"""
+        ALTER TABLE data_embeddings
+        ADD COLUMN IF NOT EXISTS text_search_tsv tsvector
+        GENERATED ALWAYS AS (to_tsvector('{_text_search_config()}', COALESCE(text, ''))) STORED
+    """)
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS idx_embeddings_text_search_tsv
+        ON data_embeddings USING GIN (text_search_tsv)
+    """)
+
+
+def downgrade() -> None:
+    """Drop tsvector column and index."""
+    op.execute("DROP INDEX IF EXISTS idx_embeddings_text_search_tsv")
+    op.execute("ALTER TABLE data_embeddings DROP COLUMN IF EXISTS text_search_tsv")
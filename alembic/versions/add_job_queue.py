@@ -0,0 +1,65 @@
+"""Add durable background job queue table
+
+Revision ID: add_job_queue
+Revises: add_embedding_cache
+Create Date: 2025-02-21
+
+RAPTOR and transformation jobs are leased from background_jobs with
+FOR UPDATE SKIP LOCKED, so any number of worker processes can drain the
+queue. The partial unique index keeps at most one active job per
+(job_type, source_id).
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_job_queue'
+down_revision: Union[str, Sequence[str], None] = 'add_embedding_cache'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create background_jobs table and its lease indexes."""
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS background_jobs (
+            job_id UUID PRIMARY KEY,
+            job_type VARCHAR(50) NOT NULL,
+            source_id TEXT,
+            notebook_id TEXT,
+            payload JSONB NOT NULL DEFAULT '{}'::jsonb,
+            status VARCHAR(20) NOT NULL DEFAULT 'queued',
+            priority INTEGER NOT NULL DEFAULT 0,
+            attempts INTEGER NOT NULL DEFAULT 0,
+            max_attempts INTEGER NOT NULL DEFAULT 3,
+            run_after TIMESTAMP NOT NULL DEFAULT NOW(),
+            leased_by TEXT,
+            lease_expires_at TIMESTAMP,
+            last_error TEXT,
+            created_at TIMESTAMP NOT NULL DEFAULT NOW(),
+            updated_at TIMESTAMP NOT NULL DEFAULT NOW(),
+            completed_at TIMESTAMP
+        )
+    """)
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS idx_background_jobs_due
+        ON background_jobs (job_type, priority DESC, run_after)
+        WHERE status = 'queued'
+    """)
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS idx_background_jobs_lease
+        ON background_jobs (lease_expires_at)
+        WHERE status = 'running'
+    """)
+    op.execute("""
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_background_jobs_active_source
+        ON background_jobs (job_type, source_id)
+        WHERE status IN ('queued', 'running')
+    """)
+
+
+def downgrade() -> None:
+    """Drop background_jobs table."""
+    op.execute("DROP TABLE IF EXISTS background_jobs")
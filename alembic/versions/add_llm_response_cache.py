@@ -0,0 +1,45 @@
+"""Add content-addressed LLM response cache table
+
+Revision ID: add_llm_response_cache
+Revises: add_job_queue
+Create Date: 2025-02-24
+
+Stores completion texts keyed by sha256 of (provider, model, generation
+params, prompt) so re-ingested documents and retried jobs reuse
+contextual enrichment, transformation and RAPTOR summary generations.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_llm_response_cache'
+down_revision: Union[str, Sequence[str], None] = 'add_job_queue'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create llm_response_cache table."""
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS llm_response_cache (
+            cache_key CHAR(64) PRIMARY KEY,
+            provider TEXT NOT NULL,
+            model_name TEXT NOT NULL,
+            feature TEXT,
+            response TEXT NOT NULL,
+            created_at TIMESTAMP NOT NULL DEFAULT NOW(),
+            expires_at TIMESTAMP
+        )
+    """)
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS idx_llm_response_cache_expires
+        ON llm_response_cache (expires_at)
+        WHERE expires_at IS NOT NULL
+    """)
+
+
+def downgrade() -> None:
+    """Drop llm_response_cache table."""
+    op.execute("DROP TABLE IF EXISTS llm_response_cache")
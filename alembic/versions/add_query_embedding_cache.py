@@ -0,0 +1,39 @@
+"""Add shared query embedding cache table
+
+Revision ID: add_query_embedding_cache
+Revises: add_schema_embeddings
+Create Date: 2025-03-09
+
+Stores query embeddings keyed by (embedding model name, md5 of the
+normalized query) so Gunicorn workers reuse each other's cached queries.
+The table is UNLOGGED: it skips WAL and is emptied after a crash, which
+only costs re-embedding.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_query_embedding_cache'
+down_revision: Union[str, Sequence[str], None] = 'add_schema_embeddings'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create query_embedding_cache table."""
+    op.execute("""
+        CREATE UNLOGGED TABLE IF NOT EXISTS query_embedding_cache (
+            model_name TEXT NOT NULL,
+            text_hash CHAR(32) NOT NULL,
+            embedding BYTEA NOT NULL,
+            created_at TIMESTAMP NOT NULL DEFAULT NOW(),
+            PRIMARY KEY (model_name, text_hash)
+        )
+    """)
+
+
+def downgrade() -> None:
+    """Drop query_embedding_cache table."""
+    op.execute("DROP TABLE IF EXISTS query_embedding_cache")
@@ -0,0 +1,58 @@
+"""Add hourly query log rollups
+
+Revision ID: add_query_log_rollups
+Revises: add_query_embedding_cache
+Create Date: 2025-03-12
+
+Token usage per (hour, user, model), upserted by the query logger's
+background writer in the same transaction as the query_logs rows. Admin
+metrics read this table instead of scanning query_logs. Rows are deleted
+with their user (ON DELETE CASCADE), like query_logs. Existing logs are
+backfilled.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_query_log_rollups'
+down_revision: Union[str, Sequence[str], None] = 'add_query_embedding_cache'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create query_log_hourly and backfill it from query_logs."""
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS query_log_hourly (
+            hour TIMESTAMP NOT NULL,
+            user_id UUID NOT NULL REFERENCES users(user_id) ON DELETE CASCADE,
+            model_name VARCHAR(100) NOT NULL,
+            queries BIGINT NOT NULL DEFAULT 0,
+            prompt_tokens BIGINT NOT NULL DEFAULT 0,
+            completion_tokens BIGINT NOT NULL DEFAULT 0,
+            total_tokens BIGINT NOT NULL DEFAULT 0,
+            response_time_ms_sum BIGINT NOT NULL DEFAULT 0,
+            response_count BIGINT NOT NULL DEFAULT 0,
+            PRIMARY KEY (hour, user_id, model_name)
+        )
+    """)
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS idx_query_log_hourly_user ON query_log_hourly (user_id)
+    """)
+    op.execute("""
+        INSERT INTO query_log_hourly
+        SELECT date_trunc('hour', timestamp), user_id, COALESCE(model_name, 'unknown'),
+               COUNT(*), COALESCE(SUM(prompt_tokens), 0), COALESCE(SUM(completion_tokens), 0),
+               COALESCE(SUM(total_tokens), 0), COALESCE(SUM(response_time_ms), 0),
+               COUNT(response_time_ms)
+        FROM query_logs
+        GROUP BY 1, 2, 3
+        ON CONFLICT DO NOTHING
+    """)
+
+
+def downgrade() -> None:
+    """Drop query_log_hourly."""
+    op.execute("DROP TABLE IF EXISTS query_log_hourly")
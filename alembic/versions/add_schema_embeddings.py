@@ -0,0 +1,42 @@
+"""Add persisted schema description embeddings for SQL Chat schema linking
+
+Revision ID: add_schema_embeddings
+Revises: add_few_shot_search_tsv
+Create Date: 2025-03-02
+
+Schema linking embedded every table description on first use in each
+process. sql_schema_embeddings keeps the embeddings (little-endian float32)
+with a hash of the description they came from, so restarts and schema
+changes only re-embed descriptions that changed.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_schema_embeddings'
+down_revision: Union[str, Sequence[str], None] = 'add_few_shot_search_tsv'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create sql_schema_embeddings table."""
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS sql_schema_embeddings (
+            connection_id TEXT NOT NULL,
+            model_name TEXT NOT NULL,
+            item_key TEXT NOT NULL,
+            description_hash CHAR(32) NOT NULL,
+            schema_fingerprint TEXT,
+            embedding BYTEA NOT NULL,
+            updated_at TIMESTAMP NOT NULL DEFAULT NOW(),
+            PRIMARY KEY (connection_id, model_name, item_key)
+        )
+    """)
+
+
+def downgrade() -> None:
+    """Drop sql_schema_embeddings table."""
+    op.execute("DROP TABLE IF EXISTS sql_schema_embeddings")
@@ -0,0 +1,113 @@
+"""
+Benchmark: synchronous RAPTOR tree build, serial vs concurrent summarization.
+
+The LLM is a stub with a fixed per-call latency (the dominant cost of a real
+build) and the embedder is LlamaIndex's MockEmbedding, so the numbers isolate
+orchestration overhead: with N concurrent summaries a level of C clusters
+should take roughly ceil(C / N) * latency instead of C * latency.
+
+Clustering runs for real (UMAP + GMM), on random embeddings.
+
+Usage:
+    python benchmarks/bench_raptor_build.py --chunks 300 --latency-ms 200
+    python benchmarks/bench_raptor_build.py --concurrency 1 4 8 --per-minute 600
+"""
+
+import argparse
+import asyncio
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import numpy as np
+from llama_index.core.embeddings import MockEmbedding
+from llama_index.core.schema import TextNode
+
+
+class _Response:
+    def __init__(self, text: str):
+        self.text = text
+
+
+class StubLLM:
+    """Duck-typed LLM: sleeps for a fixed latency and echoes a short summary."""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def complete(self, prompt: str, **kwargs) -> _Response:
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.latency)
+        return _Response(f"summary of {len(prompt)} chars")
+
+    async def acomplete(self, prompt: str, **kwargs) -> _Response:
+        with self._lock:
+            self.calls += 1
+        await asyncio.sleep(self.latency)
+        return _Response(f"summary of {len(prompt)} chars")
+
+
+def _chunks(count: int, dim: int):
+    rng = np.random.default_rng(0)
+    return [
+        TextNode(
+            text=f"chunk {i} " + "lorem ipsum " * 20,
+            embedding=rng.standard_normal(dim).astype(np.float32).tolist(),
+        )
+        for i in range(count)
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="RAPTOR build benchmark")
+    parser.add_argument("--chunks", type=int, default=300, help="Leaf chunks")
+    parser.add_argument("--dim", type=int, default=384, help="Embedding dimension")
+    parser.add_argument("--latency-ms", type=float, default=200, help="Stub LLM latency per call")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 3, 8],
+                        help="max_concurrent_summaries values (1 = serial)")
+    parser.add_argument("--per-minute", type=float, default=0, help="summaries_per_minute (0 = unlimited)")
+    args = parser.parse_args()
+
+    from dbnotebook.core.raptor.config import RAPTORConfig
+    from dbnotebook.core.raptor.tree_builder import RAPTORTreeBuilder
+
+    chunks = _chunks(args.chunks, args.dim)
+    embed_model = MockEmbedding(embed_dim=args.dim)
+
+    print(f"chunks: {args.chunks}, LLM latency: {args.latency_ms:.0f} ms\n")
+    print(f"{'concurrency':>11} {'seconds':>9} {'LLM calls':>10} {'levels':>7}")
+    baseline = None
+    for concurrency in args.concurrency:
+        config = RAPTORConfig.default()
+        config.tree_building.max_concurrent_summaries = concurrency
+        config.tree_building.summaries_per_minute = args.per_minute
+        llm = StubLLM(args.latency_ms / 1000)
+        builder = RAPTORTreeBuilder(llm=llm, embed_model=embed_model, config=config)
+
+        start = time.perf_counter()
+        result = builder.build_tree(chunks, source_id="bench", notebook_id="bench")
+        elapsed = time.perf_counter() - start
+        if not result.success:
+            print(f"build failed: {result.error}")
+            sys.exit(1)
+
+        baseline = baseline or elapsed
+        print(f"{concurrency:>11} {elapsed:>9.2f} {llm.calls:>10} {result.max_level:>7}"
+              f"   ({baseline / elapsed:.1f}x)")
+        for level, timing in sorted(result.level_timings.items()):
+            print(
+                f"{'':>11}   level {level}: {int(timing['clusters'])} clusters, "
+                f"cluster {timing['cluster_seconds']:.2f}s, "
+                f"summarize {timing['summarize_seconds']:.2f}s, "
+                f"embed {timing['embed_seconds']:.2f}s"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Benchmark: RAPTOR clustering tiers on synthetic embedding sets.
+
+Compares the small-level path (UMAP + full-covariance GMM) with the
+large-level fast paths ((Incremental)PCA + diagonal GMM / MiniBatchKMeans)
+on normalized Gaussian blobs of known membership.
+
+Reported per method and size:
+    fit      seconds to reduce + compute soft assignments
+    build    seconds to turn probabilities into Cluster objects
+    ARI      adjusted Rand index of argmax labels vs the true blobs
+    silh     silhouette (cosine) of argmax labels on a 2,000-point sample
+
+UMAP is skipped above --max-umap nodes (it is the cost the fast path avoids).
+
+Usage:
+    python benchmarks/bench_raptor_clustering.py
+    python benchmarks/bench_raptor_clustering.py --sizes 1000 10000 50000 --dim 768
+    python benchmarks/bench_raptor_clustering.py --methods pca+gmm_diag ipca+minibatch_kmeans
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import numpy as np
+from llama_index.core.schema import TextNode
+
+METHODS = ("umap+gmm", "pca+gmm_diag", "pca+minibatch_kmeans", "ipca+gmm_diag", "ipca+minibatch_kmeans")
+
+
+def _blobs(n: int, dim: int, k: int, noise: float, seed: int = 0):
+    """Unit-normalized Gaussian blobs around k random directions (float32)."""
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((k, dim)).astype(np.float32)
+    centers /= np.linalg.norm(centers, axis=1, keepdims=True)
+    labels = rng.integers(0, k, size=n)
+    points = centers[labels] + noise * rng.standard_normal((n, dim)).astype(np.float32) / np.sqrt(dim)
+    points /= np.linalg.norm(points, axis=1, keepdims=True)
+    return points, labels
+
+
+def _clustering(method: str):
+    from dbnotebook.core.raptor.clustering import RAPTORClustering
+    from dbnotebook.core.raptor.config import ClusteringConfig
+
+    config = ClusteringConfig()
+    if method == "umap+gmm":
+        config.fast_path_min_nodes = 0
+    else:
+        reducer, clusterer = method.split("+")
+        config.fast_path_min_nodes = 1
+        config.fast_reducer = "incremental_pca" if reducer == "ipca" else "pca"
+        config.fast_clusterer = clusterer
+    return RAPTORClustering(config)
+
+
+def _fit(clustering, method: str, embeddings: np.ndarray) -> np.ndarray:
+    """Reduce and soft-assign with the tier's own code path."""
+    if method == "umap+gmm":
+        from sklearn.mixture import GaussianMixture
+
+        reduced = clustering._reduce_dimensions(embeddings)
+        gmm = GaussianMixture(
+            n_components=clustering._estimate_n_clusters(len(embeddings)),
+            covariance_type="full",
+            n_init=clustering.config.n_init,
+            random_state=clustering.config.random_state,
+        )
+        gmm.fit(reduced)
+        return reduced, gmm.predict_proba(reduced)
+    reduced = clustering._reduce_dimensions_fast(embeddings)
+    return reduced, clustering._fast_probabilities(reduced)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="RAPTOR clustering benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--dim", type=int, default=768, help="Embedding dimension")
+    parser.add_argument("--true-clusters", type=int, default=40, help="Synthetic blob count")
+    parser.add_argument("--noise", type=float, default=4.0, help="Blob spread (higher = harder)")
+    parser.add_argument("--methods", nargs="+", default=list(METHODS), choices=METHODS)
+    parser.add_argument("--max-umap", type=int, default=10000, help="Largest size to run UMAP on")
+    args = parser.parse_args()
+
+    from sklearn.metrics import adjusted_rand_score, silhouette_score
+
+    print(f"{'nodes':>7} {'method':<22} {'fit s':>8} {'build s':>8} {'ARI':>6} {'silh':>6}")
+    for n in args.sizes:
+        embeddings, truth = _blobs(n, args.dim, args.true_clusters, args.noise)
+        nodes = [TextNode(id_=str(i), text="") for i in range(n)]
+        sample = np.random.default_rng(1).choice(n, size=min(n, 2000), replace=False)
+
+        for method in args.methods:
+            if method == "umap+gmm" and n > args.max_umap:
+                print(f"{n:>7} {method:<22} {'skipped':>8}")
+                continue
+            clustering = _clustering(method)
+
+            start = time.perf_counter()
+            reduced, probabilities = _fit(clustering, method, embeddings)
+            fit_seconds = time.perf_counter() - start
+
+            start = time.perf_counter()
+            clusters = clustering._build_clusters_from_probabilities(nodes, probabilities, reduced)
+            build_seconds = time.perf_counter() - start
+
+            labels = probabilities.argmax(axis=1)
+            ari = adjusted_rand_score(truth, labels)
+            silh = (
+                silhouette_score(embeddings[sample], labels[sample], metric="cosine")
+                if len(set(labels[sample])) > 1 else 0.0
+            )
+            print(
+                f"{n:>7} {method:<22} {fit_seconds:>8.2f} {build_seconds:>8.2f} "
+                f"{ari:>6.3f} {silh:>6.3f}   ({len(clusters)} clusters)"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+"""
+Benchmark: global-lock reranking vs the micro-batching rerank executor.
+
+Simulates concurrent chat retrievals reranking a stub passage set: each
+client repeatedly reranks --candidates passages for its own query, the way
+/api/v2/chat does after retrieval. "before" is ThreadSafeReranker (one
+forward pass at a time behind a lock); "after" is BatchedReranker on a
+RerankExecutor. Reports per-call p50/p99 latency and pairs per second.
+
+By default a stub cross-encoder is used whose forward pass costs
+--stub-fixed-ms plus --stub-per-pair-ms per pair (sleep, so no model is
+needed). Pass --model to load a real SentenceTransformerRerank model.
+
+Usage:
+    python benchmarks/bench_reranker_batching.py --clients 32 --calls 10
+    python benchmarks/bench_reranker_batching.py --model xsmall --clients 32 \\
+        --replicas 2 --max-batch-pairs 128 --max-wait-ms 5
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from llama_index.core.schema import NodeWithScore, QueryBundle, TextNode
+
+from dbnotebook.core.providers.rerank_executor import RerankExecutor
+from dbnotebook.core.providers.reranker_provider import (
+    BatchedReranker,
+    ThreadSafeReranker,
+    resolve_model_path,
+)
+
+WORDS = (
+    "revenue customer invoice region quarter growth churn policy contract "
+    "shipment warehouse supplier margin forecast budget audit compliance"
+).split()
+
+
+class StubCrossEncoder:
+    """CrossEncoder stand-in: fixed + per-pair cost, scores by word overlap."""
+
+    def __init__(self, fixed_ms: float, per_pair_ms: float):
+        self._fixed = fixed_ms / 1000
+        self._per_pair = per_pair_ms / 1000
+
+    def predict(self, pairs, batch_size=32):
+        time.sleep(self._fixed + self._per_pair * len(pairs))
+        return [len(set(q.split()) & set(p.split())) for q, p in pairs]
+
+
+class StubRerank:
+    """SentenceTransformerRerank stand-in for ThreadSafeReranker."""
+
+    def __init__(self, model, top_n: int):
+        self._model = model
+        self.top_n = top_n
+
+    def postprocess_nodes(self, nodes, query_bundle=None, query_str=None):
+        query = query_str or query_bundle.query_str
+        scores = self._model.predict([(query, n.node.get_content()) for n in nodes])
+        for node, score in zip(nodes, scores):
+            node.score = score
+        return sorted(nodes, key=lambda x: -x.score)[:self.top_n]
+
+
+def _percentile(values, pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def _passages(count: int, seed: int):
+    rng = random.Random(seed)
+    return [" ".join(rng.choices(WORDS, k=40)) for _ in range(count)]
+
+
+def _run(reranker, args) -> dict:
+    """Run --clients threads, each making --calls rerank calls."""
+    latencies = []
+    lock = threading.Lock()
+    start_gate = threading.Barrier(args.clients)
+
+    def client(i: int):
+        passages = _passages(args.candidates, seed=i)
+        rng = random.Random(1000 + i)
+        start_gate.wait()
+        for _ in range(args.calls):
+            nodes = [NodeWithScore(node=TextNode(text=p), score=0.5) for p in passages]
+            query = QueryBundle(" ".join(rng.choices(WORDS, k=6)))
+            t0 = time.perf_counter()
+            reranker.postprocess_nodes(nodes, query_bundle=query)
+            elapsed = (time.perf_counter() - t0) * 1000
+            with lock:
+                latencies.append(elapsed)
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(args.clients)]
+    t0 = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    wall = time.perf_counter() - t0
+
+    pairs = args.clients * args.calls * args.candidates
+    return {
+        "p50": statistics.median(latencies),
+        "p99": _percentile(latencies, 99),
+        "pairs_per_s": pairs / wall,
+        "wall_s": wall,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=32, help="Concurrent chat requests")
+    parser.add_argument("--calls", type=int, default=10, help="Rerank calls per client")
+    parser.add_argument("--candidates", type=int, default=20, help="Passages reranked per call")
+    parser.add_argument("--top-n", type=int, default=6)
+    parser.add_argument("--max-batch-pairs", type=int, default=64)
+    parser.add_argument("--max-wait-ms", type=float, default=5.0)
+    parser.add_argument("--replicas", type=int, default=1)
+    parser.add_argument("--model", help="Real reranker model (alias, path or HF id) instead of the stub")
+    parser.add_argument("--stub-fixed-ms", type=float, default=15.0, help="Stub per-forward-pass overhead")
+    parser.add_argument("--stub-per-pair-ms", type=float, default=0.5, help="Stub cost per pair")
+    args = parser.parse_args()
+
+    if args.model:
+        from llama_index.core.postprocessor import SentenceTransformerRerank
+
+        model_path = resolve_model_path(args.model)
+        print(f"Loading {args.replicas} replica(s) of {model_path}...")
+        loaded = [SentenceTransformerRerank(model=model_path, top_n=args.top_n) for _ in range(args.replicas)]
+        primary = loaded[0]
+        replicas = [r._model for r in loaded]
+    else:
+        primary = StubRerank(StubCrossEncoder(args.stub_fixed_ms, args.stub_per_pair_ms), args.top_n)
+        replicas = [StubCrossEncoder(args.stub_fixed_ms, args.stub_per_pair_ms) for _ in range(args.replicas)]
+
+    print(
+        f"{args.clients} clients x {args.calls} calls x {args.candidates} passages "
+        f"({'stub' if not args.model else args.model})\n"
+    )
+
+    before = _run(ThreadSafeReranker(primary, threading.RLock(), args.top_n), args)
+
+    executor = RerankExecutor(
+        replicas,
+        max_batch_pairs=args.max_batch_pairs,
+        max_wait_ms=args.max_wait_ms,
+        name="bench"
+    )
+    try:
+        after = _run(BatchedReranker(executor, args.top_n), args)
+        stats = executor.get_stats()
+    finally:
+        executor.close()
+
+    print(f"{'mode':<28} {'p50 ms':>9} {'p99 ms':>9} {'pairs/s':>10} {'wall s':>8}")
+    print("-" * 68)
+    for label, r in (("global lock", before), (f"batched ({args.replicas} replica)", after)):
+        print(f"{label:<28} {r['p50']:>9.1f} {r['p99']:>9.1f} {r['pairs_per_s']:>10.0f} {r['wall_s']:>8.2f}")
+    print(
+        f"\nbatches: {stats['batches']}, avg pairs/batch: {stats['avg_batch_pairs']}, "
+        f"avg requests/batch: {stats['avg_batch_requests']}, "
+        f"avg queue wait: {stats['avg_queue_wait_ms']} ms"
+    )
+    print(f"p99 speedup: {before['p99'] / after['p99']:.1f}x, "
+          f"throughput: {after['pairs_per_s'] / before['pairs_per_s']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Benchmark: upload hashing, legacy three-pass path vs single streamed pass.
+
+Legacy path (per uploaded file):
+    1. _process_single_file: SHA-256 with 4 KB reads (cache validation)
+    2. _process_single_file: SHA-256 with 4 KB reads again (metadata)
+    3. store_nodes: whole file read into memory, SHA-256 in add_document
+
+Single-pass path:
+    hash_file(): one 1 MiB-buffer streamed read, digest + size reused
+
+Each path runs in a fresh subprocess so peak RSS reflects only that path.
+The OS page cache is warm after the first run, so the numbers mostly show
+CPU and copy overhead; cold-cache runs add the same disk time per pass.
+
+Usage:
+    python benchmarks/bench_upload_hashing.py --size-mb 200
+    python benchmarks/bench_upload_hashing.py --file path/to/large.pdf
+"""
+
+import argparse
+import hashlib
+import multiprocessing as mp
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import psutil
+
+
+def _legacy(file_path: str) -> str:
+    def sha256_4k(path: str) -> str:
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(4096), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    sha256_4k(file_path)
+    sha256_4k(file_path)
+    with open(file_path, "rb") as f:
+        content = f.read()
+    return hashlib.sha256(content).hexdigest()
+
+
+def _single_pass(file_path: str) -> str:
+    from dbnotebook.core.utils.file_utils import hash_file
+
+    digest, _ = hash_file(file_path)
+    return digest
+
+
+def _worker(path: str, file_path: str, queue: mp.Queue) -> None:
+    process = psutil.Process()
+    rss_before = process.memory_info().rss
+    start = time.perf_counter()
+    digest = _legacy(file_path) if path == "legacy" else _single_pass(file_path)
+    elapsed = time.perf_counter() - start
+    # Peak would need sampling; the in-memory copy of the legacy path stays
+    # referenced until return, so the post-call RSS delta captures it
+    rss_after = process.memory_info().rss
+    queue.put({
+        "path": path,
+        "digest": digest,
+        "seconds": elapsed,
+        "rss_delta_mb": (rss_after - rss_before) / (1024 * 1024),
+    })
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Upload hashing benchmark")
+    parser.add_argument("--size-mb", type=int, default=200, help="Synthetic file size")
+    parser.add_argument("--file", help="Benchmark an existing file instead")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per path (best is reported)")
+    args = parser.parse_args()
+
+    tmp = None
+    if args.file:
+        file_path = args.file
+    else:
+        tmp = tempfile.NamedTemporaryFile(delete=False, suffix=".bin")
+        chunk = os.urandom(1 << 20)
+        for _ in range(args.size_mb):
+            tmp.write(chunk)
+        tmp.close()
+        file_path = tmp.name
+
+    size_mb = os.path.getsize(file_path) / (1024 * 1024)
+    ctx = mp.get_context("spawn")
+    try:
+        best = {}
+        for path in ("legacy", "single"):
+            for _ in range(args.repeat):
+                queue = ctx.Queue()
+                proc = ctx.Process(target=_worker, args=(path, file_path, queue))
+                proc.start()
+                result = queue.get()
+                proc.join()
+                if path not in best or result["seconds"] < best[path]["seconds"]:
+                    best[path] = result
+    finally:
+        if tmp:
+            os.unlink(file_path)
+
+    if best["legacy"]["digest"] != best["single"]["digest"]:
+        print("ERROR: digests differ")
+        sys.exit(1)
+
+    print(f"file: {size_mb:.0f} MB\n")
+    print(f"{'path':<8} {'seconds':>9} {'MB/s':>9} {'RSS delta MB':>13}")
+    for r in best.values():
+        print(
+            f"{r['path']:<8} {r['seconds']:>9.3f} {size_mb / r['seconds']:>9.0f} "
+            f"{r['rss_delta_mb']:>13.1f}"
+        )
+    print(f"\nspeedup: {best['legacy']['seconds'] / best['single']['seconds']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
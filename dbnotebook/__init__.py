@@ -46,8 +46,23 @@ try:
 except (ImportError, AttributeError):
     pass
 
-from .pipeline import LocalRAGPipeline
-from .ollama import run_ollama_server
+import importlib
+
+# Imported lazily so submodules can be used without the full integration set
+_EXPORTS = {
+    "LocalRAGPipeline": ".pipeline",
+    "run_ollama_server": ".ollama",
+}
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        module = importlib.import_module(_EXPORTS[name], __name__)
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = [
     "LocalRAGPipeline",
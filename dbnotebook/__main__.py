@@ -28,6 +28,7 @@ from .pipeline import LocalRAGPipeline
 from .ollama import run_ollama_server, is_port_open
 from .core.db.db import DatabaseManager
 from .core.notebook.notebook_manager import NotebookManager
+from .core.providers.reranker_provider import preload_rerankers
 
 
 def setup_logging(log_level: str = "INFO") -> None:
@@ -137,6 +138,9 @@ def main():
     else:
         logger.warning("DATABASE_URL not set. Notebook feature will be unavailable.")
 
+    # Load configured reranker models in the background (retrieval.reranker.registry.preload)
+    preload_rerankers()
+
     # Initialize Flask UI
     logger.info("Building Flask UI...")
     ui = FlaskChatbotUI(
@@ -628,6 +628,41 @@ def create_admin_routes(app, db_manager, notebook_manager, pipeline=None):
             logger.error(f"Error getting token metrics: {e}")
             return jsonify({"success": False, "error": str(e)}), 500
 
+    # ========== Cache Metrics ==========
+
+    @admin_bp.route("/metrics/cache", methods=["GET"])
+    @require_permission(Permission.MANAGE_USERS)
+    def get_cache_metrics():
+        """Get in-process cache statistics.
+
+        Returns:
+            {
+                "success": true,
+                "node_cache": { "hits", "misses", "evictions", "avg_load_ms", ... },
+                "embedding_cache": { "hits", "db_hits", "misses", "hit_rate", ... },
+                "query_embedding_cache": { "hits", "db_hits", "misses", "hit_rate", ... },
+                "llm_cache": { "hits", "db_hits", "misses", "hit_rate", "by_feature", ... }
+            }
+        """
+        try:
+            if not pipeline or not hasattr(pipeline, "get_node_cache_stats"):
+                return jsonify({
+                    "success": False,
+                    "error": "Pipeline not available"
+                }), 500
+
+            return jsonify({
+                "success": True,
+                "node_cache": pipeline.get_node_cache_stats(),
+                "embedding_cache": pipeline.get_embedding_cache_stats(),
+                "query_embedding_cache": pipeline.get_query_embedding_cache_stats(),
+                "llm_cache": pipeline.get_llm_cache_stats(),
+            })
+
+        except Exception as e:
+            logger.error(f"Error getting cache metrics: {e}")
+            return jsonify({"success": False, "error": str(e)}), 500
+
     # Register blueprint
     app.register_blueprint(admin_bp)
 
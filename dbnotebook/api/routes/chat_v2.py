@@ -25,7 +25,9 @@ from dbnotebook.core.stateless import (
     load_conversation_history,
     save_conversation_turn,
     generate_session_id,
-    expand_query_with_history_timed,
+    expand_query_with_history,
+    use_server_side_retrieval,
+    StageGraph,
 )
 
 logger = logging.getLogger(__name__)
@@ -34,6 +36,18 @@ logger = logging.getLogger(__name__)
 # Use /api/query with X-API-Key header for programmatic API access.
 
 
+def _embed_query(query: str):
+    """Embed the retrieval query once, shared by chunk and RAPTOR retrieval.
+
+    Returns None on failure so retrieval falls back to embedding on its own.
+    """
+    try:
+        return Settings.embed_model.get_query_embedding(query)
+    except Exception as e:
+        logger.warning(f"Query embedding failed: {e}")
+        return None
+
+
 def create_chat_v2_routes(app, pipeline, db_manager, notebook_manager, conversation_store):
     """Create V2 chat API routes with fast pattern and memory.
 
@@ -113,20 +127,6 @@ def create_chat_v2_routes(app, pipeline, db_manager, notebook_manager, conversat
             use_raptor = data.get("use_raptor", True)
             top_k = data.get("top_k", max_sources)  # Allow explicit top_k override
 
-            # Apply per-request reranker model if specified
-            original_reranker_config = None
-            if reranker_model:
-                from dbnotebook.core.providers.reranker_provider import (
-                    get_reranker_config, set_reranker_config
-                )
-                original_reranker_config = get_reranker_config()
-                set_reranker_config(
-                    model=reranker_model,
-                    enabled=use_reranker,
-                    top_n=top_k,
-                )
-                logger.debug(f"Per-request reranker: model={reranker_model}, enabled={use_reranker}")
-
             # Get LLM instance for this specific request
             from dbnotebook.core.model.model import LocalRAGModel
             local_llm = LocalRAGModel.set(model_name) if model_name else Settings.llm
@@ -134,7 +134,7 @@ def create_chat_v2_routes(app, pipeline, db_manager, notebook_manager, conversat
             used_model = local_llm.model if hasattr(local_llm, 'model') else "unknown"
             logger.info(f"V2 chat: notebook_id={notebook_id}, user_id={user_id}, session_id={session_id}, model={used_model} (requested={model_name})")
 
-            # Step 1: Verify notebook exists
+            # Step 1: Verify notebook exists (before any LLM or embedding work)
             t1 = time.time()
             notebook = notebook_manager.get_notebook(notebook_id)
             timings["1_notebook_lookup_ms"] = int((time.time() - t1) * 1000)
@@ -142,40 +142,50 @@ def create_chat_v2_routes(app, pipeline, db_manager, notebook_manager, conversat
             if not notebook:
                 return not_found("Notebook", notebook_id)
 
-            # Step 2: Load conversation history (from database)
-            t2 = time.time()
-            conversation_history = []
-            if include_history:
-                conversation_history = load_conversation_history(
+            # Steps 2-3 run as a stage graph: history load and node cache fetch
+            # are independent; query expansion waits for the history and the
+            # query embedding waits for the expanded query
+            retriever_factory = pipeline._engine._retriever if pipeline._engine else None
+            server_side = use_server_side_retrieval(pipeline._vector_store, retriever_factory)
+
+            def load_history():
+                if not include_history:
+                    return []
+                return load_conversation_history(
                     conversation_store=conversation_store,
                     notebook_id=notebook_id,
                     user_id=user_id,
                     max_history=max_history,
                 )
-            timings["2a_load_history_ms"] = int((time.time() - t2) * 1000)
-
-            # Step 2b: Expand follow-up queries using conversation history
-            retrieval_query = query  # Default to original query
-            if include_history and conversation_history:
-                retrieval_query = expand_query_with_history_timed(
-                    query=query,
-                    conversation_history=conversation_history,
-                    llm=local_llm,
-                    timings=timings,
-                    timing_key="2b_query_expansion_ms",
-                )
 
-            # Step 3: Get cached nodes (thread-safe)
-            t3 = time.time()
-            nodes = pipeline._get_cached_nodes(notebook_id)
-            timings["3_node_cache_ms"] = int((time.time() - t3) * 1000)
+            def expand_query(history):
+                # Expand follow-up queries using conversation history
+                if not (include_history and history):
+                    return query
+                return expand_query_with_history(query, history, local_llm)
+
+            # Server-side retrieval ranks in Postgres, so nodes are not loaded
+            graph = StageGraph(timings)
+            graph.add("history", load_history, timing_key="2a_load_history_ms")
+            graph.add("retrieval_query", expand_query, deps=("history",),
+                      timing_key="2b_query_expansion_ms")
+            graph.add("nodes", lambda: [] if server_side else pipeline._get_cached_nodes(notebook_id),
+                      timing_key="3_node_cache_ms")
+            graph.add("query_embedding", lambda retrieval_query: _embed_query(retrieval_query),
+                      deps=("retrieval_query",), timing_key="3b_query_embedding_ms")
+            stages = graph.run()
+
+            conversation_history = stages["history"]
+            retrieval_query = stages["retrieval_query"]
+            nodes = stages["nodes"]
+            query_embedding = stages["query_embedding"]
             logger.debug(f"Got {len(nodes)} cached nodes for notebook {notebook_id}")
 
             # Step 4: Enhanced retrieval with RAPTOR-aware reranking
             retrieval_results = []
             raptor_summaries = []
             retrieval_strategy = "hybrid"
-            if nodes:
+            if nodes or server_side:
                 try:
                     if not pipeline._engine or not pipeline._engine._retriever:
                         return service_unavailable("Pipeline not initialized. Please try again.")
@@ -193,6 +203,8 @@ def create_chat_v2_routes(app, pipeline, db_manager, notebook_manager, conversat
                         top_k=top_k,
                         use_raptor=use_raptor,
                         use_reranker=use_reranker,
+                        reranker_model=reranker_model,  # Per request, no global state
+                        query_embedding=query_embedding,
                     )
                     timings["4_enhanced_retrieval_ms"] = int((time.time() - t4) * 1000)
                     retrieval_strategy = retrieval_meta.get("strategy_used", "raptor_aware")
@@ -204,6 +216,8 @@ def create_chat_v2_routes(app, pipeline, db_manager, notebook_manager, conversat
                         timings["4b_raptor_retrieval_ms"] = retrieval_meta["raptor_retrieval_ms"]
                     if "reranking_ms" in retrieval_meta:
                         timings["4c_reranking_ms"] = retrieval_meta["reranking_ms"]
+                    if "retrieval_critical_path_ms" in retrieval_meta:
+                        timings["4d_retrieval_critical_path_ms"] = retrieval_meta["retrieval_critical_path_ms"]
 
                 except Exception as e:
                     logger.warning(f"Enhanced retrieval failed [{type(e).__name__}]: {e}", exc_info=True)
@@ -217,6 +231,7 @@ def create_chat_v2_routes(app, pipeline, db_manager, notebook_manager, conversat
                             retriever_factory=pipeline._engine._retriever,
                             llm=local_llm,
                             top_k=max_sources,
+                            query_embedding=query_embedding,
                         )
                         retrieval_strategy = "hybrid_fallback"
                     except Exception as fallback_e:
@@ -339,20 +354,6 @@ def create_chat_v2_routes(app, pipeline, db_manager, notebook_manager, conversat
             use_raptor = data.get("use_raptor", True)
             top_k = data.get("top_k", max_sources)
 
-            # Apply per-request reranker model if specified
-            original_reranker_config = None
-            if reranker_model:
-                from dbnotebook.core.providers.reranker_provider import (
-                    get_reranker_config, set_reranker_config
-                )
-                original_reranker_config = get_reranker_config()
-                set_reranker_config(
-                    model=reranker_model,
-                    enabled=use_reranker,
-                    top_n=top_k,
-                )
-                logger.debug(f"Per-request reranker (stream): model={reranker_model}, enabled={use_reranker}")
-
             # Get LLM instance for this specific request
             from dbnotebook.core.model.model import LocalRAGModel
             local_llm = LocalRAGModel.set(model_name) if model_name else Settings.llm
@@ -373,38 +374,47 @@ def create_chat_v2_routes(app, pipeline, db_manager, notebook_manager, conversat
                 timings = {}
 
                 try:
-                    # Load history
-                    t1 = time_module.time()
-                    conversation_history = []
-                    if include_history:
-                        conversation_history = load_conversation_history(
+                    # History load and node cache fetch run concurrently;
+                    # expansion waits for history, embedding for expansion
+                    retriever_factory = pipeline._engine._retriever if pipeline._engine else None
+                    server_side = use_server_side_retrieval(pipeline._vector_store, retriever_factory)
+
+                    def load_history():
+                        if not include_history:
+                            return []
+                        return load_conversation_history(
                             conversation_store=conversation_store,
                             notebook_id=notebook_id,
                             user_id=user_id,
                             max_history=max_history,
                         )
-                    timings["1a_load_history_ms"] = int((time_module.time() - t1) * 1000)
-
-                    # Query expansion for follow-up queries
-                    retrieval_query = query  # Default to original query
-                    if include_history and conversation_history:
-                        retrieval_query = expand_query_with_history_timed(
-                            query=query,
-                            conversation_history=conversation_history,
-                            llm=local_llm,
-                            timings=timings,
-                            timing_key="1b_query_expansion_ms",
-                        )
 
-                    # Get nodes and retrieve
-                    t2 = time_module.time()
-                    nodes = pipeline._get_cached_nodes(notebook_id)
-                    timings["2_node_cache_ms"] = int((time_module.time() - t2) * 1000)
+                    def expand_query(history):
+                        # Query expansion for follow-up queries
+                        if not (include_history and history):
+                            return query
+                        return expand_query_with_history(query, history, local_llm)
+
+                    # Server-side retrieval ranks in Postgres, so nodes are not loaded
+                    graph = StageGraph(timings)
+                    graph.add("history", load_history, timing_key="1a_load_history_ms")
+                    graph.add("retrieval_query", expand_query, deps=("history",),
+                              timing_key="1b_query_expansion_ms")
+                    graph.add("nodes", lambda: [] if server_side else pipeline._get_cached_nodes(notebook_id),
+                              timing_key="2_node_cache_ms")
+                    graph.add("query_embedding", lambda retrieval_query: _embed_query(retrieval_query),
+                              deps=("retrieval_query",), timing_key="2b_query_embedding_ms")
+                    stages = graph.run()
+
+                    conversation_history = stages["history"]
+                    retrieval_query = stages["retrieval_query"]
+                    nodes = stages["nodes"]
+                    query_embedding = stages["query_embedding"]
 
                     retrieval_results = []
                     raptor_summaries = []
                     retrieval_strategy = "hybrid"
-                    if nodes and pipeline._engine and pipeline._engine._retriever:
+                    if (nodes or server_side) and pipeline._engine and pipeline._engine._retriever:
                         t3 = time_module.time()
                         try:
                             # Use enhanced_retrieve for unified RAPTOR + chunk retrieval
@@ -419,8 +429,12 @@ def create_chat_v2_routes(app, pipeline, db_manager, notebook_manager, conversat
                                 top_k=top_k,
                                 use_raptor=use_raptor,
                                 use_reranker=use_reranker,
+                                reranker_model=reranker_model,  # Per request, no global state
+                                query_embedding=query_embedding,
                             )
                             retrieval_strategy = retrieval_meta.get("strategy_used", "raptor_aware")
+                            if "retrieval_critical_path_ms" in retrieval_meta:
+                                timings["3a_retrieval_critical_path_ms"] = retrieval_meta["retrieval_critical_path_ms"]
                         except Exception as e:
                             logger.warning(f"Enhanced retrieval failed in stream: {e}")
                             # Fallback to simple retrieval
@@ -432,6 +446,7 @@ def create_chat_v2_routes(app, pipeline, db_manager, notebook_manager, conversat
                                 retriever_factory=pipeline._engine._retriever,
                                 llm=local_llm,
                                 top_k=max_sources,
+                                query_embedding=query_embedding,
                             )
                             retrieval_strategy = "hybrid_fallback"
                         timings["3_retrieval_ms"] = int((time_module.time() - t3) * 1000)
@@ -508,15 +523,6 @@ def create_chat_v2_routes(app, pipeline, db_manager, notebook_manager, conversat
                 except Exception as e:
                     logger.error(f"Streaming error: {e}")
                     yield f"data: {json.dumps({'type': 'error', 'error': str(e)})}\n\n"
-                finally:
-                    # Restore original reranker config if it was overridden
-                    if original_reranker_config is not None:
-                        from dbnotebook.core.providers.reranker_provider import set_reranker_config
-                        set_reranker_config(
-                            model=original_reranker_config.get("model"),
-                            enabled=original_reranker_config.get("enabled", True),
-                            top_n=original_reranker_config.get("top_n"),
-                        )
 
             return Response(
                 generate(),
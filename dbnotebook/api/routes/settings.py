@@ -16,6 +16,7 @@ from flask import request, jsonify
 
 from ...core.providers.reranker_provider import (
     get_reranker_config,
+    get_reranker_registry_stats,
     set_reranker_config,
     is_reranker_enabled,
     list_available_models,
@@ -48,6 +49,11 @@ def create_settings_routes(app):
                     "loaded": true,
                     "is_local": true
                 },
+                "registry": {
+                    "loads": 2, "evictions": 0, "hits": 120, "misses": 2,
+                    "memory_budget_mb": 4096, "resident_mb": 900.0,
+                    "models": [{"model": "...", "size_mb": 750.0, "hits": 100, ...}]
+                },
                 "available_models": [
                     {
                         "id": "base",
@@ -65,6 +71,7 @@ def create_settings_routes(app):
             return jsonify({
                 "success": True,
                 "config": config,
+                "registry": get_reranker_registry_stats(),
                 "available_models": available
             })
         except Exception as e:
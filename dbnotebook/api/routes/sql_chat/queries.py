@@ -3,6 +3,7 @@
 Endpoints for natural language to SQL query execution:
 - Execute queries (sync)
 - Execute queries with SSE streaming
+- Stream full query results (NDJSON / Arrow IPC)
 - Get query history
 """
 
@@ -16,7 +17,9 @@ from dbnotebook.api.core.response import (
     success_response, error_response, validation_error
 )
 
-from .utils import get_service, get_current_user_id, SQLChatJSONEncoder
+from dbnotebook.core.sql_chat.result_set import arrow_available, iter_arrow_ipc
+
+from .utils import get_service, get_current_user_id, result_rows, SQLChatJSONEncoder
 
 logger = logging.getLogger(__name__)
 
@@ -93,7 +96,7 @@ def execute_query(session_id: str):
         response_data = {
             'result': {
                 'sqlGenerated': result.sql_generated,
-                'data': result.data,
+                'data': result_rows(result.data),
                 'columns': [
                     {
                         'name': c.name,
@@ -259,6 +262,74 @@ def execute_query_stream(session_id: str):
         return error_response(str(e), 500)
 
 
+@queries_bp.route('/query/<session_id>/results', methods=['GET'])
+def stream_query_results(session_id: str):
+    """
+    Stream the full result of a query from session history.
+
+    Re-executes the query with a server-side cursor and streams masked rows
+    chunk by chunk, so the first rows arrive before the whole result is read.
+
+    Query params:
+        - index: Query history position (default -1, the latest query)
+        - format: "ndjson" (default) or "arrow" (Arrow IPC stream, needs pyarrow)
+        - chunk_rows: Rows per chunk (default sql_chat.query.fetch_chunk_rows)
+        - user_id: Optional user ID for access validation
+
+    Response:
+        application/x-ndjson: one JSON object per row
+        application/vnd.apache.arrow.stream: one record batch per chunk
+    """
+    try:
+        service = get_service()
+        user_id = get_current_user_id()
+
+        fmt = request.args.get('format', 'ndjson').lower()
+        if fmt not in ('ndjson', 'arrow'):
+            return validation_error('format must be "ndjson" or "arrow"')
+        if fmt == 'arrow' and not arrow_available():
+            return error_response('Arrow streaming requires pyarrow', 501)
+
+        index = int(request.args.get('index', -1))
+        chunk_rows = request.args.get('chunk_rows', type=int)
+
+        try:
+            columns, chunks = service.stream_query_results(
+                session_id, user_id, history_index=index, chunk_rows=chunk_rows
+            )
+        except ValueError as e:
+            return error_response(str(e), 400)
+
+        headers = {
+            'Cache-Control': 'no-cache',
+            'X-Accel-Buffering': 'no',
+            'X-Result-Columns': json.dumps([{'name': c.name, 'type': c.type} for c in columns]),
+        }
+
+        if fmt == 'arrow':
+            return Response(
+                iter_arrow_ipc(chunks),
+                mimetype='application/vnd.apache.arrow.stream',
+                headers=headers
+            )
+
+        def generate():
+            """Generate NDJSON lines chunk by chunk."""
+            encoder = SQLChatJSONEncoder()
+            try:
+                for chunk in chunks:
+                    yield from chunk.iter_ndjson(encoder, chunk_rows=len(chunk) or 1)
+            except Exception as e:
+                logger.error(f"Error streaming results for session {session_id}: {e}")
+                yield json.dumps({'error': str(e)}) + "\n"
+
+        return Response(generate(), mimetype='application/x-ndjson', headers=headers)
+
+    except Exception as e:
+        logger.error(f"Error streaming results for session {session_id}: {e}")
+        return error_response(str(e), 500)
+
+
 @queries_bp.route('/history/<session_id>', methods=['GET'])
 def get_query_history(session_id: str):
     """
@@ -131,6 +131,13 @@ def get_accuracy_metrics():
                 "avgRetries": 0.3,
                 "avgConfidence": 0.85,
                 "emptyResultRate": 0.05
+            },
+            "queryCache": {
+                "sql_hits": 12,
+                "sql_semantic_hits": 3,
+                "sql_misses": 40,
+                "result_hits": 7,
+                ...
             }
         }
     """
@@ -142,7 +149,10 @@ def get_accuracy_metrics():
 
         metrics = service.get_accuracy_metrics(days=days, session_id=session_id)
 
-        return success_response({'metrics': metrics})
+        return success_response({
+            'metrics': metrics,
+            'queryCache': service.get_query_cache_stats()
+        })
 
     except Exception as e:
         logger.error(f"Error getting metrics: {e}")
@@ -13,6 +13,7 @@ from uuid import UUID
 from flask import request
 
 from dbnotebook.core.constants import DEFAULT_USER_ID
+from dbnotebook.core.sql_chat.result_set import ColumnarResult
 
 logger = logging.getLogger(__name__)
 
@@ -25,6 +26,7 @@ class SQLChatJSONEncoder(json.JSONEncoder):
     - datetime/date -> ISO format string
     - Decimal -> float
     - bytes -> UTF-8 decoded string
+    - ColumnarResult -> list of row dicts
     """
 
     def default(self, obj: Any) -> Any:
@@ -36,9 +38,18 @@ class SQLChatJSONEncoder(json.JSONEncoder):
             return float(obj)
         if isinstance(obj, bytes):
             return obj.decode('utf-8', errors='replace')
+        if isinstance(obj, ColumnarResult):
+            return obj.to_records()
         return super().default(obj)
 
 
+def result_rows(data: Any) -> list:
+    """Row dicts for a query result payload (ColumnarResult or list)."""
+    if isinstance(data, ColumnarResult):
+        return data.to_records()
+    return data or []
+
+
 # SQL Chat service instance (initialized in create_sql_chat_routes)
 _sql_chat_service = None
 
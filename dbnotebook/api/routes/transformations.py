@@ -12,7 +12,12 @@ from flask import request, jsonify
 
 from ...core.db import DatabaseManager
 from ...core.db.models import NotebookSource
-from ...core.transformations import TransformationWorker, TransformationJob
+from ...core.jobs import JobQueue
+from ...core.transformations import (
+    TransformationWorker,
+    TransformationJob,
+    enqueue_transformation_job,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -21,6 +26,7 @@ def create_transformation_routes(
     app,
     db_manager: DatabaseManager,
     transformation_worker: TransformationWorker = None,
+    job_queue: JobQueue = None,
 ):
     """Create AI Transformations API routes.
 
@@ -28,7 +34,11 @@ def create_transformation_routes(
         app: Flask application instance
         db_manager: DatabaseManager instance
         transformation_worker: Optional TransformationWorker for retries
+        job_queue: Optional job queue for retries when the worker runs in
+            another process (python -m dbnotebook.worker)
     """
+    if job_queue is None and transformation_worker is not None:
+        job_queue = transformation_worker.job_queue
 
     @app.route('/api/sources/<source_id>/transformations', methods=['GET'])
     def get_transformations(source_id: str):
@@ -87,7 +97,7 @@ def create_transformation_routes(
         Returns:
             JSON with status indicating if retry was queued
         """
-        if not transformation_worker:
+        if not job_queue:
             return jsonify({
                 "success": False,
                 "error": "Transformation worker not available"
@@ -120,12 +130,15 @@ def create_transformation_routes(
                     file_name=source.file_name
                 )
 
-                # Queue the job
-                transformation_worker.queue_job(job)
+                # Queue the job (any worker process may pick it up)
+                queued = enqueue_transformation_job(job_queue, job) is not None
 
                 return jsonify({
                     "success": True,
-                    "message": "Transformation retry queued",
+                    "message": (
+                        "Transformation retry queued" if queued
+                        else "Transformation already queued"
+                    ),
                     "source_id": str(source.source_id)
                 })
 
@@ -1,28 +1,46 @@
-from .embedding import LocalEmbedding
-from .model import LocalRAGModel
-from .ingestion import LocalDataIngestion
-from .vector_store import LocalVectorStore, PGVectorStore
-from .engine import LocalChatEngine
-from .prompt import get_system_prompt
+"""Core package.
+
+Top-level names are imported lazily so that loading one submodule (for
+example ``dbnotebook.core.raptor.clustering``) does not pull in every LLM
+and embedding integration.
+"""
+
+import importlib
+
+_EXPORTS = {
+    # Legacy exports
+    "LocalEmbedding": ".embedding",
+    "LocalRAGModel": ".model",
+    "LocalDataIngestion": ".ingestion",
+    "LocalVectorStore": ".vector_store",
+    "PGVectorStore": ".vector_store",
+    "LocalChatEngine": ".engine",
+    "get_system_prompt": ".prompt",
+    # Plugin architecture (MVP 5)
+    "PluginRegistry": ".registry",
+    "RetrievalStrategy": ".interfaces",
+    "LLMProvider": ".interfaces",
+    "EmbeddingProvider": ".interfaces",
+    "ContentProcessor": ".interfaces",
+    "ImageGenerationProvider": ".interfaces",
+    "register_default_plugins": ".plugins",
+    "get_configured_llm": ".plugins",
+    "get_configured_embedding": ".plugins",
+    "get_configured_strategy": ".plugins",
+    "get_configured_image_provider": ".plugins",
+    "list_available_plugins": ".plugins",
+    "get_plugin_info": ".plugins",
+}
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        module = importlib.import_module(_EXPORTS[name], __name__)
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-# Plugin architecture (MVP 5)
-from .registry import PluginRegistry
-from .interfaces import (
-    RetrievalStrategy,
-    LLMProvider,
-    EmbeddingProvider,
-    ContentProcessor,
-    ImageGenerationProvider,
-)
-from .plugins import (
-    register_default_plugins,
-    get_configured_llm,
-    get_configured_embedding,
-    get_configured_strategy,
-    get_configured_image_provider,
-    list_available_plugins,
-    get_plugin_info,
-)
 
 __all__ = [
     # Legacy exports
@@ -1,5 +1,17 @@
 from .embedding import LocalEmbedding
+from .embedding_cache import (
+    CachedEmbedding,
+    EmbeddingCache,
+    configure_embedding_cache,
+    get_embedding_cache,
+    get_query_embedding_cache,
+)
 
 __all__ = [
     "LocalEmbedding",
+    "CachedEmbedding",
+    "EmbeddingCache",
+    "configure_embedding_cache",
+    "get_embedding_cache",
+    "get_query_embedding_cache",
 ]
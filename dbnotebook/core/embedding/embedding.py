@@ -9,6 +9,7 @@ from llama_index.embeddings.openai import OpenAIEmbedding
 from dotenv import load_dotenv
 
 from ...setting import get_settings, RAGSettings
+from .embedding_cache import CachedEmbedding, get_embedding_cache, get_query_embedding_cache
 
 load_dotenv()
 
@@ -69,6 +70,13 @@ class LocalEmbedding:
                 max_length=512  # Ensure chunks don't exceed model's token limit
             )
 
+        # Reuse embeddings of previously seen text (re-uploads, job retries)
+        # and of repeated queries (chat retrieval, RAPTOR lookups)
+        text_cache = get_embedding_cache() if setting.ingestion.embed_cache_enabled else None
+        query_cache = get_query_embedding_cache() if setting.ingestion.embed_query_cache_enabled else None
+        if text_cache is not None or query_cache is not None:
+            model = CachedEmbedding(model, text_cache, query_cache=query_cache)
+
         # Cache the model
         _embedding_cache[cache_key] = model
         logger.debug(f"Created and cached embedding model: {model_name}")
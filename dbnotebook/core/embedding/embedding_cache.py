@@ -0,0 +1,429 @@
+"""
+Content-addressed embedding cache shared by every embedding path.
+
+Ingestion, transformation embedding and RAPTOR summaries all embed through
+Settings.embed_model. Identical text (re-uploads, re-runs, failed-job
+retries) used to be embedded again each time. Embeddings are now keyed by
+(embed model name, md5 of text) and kept in two tiers:
+
+- In-process LRU of float32 vectors (bounded entry count)
+- Postgres table embedding_cache (bytea float32), shared across workers
+
+CachedEmbedding wraps the model LocalEmbedding.set() returns and resolves a
+whole batch from the cache before sending only the misses to HuggingFace or
+OpenAI.
+
+Query embeddings (chat retrieval, RAPTOR summary lookup) go through a
+separate EmbeddingCache keyed by (model, md5 of the normalized query): a
+small in-process LRU plus an UNLOGGED Postgres table so Gunicorn workers
+reuse each other's hits. Query and document embeddings are kept apart
+because models with query instructions embed the same string differently.
+"""
+
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+from llama_index.core.base.embeddings.base import BaseEmbedding, Embedding
+from llama_index.core.bridge.pydantic import PrivateAttr
+from sqlalchemy import text
+
+logger = logging.getLogger(__name__)
+
+CACHE_TABLE = "embedding_cache"
+QUERY_CACHE_TABLE = "query_embedding_cache"
+
+
+def text_hash(content: str) -> str:
+    """md5 hex digest used as the cache key for a text."""
+    return hashlib.md5(content.encode("utf-8")).hexdigest()
+
+
+def normalize_query(query: str) -> str:
+    """Collapse whitespace so trivially different repeats share a key.
+
+    Case is kept: cased models embed "What is X" and "what is x" differently.
+    """
+    return " ".join(query.split())
+
+
+class EmbeddingCache:
+    """
+    Two-tier (LRU + Postgres) embedding store keyed by (model, text hash).
+
+    The Postgres tier is optional: without a session factory the cache is
+    process-local only. Database errors are logged and treated as misses so
+    embedding never fails because of the cache.
+    """
+
+    def __init__(
+        self,
+        session_factory=None,
+        max_entries: int = 20000,
+        persistent: bool = True,
+        table: str = CACHE_TABLE,
+        unlogged: bool = False,
+    ) -> None:
+        """
+        Args:
+            session_factory: SQLAlchemy session factory (None = LRU only)
+            max_entries: LRU capacity in vectors
+            persistent: Read/write the Postgres tier when a session factory is set
+            table: Postgres table backing the shared tier
+            unlogged: Create the table UNLOGGED (no WAL; emptied after a crash)
+        """
+        self._table = table
+        self._unlogged = unlogged
+        self._session_factory = session_factory
+        self._max_entries = max_entries
+        self._persistent = persistent
+        self._lru: "OrderedDict[tuple, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._db_hits = 0
+        self._misses = 0
+        self._writes = 0
+        self._db_errors = 0
+
+    def configure(self, session_factory, persistent: Optional[bool] = None) -> None:
+        """Attach (or replace) the Postgres tier and make sure its table exists."""
+        self._session_factory = session_factory
+        if persistent is not None:
+            self._persistent = persistent
+        if self._db_enabled:
+            self.ensure_table()
+
+    @property
+    def _db_enabled(self) -> bool:
+        return self._persistent and self._session_factory is not None
+
+    def ensure_table(self) -> None:
+        """Create the cache table if the migration has not been applied."""
+        session = self._session_factory()
+        try:
+            session.execute(text(f"""
+                CREATE {"UNLOGGED " if self._unlogged else ""}TABLE IF NOT EXISTS {self._table} (
+                    model_name TEXT NOT NULL,
+                    text_hash CHAR(32) NOT NULL,
+                    embedding BYTEA NOT NULL,
+                    created_at TIMESTAMP NOT NULL DEFAULT NOW(),
+                    PRIMARY KEY (model_name, text_hash)
+                )
+            """))
+            session.commit()
+        except Exception as e:
+            session.rollback()
+            logger.warning(f"Could not ensure embedding cache table: {e}")
+        finally:
+            session.close()
+
+    # =========================================================================
+    # Lookup / store
+    # =========================================================================
+
+    def get_many(self, model_name: str, hashes: Sequence[str]) -> Dict[str, np.ndarray]:
+        """
+        Resolve hashes from the LRU, then the database in one query.
+
+        Args:
+            model_name: Embedding model name
+            hashes: Unique text hashes to look up
+
+        Returns:
+            Mapping of found hash -> float32 vector
+        """
+        found: Dict[str, np.ndarray] = {}
+        missing: List[str] = []
+        with self._lock:
+            for h in hashes:
+                vec = self._lru.get((model_name, h))
+                if vec is not None:
+                    self._lru.move_to_end((model_name, h))
+                    found[h] = vec
+                else:
+                    missing.append(h)
+            self._hits += len(hashes) - len(missing)
+
+        if missing and self._db_enabled:
+            loaded = self._db_get(model_name, missing)
+            if loaded:
+                found.update(loaded)
+                self._remember(model_name, loaded)
+            with self._lock:
+                self._db_hits += sum(1 for h in missing if h in loaded)
+
+        with self._lock:
+            self._misses += sum(1 for h in missing if h not in found)
+        return found
+
+    def put_many(self, model_name: str, vectors: Dict[str, np.ndarray]) -> None:
+        """Store freshly computed vectors in both tiers."""
+        if not vectors:
+            return
+        self._remember(model_name, vectors)
+        if self._db_enabled:
+            self._db_put(model_name, vectors)
+        with self._lock:
+            self._writes += len(vectors)
+
+    def _remember(self, model_name: str, vectors: Dict[str, np.ndarray]) -> None:
+        with self._lock:
+            for h, vec in vectors.items():
+                self._lru[(model_name, h)] = vec
+                self._lru.move_to_end((model_name, h))
+            while len(self._lru) > self._max_entries:
+                self._lru.popitem(last=False)
+
+    def _db_get(self, model_name: str, hashes: List[str]) -> Dict[str, np.ndarray]:
+        session = self._session_factory()
+        try:
+            rows = session.execute(
+                text(f"""
+                    SELECT text_hash, embedding FROM {self._table}
+                    WHERE model_name = :model_name
+                    AND text_hash = ANY(CAST(:hashes AS text[]))
+                """),
+                {"model_name": model_name, "hashes": hashes}
+            ).fetchall()
+            return {row[0]: np.frombuffer(bytes(row[1]), dtype="<f4") for row in rows}
+        except Exception as e:
+            self._db_errors += 1
+            logger.warning(f"Embedding cache lookup failed: {e}")
+            return {}
+        finally:
+            session.close()
+
+    def _db_put(self, model_name: str, vectors: Dict[str, np.ndarray]) -> None:
+        hashes = list(vectors.keys())
+        blobs = [np.asarray(vectors[h], dtype="<f4").tobytes() for h in hashes]
+        session = self._session_factory()
+        try:
+            session.execute(
+                text(f"""
+                    INSERT INTO {self._table} (model_name, text_hash, embedding)
+                    SELECT :model_name, h, e
+                    FROM unnest(CAST(:hashes AS text[]), CAST(:blobs AS bytea[])) AS t(h, e)
+                    ON CONFLICT (model_name, text_hash) DO NOTHING
+                """),
+                {"model_name": model_name, "hashes": hashes, "blobs": blobs}
+            )
+            session.commit()
+        except Exception as e:
+            session.rollback()
+            self._db_errors += 1
+            logger.warning(f"Embedding cache write failed: {e}")
+        finally:
+            session.close()
+
+    def clear(self) -> None:
+        """Drop the in-process tier (the Postgres tier is content-addressed and kept)."""
+        with self._lock:
+            self._lru.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for both tiers."""
+        with self._lock:
+            lookups = self._hits + self._db_hits + self._misses
+            return {
+                "entries": len(self._lru),
+                "max_entries": self._max_entries,
+                "persistent": self._db_enabled,
+                "hits": self._hits,
+                "db_hits": self._db_hits,
+                "misses": self._misses,
+                "hit_rate": (self._hits + self._db_hits) / lookups if lookups else 0.0,
+                "writes": self._writes,
+                "db_errors": self._db_errors,
+            }
+
+
+class CachedEmbedding(BaseEmbedding):
+    """
+    Embedding model wrapper that consults an EmbeddingCache for text batches
+    and, when given one, a separate cache for query embeddings.
+
+    Either cache may be None, in which case those calls pass straight
+    through to the wrapped model.
+    """
+
+    _model: BaseEmbedding = PrivateAttr()
+    _cache: Optional[EmbeddingCache] = PrivateAttr()
+    _query_cache: Optional[EmbeddingCache] = PrivateAttr()
+
+    def __init__(
+        self,
+        model: BaseEmbedding,
+        cache: Optional[EmbeddingCache],
+        query_cache: Optional[EmbeddingCache] = None,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(
+            model_name=model.model_name,
+            embed_batch_size=model.embed_batch_size,
+            callback_manager=model.callback_manager,
+            **kwargs,
+        )
+        self._model = model
+        self._cache = cache
+        self._query_cache = query_cache
+
+    @classmethod
+    def class_name(cls) -> str:
+        return "CachedEmbedding"
+
+    @property
+    def wrapped_model(self) -> BaseEmbedding:
+        """The underlying HuggingFace/OpenAI embedding model."""
+        return self._model
+
+    @property
+    def cache(self) -> Optional[EmbeddingCache]:
+        return self._cache
+
+    @property
+    def query_cache(self) -> Optional[EmbeddingCache]:
+        return self._query_cache
+
+    def _resolve(self, texts: List[str]):
+        """Split texts into cached vectors and the unique texts still to embed."""
+        hashes = [text_hash(t) for t in texts]
+        found = self._cache.get_many(self.model_name, list(dict.fromkeys(hashes)))
+        pending: Dict[str, str] = {}
+        for h, t in zip(hashes, texts):
+            if h not in found and h not in pending:
+                pending[h] = t
+        return hashes, found, pending
+
+    def _finish(self, hashes, found, pending, embeddings) -> List[Embedding]:
+        computed = {
+            h: np.asarray(vec, dtype=np.float32)
+            for h, vec in zip(pending.keys(), embeddings)
+        }
+        self._cache.put_many(self.model_name, computed)
+        found.update(computed)
+        return [found[h].tolist() for h in hashes]
+
+    def get_text_embedding_batch(
+        self,
+        texts: List[str],
+        show_progress: bool = False,
+        **kwargs: Any,
+    ) -> List[Embedding]:
+        """Embed texts, computing only those not already cached."""
+        if not texts:
+            return []
+        if self._cache is None:
+            return self._model.get_text_embedding_batch(texts, show_progress=show_progress, **kwargs)
+        hashes, found, pending = self._resolve(texts)
+        embeddings = []
+        if pending:
+            embeddings = self._model.get_text_embedding_batch(
+                list(pending.values()), show_progress=show_progress, **kwargs
+            )
+        if len(pending) < len(texts):
+            logger.debug(f"Embedding cache: {len(texts) - len(pending)}/{len(texts)} texts reused")
+        return self._finish(hashes, found, pending, embeddings)
+
+    async def aget_text_embedding_batch(
+        self,
+        texts: List[str],
+        show_progress: bool = False,
+        **kwargs: Any,
+    ) -> List[Embedding]:
+        if not texts:
+            return []
+        if self._cache is None:
+            return await self._model.aget_text_embedding_batch(
+                texts, show_progress=show_progress, **kwargs
+            )
+        hashes, found, pending = self._resolve(texts)
+        embeddings = []
+        if pending:
+            embeddings = await self._model.aget_text_embedding_batch(
+                list(pending.values()), show_progress=show_progress, **kwargs
+            )
+        return self._finish(hashes, found, pending, embeddings)
+
+    def _get_text_embedding(self, text: str) -> Embedding:
+        return self.get_text_embedding_batch([text])[0]
+
+    async def _aget_text_embedding(self, text: str) -> Embedding:
+        return (await self.aget_text_embedding_batch([text]))[0]
+
+    def _get_text_embeddings(self, texts: List[str]) -> List[Embedding]:
+        return self.get_text_embedding_batch(texts)
+
+    def _cached_query(self, query: str):
+        """Look up a normalized query; returns (normalized query, key, vector or None)."""
+        normalized = normalize_query(query)
+        key = text_hash(normalized)
+        return normalized, key, self._query_cache.get_many(self.model_name, [key]).get(key)
+
+    def _get_query_embedding(self, query: str) -> Embedding:
+        if self._query_cache is None:
+            return self._model.get_query_embedding(query)
+        # Embed the normalized text so the stored vector matches its key
+        normalized, key, vec = self._cached_query(query)
+        if vec is None:
+            vec = np.asarray(self._model.get_query_embedding(normalized), dtype=np.float32)
+            self._query_cache.put_many(self.model_name, {key: vec})
+        return vec.tolist()
+
+    async def _aget_query_embedding(self, query: str) -> Embedding:
+        if self._query_cache is None:
+            return await self._model.aget_query_embedding(query)
+        normalized, key, vec = self._cached_query(query)
+        if vec is None:
+            vec = np.asarray(await self._model.aget_query_embedding(normalized), dtype=np.float32)
+            self._query_cache.put_many(self.model_name, {key: vec})
+        return vec.tolist()
+
+
+# Process-wide cache shared by every LocalEmbedding-produced model
+_shared_cache: Optional[EmbeddingCache] = None
+_shared_lock = threading.Lock()
+
+
+def get_embedding_cache() -> EmbeddingCache:
+    """Get the process-wide embedding cache (LRU-only until configured)."""
+    global _shared_cache
+    with _shared_lock:
+        if _shared_cache is None:
+            from ...setting import get_settings
+            ingestion = get_settings().ingestion
+            _shared_cache = EmbeddingCache(
+                max_entries=ingestion.embed_cache_max_entries,
+                persistent=ingestion.embed_cache_persistent,
+            )
+        return _shared_cache
+
+
+# Process-wide query embedding cache, separate from document embeddings
+_query_cache: Optional[EmbeddingCache] = None
+
+
+def get_query_embedding_cache() -> EmbeddingCache:
+    """Get the process-wide query embedding cache (LRU-only until configured)."""
+    global _query_cache
+    with _shared_lock:
+        if _query_cache is None:
+            from ...setting import get_settings
+            ingestion = get_settings().ingestion
+            _query_cache = EmbeddingCache(
+                max_entries=ingestion.embed_query_cache_max_entries,
+                persistent=ingestion.embed_query_cache_shared,
+                table=QUERY_CACHE_TABLE,
+                unlogged=True,
+            )
+        return _query_cache
+
+
+def configure_embedding_cache(session_factory) -> EmbeddingCache:
+    """Attach the Postgres tier to the process-wide embedding caches."""
+    cache = get_embedding_cache()
+    cache.configure(session_factory)
+    get_query_embedding_cache().configure(session_factory)
+    return cache
@@ -1,8 +1,10 @@
 from .engine import LocalChatEngine
 from .retriever import LocalRetriever, QueryIntent
+from .notebook_index import NotebookIndex
 
 __all__ = [
     "LocalChatEngine",
     "LocalRetriever",
     "QueryIntent",
+    "NotebookIndex",
 ]
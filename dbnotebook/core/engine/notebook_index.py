@@ -0,0 +1,288 @@
+"""
+Incrementally updatable per-notebook retrieval index.
+
+LocalRetriever used to rebuild a VectorStoreIndex and a BM25Retriever from
+scratch whenever a notebook's node list changed. NotebookIndex holds the
+same two structures in a form that takes deltas in place:
+
+- Vector leg: L2-normalized float32 matrix with spare capacity; appends
+  write past the published row count, removals flip a tombstone mask, so
+  concurrent searches always see a consistent snapshot without locking.
+- BM25 leg: inverted index (term -> {row: tf}) plus per-row lengths,
+  maintained under a lock; adding or removing a document touches only that
+  document's postings.
+
+The index tracks the NodeCache version it reflects; LocalRetriever applies
+NotebookNodes.deltas_since(index.version) to catch up.
+"""
+
+import logging
+import math
+import threading
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+from llama_index.core import Settings
+from llama_index.core.callbacks.base import CallbackManager
+from llama_index.core.retrievers import BaseRetriever
+from llama_index.core.schema import BaseNode, NodeWithScore, QueryBundle
+
+from ..utils.text_utils import BM25_B, BM25_K1, bm25_tokenize
+from ..vector_store.columnar import embedding_block, embedding_dim
+
+logger = logging.getLogger(__name__)
+
+# Compact when tombstones exceed this fraction of rows
+_COMPACT_RATIO = 0.5
+
+
+class NotebookIndex:
+    """
+    Vector + BM25 retrieval structures for one notebook, updatable in place.
+
+    Attributes:
+        notebook_id: Notebook this index belongs to
+        version: NodeCache version the index currently reflects
+        has_bm25: Whether the in-memory BM25 leg is maintained (skipped when
+                  the persistent Postgres BM25 index serves keyword search)
+    """
+
+    def __init__(
+        self,
+        notebook_id: str,
+        nodes: Sequence[BaseNode],
+        version: Optional[int] = None,
+        with_bm25: bool = True,
+    ):
+        self.notebook_id = notebook_id
+        self.version = version
+        self.has_bm25 = with_bm25
+        self._lock = threading.Lock()
+        self._reset(nodes)
+
+    # =========================================================================
+    # Construction and deltas
+    # =========================================================================
+
+    def _reset(self, nodes: Sequence[BaseNode]) -> None:
+        """(Re)build every structure from a node list. Caller holds _lock or owns self."""
+        self._dim = 0
+        self._nodes: List[Optional[BaseNode]] = []
+        self._positions: Dict[str, int] = {}
+        self._doc_terms: List[Optional[Counter]] = []
+        self._postings: Dict[str, Dict[int, int]] = {}
+        self._doc_len = np.zeros(max(len(nodes), 16), dtype=np.float32)
+        self._total_len = 0
+        self._live = 0
+        # Published snapshot for lock-free vector search:
+        # (matrix, rows, alive, nodes). Rows below `rows` never move until a
+        # compaction publishes a whole new snapshot.
+        capacity = max(len(nodes), 16)
+        self._snapshot = (
+            np.zeros((capacity, 0), dtype=np.float32),
+            0,
+            np.zeros(capacity, dtype=bool),
+            self._nodes,
+        )
+        self._append(nodes)
+
+    def _append(self, nodes: Sequence[BaseNode]) -> None:
+        """Append nodes to both legs and publish a new snapshot."""
+        if not nodes:
+            return
+        matrix, rows, alive, _ = self._snapshot
+        needed = rows + len(nodes)
+
+        if self._dim == 0 and rows == 0:
+            # Dimension comes from the first embedded node
+            self._dim = embedding_dim(nodes)
+            matrix = np.zeros((matrix.shape[0], self._dim), dtype=np.float32)
+
+        if needed > matrix.shape[0]:
+            capacity = max(needed, matrix.shape[0] * 2)
+            grown = np.zeros((capacity, self._dim), dtype=np.float32)
+            grown[:rows] = matrix[:rows]
+            matrix = grown
+            grown_alive = np.zeros(capacity, dtype=bool)
+            grown_alive[:rows] = alive[:rows]
+            alive = grown_alive
+            doc_len = np.zeros(capacity, dtype=np.float32)
+            doc_len[:rows] = self._doc_len[:rows]
+            self._doc_len = doc_len
+        else:
+            alive = alive.copy()
+
+        # Matrix-backed nodes are copied row to row, without embedding lists
+        block = embedding_block(nodes, self._dim)
+        norms = np.linalg.norm(block, axis=1, keepdims=True)
+        np.divide(block, norms, out=block, where=norms > 0)
+        matrix[rows:needed] = block
+
+        for offset, node in enumerate(nodes):
+            pos = rows + offset
+            self._nodes.append(node)
+            self._positions[node.node_id] = pos
+            if not self.has_bm25:
+                self._doc_terms.append(None)
+                continue
+            terms = Counter(bm25_tokenize(node.get_content()))
+            self._doc_terms.append(terms)
+            length = sum(terms.values())
+            self._doc_len[pos] = length
+            self._total_len += length
+            for term, tf in terms.items():
+                self._postings.setdefault(term, {})[pos] = tf
+        alive[rows:needed] = True
+        self._live += len(nodes)
+
+        self._snapshot = (matrix, needed, alive, self._nodes)
+
+    def _remove(self, node_ids: Iterable[str]) -> int:
+        """Tombstone nodes in both legs and publish a new snapshot."""
+        matrix, rows, alive, _ = self._snapshot
+        alive = alive.copy()
+        removed = 0
+        for node_id in node_ids:
+            pos = self._positions.pop(node_id, None)
+            if pos is None:
+                continue
+            alive[pos] = False
+            terms = self._doc_terms[pos] or ()
+            for term in terms:
+                postings = self._postings.get(term)
+                if postings is not None:
+                    postings.pop(pos, None)
+                    if not postings:
+                        del self._postings[term]
+            self._total_len -= int(self._doc_len[pos])
+            self._doc_len[pos] = 0
+            self._doc_terms[pos] = None
+            self._nodes[pos] = None
+            removed += 1
+        self._live -= removed
+        self._snapshot = (matrix, rows, alive, self._nodes)
+        return removed
+
+    def apply_deltas(self, deltas: Sequence, version: int) -> None:
+        """
+        Apply NodeCache deltas in order and advance to version.
+
+        Args:
+            deltas: NotebookDelta objects (added nodes, removed node IDs)
+            version: Version the index reflects afterwards
+        """
+        with self._lock:
+            added_count = removed_count = 0
+            for delta in deltas:
+                removed_count += self._remove(delta.removed_ids)
+                # A re-added ID replaces its old row
+                self._remove([n.node_id for n in delta.added if n.node_id in self._positions])
+                self._append(delta.added)
+                added_count += len(delta.added)
+
+            rows = self._snapshot[1]
+            if rows and (rows - self._live) / rows > _COMPACT_RATIO:
+                logger.debug(f"Compacting notebook index {self.notebook_id}")
+                self._reset([n for n in self._nodes if n is not None])
+
+            self.version = version
+        logger.info(
+            f"Applied {len(deltas)} delta(s) to notebook index {self.notebook_id}: "
+            f"+{added_count} -{removed_count} (version {version}, {self._live} nodes)"
+        )
+
+    def __len__(self) -> int:
+        return self._live
+
+    # =========================================================================
+    # Search
+    # =========================================================================
+
+    def vector_search(self, query_embedding: List[float], top_k: int) -> List[NodeWithScore]:
+        """Cosine similarity top-k over live rows (lock-free snapshot read)."""
+        matrix, rows, alive, nodes = self._snapshot
+        if rows == 0 or self._dim == 0 or len(query_embedding) != self._dim:
+            return []
+
+        query = np.asarray(query_embedding, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        if norm > 0:
+            query = query / norm
+
+        scores = matrix[:rows] @ query
+        scores[~alive[:rows]] = -np.inf
+        k = min(top_k, int(alive[:rows].sum()))
+        if k <= 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+
+        return [
+            NodeWithScore(node=nodes[i], score=float(scores[i]))
+            for i in top
+            if nodes[i] is not None
+        ]
+
+    def bm25_search(self, query_str: str, top_k: int) -> List[NodeWithScore]:
+        """Okapi BM25 top-k using the inverted index."""
+        query_terms = bm25_tokenize(query_str) if self.has_bm25 else []
+        if not query_terms:
+            return []
+
+        with self._lock:
+            live = self._live
+            if live == 0:
+                return []
+            avgdl = self._total_len / live if self._total_len else 1.0
+            scores: Dict[int, float] = {}
+            for term in set(query_terms):
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                df = len(postings)
+                idf = math.log(1 + (live - df + 0.5) / (df + 0.5))
+                for pos, tf in postings.items():
+                    norm = BM25_K1 * (1 - BM25_B + BM25_B * self._doc_len[pos] / avgdl)
+                    scores[pos] = scores.get(pos, 0.0) + idf * tf * (BM25_K1 + 1) / (tf + norm)
+            ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:top_k]
+            return [NodeWithScore(node=self._nodes[pos], score=score) for pos, score in ranked]
+
+
+class NotebookVectorRetriever(BaseRetriever):
+    """Vector leg over a NotebookIndex (replaces VectorIndexRetriever)."""
+
+    def __init__(
+        self,
+        index: NotebookIndex,
+        similarity_top_k: int = 20,
+        embed_model=None,
+        callback_manager: Optional[CallbackManager] = None,
+    ) -> None:
+        super().__init__(callback_manager=callback_manager)
+        self._index = index
+        self._similarity_top_k = similarity_top_k
+        self._embed_model = embed_model
+
+    def _retrieve(self, query_bundle: QueryBundle) -> List[NodeWithScore]:
+        if query_bundle.embedding is None:
+            embed_model = self._embed_model or Settings.embed_model
+            query_bundle.embedding = embed_model.get_query_embedding(query_bundle.query_str)
+        return self._index.vector_search(query_bundle.embedding, self._similarity_top_k)
+
+
+class NotebookBM25Retriever(BaseRetriever):
+    """BM25 leg over a NotebookIndex (replaces BM25Retriever)."""
+
+    def __init__(
+        self,
+        index: NotebookIndex,
+        similarity_top_k: int = 20,
+        callback_manager: Optional[CallbackManager] = None,
+    ) -> None:
+        super().__init__(callback_manager=callback_manager)
+        self._index = index
+        self._similarity_top_k = similarity_top_k
+
+    def _retrieve(self, query_bundle: QueryBundle) -> List[NodeWithScore]:
+        return self._index.bm25_search(query_bundle.query_str, self._similarity_top_k)
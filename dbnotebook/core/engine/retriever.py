@@ -16,7 +16,9 @@ The retrieval pipeline adapts based on:
 import logging
 import os
 import re
+import threading
 import time
+from collections import OrderedDict
 from enum import Enum
 from typing import List, Optional, Tuple, Dict
 
@@ -38,6 +40,8 @@ from ..prompt import get_query_gen_prompt
 from ...setting import get_settings, RAGSettings, QueryTimeSettings
 from ..raptor import RAPTORRetriever, has_raptor_tree, RAPTORConfig
 from ..utils import unwrap_llm
+from .notebook_index import NotebookIndex, NotebookBM25Retriever, NotebookVectorRetriever
+from ..vector_store.columnar import with_embedding_lists
 
 load_dotenv()
 
@@ -174,6 +178,80 @@ class TwoStageRetriever(QueryFusionRetriever):
         return rerank_model.postprocess_nodes(results, query_bundle)
 
 
+class PGHybridRetriever(BaseRetriever):
+    """
+    Hybrid retriever that runs both BM25-style and vector ranking in Postgres.
+
+    Delegates to PGVectorStore.hybrid_search(): HNSW ANN plus ts_rank_cd
+    full-text ranking, fused with RRF in SQL. Nothing is loaded per notebook,
+    so memory stays flat no matter how many chunks the notebook holds.
+    """
+
+    def __init__(
+        self,
+        vector_store,
+        notebook_id: str,
+        similarity_top_k: int = 20,
+        candidate_k: int = 50,
+        rrf_k: int = 60,
+        retriever_weights: Optional[List[float]] = None,
+        embed_model=None,
+        callback_manager: Optional[CallbackManager] = None,
+    ) -> None:
+        super().__init__(callback_manager=callback_manager)
+        self._vector_store = vector_store
+        self._notebook_id = notebook_id
+        self._similarity_top_k = similarity_top_k
+        self._candidate_k = candidate_k
+        self._rrf_k = rrf_k
+        self._retriever_weights = retriever_weights
+        self._embed_model = embed_model
+
+    def _retrieve(self, query_bundle: QueryBundle) -> List[NodeWithScore]:
+        if query_bundle.embedding is None:
+            embed_model = self._embed_model or Settings.embed_model
+            query_bundle.embedding = embed_model.get_query_embedding(query_bundle.query_str)
+
+        return self._vector_store.hybrid_search(
+            notebook_id=self._notebook_id,
+            query_str=query_bundle.query_str,
+            query_embedding=query_bundle.embedding,
+            top_k=self._similarity_top_k,
+            candidate_k=self._candidate_k,
+            rrf_k=self._rrf_k,
+            weights=self._retriever_weights,
+        )
+
+
+class PGBM25Retriever(BaseRetriever):
+    """
+    BM25 leg backed by the persistent Postgres inverted index.
+
+    Delegates to PGVectorStore.bm25_search(), which scores only the query
+    terms' postings in SQL, so no corpus is tokenized at retriever build or
+    query time.
+    """
+
+    def __init__(
+        self,
+        vector_store,
+        notebook_id: str,
+        similarity_top_k: int = 20,
+        callback_manager: Optional[CallbackManager] = None,
+    ) -> None:
+        super().__init__(callback_manager=callback_manager)
+        self._vector_store = vector_store
+        self._notebook_id = notebook_id
+        self._similarity_top_k = similarity_top_k
+
+    def _retrieve(self, query_bundle: QueryBundle) -> List[NodeWithScore]:
+        return self._vector_store.bm25_search(
+            notebook_id=self._notebook_id,
+            query_str=query_bundle.query_str,
+            top_k=self._similarity_top_k,
+        )
+
+
 class LocalRetriever:
     """
     Factory for creating optimized retrievers based on document count.
@@ -200,12 +278,19 @@ class LocalRetriever:
         # Query-time settings (updated per-request, cleared after use)
         self._query_settings: Optional[QueryTimeSettings] = None
 
-        # Retriever cache for performance optimization
+        # Retriever cache for filtered (offering/practice) retrieval
         # Cache format: {cache_key: (retriever, timestamp)}
-        # Cache key: f"{notebook_id}:{node_count}"
+        # Cache key: f"{notebook_id}:{node_cache_version}"
         self._retriever_cache: Dict[str, Tuple[BaseRetriever, float]] = {}
         self._retriever_cache_ttl = 300  # 5 minutes TTL
 
+        # Per-notebook incremental indexes (vector + BM25), LRU-bounded.
+        # Kept current by applying NodeCache deltas instead of rebuilding.
+        self._notebook_indexes: "OrderedDict[str, Tuple[NotebookIndex, float]]" = OrderedDict()
+        self._notebook_index_lock = threading.Lock()
+        self._notebook_build_locks: Dict[str, threading.Lock] = {}
+        self._max_notebook_indexes = 16
+
         logger.debug("LocalRetriever initialized")
 
     def set_query_settings(self, settings: Optional[QueryTimeSettings]) -> None:
@@ -386,13 +471,162 @@ class LocalRetriever:
         # Build new index
         start_time = time.time()
         logger.debug(f"Creating new vector index with {len(nodes)} nodes for notebook {notebook_id}")
-        self._index_cache = VectorStoreIndex(nodes=nodes)
+        self._index_cache = VectorStoreIndex(nodes=with_embedding_lists(nodes))
         self._cached_node_count = len(nodes)
         self._cached_notebook_id = notebook_id
         build_time_ms = int((time.time() - start_time) * 1000)
         logger.info(f"Built vector index: {len(nodes)} nodes in {build_time_ms}ms")
         return self._index_cache
 
+    def _get_notebook_index(
+        self,
+        nodes: List[BaseNode],
+        notebook_id: str,
+        with_bm25: bool = True,
+    ) -> NotebookIndex:
+        """Get the notebook's incremental index, catching up via deltas if possible.
+
+        Nodes from NodeCache carry a version; when the cached index is behind,
+        the deltas between the two versions are applied in place. A full build
+        only happens for a notebook seen for the first time (or after its
+        delta history was lost, e.g. on cache eviction).
+
+        Args:
+            nodes: Notebook nodes (NotebookNodes from NodeCache, or a plain list)
+            notebook_id: Notebook ID
+            with_bm25: Maintain the in-memory BM25 leg (False when the
+                       persistent BM25 index is used)
+
+        Returns:
+            NotebookIndex reflecting nodes
+        """
+        version = getattr(nodes, "version", None)
+
+        with self._notebook_index_lock:
+            build_lock = self._notebook_build_locks.setdefault(notebook_id, threading.Lock())
+
+        with build_lock:
+            with self._notebook_index_lock:
+                cached = self._notebook_indexes.get(notebook_id)
+                if cached is not None:
+                    self._notebook_indexes.move_to_end(notebook_id)
+
+            if cached is not None and cached[0].has_bm25 != with_bm25:
+                cached = None
+
+            if cached is not None:
+                index, timestamp = cached
+                if version is not None and index.version is not None:
+                    if version <= index.version:
+                        logger.debug(f"Notebook index hit for {notebook_id} (version {index.version})")
+                        return index
+                    deltas = nodes.deltas_since(index.version)
+                    if deltas is not None:
+                        index.apply_deltas(deltas, version)
+                        return index
+                    logger.debug(f"No delta path from version {index.version} to {version}, rebuilding")
+                elif (
+                    version is None and index.version is None and
+                    len(index) == len(nodes) and
+                    time.time() - timestamp < self._retriever_cache_ttl
+                ):
+                    return index
+
+            start_time = time.time()
+            index = NotebookIndex(notebook_id, nodes, version, with_bm25=with_bm25)
+            build_time_ms = int((time.time() - start_time) * 1000)
+            logger.info(
+                f"Built notebook index for {notebook_id}: {len(nodes)} nodes "
+                f"in {build_time_ms}ms (version {version})"
+            )
+
+            with self._notebook_index_lock:
+                self._notebook_indexes[notebook_id] = (index, time.time())
+                self._notebook_indexes.move_to_end(notebook_id)
+                while len(self._notebook_indexes) > self._max_notebook_indexes:
+                    evicted, _ = self._notebook_indexes.popitem(last=False)
+                    self._notebook_build_locks.pop(evicted, None)
+                    logger.debug(f"Evicted notebook index for {evicted}")
+
+            return index
+
+    def _get_notebook_retriever(
+        self,
+        index: NotebookIndex,
+        llm: Optional[LLM] = None,
+        vector_store=None,
+    ) -> BaseRetriever:
+        """Create a retriever over a NotebookIndex.
+
+        Mirrors the size-based strategy of get_retrievers(): vector-only for
+        small notebooks, BM25 + vector two-stage retrieval otherwise. The
+        wrappers are cheap, so they are created per call with current
+        query-time settings while the index itself is shared.
+        """
+        similarity_top_k = self._get_similarity_top_k()
+        vector_retriever = NotebookVectorRetriever(
+            index=index,
+            similarity_top_k=similarity_top_k,
+            embed_model=Settings.embed_model,
+        )
+
+        if len(index) <= self._setting.retriever.top_k_rerank:
+            logger.debug(f"Using simple retriever for {len(index)} nodes")
+            return vector_retriever
+
+        logger.debug(f"Using two-stage retriever for {len(index)} nodes")
+        if index.has_bm25:
+            bm25_retriever = NotebookBM25Retriever(
+                index=index,
+                similarity_top_k=similarity_top_k,
+            )
+        else:
+            bm25_retriever = PGBM25Retriever(
+                vector_store=vector_store,
+                notebook_id=index.notebook_id,
+                similarity_top_k=similarity_top_k,
+            )
+        return TwoStageRetriever(
+            retrievers=[bm25_retriever, vector_retriever],
+            retriever_weights=self._get_retriever_weights(),
+            setting=self._setting,
+            llm=llm or Settings.llm,
+            query_gen_prompt=None,
+            similarity_top_k=similarity_top_k,
+            num_queries=1,
+            mode=self._setting.retriever.fusion_mode,
+            use_async=False,
+            verbose=False
+        )
+
+    def supports_persistent_bm25(self, vector_store=None) -> bool:
+        """Check whether the persistent Postgres BM25 index can serve keyword search."""
+        return (
+            vector_store is not None and
+            getattr(vector_store, "has_bm25_index", False) and
+            hasattr(vector_store, "bm25_search")
+        )
+
+    def _get_bm25_retriever(
+        self,
+        vector_index: VectorStoreIndex,
+        similarity_top_k: int,
+        vector_store=None,
+        notebook_id: Optional[str] = None,
+    ) -> BaseRetriever:
+        """BM25 leg: persistent Postgres index when available, else in-memory BM25Retriever."""
+        if notebook_id and self.supports_persistent_bm25(vector_store):
+            return PGBM25Retriever(
+                vector_store=vector_store,
+                notebook_id=notebook_id,
+                similarity_top_k=similarity_top_k,
+            )
+        return BM25Retriever.from_defaults(
+            index=vector_index,
+            similarity_top_k=similarity_top_k,
+            verbose=False
+        )
+
     def _get_normal_retriever(
         self,
         vector_index: VectorStoreIndex,
@@ -412,11 +646,15 @@ class LocalRetriever:
         vector_index: VectorStoreIndex,
         llm: Optional[LLM] = None,
         language: str = "eng",
-        gen_query: bool = True
+        gen_query: bool = True,
+        vector_store=None,
+        notebook_id: Optional[str] = None,
     ) -> BaseRetriever:
         """Create hybrid BM25 + vector retriever.
 
         Uses query-time settings if set, otherwise falls back to config defaults.
+        The BM25 leg uses the persistent Postgres index when vector_store has
+        one and the index covers a single notebook (notebook_id).
         """
         llm = llm or Settings.llm
         similarity_top_k = self._get_similarity_top_k()
@@ -431,10 +669,8 @@ class LocalRetriever:
         )
 
         # BM25 retriever
-        bm25_retriever = BM25Retriever.from_defaults(
-            index=vector_index,
-            similarity_top_k=similarity_top_k,
-            verbose=False
+        bm25_retriever = self._get_bm25_retriever(
+            vector_index, similarity_top_k, vector_store=vector_store, notebook_id=notebook_id
         )
 
         retrievers = [bm25_retriever, vector_retriever]
@@ -482,8 +718,12 @@ class LocalRetriever:
         """
         Get appropriate retriever based on collection size with optional filtering.
 
-        Uses caching to avoid rebuilding retrievers for repeat queries.
-        Cache is invalidated after TTL (5 minutes) or when notebook/nodes change.
+        Unfiltered notebook retrieval uses a per-notebook NotebookIndex that
+        is updated in place from NodeCache deltas (tracked by version), so
+        uploads, deletions and source toggles don't trigger a full rebuild.
+        Filtered retrievers are cached per notebook version with a TTL.
+        With server-side hybrid retrieval enabled, unfiltered notebook
+        retrieval runs in Postgres via get_server_side_retriever() instead.
 
         Args:
             llm: Language model for query generation
@@ -500,8 +740,24 @@ class LocalRetriever:
         # Unwrap LLM wrappers (e.g., GroqWithBackoff) for LlamaIndex compatibility
         llm = unwrap_llm(llm)
 
+        # Nodes are already the notebook's own; filtering by it again is a no-op
+        if offering_filter and list(offering_filter) == [notebook_id] and not practice_filter:
+            offering_filter = None
+
+        if notebook_id and not (offering_filter or practice_filter):
+            # Rank in Postgres instead of indexing the in-memory nodes
+            if self.supports_server_side(vector_store):
+                return self.get_server_side_retriever(llm, vector_store, notebook_id)
+            persistent_bm25 = self.supports_persistent_bm25(vector_store)
+            index = self._get_notebook_index(nodes, notebook_id, with_bm25=not persistent_bm25)
+            return self._get_notebook_retriever(index, llm, vector_store=vector_store)
+
         # Check retriever cache first (only if notebook_id is valid)
-        cache_key = f"{notebook_id}:{len(nodes)}" if notebook_id else None
+        version = getattr(nodes, "version", None)
+        cache_key = (
+            f"{notebook_id}:{version if version is not None else len(nodes)}"
+            if notebook_id else None
+        )
         current_time = time.time()
 
         if cache_key and cache_key in self._retriever_cache:
@@ -618,6 +874,60 @@ class LocalRetriever:
 
         return retriever
 
+    def supports_server_side(self, vector_store=None) -> bool:
+        """Check whether server-side hybrid retrieval is enabled and available."""
+        return (
+            self._setting.retriever.server_side_hybrid and
+            vector_store is not None and
+            getattr(vector_store, "supports_hybrid_search", False)
+        )
+
+    def get_server_side_retriever(
+        self,
+        llm: LLM,
+        vector_store,
+        notebook_id: str,
+    ) -> BaseRetriever:
+        """
+        Get a retriever that ranks entirely inside Postgres.
+
+        Unlike get_retrievers(), no notebook nodes are needed: candidate
+        selection and RRF fusion happen in SQL, and only the top-k rows come
+        back. Reranking still runs in-process via TwoStageRetriever.
+
+        Args:
+            llm: Language model (kept for TwoStageRetriever parity)
+            vector_store: PGVectorStore with hybrid_search()
+            notebook_id: Notebook to retrieve from
+
+        Returns:
+            TwoStageRetriever wrapping a PGHybridRetriever
+        """
+        llm = unwrap_llm(llm)
+        similarity_top_k = self._get_similarity_top_k()
+
+        pg_retriever = PGHybridRetriever(
+            vector_store=vector_store,
+            notebook_id=notebook_id,
+            similarity_top_k=similarity_top_k,
+            candidate_k=self._setting.retriever.server_side_candidate_k,
+            rrf_k=self._setting.retriever.rrf_k,
+            retriever_weights=self._get_retriever_weights(),
+            embed_model=Settings.embed_model,
+        )
+
+        return TwoStageRetriever(
+            retrievers=[pg_retriever],
+            setting=self._setting,
+            llm=llm,
+            query_gen_prompt=None,
+            similarity_top_k=similarity_top_k,
+            num_queries=1,
+            mode=FUSION_MODES.SIMPLE,
+            use_async=False,
+            verbose=False
+        )
+
     def get_all_nodes_for_offering(
         self,
         nodes: List[BaseNode],
@@ -658,13 +968,28 @@ class LocalRetriever:
         return filtered_nodes
 
     def clear_cache(self) -> None:
-        """Clear all caches (index cache and retriever cache)."""
+        """Clear all caches (index cache, notebook indexes and retriever cache)."""
         self._index_cache = None
         self._cached_node_count = 0
         self._cached_notebook_id = None
         self._retriever_cache.clear()
+        with self._notebook_index_lock:
+            self._notebook_indexes.clear()
         logger.debug("Retriever caches cleared (index + retriever)")
 
+    def _get_standard_retriever(
+        self,
+        llm: LLM,
+        language: str,
+        nodes: List[BaseNode],
+        vector_store,
+        notebook_id: str,
+    ) -> BaseRetriever:
+        """Non-RAPTOR fallback: server-side hybrid if available, else node-based."""
+        if self.supports_server_side(vector_store):
+            return self.get_server_side_retriever(llm, vector_store, notebook_id)
+        return self.get_retrievers(llm, language, nodes, vector_store=vector_store)
+
     def get_raptor_aware_retriever(
         self,
         llm: LLM,
@@ -706,7 +1031,7 @@ class LocalRetriever:
 
         if not sources_with_raptor:
             logger.debug("No RAPTOR trees found, using standard retrieval")
-            return self.get_retrievers(llm, language, nodes, vector_store=vector_store)
+            return self._get_standard_retriever(llm, language, nodes, vector_store, notebook_id)
 
         logger.info(
             f"Using RAPTOR retrieval for {len(sources_with_raptor)} sources "
@@ -792,12 +1117,12 @@ class LocalRetriever:
 
         # If no sources have RAPTOR, use standard retrieval
         if not raptor_sources:
-            return self.get_retrievers(llm, language, nodes, vector_store=vector_store)
+            return self._get_standard_retriever(llm, language, nodes, vector_store, notebook_id)
 
         # Mixed: use standard retrieval for now
         # TODO: Implement proper fusion of RAPTOR and standard retrievers
         logger.debug("Mixed RAPTOR/standard sources, falling back to standard retrieval")
-        return self.get_retrievers(llm, language, nodes, vector_store=vector_store)
+        return self._get_standard_retriever(llm, language, nodes, vector_store, notebook_id)
 
     def get_unified_retriever(
         self,
@@ -852,10 +1177,8 @@ class LocalRetriever:
         )
 
         # BM25 retriever
-        bm25_retriever = BM25Retriever.from_defaults(
-            index=vector_index,
-            similarity_top_k=similarity_top_k,
-            verbose=False
+        bm25_retriever = self._get_bm25_retriever(
+            vector_index, similarity_top_k, vector_store=vector_store, notebook_id=notebook_id
         )
 
         retrievers = [bm25_retriever, vector_retriever]
@@ -3,12 +3,16 @@ import re
 import logging
 import hashlib
 import pickle
+import queue
 import asyncio
+import threading
+import time
 from datetime import datetime
 from pathlib import Path
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import Any, List, Optional
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
+from typing import Any, Callable, List, Optional
 
+import backoff
 from llama_index.core import Document, Settings
 from llama_index.core.schema import BaseNode, TextNode
 from llama_index.core.node_parser import SentenceSplitter
@@ -18,9 +22,11 @@ from tqdm import tqdm
 
 from ...setting import get_settings, RAGSettings
 from .synopsis_manager import SynopsisManager
+from .parse_pool import ParsePool
 from ..db import DatabaseManager
 from ..notebook import NotebookManager
 from ..transformations.context_service import ContextualRetrievalService
+from ..utils import hash_file
 
 load_dotenv()
 
@@ -35,11 +41,12 @@ class DocumentReader:
     SUPPORTED_MARKDOWN_FORMATS = ('.md', '.markdown')
     SUPPORTED_IMAGE_FORMATS = ('.jpg', '.jpeg', '.tiff', '.png', '.gif', '.webp')
 
-    def __init__(self):
+    def __init__(self, with_vision: bool = True):
         self._textract_available = self._check_textract_available()
         self._docx_available = self._check_docx_available()
         self._pptx_available = self._check_pptx_available()
-        self._vision_manager = self._init_vision_manager()
+        # Parse pool workers never read images, so skip vision provider setup there
+        self._vision_manager = self._init_vision_manager() if with_vision else None
 
     def _init_vision_manager(self):
         """Initialize VisionManager for image processing."""
@@ -289,6 +296,14 @@ class LocalDataIngestion:
 
         # Initialize components
         self._reader = DocumentReader()
+        # CPU-bound extraction (PDF/DOCX/PPTX) runs in worker processes
+        self._parse_pool: Optional[ParsePool] = None
+        if self._setting.ingestion.parse_processes_enabled:
+            self._parse_pool = ParsePool(
+                max_workers=self._setting.ingestion.parse_processes,
+                pages_per_task=self._setting.ingestion.parse_pages_per_task,
+                min_pages_to_split=self._setting.ingestion.parse_min_pages_to_split,
+            )
         self._processor = TextProcessor()
         self._cache = NodeCache() if use_cache else None  # Disabled - causes stale data issues
         self._synopsis_manager = SynopsisManager()
@@ -337,17 +352,51 @@ class LocalDataIngestion:
             if deleted_count > 0:
                 logger.info(f"Cleaned up {deleted_count} deprecated node cache files")
 
-    def _calculate_file_hash(self, file_path: str) -> str:
-        """Calculate SHA256 hash of file contents for duplicate detection."""
+    def _calculate_file_hash(self, file_path: str) -> tuple[str, int]:
+        """Calculate SHA256 hash and size of a file in one streamed pass."""
         try:
-            hash_sha256 = hashlib.sha256()
-            with open(file_path, "rb") as f:
-                for chunk in iter(lambda: f.read(4096), b""):
-                    hash_sha256.update(chunk)
-            return hash_sha256.hexdigest()
+            return hash_file(file_path)
         except Exception as e:
             logger.warning(f"Error calculating hash for {file_path}: {e}")
-            return ""
+            return "", 0
+
+    def _find_ingested_duplicate(self, notebook_id: str, file_hash: str) -> Optional[dict]:
+        """Return the registered document with this hash if all its chunks are stored.
+
+        A document whose stored chunks fall short of its registered chunk_count
+        (e.g. an earlier upload failed part-way) has its partial rows deleted
+        and is re-processed under the same source_id.
+        """
+        if not (file_hash and self._notebook_manager and self._vector_store):
+            return None
+        existing = self._notebook_manager.find_document_by_hash(notebook_id, file_hash)
+        if not existing:
+            return None
+        source_id = existing["source_id"]
+        stored = self._vector_store.get_source_leaf_count(source_id)
+        expected = existing.get("chunk_count") or 0
+        if expected and stored >= expected:
+            return existing
+        if stored:
+            logger.info(
+                f"{existing['file_name']} has {stored}/{expected} chunks stored, "
+                f"deleting partial rows and re-processing"
+            )
+            self._vector_store.delete_document_nodes(source_id)
+        return None
+
+    def _read_document(self, input_file: str) -> str:
+        """Extract text, in the parse pool for CPU-bound formats."""
+        if self._parse_pool and ParsePool.handles(input_file):
+            try:
+                return self._parse_pool.read(input_file).text
+            except Exception as e:
+                logger.warning(f"Parse pool failed for {input_file}, reading in-process: {e}")
+        return self._reader.read(input_file)
+
+    def get_parse_stats(self) -> dict:
+        """Parse pool counters (files, pages, wall vs worker seconds), empty if disabled."""
+        return self._parse_pool.get_stats() if self._parse_pool else {}
 
     def _enrich_nodes_with_context(
         self,
@@ -412,23 +461,39 @@ class LocalDataIngestion:
         self,
         input_file: str,
         embed_nodes: bool = True,
-        embed_model: Any | None = None
+        embed_model: Any | None = None,
+        notebook_id: Optional[str] = None
     ) -> tuple[str, List[BaseNode], str]:
         """Process a single file and return (filename, nodes, document_text).
 
+        The file is hashed once up front; the digest serves cache validation,
+        duplicate detection and node metadata, and is passed on to document
+        registration.
+
         Args:
             input_file: Path to the file
             embed_nodes: Whether to embed nodes
             embed_model: Embedding model to use
+            notebook_id: Notebook being ingested into (enables duplicate skip)
 
         Returns:
-            Tuple of (filename, nodes, document_text)
+            Tuple of (filename, nodes, document_text); no nodes if the file is
+            already fully ingested in the notebook
         """
         file_name = Path(input_file).name
-        file_path = Path(input_file)
 
-        # Calculate current file hash for cache validation
-        current_file_hash = self._calculate_file_hash(input_file)
+        # Single streamed pass: SHA-256 + size
+        current_file_hash, file_size = self._calculate_file_hash(input_file)
+
+        # Skip parsing and embedding entirely for re-uploads of ingested files
+        if notebook_id:
+            existing = self._find_ingested_duplicate(notebook_id, current_file_hash)
+            if existing:
+                logger.info(
+                    f"{file_name} already ingested in notebook {notebook_id} "
+                    f"as {existing['file_name']} (source_id: {existing['source_id']}), skipping"
+                )
+                return file_name, [], ""
 
         # Check memory cache first - but validate hash to detect file changes
         if file_name in self._node_store:
@@ -451,7 +516,7 @@ class LocalDataIngestion:
                 return file_name, cached_nodes, ""
 
         # Read and process document
-        raw_text = self._reader.read(input_file)
+        raw_text = self._read_document(input_file)
         if not raw_text:
             logger.warning(f"No text extracted from {file_name}")
             return file_name, [], ""
@@ -459,14 +524,12 @@ class LocalDataIngestion:
         filtered_text = self._processor.filter_text(raw_text)
 
         # Calculate file metadata
-        file_hash = self._calculate_file_hash(input_file)
-        file_size = file_path.stat().st_size if file_path.exists() else 0
         upload_timestamp = datetime.now().isoformat()
 
         # Create metadata
         metadata = {
             "file_name": file_name,
-            "file_hash": file_hash,
+            "file_hash": current_file_hash,
             "file_size": file_size,
             "upload_timestamp": upload_timestamp,
         }
@@ -510,19 +573,26 @@ class LocalDataIngestion:
         embed_nodes: bool = True,
         embed_model: Any | None = None,
         notebook_id: Optional[str] = None,
-        user_id: str = "default"
+        user_id: str = "default",
+        on_batch_stored: Optional[Callable[[str], None]] = None,
     ) -> List[BaseNode]:
         """Process multiple files with parallel execution and enhanced metadata.
 
+        With a vector store and notebook_id, files are streamed through
+        parse -> embed -> write stages in bounded batches (see
+        _store_nodes_streaming) and chunks are persisted as they are embedded.
+
         Args:
             input_files: List of file paths to process
             embed_nodes: Whether to embed nodes
             embed_model: Embedding model to use
             notebook_id: Notebook ID for document organization
             user_id: User ID for multi-user support (default: "default")
+            on_batch_stored: Called with notebook_id after each batch is written
 
         Returns:
-            List of processed nodes with enhanced metadata
+            List of processed nodes with enhanced metadata (empty when streamed
+            to pgvector, since nodes are not retained in memory)
         """
         return_nodes: List[BaseNode] = []
         # Don't clear _ingested_file to allow multiple offerings to accumulate
@@ -540,6 +610,17 @@ class LocalDataIngestion:
                 f"Processing {len(input_files)} files for notebook: {notebook_id}"
             )
 
+        if self._vector_store and notebook_id:
+            self._store_nodes_streaming(
+                input_files,
+                embed_nodes=embed_nodes,
+                embed_model=embed_model,
+                notebook_id=notebook_id,
+                user_id=user_id,
+                on_batch_stored=on_batch_stored,
+            )
+            return return_nodes
+
         # Process files in parallel
         with ThreadPoolExecutor(max_workers=self._max_workers) as executor:
             futures = {
@@ -547,7 +628,8 @@ class LocalDataIngestion:
                     self._process_single_file,
                     input_file,
                     embed_nodes,
-                    embed_model
+                    embed_model,
+                    notebook_id
                 ): input_file
                 for input_file in input_files
             }
@@ -561,119 +643,333 @@ class LocalDataIngestion:
                 try:
                     file_name, nodes, document_text = future.result()
                     if nodes:
-                        # Register document in notebook database if notebook_id provided
-                        source_id = None
-                        if notebook_id and self._notebook_manager:
-                            try:
-                                # Read file content for hash calculation
-                                input_file = futures[future]
-                                with open(input_file, 'rb') as f:
-                                    file_content = f.read()
-
-                                # Determine file type
-                                file_type = Path(input_file).suffix.lstrip('.')
-
-                                # Register in database
-                                source_id = self._notebook_manager.add_document(
-                                    notebook_id=notebook_id,
-                                    file_name=file_name,
-                                    file_content=file_content,
-                                    file_type=file_type,
-                                    chunk_count=len(nodes)
-                                )
-                                logger.info(f"Registered {file_name} in notebook {notebook_id} (source_id: {source_id})")
-
-                                # Queue AI transformations if callback is set
-                                if self._transformation_callback and source_id and document_text:
-                                    try:
-                                        self._transformation_callback(
-                                            source_id=source_id,
-                                            document_text=document_text,
-                                            notebook_id=notebook_id,
-                                            file_name=file_name
-                                        )
-                                        logger.debug(f"Queued transformations for {file_name}")
-                                    except Exception as te:
-                                        logger.warning(f"Failed to queue transformations for {file_name}: {te}")
-
-                            except ValueError as e:
-                                # Duplicate document detected - but still need to create embeddings
-                                # Try to get existing source_id so we can continue with embedding creation
-                                logger.info(f"Document {file_name} already registered, looking up source_id for embedding creation")
-                                try:
-                                    docs = self._notebook_manager.get_documents(notebook_id)
-                                    for doc in docs:
-                                        if doc.get('file_name') == file_name:
-                                            source_id = doc.get('source_id')
-                                            logger.info(f"Found existing source_id: {source_id} for {file_name}")
-                                            # Track this source for chunk_count update after embedding creation
-                                            if not hasattr(self, '_sources_needing_chunk_update'):
-                                                self._sources_needing_chunk_update = {}
-                                            self._sources_needing_chunk_update[source_id] = len(nodes)
-                                            break
-                                except Exception as lookup_err:
-                                    logger.warning(f"Could not look up existing source_id for {file_name}: {lookup_err}")
-                                # Continue with embedding creation (don't skip)
-                            except Exception as e:
-                                logger.error(f"Error registering {file_name} in database: {e}")
-                                raise
-
-                        # Add notebook metadata to all nodes
-                        if notebook_id:
-                            for node in nodes:
-                                if hasattr(node, 'metadata'):
-                                    node.metadata["notebook_id"] = notebook_id
-                                    node.metadata["user_id"] = user_id
-                                    node.metadata["tree_level"] = 0  # Mark as leaf node for RAPTOR
-                                    if source_id:
-                                        node.metadata["source_id"] = source_id
-
+                        self._register_document(
+                            futures[future], file_name, nodes, document_text, notebook_id, user_id
+                        )
                         self._node_store[file_name] = nodes
                         self._ingested_file.append(file_name)
                         return_nodes.extend(nodes)
-
-                        # Log node count with metadata
-                        chunk_count = len(nodes)
-                        logger.debug(
-                            f"Processed {file_name}: {chunk_count} chunks, "
-                            f"Notebook='{notebook_id}', Source ID='{source_id}'"
-                        )
                 except Exception as e:
                     input_file = futures[future]
                     logger.error(f"Error processing {input_file}: {e}")
 
-        # Persist new nodes to pgvector using incremental add (with duplicate detection)
-        # This is O(n) for n new nodes and handles duplicates gracefully
-        if self._vector_store and notebook_id and return_nodes:
-            try:
-                logger.info(f"Adding {len(return_nodes)} new nodes to pgvector for notebook {notebook_id}")
+        logger.info(f"Total nodes created: {len(return_nodes)}")
+        return return_nodes
 
-                # Use add_nodes() for incremental add - handles duplicates automatically
-                added_count = self._vector_store.add_nodes(return_nodes, notebook_id=notebook_id)
+    def _register_document(
+        self,
+        input_file: str,
+        file_name: str,
+        nodes: List[BaseNode],
+        document_text: str,
+        notebook_id: Optional[str],
+        user_id: str,
+    ) -> Optional[str]:
+        """Register a processed file in its notebook and tag its nodes.
 
-                # Verify nodes are persisted
-                notebook_nodes = self._vector_store.get_nodes_by_notebook_sql(notebook_id)
-                logger.info(
-                    f"✓ Added {added_count} nodes to pgvector "
-                    f"(total {len(notebook_nodes)} nodes for notebook {notebook_id})"
+        Queues AI transformations for newly registered documents. Re-uploads
+        of an already registered document keep its source_id so embeddings
+        can still be created.
+
+        Returns:
+            source_id of the document, or None without a notebook
+        """
+        source_id = None
+        if notebook_id and self._notebook_manager:
+            try:
+                # Hash and size were computed in _process_single_file's single pass
+                file_hash = nodes[0].metadata.get("file_hash")
+                file_size = nodes[0].metadata.get("file_size")
+                if not file_hash:
+                    file_hash, file_size = self._calculate_file_hash(input_file)
+
+                # Determine file type
+                file_type = Path(input_file).suffix.lstrip('.')
+
+                # Register in database
+                source_id = self._notebook_manager.add_document(
+                    notebook_id=notebook_id,
+                    file_name=file_name,
+                    file_type=file_type,
+                    chunk_count=len(nodes),
+                    file_hash=file_hash,
+                    file_size=file_size,
                 )
+                logger.info(f"Registered {file_name} in notebook {notebook_id} (source_id: {source_id})")
+
+                # Queue AI transformations if callback is set
+                if self._transformation_callback and source_id and document_text:
+                    try:
+                        self._transformation_callback(
+                            source_id=source_id,
+                            document_text=document_text,
+                            notebook_id=notebook_id,
+                            file_name=file_name
+                        )
+                        logger.debug(f"Queued transformations for {file_name}")
+                    except Exception as te:
+                        logger.warning(f"Failed to queue transformations for {file_name}: {te}")
+
+            except ValueError as e:
+                # Duplicate document detected - but still need to create embeddings
+                # Try to get existing source_id so we can continue with embedding creation
+                logger.info(f"Document {file_name} already registered, looking up source_id for embedding creation")
+                try:
+                    docs = self._notebook_manager.get_documents(notebook_id)
+                    for doc in docs:
+                        if doc.get('file_name') == file_name:
+                            source_id = doc.get('source_id')
+                            logger.info(f"Found existing source_id: {source_id} for {file_name}")
+                            # Track this source for chunk_count update after embedding creation
+                            if not hasattr(self, '_sources_needing_chunk_update'):
+                                self._sources_needing_chunk_update = {}
+                            self._sources_needing_chunk_update[source_id] = len(nodes)
+                            break
+                except Exception as lookup_err:
+                    logger.warning(f"Could not look up existing source_id for {file_name}: {lookup_err}")
+                # Continue with embedding creation (don't skip)
+            except Exception as e:
+                logger.error(f"Error registering {file_name} in database: {e}")
+                raise
 
-                # Update chunk_count for any documents that were duplicates
-                if hasattr(self, '_sources_needing_chunk_update') and self._sources_needing_chunk_update:
-                    for source_id, chunk_count in self._sources_needing_chunk_update.items():
-                        try:
-                            self._notebook_manager.update_document_chunk_count(source_id, chunk_count)
-                        except Exception as update_err:
-                            logger.warning(f"Failed to update chunk_count for {source_id}: {update_err}")
-                    self._sources_needing_chunk_update.clear()
+        # Add notebook metadata to all nodes
+        if notebook_id:
+            for node in nodes:
+                if hasattr(node, 'metadata'):
+                    node.metadata["notebook_id"] = notebook_id
+                    node.metadata["user_id"] = user_id
+                    node.metadata["tree_level"] = 0  # Mark as leaf node for RAPTOR
+                    if source_id:
+                        node.metadata["source_id"] = source_id
+
+        # Log node count with metadata
+        logger.debug(
+            f"Processed {file_name}: {len(nodes)} chunks, "
+            f"Notebook='{notebook_id}', Source ID='{source_id}'"
+        )
+        return source_id
 
-            except Exception as e:
-                logger.error(f"Error persisting nodes to pgvector: {e}")
-                import traceback
-                logger.error(traceback.format_exc())
+    def _store_nodes_streaming(
+        self,
+        input_files: list[str],
+        embed_nodes: bool,
+        embed_model: Any | None,
+        notebook_id: str,
+        user_id: str,
+        on_batch_stored: Optional[Callable[[str], None]] = None,
+    ) -> int:
+        """Parse, embed and persist files as a back-pressured three-stage pipeline.
+
+        - Parse: up to max_workers files (or parse pool processes) read and
+          split concurrently; the next file is only started when a parsed one
+          has been handed on
+        - Embed: one thread embeds batches of pipeline_batch_size chunks
+          (a multiple of embed_batch_size)
+        - Write: one thread persists each embedded batch via add_nodes (binary
+          COPY) and commits it, so chunks become queryable progressively
+
+        Stages are joined by queues of pipeline_queue_depth batches, bounding
+        peak memory to a few batches plus the files being parsed regardless
+        of upload size. Nodes are not retained after they are written.
+
+        A batch that still fails to embed or persist after pipeline_retries
+        attempts fails every file it contains: their stored chunks and
+        document registrations are removed (so a re-upload processes them
+        again) and a RuntimeError names them once the pipeline has drained.
 
-        logger.info(f"Total nodes created: {len(return_nodes)}")
-        return return_nodes
+        Returns:
+            Number of nodes added to pgvector
+
+        Raises:
+            RuntimeError: Some files could not be fully stored
+        """
+        ingestion = self._setting.ingestion
+        model = (embed_model or Settings.embed_model) if embed_nodes else None
+        embed_batch = max(1, ingestion.embed_batch_size)
+        batch_size = max(embed_batch, -(-ingestion.pipeline_batch_size // embed_batch) * embed_batch)
+        depth = max(1, ingestion.pipeline_queue_depth)
+
+        embed_queue: queue.Queue = queue.Queue(maxsize=depth)
+        write_queue: queue.Queue = queue.Queue(maxsize=depth)
+        timings = {"parse": 0.0, "embed": 0.0, "write": 0.0}
+        counts = {"chunks": 0, "added": 0, "batches": 0, "failed": 0}
+        # source_id -> file name for files with a batch that could not be stored
+        failed_sources: dict = {}
+        failed_files: set = set()
+
+        def fail_batch(batch: List[BaseNode], stage: str, error: Exception) -> None:
+            logger.error(f"Error {stage} batch of {len(batch)} chunks: {error}")
+            counts["failed"] += len(batch)
+            for node in batch:
+                file_name = node.metadata.get("file_name", "")
+                failed_files.add(file_name)
+                source_id = node.metadata.get("source_id")
+                if source_id:
+                    failed_sources[source_id] = file_name
+
+        def embed_stage() -> None:
+            while True:
+                batch = embed_queue.get()
+                if batch is None:
+                    write_queue.put(None)
+                    return
+                if model is not None:
+                    start = time.perf_counter()
+                    try:
+                        batch = self._retry_batch(
+                            lambda: model(batch, show_progress=False), "embedding"
+                        )
+                    except Exception as e:
+                        fail_batch(batch, "embedding", e)
+                        continue
+                    finally:
+                        timings["embed"] += time.perf_counter() - start
+                write_queue.put(batch)
+
+        def write_stage() -> None:
+            while True:
+                batch = write_queue.get()
+                if batch is None:
+                    return
+                start = time.perf_counter()
+                try:
+                    counts["added"] += self._retry_batch(
+                        lambda: self._vector_store.add_nodes(
+                            batch, notebook_id=notebook_id, raise_errors=True
+                        ),
+                        "persisting",
+                    )
+                    counts["batches"] += 1
+                    if on_batch_stored:
+                        on_batch_stored(notebook_id)
+                except Exception as e:
+                    fail_batch(batch, "persisting", e)
+                finally:
+                    timings["write"] += time.perf_counter() - start
+
+        stages = [
+            threading.Thread(target=embed_stage, name="ingest-embed", daemon=True),
+            threading.Thread(target=write_stage, name="ingest-write", daemon=True),
+        ]
+        for stage in stages:
+            stage.start()
+
+        pending: List[BaseNode] = []
+        started = time.perf_counter()
+        try:
+            # Threads coordinate; with the parse pool, extraction runs on its processes
+            parse_workers = max(self._max_workers, self._parse_pool.max_workers if self._parse_pool else 0)
+            with ThreadPoolExecutor(max_workers=parse_workers) as executor:
+                files = iter(input_files)
+                in_flight: dict = {}
+
+                def submit_next() -> None:
+                    input_file = next(files, None)
+                    if input_file is not None:
+                        in_flight[executor.submit(
+                            self._process_single_file, input_file, False, None, notebook_id
+                        )] = input_file
+
+                for _ in range(parse_workers):
+                    submit_next()
+
+                with tqdm(total=len(input_files), desc="Ingesting documents") as progress:
+                    while in_flight:
+                        done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            input_file = in_flight.pop(future)
+                            submit_next()
+                            progress.update(1)
+                            try:
+                                file_name, nodes, document_text = future.result()
+                                if not nodes:
+                                    continue
+                                self._register_document(
+                                    input_file, file_name, nodes, document_text, notebook_id, user_id
+                                )
+                                # Track the file without holding its nodes in memory
+                                self._node_store[file_name] = []
+                                self._ingested_file.append(file_name)
+                                counts["chunks"] += len(nodes)
+
+                                for node in nodes:
+                                    pending.append(node)
+                                    if len(pending) >= batch_size:
+                                        # Blocks while downstream stages are full
+                                        embed_queue.put(pending)
+                                        pending = []
+                            except Exception as e:
+                                logger.error(f"Error processing {input_file}: {e}")
+            timings["parse"] = time.perf_counter() - started
+        finally:
+            if pending:
+                embed_queue.put(pending)
+            embed_queue.put(None)
+            for stage in stages:
+                stage.join()
+
+        # Update chunk_count for any documents that were duplicates
+        if hasattr(self, '_sources_needing_chunk_update') and self._sources_needing_chunk_update:
+            for source_id, chunk_count in self._sources_needing_chunk_update.items():
+                if source_id in failed_sources:
+                    continue
+                try:
+                    self._notebook_manager.update_document_chunk_count(source_id, chunk_count)
+                except Exception as update_err:
+                    logger.warning(f"Failed to update chunk_count for {source_id}: {update_err}")
+            self._sources_needing_chunk_update.clear()
+
+        total = self._vector_store.get_notebook_node_count(notebook_id)
+        logger.info(
+            f"✓ Added {counts['added']}/{counts['chunks']} chunks to pgvector in "
+            f"{counts['batches']} batches (total {total} nodes for notebook {notebook_id}); "
+            f"parse {timings['parse']:.1f}s, embed {timings['embed']:.1f}s, "
+            f"write {timings['write']:.1f}s, wall {time.perf_counter() - started:.1f}s"
+        )
+        if counts["failed"]:
+            logger.warning(f"{counts['failed']} chunks failed to embed or persist")
+            self._discard_failed_sources(failed_sources, notebook_id)
+            if on_batch_stored and failed_sources:
+                # Drop the discarded chunks from cached indexes
+                on_batch_stored(notebook_id)
+            for file_name in failed_files:
+                if file_name in self._ingested_file:
+                    self._ingested_file.remove(file_name)
+                self._node_store.pop(file_name, None)
+            raise RuntimeError(
+                f"Could not store {counts['failed']} chunks of "
+                f"{', '.join(sorted(failed_files))}; these files were not added, "
+                f"upload them again"
+            )
+        return counts["added"]
+
+    def _retry_batch(self, fn: Callable[[], Any], stage: str) -> Any:
+        """Run a batch stage with exponential backoff (e.g. rate limits, DB blips)."""
+        attempts = max(1, self._setting.ingestion.pipeline_retries)
+
+        @backoff.on_exception(
+            backoff.expo,
+            Exception,
+            max_tries=attempts,
+            max_time=120,
+            on_backoff=lambda details: logger.warning(
+                f"Retrying {stage} batch (attempt {details['tries']} failed, "
+                f"waiting {details['wait']:.1f}s)"
+            ),
+        )
+        def _run():
+            return fn()
+        return _run()
+
+    def _discard_failed_sources(self, failed_sources: dict, notebook_id: str) -> None:
+        """Remove the stored chunks and registrations of files that failed mid-upload."""
+        for source_id, file_name in failed_sources.items():
+            try:
+                self._vector_store.delete_document_nodes(source_id)
+                if self._notebook_manager:
+                    self._notebook_manager.remove_document(notebook_id, source_id)
+            except Exception as e:
+                logger.error(f"Could not clean up partially stored {file_name} ({source_id}): {e}")
 
     def reset(self) -> None:
         """Reset in-memory node store."""
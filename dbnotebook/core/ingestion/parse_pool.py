@@ -0,0 +1,222 @@
+"""
+Process-pool document parsing.
+
+pymupdf4llm and the docx/pptx loaders are CPU-bound and hold the GIL, so
+parsing in the ingestion thread pool scales to about one core. ParsePool
+runs extraction in worker processes instead:
+
+- PDF/EPUB/TXT, DOCX and PPTX files are extracted in a worker process
+- PDFs with at least min_pages_to_split pages are split into page ranges of
+  pages_per_task pages, extracted in parallel and reassembled in page order
+- Markdown and images stay in the calling thread (I/O or remote vision APIs)
+
+Callers keep using threads as coordinators, so results stream back to the
+split/embed stages file by file. Every parse returns per-file and per-range
+timings; cumulative worker CPU time vs wall time shows the parallel speedup.
+"""
+
+import logging
+import multiprocessing as mp
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# File types extracted in worker processes
+PROCESS_FORMATS = ('.pdf', '.epub', '.txt', '.docx', '.pptx')
+
+# Per-process reader, created on first use inside each worker
+_worker_reader = None
+
+
+def _get_worker_reader():
+    global _worker_reader
+    if _worker_reader is None:
+        from .ingestion import DocumentReader
+        _worker_reader = DocumentReader(with_vision=False)
+    return _worker_reader
+
+
+def _read_file(file_path: str) -> Tuple[str, float]:
+    """Worker: extract a whole file. Returns (text, seconds)."""
+    start = time.perf_counter()
+    text = _get_worker_reader().read(file_path)
+    return text, time.perf_counter() - start
+
+
+def _read_pdf_pages(file_path: str, pages: List[int]) -> Tuple[str, float]:
+    """Worker: extract a page range of a PDF as markdown. Returns (text, seconds)."""
+    import pymupdf4llm
+
+    start = time.perf_counter()
+    try:
+        text = pymupdf4llm.to_markdown(file_path, pages=pages)
+    except Exception as e:
+        # Fail the whole file: joining the other ranges would drop pages silently
+        raise RuntimeError(
+            f"Error reading pages {pages[0]}-{pages[-1]} of {file_path}: {e}"
+        ) from None
+    return text, time.perf_counter() - start
+
+
+def _pdf_page_count(file_path: str) -> int:
+    try:
+        import pymupdf
+    except ImportError:
+        import fitz as pymupdf
+    try:
+        with pymupdf.open(file_path) as doc:
+            return doc.page_count
+    except Exception as e:
+        logger.debug(f"Could not count pages of {file_path}: {e}")
+        return 0
+
+
+@dataclass
+class ParseResult:
+    """Extracted text plus timing for one file.
+
+    Attributes:
+        text: Extracted text (page ranges joined in order)
+        seconds: Wall time for the file
+        pages: Page count (PDFs split by page, else 0)
+        range_timings: (first_page, last_page, seconds) per page range
+    """
+
+    text: str
+    seconds: float
+    pages: int = 0
+    range_timings: List[Tuple[int, int, float]] = field(default_factory=list)
+
+    @property
+    def worker_seconds(self) -> float:
+        """Summed worker time across page ranges (equals seconds when unsplit)."""
+        return sum(t for _, _, t in self.range_timings) or self.seconds
+
+
+class ParsePool:
+    """Process pool for CPU-bound document extraction, shared by all uploads."""
+
+    def __init__(
+        self,
+        max_workers: int = 0,
+        pages_per_task: int = 16,
+        min_pages_to_split: int = 32,
+    ) -> None:
+        """
+        Args:
+            max_workers: Worker processes (0 = os.cpu_count())
+            pages_per_task: Pages per PDF extraction task
+            min_pages_to_split: PDFs below this page count are parsed whole
+        """
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self._pages_per_task = max(1, pages_per_task)
+        self._min_pages_to_split = max(1, min_pages_to_split)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._stats = {"files": 0, "pages": 0, "tasks": 0, "wall_seconds": 0.0, "worker_seconds": 0.0}
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # spawn: forking a multi-threaded server process is unsafe
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=mp.get_context("spawn"),
+                )
+                logger.info(f"Parse pool started with {self.max_workers} processes")
+            return self._executor
+
+    @staticmethod
+    def handles(file_path: str) -> bool:
+        """Whether a file type is extracted in the pool."""
+        return Path(file_path).name.lower().endswith(PROCESS_FORMATS)
+
+    def read(self, file_path: str) -> ParseResult:
+        """
+        Extract a file in worker processes (blocks the calling thread).
+
+        Args:
+            file_path: Path to a file for which handles() is True
+
+        Returns:
+            ParseResult with text and timings
+
+        Raises:
+            RuntimeError: A page range of a split PDF failed to extract
+        """
+        start = time.perf_counter()
+        executor = self._get_executor()
+
+        page_count = 0
+        if file_path.lower().endswith(".pdf"):
+            page_count = _pdf_page_count(file_path)
+
+        try:
+            if page_count >= self._min_pages_to_split:
+                ranges = [
+                    list(range(first, min(first + self._pages_per_task, page_count)))
+                    for first in range(0, page_count, self._pages_per_task)
+                ]
+                futures = [executor.submit(_read_pdf_pages, file_path, pages) for pages in ranges]
+                parts = [future.result() for future in futures]
+                text = "\n\n".join(part for part, _ in parts if part)
+                range_timings = [
+                    (pages[0], pages[-1], seconds)
+                    for pages, (_, seconds) in zip(ranges, parts)
+                ]
+            else:
+                text, seconds = executor.submit(_read_file, file_path).result()
+                range_timings = [(0, max(page_count - 1, 0), seconds)]
+        except BrokenProcessPool:
+            # A worker died (e.g. crashed on a malformed file); start fresh next time
+            logger.error(f"Parse worker died while reading {file_path}, restarting pool")
+            self.shutdown()
+            raise
+
+        result = ParseResult(
+            text=text,
+            seconds=time.perf_counter() - start,
+            pages=page_count,
+            range_timings=range_timings,
+        )
+        with self._lock:
+            self._stats["files"] += 1
+            self._stats["pages"] += page_count
+            self._stats["tasks"] += len(range_timings)
+            self._stats["wall_seconds"] += result.seconds
+            self._stats["worker_seconds"] += result.worker_seconds
+
+        logger.info(
+            f"Parsed {Path(file_path).name} in {result.seconds:.2f}s"
+            + (
+                f" ({page_count} pages, {len(range_timings)} tasks, "
+                f"{page_count / result.seconds:.1f} pages/s, "
+                f"{result.worker_seconds / result.seconds:.1f}x parallel)"
+                if page_count and result.seconds else ""
+            )
+        )
+        return result
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Cumulative parse counters; worker_seconds / wall_seconds ~ speedup."""
+        with self._lock:
+            stats = dict(self._stats)
+        stats["max_workers"] = self.max_workers
+        stats["parallelism"] = (
+            stats["worker_seconds"] / stats["wall_seconds"] if stats["wall_seconds"] else 0.0
+        )
+        return stats
+
+    def shutdown(self) -> None:
+        """Stop worker processes."""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
@@ -0,0 +1,29 @@
+"""
+Durable background job queue.
+
+Jobs are stored in PostgreSQL and leased with FOR UPDATE SKIP LOCKED, so
+RAPTOR and transformation work can be drained by any number of worker
+processes (the web app, or `python -m dbnotebook.worker`) without
+duplicates. Leases expire if a worker dies, failed jobs retry with
+exponential backoff, and LISTEN/NOTIFY wakes idle workers on enqueue.
+"""
+
+from .job_queue import (
+    JOB_RAPTOR,
+    JOB_TRANSFORMATION,
+    Job,
+    JobListener,
+    JobQueue,
+    PermanentJobError,
+)
+from .runner import JobRunner
+
+__all__ = [
+    "JOB_RAPTOR",
+    "JOB_TRANSFORMATION",
+    "Job",
+    "JobListener",
+    "JobQueue",
+    "JobRunner",
+    "PermanentJobError",
+]
@@ -0,0 +1,492 @@
+"""
+Durable background job queue stored in PostgreSQL.
+
+Jobs live in the background_jobs table and are leased with
+SELECT ... FOR UPDATE SKIP LOCKED, so any number of worker threads,
+processes or hosts can drain the same queue without handing one job to
+two workers:
+
+- enqueue() is idempotent per (job_type, source_id) while a job is queued
+  or running (partial unique index), and wakes listeners with NOTIFY
+- lease() claims the highest-priority due jobs and stamps a lease expiry
+- heartbeat() extends the lease of jobs still being processed
+- fail() re-queues with exponential backoff until max_attempts is reached
+- requeue_expired() returns jobs whose worker died (lease expired)
+
+JobListener holds a dedicated LISTEN connection so idle workers wake as
+soon as a job is enqueued instead of polling on a fixed interval.
+"""
+
+import json
+import logging
+import os
+import select
+import socket
+import threading
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence
+
+from sqlalchemy import text
+
+from ..config import get_config_value
+
+logger = logging.getLogger(__name__)
+
+JOBS_TABLE = "background_jobs"
+NOTIFY_CHANNEL = "dbnotebook_jobs"
+
+# Job types
+JOB_RAPTOR = "raptor"
+JOB_TRANSFORMATION = "transformation"
+
+
+class PermanentJobError(Exception):
+    """Raised by a job handler for failures that retrying cannot fix."""
+
+
+@dataclass
+class Job:
+    """A leased job."""
+    job_id: str
+    job_type: str
+    source_id: Optional[str]
+    notebook_id: Optional[str]
+    payload: Dict[str, Any] = field(default_factory=dict)
+    attempts: int = 0
+    max_attempts: int = 3
+
+
+def _jobs_config(key: str, default: Any) -> Any:
+    return get_config_value("dbnotebook", "jobs", key, default=default)
+
+
+def default_worker_id() -> str:
+    """hostname:pid:thread-unique suffix identifying a lease holder."""
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+
+
+class JobQueue:
+    """
+    Postgres-backed job queue with SKIP LOCKED leasing.
+
+    All methods open a short session from the factory and log database
+    errors instead of raising, except enqueue() which reports failure by
+    returning None.
+    """
+
+    def __init__(
+        self,
+        session_factory,
+        lease_seconds: Optional[float] = None,
+        max_attempts: Optional[int] = None,
+        backoff_base_seconds: Optional[float] = None,
+        backoff_max_seconds: Optional[float] = None,
+    ) -> None:
+        """
+        Args:
+            session_factory: SQLAlchemy session factory
+            lease_seconds: Lease length before an unrenewed job is re-queued
+            max_attempts: Default attempts per job (first run included)
+            backoff_base_seconds: Delay before the first retry (doubles per attempt)
+            backoff_max_seconds: Upper bound for the retry delay
+        """
+        self._session_factory = session_factory
+        self.lease_seconds = lease_seconds or _jobs_config("lease_seconds", 300)
+        self.max_attempts = max_attempts or _jobs_config("max_attempts", 3)
+        self.backoff_base_seconds = backoff_base_seconds or _jobs_config("backoff_base_seconds", 30)
+        self.backoff_max_seconds = backoff_max_seconds or _jobs_config("backoff_max_seconds", 1800)
+        self._table_ready = False
+        self._lock = threading.Lock()
+
+    def ensure_table(self) -> None:
+        """Create the jobs table if the migration has not been applied."""
+        with self._lock:
+            if self._table_ready:
+                return
+            session = self._session_factory()
+            try:
+                session.execute(text(f"""
+                    CREATE TABLE IF NOT EXISTS {JOBS_TABLE} (
+                        job_id UUID PRIMARY KEY,
+                        job_type VARCHAR(50) NOT NULL,
+                        source_id TEXT,
+                        notebook_id TEXT,
+                        payload JSONB NOT NULL DEFAULT '{{}}'::jsonb,
+                        status VARCHAR(20) NOT NULL DEFAULT 'queued',
+                        priority INTEGER NOT NULL DEFAULT 0,
+                        attempts INTEGER NOT NULL DEFAULT 0,
+                        max_attempts INTEGER NOT NULL DEFAULT 3,
+                        run_after TIMESTAMP NOT NULL DEFAULT NOW(),
+                        leased_by TEXT,
+                        lease_expires_at TIMESTAMP,
+                        last_error TEXT,
+                        created_at TIMESTAMP NOT NULL DEFAULT NOW(),
+                        updated_at TIMESTAMP NOT NULL DEFAULT NOW(),
+                        completed_at TIMESTAMP
+                    )
+                """))
+                session.execute(text(f"""
+                    CREATE INDEX IF NOT EXISTS idx_{JOBS_TABLE}_due
+                    ON {JOBS_TABLE} (job_type, priority DESC, run_after)
+                    WHERE status = 'queued'
+                """))
+                session.execute(text(f"""
+                    CREATE INDEX IF NOT EXISTS idx_{JOBS_TABLE}_lease
+                    ON {JOBS_TABLE} (lease_expires_at)
+                    WHERE status = 'running'
+                """))
+                session.execute(text(f"""
+                    CREATE UNIQUE INDEX IF NOT EXISTS idx_{JOBS_TABLE}_active_source
+                    ON {JOBS_TABLE} (job_type, source_id)
+                    WHERE status IN ('queued', 'running')
+                """))
+                session.commit()
+                self._table_ready = True
+            except Exception as e:
+                session.rollback()
+                logger.warning(f"Could not ensure job queue table: {e}")
+            finally:
+                session.close()
+
+    # =========================================================================
+    # Producer side
+    # =========================================================================
+
+    def enqueue(
+        self,
+        job_type: str,
+        source_id: Optional[str] = None,
+        notebook_id: Optional[str] = None,
+        payload: Optional[Dict[str, Any]] = None,
+        priority: int = 0,
+        max_attempts: Optional[int] = None,
+    ) -> Optional[str]:
+        """
+        Add a job unless the same (job_type, source_id) is already queued or running.
+
+        Args:
+            job_type: Handler type (e.g. JOB_RAPTOR)
+            source_id: Source the job is about (dedup key)
+            notebook_id: Notebook the source belongs to
+            payload: Extra JSON-serializable handler input
+            priority: Higher runs first
+            max_attempts: Attempts before the job is marked failed
+
+        Returns:
+            New job ID, or None if a duplicate was active or the insert failed
+        """
+        self.ensure_table()
+        job_id = str(uuid.uuid4())
+        session = self._session_factory()
+        try:
+            row = session.execute(
+                text(f"""
+                    INSERT INTO {JOBS_TABLE}
+                        (job_id, job_type, source_id, notebook_id, payload, priority, max_attempts)
+                    VALUES
+                        (:job_id, :job_type, :source_id, :notebook_id,
+                         CAST(:payload AS jsonb), :priority, :max_attempts)
+                    ON CONFLICT (job_type, source_id) WHERE status IN ('queued', 'running')
+                    DO NOTHING
+                    RETURNING job_id
+                """),
+                {
+                    "job_id": job_id,
+                    "job_type": job_type,
+                    "source_id": source_id,
+                    "notebook_id": notebook_id,
+                    "payload": json.dumps(payload or {}),
+                    "priority": priority,
+                    "max_attempts": max_attempts or self.max_attempts,
+                }
+            ).fetchone()
+            if row is not None:
+                # Delivered to listeners when the transaction commits
+                session.execute(
+                    text("SELECT pg_notify(:channel, :job_type)"),
+                    {"channel": NOTIFY_CHANNEL, "job_type": job_type}
+                )
+            session.commit()
+            if row is None:
+                logger.debug(f"{job_type} job for {source_id} already queued")
+                return None
+            logger.info(f"Enqueued {job_type} job {job_id} for source {source_id}")
+            return job_id
+        except Exception as e:
+            session.rollback()
+            logger.error(f"Failed to enqueue {job_type} job for {source_id}: {e}")
+            return None
+        finally:
+            session.close()
+
+    # =========================================================================
+    # Consumer side
+    # =========================================================================
+
+    def lease(self, job_types: Sequence[str], worker_id: str, limit: int = 1) -> List[Job]:
+        """
+        Claim up to limit due jobs, highest priority first.
+
+        Rows locked by another worker's lease transaction are skipped, so
+        concurrent callers never receive the same job.
+
+        Args:
+            job_types: Types this worker handles
+            worker_id: Lease holder (see default_worker_id)
+            limit: Maximum jobs to claim
+
+        Returns:
+            Leased jobs (attempts already incremented)
+        """
+        if limit <= 0:
+            return []
+        self.ensure_table()
+        session = self._session_factory()
+        try:
+            rows = session.execute(
+                text(f"""
+                    UPDATE {JOBS_TABLE} j
+                    SET status = 'running',
+                        attempts = j.attempts + 1,
+                        leased_by = :worker_id,
+                        lease_expires_at = NOW() + make_interval(secs => :lease_seconds),
+                        updated_at = NOW()
+                    WHERE j.job_id IN (
+                        SELECT job_id FROM {JOBS_TABLE}
+                        WHERE status = 'queued'
+                        AND job_type = ANY(CAST(:job_types AS text[]))
+                        AND run_after <= NOW()
+                        ORDER BY priority DESC, run_after, created_at
+                        LIMIT :limit
+                        FOR UPDATE SKIP LOCKED
+                    )
+                    RETURNING j.job_id, j.job_type, j.source_id, j.notebook_id,
+                              j.payload, j.attempts, j.max_attempts
+                """),
+                {
+                    "worker_id": worker_id,
+                    "lease_seconds": float(self.lease_seconds),
+                    "job_types": list(job_types),
+                    "limit": limit,
+                }
+            ).fetchall()
+            session.commit()
+        except Exception as e:
+            session.rollback()
+            logger.error(f"Failed to lease jobs: {e}")
+            return []
+        finally:
+            session.close()
+
+        return [
+            Job(
+                job_id=str(row[0]),
+                job_type=row[1],
+                source_id=row[2],
+                notebook_id=row[3],
+                payload=row[4] if isinstance(row[4], dict) else json.loads(row[4] or "{}"),
+                attempts=row[5],
+                max_attempts=row[6],
+            )
+            for row in rows
+        ]
+
+    def heartbeat(self, job_ids: Sequence[str], worker_id: str) -> int:
+        """Extend the leases of jobs this worker still holds. Returns rows renewed."""
+        if not job_ids:
+            return 0
+        session = self._session_factory()
+        try:
+            result = session.execute(
+                text(f"""
+                    UPDATE {JOBS_TABLE}
+                    SET lease_expires_at = NOW() + make_interval(secs => :lease_seconds),
+                        updated_at = NOW()
+                    WHERE job_id = ANY(CAST(:job_ids AS uuid[]))
+                    AND status = 'running' AND leased_by = :worker_id
+                """),
+                {
+                    "job_ids": list(job_ids),
+                    "worker_id": worker_id,
+                    "lease_seconds": float(self.lease_seconds),
+                }
+            )
+            session.commit()
+            return result.rowcount
+        except Exception as e:
+            session.rollback()
+            logger.warning(f"Job heartbeat failed: {e}")
+            return 0
+        finally:
+            session.close()
+
+    def complete(self, job_id: str, worker_id: str) -> None:
+        """Mark a leased job done."""
+        self._finish(job_id, worker_id, f"""
+            UPDATE {JOBS_TABLE}
+            SET status = 'completed', completed_at = NOW(), updated_at = NOW(),
+                lease_expires_at = NULL, last_error = NULL
+            WHERE job_id = :job_id AND leased_by = :worker_id
+        """, {})
+
+    def fail(self, job_id: str, worker_id: str, error: str, retry: bool = True) -> None:
+        """
+        Record a failed attempt; re-queue with exponential backoff while attempts remain.
+
+        Args:
+            job_id: Leased job
+            worker_id: Lease holder
+            error: Error message kept in last_error
+            retry: False for permanent failures (no further attempts)
+        """
+        self._finish(job_id, worker_id, f"""
+            UPDATE {JOBS_TABLE}
+            SET status = CASE
+                    WHEN :retry AND attempts < max_attempts THEN 'queued' ELSE 'failed'
+                END,
+                run_after = NOW() + make_interval(secs => LEAST(
+                    :backoff_max, :backoff_base * power(2, GREATEST(attempts - 1, 0))
+                )),
+                completed_at = CASE
+                    WHEN :retry AND attempts < max_attempts THEN NULL ELSE NOW()
+                END,
+                last_error = :error, leased_by = NULL, lease_expires_at = NULL,
+                updated_at = NOW()
+            WHERE job_id = :job_id AND leased_by = :worker_id
+        """, {
+            "error": (error or "")[:4000],
+            "retry": retry,
+            "backoff_base": float(self.backoff_base_seconds),
+            "backoff_max": float(self.backoff_max_seconds),
+        })
+
+    def _finish(self, job_id: str, worker_id: str, sql: str, params: Dict[str, Any]) -> None:
+        session = self._session_factory()
+        try:
+            session.execute(text(sql), {"job_id": job_id, "worker_id": worker_id, **params})
+            session.commit()
+        except Exception as e:
+            session.rollback()
+            logger.error(f"Failed to update job {job_id}: {e}")
+        finally:
+            session.close()
+
+    def requeue_expired(self) -> int:
+        """
+        Return jobs whose lease expired (worker crashed or hung) to the queue.
+
+        The expired attempt counts; jobs out of attempts are marked failed.
+
+        Returns:
+            Number of jobs recovered
+        """
+        self.ensure_table()
+        session = self._session_factory()
+        try:
+            result = session.execute(text(f"""
+                UPDATE {JOBS_TABLE}
+                SET status = CASE WHEN attempts < max_attempts THEN 'queued' ELSE 'failed' END,
+                    last_error = 'lease expired (held by ' || COALESCE(leased_by, '?') || ')',
+                    leased_by = NULL, lease_expires_at = NULL, updated_at = NOW()
+                WHERE status = 'running' AND lease_expires_at < NOW()
+            """))
+            session.commit()
+            if result.rowcount:
+                logger.warning(f"Recovered {result.rowcount} jobs with expired leases")
+            return result.rowcount
+        except Exception as e:
+            session.rollback()
+            logger.warning(f"Failed to recover expired jobs: {e}")
+            return 0
+        finally:
+            session.close()
+
+    def get_stats(self) -> Dict[str, Dict[str, int]]:
+        """Job counts per type and status."""
+        self.ensure_table()
+        session = self._session_factory()
+        try:
+            rows = session.execute(text(f"""
+                SELECT job_type, status, COUNT(*) FROM {JOBS_TABLE}
+                GROUP BY job_type, status
+            """)).fetchall()
+            stats: Dict[str, Dict[str, int]] = {}
+            for job_type, status, count in rows:
+                stats.setdefault(job_type, {})[status] = count
+            return stats
+        except Exception as e:
+            logger.warning(f"Failed to read job stats: {e}")
+            return {}
+        finally:
+            session.close()
+
+
+class JobListener:
+    """
+    LISTEN connection that wakes idle workers when a job is enqueued.
+
+    Uses its own psycopg2 connection detached from the pool (a listening
+    connection must stay open and in autocommit). If listening is not
+    possible, wait() degrades to a plain sleep, i.e. interval polling.
+    """
+
+    def __init__(self, engine, channel: str = NOTIFY_CHANNEL) -> None:
+        """
+        Args:
+            engine: SQLAlchemy engine (psycopg2 driver)
+            channel: NOTIFY channel name
+        """
+        self._engine = engine
+        self._channel = channel
+        self._conn = None
+        self._stopped = threading.Event()
+
+    def _connect(self) -> None:
+        raw = self._engine.raw_connection()
+        raw.detach()
+        conn = getattr(raw, "driver_connection", None) or raw.connection
+        conn.autocommit = True
+        with conn.cursor() as cursor:
+            cursor.execute(f"LISTEN {self._channel}")
+        self._conn = conn
+        logger.debug(f"Listening on channel {self._channel}")
+
+    def wait(self, timeout: float) -> bool:
+        """
+        Block until a notification arrives or timeout elapses.
+
+        Returns:
+            True if woken by a notification
+        """
+        if self._stopped.is_set():
+            return False
+        try:
+            if self._conn is None:
+                self._connect()
+            ready, _, _ = select.select([self._conn], [], [], timeout)
+            if not ready:
+                return False
+            self._conn.poll()
+            notified = bool(self._conn.notifies)
+            self._conn.notifies.clear()
+            return notified
+        except Exception as e:
+            logger.warning(f"Job listener error, falling back to polling: {e}")
+            self.close()
+            self._stopped.wait(timeout)
+            return False
+
+    def close(self) -> None:
+        """Close the listening connection (reopened on next wait)."""
+        if self._conn is not None:
+            try:
+                self._conn.close()
+            except Exception:
+                pass
+            self._conn = None
+
+    def stop(self) -> None:
+        """Stop waiting permanently."""
+        self._stopped.set()
+        self.close()
@@ -0,0 +1,149 @@
+"""
+Lease loop shared by the background workers.
+
+JobRunner drives one worker's event loop against the durable JobQueue:
+wait for a NOTIFY (or the poll interval), lease as many jobs as there are
+free slots, run the handler for each, and complete or fail the job.
+Leases of in-flight jobs are renewed every heartbeat interval, and
+expired leases left behind by dead workers are recovered on each sweep.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable, Dict, Optional, Sequence
+
+from .job_queue import (
+    Job,
+    JobListener,
+    JobQueue,
+    PermanentJobError,
+    _jobs_config,
+    default_worker_id,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class JobRunner:
+    """Leases jobs of the given types and runs them with bounded concurrency."""
+
+    def __init__(
+        self,
+        job_queue: JobQueue,
+        job_types: Sequence[str],
+        handler: Callable[[Job], Awaitable[None]],
+        max_concurrent: int = 1,
+        poll_interval: float = 10.0,
+        engine=None,
+        sweep: Optional[Callable[[], None]] = None,
+        worker_id: Optional[str] = None,
+    ) -> None:
+        """
+        Args:
+            job_queue: Durable queue to lease from
+            job_types: Job types this runner handles
+            handler: Coroutine run per job; raise to fail the attempt
+                (PermanentJobError to fail without retrying)
+            max_concurrent: Jobs run at once
+            poll_interval: Longest idle wait between lease attempts
+            engine: SQLAlchemy engine for LISTEN wakeups (None = interval polling)
+            sweep: Optional sync callable run every poll interval
+                (e.g. enqueue sources that need work)
+            worker_id: Lease holder name (defaults to host:pid:suffix)
+        """
+        self.queue = job_queue
+        self.job_types = list(job_types)
+        self.handler = handler
+        self.max_concurrent = max_concurrent
+        self.poll_interval = poll_interval
+        self.sweep = sweep
+        self.worker_id = worker_id or default_worker_id()
+        self.heartbeat_seconds = _jobs_config("heartbeat_seconds", 30)
+        self._listener = JobListener(engine) if engine is not None else None
+        self._in_flight: Dict[str, asyncio.Task] = {}
+        self._running = False
+
+    async def run(self) -> None:
+        """Lease and process jobs until stop() is called."""
+        self._running = True
+        last_sweep = 0.0
+        last_heartbeat = time.monotonic()
+        logger.info(f"Job runner {self.worker_id} handling {', '.join(self.job_types)}")
+
+        while self._running:
+            now = time.monotonic()
+            if now - last_sweep >= self.poll_interval:
+                last_sweep = now
+                await asyncio.to_thread(self._sweep)
+
+            if now - last_heartbeat >= self.heartbeat_seconds and self._in_flight:
+                last_heartbeat = now
+                await asyncio.to_thread(
+                    self.queue.heartbeat, list(self._in_flight), self.worker_id
+                )
+
+            free = self.max_concurrent - len(self._in_flight)
+            jobs = []
+            if free > 0:
+                jobs = await asyncio.to_thread(
+                    self.queue.lease, self.job_types, self.worker_id, free
+                )
+            for job in jobs:
+                self._in_flight[job.job_id] = asyncio.create_task(self._run_job(job))
+
+            if jobs and len(self._in_flight) < self.max_concurrent:
+                # More work may be waiting; lease again without sleeping
+                continue
+            await self._wait()
+
+        if self._in_flight:
+            await asyncio.gather(*self._in_flight.values(), return_exceptions=True)
+
+    def stop(self) -> None:
+        """Stop leasing new jobs; in-flight jobs finish (or their lease expires)."""
+        self._running = False
+        if self._listener:
+            self._listener.stop()
+
+    async def _wait(self) -> None:
+        """Sleep until a job is enqueued, a slot frees up, or the interval passes."""
+        timeout = min(self.poll_interval, self.heartbeat_seconds)
+        if len(self._in_flight) >= self.max_concurrent:
+            # All slots busy: wake when one finishes
+            await asyncio.wait(
+                list(self._in_flight.values()),
+                timeout=timeout,
+                return_when=asyncio.FIRST_COMPLETED
+            )
+        elif self._listener:
+            await asyncio.to_thread(self._listener.wait, timeout)
+        else:
+            await asyncio.sleep(timeout)
+
+    def _sweep(self) -> None:
+        self.queue.requeue_expired()
+        if self.sweep:
+            try:
+                self.sweep()
+            except Exception as e:
+                logger.error(f"Job sweep failed: {e}")
+
+    async def _run_job(self, job: Job) -> None:
+        try:
+            await self.handler(job)
+        except PermanentJobError as e:
+            logger.error(f"{job.job_type} job {job.job_id} failed permanently: {e}")
+            await asyncio.to_thread(self.queue.fail, job.job_id, self.worker_id, str(e), False)
+        except Exception as e:
+            retrying = job.attempts < job.max_attempts
+            logger.error(
+                f"{job.job_type} job {job.job_id} failed "
+                f"(attempt {job.attempts}/{job.max_attempts}"
+                f"{', will retry' if retrying else ''}): {e}"
+            )
+            await asyncio.to_thread(self.queue.fail, job.job_id, self.worker_id, str(e))
+        else:
+            await asyncio.to_thread(self.queue.complete, job.job_id, self.worker_id)
+        finally:
+            self._in_flight.pop(job.job_id, None)
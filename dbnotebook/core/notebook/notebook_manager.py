@@ -269,19 +269,27 @@ class NotebookManager:
         self,
         notebook_id: str,
         file_name: str,
-        file_content: bytes,
+        file_content: Optional[bytes] = None,
         file_type: Optional[str] = None,
-        chunk_count: Optional[int] = None
+        chunk_count: Optional[int] = None,
+        file_hash: Optional[str] = None,
+        file_size: Optional[int] = None,
     ) -> str:
         """
         Register a document in a notebook with duplicate detection.
 
+        Callers that already hashed the file (see utils.hash_file) pass
+        file_hash and file_size instead of file_content to avoid reading the
+        whole file into memory.
+
         Args:
             notebook_id: UUID of the notebook
             file_name: Name of the document file
-            file_content: File content for hash calculation
+            file_content: File content for hash calculation (if file_hash not given)
             file_type: File type/extension (e.g., 'pdf', 'txt')
             chunk_count: Number of chunks the document was split into
+            file_hash: Precomputed SHA-256 hex digest of the file
+            file_size: File size in bytes (with file_hash)
 
         Returns:
             source_id (UUID) of the registered document
@@ -292,8 +300,11 @@ class NotebookManager:
         """
         try:
             # Calculate file hash for duplicate detection
-            file_hash = hashlib.sha256(file_content).hexdigest()
-            file_size = len(file_content)
+            if file_hash is None:
+                if file_content is None:
+                    raise ValueError("Either file_content or file_hash is required")
+                file_hash = hashlib.sha256(file_content).hexdigest()
+                file_size = len(file_content)
 
             with self.db.get_session() as session:
                 # Verify notebook exists
@@ -342,6 +353,34 @@ class NotebookManager:
             logger.error(f"Failed to add document to notebook {notebook_id}: {e}")
             raise
 
+    def find_document_by_hash(self, notebook_id: str, file_hash: str) -> Optional[Dict]:
+        """
+        Look up a notebook document by its SHA-256 file hash.
+
+        Args:
+            notebook_id: UUID of the notebook
+            file_hash: SHA-256 hex digest of the file
+
+        Returns:
+            {"source_id", "file_name", "chunk_count"} or None if not registered
+        """
+        try:
+            with self.db.get_session() as session:
+                source = session.query(NotebookSource).filter(
+                    NotebookSource.notebook_id == UUID(notebook_id),
+                    NotebookSource.file_hash == file_hash
+                ).first()
+                if not source:
+                    return None
+                return {
+                    "source_id": str(source.source_id),
+                    "file_name": source.file_name,
+                    "chunk_count": source.chunk_count,
+                }
+        except Exception as e:
+            logger.error(f"Failed to look up document hash in notebook {notebook_id}: {e}")
+            return None
+
     def get_documents(self, notebook_id: str) -> List[Dict]:
         """
         List all documents in a notebook.
@@ -1,12 +1,45 @@
-"""Query logging service for token usage tracking and cost calculation."""
+"""Query logging service for token usage tracking and cost calculation.
 
+log_query() never touches the database on the request path: entries go to
+a bounded queue and a background writer flushes them to query_logs in
+multi-row inserts (every ``batch_size`` entries or ``flush_interval_ms``),
+updating the hourly rollup table query_log_hourly in the same transaction.
+Only the last ``ring_size`` entries are kept in memory.
+
+Usage stats are SQL aggregates over the indexed query_logs table; admin
+metrics read the hourly rollups.
+
+Configuration (observability.query_log):
+    batch_size: Entries per multi-row insert
+    flush_interval_ms: Max time an entry waits before being written
+    queue_size: Pending entries before new ones are dropped
+    ring_size: Recent entries kept in memory
+"""
+
+import atexit
 import logging
+import queue
+import threading
+import time
+from collections import deque
 from datetime import datetime
-from typing import Dict, Optional, List
+from typing import Any, Dict, Optional, List
 from uuid import uuid4
 
+from sqlalchemy import text
+
+from ..config import get_config_value
+
 logger = logging.getLogger(__name__)
 
+ROLLUP_TABLE = "query_log_hourly"
+
+_STOP = object()
+
+
+def _query_log_config(key: str, default: Any) -> Any:
+    return get_config_value("dbnotebook", "observability", "query_log", key, default=default)
+
 
 # Model pricing database (per 1M tokens)
 MODEL_PRICING = {
@@ -58,21 +91,99 @@ class QueryLogger:
     """
     Query logging service for tracking token usage and calculating costs.
 
-    Provides in-memory logging with optional database persistence.
+    Entries are written to the database asynchronously in batches; a
+    fixed-size ring buffer holds the most recent entries in memory.
     Tracks token usage, response times, and estimated costs per query.
     """
 
-    def __init__(self, db_manager=None):
+    def __init__(
+        self,
+        db_manager=None,
+        batch_size: Optional[int] = None,
+        flush_interval_ms: Optional[float] = None,
+        queue_size: Optional[int] = None,
+        ring_size: Optional[int] = None,
+    ):
         """
         Initialize query logger.
 
         Args:
             db_manager: Optional database manager for persistent storage
+            batch_size: Entries per insert (default from config)
+            flush_interval_ms: Max wait before a partial batch is written
+            queue_size: Pending entries before new ones are dropped
+            ring_size: Recent entries kept in memory
         """
         self.db = db_manager
-        self._in_memory_logs: List[Dict] = []
+        self._batch_size = max(1, int(batch_size or _query_log_config("batch_size", 200)))
+        self._flush_interval = float(
+            flush_interval_ms or _query_log_config("flush_interval_ms", 1000)
+        ) / 1000.0
+        self._recent: deque = deque(maxlen=int(ring_size or _query_log_config("ring_size", 1000)))
+        self._recent_lock = threading.Lock()
+        self._queue: "queue.Queue" = queue.Queue(
+            maxsize=int(queue_size or _query_log_config("queue_size", 10000))
+        )
+        self._stats_lock = threading.Lock()
+        self._stats = {"queued": 0, "written": 0, "dropped": 0, "batches": 0, "failed": 0}
+        self._closed = False
+        self._writer: Optional[threading.Thread] = None
+
+        if self.db:
+            self._session_factory = self.db.get_session_maker()
+            self.ensure_tables()
+            self._writer = threading.Thread(
+                target=self._writer_loop,
+                name="query-log-writer",
+                daemon=True
+            )
+            self._writer.start()
+            atexit.register(self.close)
         logger.info("QueryLogger initialized")
 
+    def ensure_tables(self) -> None:
+        """Create the hourly rollup table (backfilled from query_logs) if missing."""
+        session = self._session_factory()
+        try:
+            exists = session.execute(
+                text("SELECT to_regclass(:name) IS NOT NULL"), {"name": ROLLUP_TABLE}
+            ).scalar()
+            if exists:
+                return
+            session.execute(text(f"""
+                CREATE TABLE IF NOT EXISTS {ROLLUP_TABLE} (
+                    hour TIMESTAMP NOT NULL,
+                    user_id UUID NOT NULL REFERENCES users(user_id) ON DELETE CASCADE,
+                    model_name VARCHAR(100) NOT NULL,
+                    queries BIGINT NOT NULL DEFAULT 0,
+                    prompt_tokens BIGINT NOT NULL DEFAULT 0,
+                    completion_tokens BIGINT NOT NULL DEFAULT 0,
+                    total_tokens BIGINT NOT NULL DEFAULT 0,
+                    response_time_ms_sum BIGINT NOT NULL DEFAULT 0,
+                    response_count BIGINT NOT NULL DEFAULT 0,
+                    PRIMARY KEY (hour, user_id, model_name)
+                )
+            """))
+            session.execute(text(f"""
+                CREATE INDEX IF NOT EXISTS idx_{ROLLUP_TABLE}_user ON {ROLLUP_TABLE} (user_id)
+            """))
+            session.execute(text(f"""
+                INSERT INTO {ROLLUP_TABLE}
+                SELECT date_trunc('hour', timestamp), user_id, COALESCE(model_name, 'unknown'),
+                       COUNT(*), COALESCE(SUM(prompt_tokens), 0), COALESCE(SUM(completion_tokens), 0),
+                       COALESCE(SUM(total_tokens), 0), COALESCE(SUM(response_time_ms), 0),
+                       COUNT(response_time_ms)
+                FROM query_logs
+                GROUP BY 1, 2, 3
+                ON CONFLICT DO NOTHING
+            """))
+            session.commit()
+        except Exception as e:
+            session.rollback()
+            logger.warning(f"Could not ensure query log rollup table: {e}")
+        finally:
+            session.close()
+
     def log_query(
         self,
         notebook_id: Optional[str],
@@ -116,31 +227,22 @@ class QueryLogger:
             "timestamp": datetime.utcnow()
         }
 
-        # Store in memory
-        self._in_memory_logs.append(log_entry)
+        # Keep in the ring buffer (oldest entries fall off)
+        with self._recent_lock:
+            self._recent.append(log_entry)
 
-        # Store in database if available
-        if self.db:
+        # Hand off to the background writer; never block the request
+        if self._writer is not None and not self._closed:
             try:
-                with self.db.get_session() as session:
-                    from ..db.models import QueryLog
-
-                    query_log = QueryLog(
-                        log_id=log_id,
-                        notebook_id=notebook_id,
-                        user_id=user_id,
-                        query_text=query_text,
-                        model_name=model_name,
-                        prompt_tokens=prompt_tokens,
-                        completion_tokens=completion_tokens,
-                        total_tokens=total_tokens,
-                        response_time_ms=response_time_ms,
-                        timestamp=log_entry["timestamp"]
-                    )
-                    session.add(query_log)
-                logger.debug(f"Query logged to database: {log_id}")
-            except Exception as e:
-                logger.error(f"Failed to log query to database: {e}")
+                self._queue.put_nowait(log_entry)
+                with self._stats_lock:
+                    self._stats["queued"] += 1
+            except queue.Full:
+                with self._stats_lock:
+                    self._stats["dropped"] += 1
+                    dropped = self._stats["dropped"]
+                if dropped == 1 or dropped % 1000 == 0:
+                    logger.warning(f"Query log queue full, {dropped} entries dropped so far")
 
         logger.info(
             f"Query logged | Model: {model_name} | "
@@ -150,6 +252,143 @@ class QueryLogger:
 
         return log_id
 
+    # ========== Background writer ==========
+
+    def _writer_loop(self) -> None:
+        """Collect queued entries into batches and write them.
+
+        close() enqueues a stop marker, so everything queued before it is
+        still written.
+        """
+        stopping = False
+        while not stopping:
+            first = self._queue.get()
+            if first is _STOP:
+                break
+            batch = [first]
+            deadline = time.monotonic() + self._flush_interval
+            while len(batch) < self._batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+            self._write_batch(batch)
+
+    def _write_batch(self, batch: List[Dict]) -> None:
+        """Insert a batch in one transaction; on failure retry row by row."""
+        session = self._session_factory()
+        try:
+            self._insert_entries(session, batch)
+            session.commit()
+            written, failed = len(batch), 0
+        except Exception as e:
+            session.rollback()
+            logger.warning(f"Batched query log insert of {len(batch)} entries failed, retrying per row: {e}")
+            written, failed = 0, 0
+            for entry in batch:
+                try:
+                    self._insert_entries(session, [entry])
+                    session.commit()
+                    written += 1
+                except Exception as row_error:
+                    session.rollback()
+                    failed += 1
+                    logger.error(f"Failed to log query {entry['log_id']} to database: {row_error}")
+        finally:
+            session.close()
+
+        with self._stats_lock:
+            self._stats["batches"] += 1
+            self._stats["written"] += written
+            self._stats["failed"] += failed
+        logger.debug(f"Query log batch written: {written} entries ({failed} failed)")
+
+    @staticmethod
+    def _insert_entries(session, entries: List[Dict]) -> None:
+        """Multi-row insert into query_logs plus the matching rollup upsert."""
+        params = {
+            "log_ids": [e["log_id"] for e in entries],
+            "notebook_ids": [e["notebook_id"] for e in entries],
+            "user_ids": [e["user_id"] for e in entries],
+            "query_texts": [e["query_text"] for e in entries],
+            "model_names": [e["model_name"] for e in entries],
+            "prompt_tokens": [e["prompt_tokens"] for e in entries],
+            "completion_tokens": [e["completion_tokens"] for e in entries],
+            "total_tokens": [e["total_tokens"] for e in entries],
+            "response_times": [e["response_time_ms"] for e in entries],
+            "timestamps": [e["timestamp"] for e in entries],
+        }
+        session.execute(
+            text("""
+                INSERT INTO query_logs (
+                    log_id, notebook_id, user_id, query_text, model_name, prompt_tokens,
+                    completion_tokens, total_tokens, response_time_ms, timestamp
+                )
+                SELECT * FROM unnest(
+                    CAST(:log_ids AS uuid[]), CAST(:notebook_ids AS uuid[]),
+                    CAST(:user_ids AS uuid[]), CAST(:query_texts AS text[]),
+                    CAST(:model_names AS text[]), CAST(:prompt_tokens AS integer[]),
+                    CAST(:completion_tokens AS integer[]), CAST(:total_tokens AS integer[]),
+                    CAST(:response_times AS integer[]), CAST(:timestamps AS timestamp[])
+                )
+            """),
+            params
+        )
+        session.execute(
+            text(f"""
+                INSERT INTO {ROLLUP_TABLE} AS r
+                SELECT date_trunc('hour', ts), uid, COALESCE(model, 'unknown'),
+                       COUNT(*), COALESCE(SUM(p), 0), COALESCE(SUM(c), 0),
+                       COALESCE(SUM(tot), 0), COALESCE(SUM(rt), 0), COUNT(rt)
+                FROM unnest(
+                    CAST(:user_ids AS uuid[]), CAST(:model_names AS text[]),
+                    CAST(:prompt_tokens AS integer[]), CAST(:completion_tokens AS integer[]),
+                    CAST(:total_tokens AS integer[]), CAST(:response_times AS integer[]),
+                    CAST(:timestamps AS timestamp[])
+                ) AS t(uid, model, p, c, tot, rt, ts)
+                GROUP BY 1, 2, 3
+                ON CONFLICT (hour, user_id, model_name) DO UPDATE SET
+                    queries = r.queries + EXCLUDED.queries,
+                    prompt_tokens = r.prompt_tokens + EXCLUDED.prompt_tokens,
+                    completion_tokens = r.completion_tokens + EXCLUDED.completion_tokens,
+                    total_tokens = r.total_tokens + EXCLUDED.total_tokens,
+                    response_time_ms_sum = r.response_time_ms_sum + EXCLUDED.response_time_ms_sum,
+                    response_count = r.response_count + EXCLUDED.response_count
+            """),
+            params
+        )
+
+    def close(self) -> None:
+        """Stop the writer after flushing everything already queued."""
+        if self._closed:
+            return
+        self._closed = True
+        if self._writer is not None:
+            self._queue.put(_STOP)
+            self._writer.join()
+            logger.info("QueryLogger writer stopped")
+
+    def get_writer_stats(self) -> Dict[str, Any]:
+        """Get background writer counters (queued, written, dropped, failed)."""
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats["pending"] = self._queue.qsize()
+        stats["avg_batch_size"] = round(stats["written"] / stats["batches"], 1) if stats["batches"] else 0.0
+        stats["ring_entries"] = len(self._recent)
+        return stats
+
+    def _snapshot(self) -> List[Dict]:
+        """Copy of the ring buffer, oldest first."""
+        with self._recent_lock:
+            return list(self._recent)
+
     def estimate_cost(
         self,
         model_name: str,
@@ -201,6 +440,10 @@ class QueryLogger:
         """
         Get usage statistics with optional filtering.
 
+        Aggregated in SQL over query_logs (filters use its notebook/user/
+        timestamp indexes); without a database, computed from the ring
+        buffer. Entries still queued for the writer are not yet counted.
+
         Args:
             notebook_id: Filter by notebook ID
             user_id: Filter by user ID
@@ -215,8 +458,15 @@ class QueryLogger:
             - avg_response_time: Average response time in ms
             - queries_by_model: Breakdown by model
         """
+        if self.db:
+            try:
+                return self._usage_stats_from_db(notebook_id, user_id, start_date, end_date)
+            except Exception as e:
+                logger.error(f"Failed to get usage stats from database: {e}")
+                # Fall through to in-memory fallback
+
         # Filter logs based on criteria
-        filtered_logs = self._in_memory_logs
+        filtered_logs = self._snapshot()
 
         if notebook_id:
             filtered_logs = [log for log in filtered_logs if log["notebook_id"] == notebook_id]
@@ -232,13 +482,7 @@ class QueryLogger:
 
         # Calculate statistics
         if not filtered_logs:
-            return {
-                "total_queries": 0,
-                "total_tokens": 0,
-                "total_cost": 0.0,
-                "avg_response_time": 0.0,
-                "queries_by_model": {}
-            }
+            return self._empty_usage_stats()
 
         total_queries = len(filtered_logs)
         total_tokens = sum(log["total_tokens"] for log in filtered_logs)
@@ -267,6 +511,84 @@ class QueryLogger:
             "queries_by_model": queries_by_model
         }
 
+    @staticmethod
+    def _empty_usage_stats() -> Dict:
+        return {
+            "total_queries": 0,
+            "total_tokens": 0,
+            "total_cost": 0.0,
+            "avg_response_time": 0.0,
+            "queries_by_model": {}
+        }
+
+    def _usage_stats_from_db(
+        self,
+        notebook_id: Optional[str],
+        user_id: Optional[str],
+        start_date: Optional[datetime],
+        end_date: Optional[datetime]
+    ) -> Dict:
+        """Per-model SQL aggregate over query_logs for get_usage_stats()."""
+        from sqlalchemy import func
+        from ..db.models import QueryLog
+
+        session = self._session_factory()
+        try:
+            query = session.query(
+                QueryLog.model_name,
+                func.count(QueryLog.log_id).label('query_count'),
+                func.sum(QueryLog.total_tokens).label('total_tokens'),
+                func.sum(QueryLog.prompt_tokens).label('prompt_tokens'),
+                func.sum(QueryLog.completion_tokens).label('completion_tokens'),
+                func.sum(QueryLog.response_time_ms).label('response_time_ms_sum'),
+                func.count(QueryLog.response_time_ms).label('response_count')
+            )
+            if notebook_id:
+                query = query.filter(QueryLog.notebook_id == notebook_id)
+            if user_id:
+                query = query.filter(QueryLog.user_id == user_id)
+            if start_date:
+                query = query.filter(QueryLog.timestamp >= start_date)
+            if end_date:
+                query = query.filter(QueryLog.timestamp <= end_date)
+            rows = query.group_by(QueryLog.model_name).all()
+        finally:
+            session.close()
+
+        if not rows:
+            return self._empty_usage_stats()
+
+        queries_by_model = {}
+        total_queries = 0
+        total_tokens = 0
+        total_cost = 0.0
+        response_time_sum = 0
+        response_count = 0
+        for row in rows:
+            model_name = row.model_name or "unknown"
+            tokens = int(row.total_tokens or 0)
+            cost = self.estimate_cost(
+                model_name, int(row.prompt_tokens or 0), int(row.completion_tokens or 0)
+            )
+            queries_by_model[model_name] = {
+                "count": row.query_count,
+                "tokens": tokens,
+                "cost": cost
+            }
+            total_queries += row.query_count
+            total_tokens += tokens
+            total_cost += cost
+            response_time_sum += int(row.response_time_ms_sum or 0)
+            response_count += int(row.response_count or 0)
+
+        return {
+            "total_queries": total_queries,
+            "total_tokens": total_tokens,
+            "total_cost": total_cost,
+            "avg_response_time": response_time_sum / response_count if response_count else 0.0,
+            "queries_by_model": queries_by_model
+        }
+
     def get_recent_logs(self, limit: int = 50) -> List[Dict]:
         """
         Get most recent query logs.
@@ -275,18 +597,20 @@ class QueryLogger:
             limit: Maximum number of logs to return
 
         Returns:
-            List of log entries sorted by timestamp (newest first)
+            List of log entries sorted by timestamp (newest first), at most
+            the ring buffer size
         """
         sorted_logs = sorted(
-            self._in_memory_logs,
+            self._snapshot(),
             key=lambda x: x["timestamp"],
             reverse=True
         )
         return sorted_logs[:limit]
 
     def clear_logs(self) -> None:
-        """Clear all in-memory logs."""
-        self._in_memory_logs.clear()
+        """Clear the in-memory ring buffer (persisted logs are kept)."""
+        with self._recent_lock:
+            self._recent.clear()
         logger.info("Query logs cleared")
 
     def get_model_pricing(self, model_name: str) -> Optional[Dict[str, float]]:
@@ -317,7 +641,8 @@ class QueryLogger:
         Get aggregated metrics for admin dashboard.
 
         Aggregates token usage, costs, and query counts by model, user, and day
-        from the database (with in-memory fallback).
+        from the hourly rollup table (with a fallback to the in-memory ring
+        buffer). The window starts at the top of the hour ``days`` ago.
 
         Args:
             days: Number of days to look back (default: 30)
@@ -330,7 +655,6 @@ class QueryLogger:
             - by_day: List of metrics grouped by day
         """
         from datetime import timedelta
-        from sqlalchemy import func, cast, Date
 
         cutoff_date = datetime.utcnow() - timedelta(days=days)
 
@@ -347,153 +671,128 @@ class QueryLogger:
             "by_day": []
         }
 
-        # Try database query first
+        # Hourly rollups: one row per (hour, user, model), written with the logs
         if self.db:
             try:
-                with self.db.get_session() as session:
-                    from ..db.models import QueryLog, User
-
-                    # Base query for time range
-                    base_query = session.query(QueryLog).filter(
-                        QueryLog.timestamp >= cutoff_date
+                cutoff_hour = cutoff_date.replace(minute=0, second=0, microsecond=0)
+                session = self._session_factory()
+                try:
+                    user_model_results = session.execute(
+                        text(f"""
+                            SELECT r.user_id, u.username, r.model_name,
+                                   SUM(r.queries) AS queries,
+                                   SUM(r.prompt_tokens) AS prompt_tokens,
+                                   SUM(r.completion_tokens) AS completion_tokens,
+                                   SUM(r.total_tokens) AS total_tokens,
+                                   SUM(r.response_time_ms_sum) AS response_time_ms_sum,
+                                   SUM(r.response_count) AS response_count
+                            FROM {ROLLUP_TABLE} r
+                            LEFT JOIN users u ON u.user_id = r.user_id
+                            WHERE r.hour >= :cutoff
+                            GROUP BY r.user_id, u.username, r.model_name
+                        """),
+                        {"cutoff": cutoff_hour}
+                    ).fetchall()
+                    day_results = session.execute(
+                        text(f"""
+                            SELECT CAST(hour AS DATE) AS date,
+                                   SUM(queries) AS queries,
+                                   SUM(total_tokens) AS total_tokens
+                            FROM {ROLLUP_TABLE}
+                            WHERE hour >= :cutoff
+                            GROUP BY 1
+                            ORDER BY 1
+                        """),
+                        {"cutoff": cutoff_hour}
+                    ).fetchall()
+                finally:
+                    session.close()
+
+                if not user_model_results:
+                    return empty_response
+
+                # Cost is priced per model, so aggregate (user, model) rows
+                model_agg = {}
+                user_agg = {}
+                total_queries = 0
+                total_tokens = 0
+                response_time_sum = 0
+                response_count = 0
+                for row in user_model_results:
+                    user_id = str(row.user_id)
+                    model_name = row.model_name or "unknown"
+                    tokens = int(row.total_tokens or 0)
+                    queries = int(row.queries or 0)
+                    cost = self.estimate_cost(
+                        model_name, int(row.prompt_tokens or 0), int(row.completion_tokens or 0)
                     )
 
-                    # Get total count
-                    total_queries = base_query.count()
-                    if total_queries == 0:
-                        return empty_response
-
-                    # Summary aggregation
-                    summary_result = session.query(
-                        func.sum(QueryLog.total_tokens).label('total_tokens'),
-                        func.sum(QueryLog.prompt_tokens).label('prompt_tokens'),
-                        func.sum(QueryLog.completion_tokens).label('completion_tokens'),
-                        func.avg(QueryLog.response_time_ms).label('avg_response_time')
-                    ).filter(QueryLog.timestamp >= cutoff_date).first()
-
-                    # Calculate total cost from token usage
-                    total_prompt = summary_result.prompt_tokens or 0
-                    total_completion = summary_result.completion_tokens or 0
-
-                    # Get model breakdown for accurate cost calculation
-                    model_results = session.query(
-                        QueryLog.model_name,
-                        func.count(QueryLog.log_id).label('query_count'),
-                        func.sum(QueryLog.total_tokens).label('total_tokens'),
-                        func.sum(QueryLog.prompt_tokens).label('prompt_tokens'),
-                        func.sum(QueryLog.completion_tokens).label('completion_tokens')
-                    ).filter(
-                        QueryLog.timestamp >= cutoff_date
-                    ).group_by(QueryLog.model_name).all()
-
-                    by_model = []
-                    total_cost = 0.0
-                    for row in model_results:
-                        model_name = row.model_name or "unknown"
-                        prompt = row.prompt_tokens or 0
-                        completion = row.completion_tokens or 0
-                        cost = self.estimate_cost(model_name, prompt, completion)
-                        total_cost += cost
-                        by_model.append({
-                            "model": model_name,
-                            "tokens": row.total_tokens or 0,
-                            "cost": round(cost, 4),
-                            "queries": row.query_count
-                        })
-
-                    # Sort by tokens descending
-                    by_model.sort(key=lambda x: x["tokens"], reverse=True)
-
-                    # User aggregation with username lookup and accurate cost per model
-                    user_model_results = session.query(
-                        QueryLog.user_id,
-                        User.username,
-                        QueryLog.model_name,
-                        func.count(QueryLog.log_id).label('query_count'),
-                        func.sum(QueryLog.total_tokens).label('total_tokens'),
-                        func.sum(QueryLog.prompt_tokens).label('prompt_tokens'),
-                        func.sum(QueryLog.completion_tokens).label('completion_tokens')
-                    ).join(
-                        User, QueryLog.user_id == User.user_id, isouter=True
-                    ).filter(
-                        QueryLog.timestamp >= cutoff_date
-                    ).group_by(QueryLog.user_id, User.username, QueryLog.model_name).all()
-
-                    # Aggregate by user with accurate per-model cost calculation
-                    user_agg = {}
-                    for row in user_model_results:
-                        user_id = str(row.user_id)
-                        username = row.username or user_id[:8]
-                        model_name = row.model_name or "unknown"
-                        prompt = row.prompt_tokens or 0
-                        completion = row.completion_tokens or 0
-                        cost = self.estimate_cost(model_name, prompt, completion)
-
-                        if user_id not in user_agg:
-                            user_agg[user_id] = {
-                                "username": username,
-                                "tokens": 0,
-                                "cost": 0.0,
-                                "queries": 0
-                            }
-                        user_agg[user_id]["tokens"] += row.total_tokens or 0
-                        user_agg[user_id]["cost"] += cost
-                        user_agg[user_id]["queries"] += row.query_count
-
-                    by_user = [
-                        {
-                            "user_id": uid,
-                            "username": data["username"],
-                            "tokens": data["tokens"],
-                            "cost": round(data["cost"], 4),
-                            "queries": data["queries"]
-                        }
-                        for uid, data in user_agg.items()
-                    ]
-
-                    # Sort by tokens descending
-                    by_user.sort(key=lambda x: x["tokens"], reverse=True)
-
-                    # Daily aggregation
-                    day_results = session.query(
-                        cast(QueryLog.timestamp, Date).label('date'),
-                        func.count(QueryLog.log_id).label('query_count'),
-                        func.sum(QueryLog.total_tokens).label('total_tokens')
-                    ).filter(
-                        QueryLog.timestamp >= cutoff_date
-                    ).group_by(
-                        cast(QueryLog.timestamp, Date)
-                    ).order_by(
-                        cast(QueryLog.timestamp, Date)
-                    ).all()
-
-                    by_day = []
-                    for row in day_results:
-                        by_day.append({
-                            "date": row.date.isoformat() if row.date else None,
-                            "tokens": row.total_tokens or 0,
-                            "queries": row.query_count
-                        })
-
-                    return {
-                        "summary": {
-                            "total_tokens": summary_result.total_tokens or 0,
-                            "total_cost": round(total_cost, 4),
-                            "total_queries": total_queries,
-                            "avg_response_time": round(summary_result.avg_response_time or 0, 2)
-                        },
-                        "by_model": by_model,
-                        "by_user": by_user,
-                        "by_day": by_day
+                    total_queries += queries
+                    total_tokens += tokens
+                    response_time_sum += int(row.response_time_ms_sum or 0)
+                    response_count += int(row.response_count or 0)
+
+                    model = model_agg.setdefault(model_name, {"tokens": 0, "cost": 0.0, "queries": 0})
+                    model["tokens"] += tokens
+                    model["cost"] += cost
+                    model["queries"] += queries
+
+                    user = user_agg.setdefault(user_id, {
+                        "username": row.username or user_id[:8],
+                        "tokens": 0,
+                        "cost": 0.0,
+                        "queries": 0
+                    })
+                    user["tokens"] += tokens
+                    user["cost"] += cost
+                    user["queries"] += queries
+
+                by_model = [
+                    {"model": m, "tokens": d["tokens"], "cost": round(d["cost"], 4), "queries": d["queries"]}
+                    for m, d in model_agg.items()
+                ]
+                by_model.sort(key=lambda x: x["tokens"], reverse=True)
+
+                by_user = [
+                    {
+                        "user_id": uid,
+                        "username": data["username"],
+                        "tokens": data["tokens"],
+                        "cost": round(data["cost"], 4),
+                        "queries": data["queries"]
+                    }
+                    for uid, data in user_agg.items()
+                ]
+                by_user.sort(key=lambda x: x["tokens"], reverse=True)
+
+                by_day = [
+                    {
+                        "date": row.date.isoformat() if row.date else None,
+                        "tokens": int(row.total_tokens or 0),
+                        "queries": int(row.queries or 0)
                     }
+                    for row in day_results
+                ]
+
+                return {
+                    "summary": {
+                        "total_tokens": total_tokens,
+                        "total_cost": round(sum(d["cost"] for d in model_agg.values()), 4),
+                        "total_queries": total_queries,
+                        "avg_response_time": round(response_time_sum / response_count, 2) if response_count else 0.0
+                    },
+                    "by_model": by_model,
+                    "by_user": by_user,
+                    "by_day": by_day
+                }
 
             except Exception as e:
                 logger.error(f"Failed to get admin metrics from database: {e}")
                 # Fall through to in-memory fallback
 
-        # In-memory fallback
+        # In-memory fallback (recent entries only)
         filtered_logs = [
-            log for log in self._in_memory_logs
+            log for log in self._snapshot()
             if log["timestamp"] >= cutoff_date
         ]
 
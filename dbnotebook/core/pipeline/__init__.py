@@ -1,7 +1,7 @@
 """Pipeline utilities package.
 
 Provides modular components for the LocalRAGPipeline:
-- NodeCache: Thread-safe node caching with TTL
+- NodeCache: Thread-safe node caching with TTL and versioned deltas
 - Worker utilities: RAPTOR and Transformation worker management
 - Stateless query utilities: Multi-user safe query functions
 
@@ -16,12 +16,12 @@ Usage:
     nodes = cache.get(notebook_id)
 
     # Worker management
-    transformation_worker = init_transformation_worker(db_manager, embed_callback)
+    transformation_worker = init_transformation_worker(db_manager, vector_store)
     raptor_worker = init_raptor_worker(db_manager, vector_store)
     shutdown_workers(transformation_worker, raptor_worker)
 """
 
-from .node_cache import NodeCache
+from .node_cache import NodeCache, NotebookDelta, NotebookNodes
 from .workers import (
     should_skip_background_workers,
     init_transformation_worker,
@@ -32,6 +32,8 @@ from .workers import (
 
 __all__ = [
     "NodeCache",
+    "NotebookDelta",
+    "NotebookNodes",
     "should_skip_background_workers",
     "init_transformation_worker",
     "init_raptor_worker",
@@ -1,32 +1,128 @@
-"""Thread-safe node caching with TTL for multi-user RAG pipelines.
+"""Bounded, single-flight node cache for multi-user RAG pipelines.
 
 Provides efficient caching of document nodes per notebook to avoid
-repeated database queries. Cache entries expire after TTL.
+repeated database queries.
+
+- Per-notebook single-flight loads: concurrent misses on the same notebook
+  trigger one DB load; hits on other notebooks never wait on it.
+- LRU eviction under an entry count and an estimated byte budget.
+- Stale-while-revalidate: entries past TTL but within the stale window are
+  served immediately while one background refresh reloads them.
+- Delta revalidation: a cached notebook is refreshed by diffing row IDs, so
+  only added rows are loaded and removed/hidden rows dropped. Each change
+  gets a new version; downstream indexes (LocalRetriever) pull the deltas
+  between the version they hold and the current one instead of rebuilding.
 
 Usage:
-    cache = NodeCache(vector_store, ttl=300)
-    nodes = cache.get(notebook_id)  # Thread-safe
+    cache = NodeCache(vector_store, ttl=300, max_bytes=2 * 1024**3)
+    nodes = cache.get(notebook_id)  # Thread-safe, returns NotebookNodes
+    cache.refresh(notebook_id)      # Apply DB changes as a delta (after upload/delete/toggle)
     cache.invalidate(notebook_id)   # Invalidate specific notebook
     cache.clear()                   # Clear all
+    cache.get_stats()               # Hits, misses, evictions, load latency
 """
 
+import itertools
 import logging
 import threading
 import time
-from typing import Dict, List, Optional, Tuple
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from typing import Deque, Dict, FrozenSet, List, Optional
+
+from llama_index.core.schema import BaseNode, TextNode
 
-from llama_index.core.schema import TextNode
+from ..vector_store.columnar import ColumnarNode
 
 logger = logging.getLogger(__name__)
 
+# Rough per-object costs used for the byte estimate: a Python float inside a
+# list costs a 24-byte object plus an 8-byte pointer (matrix-backed nodes
+# cost their float32 row instead); node/metadata overhead is a flat
+# allowance per node.
+_BYTES_PER_EMBEDDING_VALUE = 32
+_BYTES_PER_NODE_OVERHEAD = 512
+
+# Single-flight load lock stripes shared by all notebooks
+_LOAD_LOCK_STRIPES = 64
+
+
+def estimate_nodes_bytes(nodes: List[TextNode]) -> int:
+    """Estimate the memory held by a list of nodes (text + embeddings)."""
+    total = 0
+    for node in nodes:
+        total += _BYTES_PER_NODE_OVERHEAD
+        total += len(getattr(node, "text", "") or "")
+        row = node.embedding_row if isinstance(node, ColumnarNode) else None
+        if row is not None:
+            total += row.nbytes
+            continue
+        embedding = getattr(node, "embedding", None)
+        if embedding is not None:
+            total += len(embedding) * _BYTES_PER_EMBEDDING_VALUE
+    return total
+
+
+# Deltas kept per notebook for consumers that are a few versions behind
+_MAX_DELTAS_PER_ENTRY = 32
+
+
+@dataclass(frozen=True)
+class NotebookDelta:
+    """Change between two consecutive versions of a cached notebook.
+
+    Attributes:
+        version: Version produced by applying this delta
+        added: Nodes added (new uploads, re-activated sources)
+        removed_ids: Node IDs removed (deleted or deactivated sources)
+    """
+    version: int
+    added: List[BaseNode]
+    removed_ids: FrozenSet[str]
+
+
+class NotebookNodes(list):
+    """Immutable-by-convention node list for one notebook at one cache version.
+
+    Behaves like a plain list, and additionally carries the notebook ID and
+    version so caches built from it can catch up via deltas_since().
+    """
+
+    def __init__(self, nodes: List[BaseNode], notebook_id: str, version: int, cache: "NodeCache"):
+        super().__init__(nodes)
+        self.notebook_id = notebook_id
+        self.version = version
+        self._cache = cache
+
+    def deltas_since(self, version: int) -> Optional[List[NotebookDelta]]:
+        """Get the deltas leading from version to this list's version.
+
+        Returns:
+            Ordered deltas (empty if already current), or None if the history
+            no longer covers that version and a full rebuild is required
+        """
+        return self._cache.get_deltas(self.notebook_id, version, self.version)
+
+
+@dataclass
+class _CacheEntry:
+    """A cached node list with load time, estimated size and delta history."""
+    nodes: NotebookNodes
+    loaded_at: float
+    nbytes: int
+    base_version: int
+    deltas: Deque[NotebookDelta] = field(
+        default_factory=lambda: deque(maxlen=_MAX_DELTAS_PER_ENTRY)
+    )
+
 
 class NodeCache:
-    """Thread-safe node cache with TTL for multi-user access.
+    """Thread-safe, bounded node cache with single-flight loading.
 
-    Caches document nodes per notebook to avoid repeated DB queries.
-    Cache is invalidated when:
-    - TTL expires (default: 5 minutes)
+    Cache entries are invalidated when:
+    - TTL expires (served stale for up to stale_ttl while refreshing)
     - Explicitly invalidated (e.g., after document upload)
+    - Evicted as least recently used when over max_entries / max_bytes
 
     Attributes:
         vector_store: PGVectorStore instance for loading nodes
@@ -37,56 +133,157 @@ class NodeCache:
         self,
         vector_store,
         ttl: int = 300,
+        stale_ttl: int = 60,
+        max_entries: int = 64,
+        max_bytes: Optional[int] = None,
     ):
         """Initialize the node cache.
 
         Args:
             vector_store: PGVectorStore instance with get_nodes_by_notebook_sql method
             ttl: Cache TTL in seconds (default: 300 = 5 minutes)
+            stale_ttl: Seconds past TTL an entry may still be served while a
+                       background refresh runs (0 disables stale serving)
+            max_entries: Maximum number of notebooks kept in memory
+            max_bytes: Estimated memory budget in bytes (None = unbounded)
         """
         self._vector_store = vector_store
         self._ttl = ttl
-        self._cache: Dict[str, Tuple[List[TextNode], float, int]] = {}
+        self._stale_ttl = stale_ttl
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+
+        # LRU order: oldest first. Guarded by _lock, which is never held
+        # across a database load.
+        self._cache: "OrderedDict[str, _CacheEntry]" = OrderedDict()
+        self._total_bytes = 0
         self._lock = threading.Lock()
 
-    def get(self, notebook_id: str) -> List[TextNode]:
+        # Single-flight: a fixed pool of striped load locks, so the lock set
+        # does not grow with every notebook ever loaded
+        self._load_locks: List[threading.Lock] = [
+            threading.Lock() for _ in range(_LOAD_LOCK_STRIPES)
+        ]
+        self._refreshing: set = set()
+
+        # Invalidation generations - a load started before an invalidate()
+        # must not repopulate the cache with pre-invalidation data
+        self._generations: Dict[str, int] = {}
+        self._epoch = 0
+
+        # Monotonic version counter shared by all notebooks, so a full reload
+        # never reuses a version an index may still hold
+        self._versions = itertools.count(1)
+
+        # Counters
+        self._hits = 0
+        self._stale_hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._loads = 0
+        self._delta_updates = 0
+        self._load_errors = 0
+        self._load_time_total_ms = 0.0
+        self._load_time_max_ms = 0.0
+
+    def get(self, notebook_id: str) -> NotebookNodes:
         """Get nodes for a notebook with caching.
 
-        Thread-safe for multi-user concurrent access.
+        Thread-safe for multi-user concurrent access. Only callers missing
+        the same notebook wait on each other.
 
         Args:
             notebook_id: UUID of the notebook
 
         Returns:
-            List of TextNode objects for the notebook
+            NotebookNodes (a list of TextNode objects) for the notebook
         """
         with self._lock:
-            current_time = time.time()
+            entry = self._lookup(notebook_id)
+            if entry is not None:
+                age = time.time() - entry.loaded_at
+                if age < self._ttl:
+                    self._hits += 1
+                    logger.debug(f"Cache hit for notebook {notebook_id}: {len(entry.nodes)} nodes")
+                    return entry.nodes
+                if age < self._ttl + self._stale_ttl:
+                    self._stale_hits += 1
+                    self._schedule_refresh(notebook_id)
+                    logger.debug(f"Serving stale nodes for notebook {notebook_id} while refreshing")
+                    return entry.nodes
+                logger.debug(f"Cache expired for notebook {notebook_id}")
+            load_lock = self._load_lock(notebook_id)
 
-            # Check cache
-            if notebook_id in self._cache:
-                nodes, timestamp, cached_count = self._cache[notebook_id]
+        with load_lock:
+            # Another caller may have loaded it while we waited
+            with self._lock:
+                entry = self._lookup(notebook_id)
+                if entry is not None and time.time() - entry.loaded_at < self._ttl:
+                    self._hits += 1
+                    return entry.nodes
+                self._misses += 1
 
-                # Check TTL
-                if current_time - timestamp < self._ttl:
-                    logger.debug(f"Cache hit for notebook {notebook_id}: {len(nodes)} nodes")
-                    return nodes
-                else:
-                    logger.debug(f"Cache expired for notebook {notebook_id}")
+            if entry is not None:
+                return self._revalidate(notebook_id)
+            return self._load(notebook_id)
 
-            # Cache miss - load from DB
-            start_time = time.time()
-            nodes = self._vector_store.get_nodes_by_notebook_sql(notebook_id)
-            load_time_ms = int((time.time() - start_time) * 1000)
+    def refresh(self, notebook_id: str) -> None:
+        """Bring a cached notebook up to date with the database as a delta.
 
-            # Store in cache
-            self._cache[notebook_id] = (nodes, current_time, len(nodes))
-            logger.info(
-                f"Cached {len(nodes)} nodes for notebook {notebook_id} "
-                f"(loaded in {load_time_ms}ms)"
-            )
+        Call after nodes are stored, deleted or hidden/shown. Only the row IDs
+        are diffed; added rows are loaded and removed rows dropped, producing
+        a new version. No-op if the notebook is not cached.
 
-            return nodes
+        Args:
+            notebook_id: UUID of the notebook
+        """
+        with self._lock:
+            if notebook_id not in self._cache:
+                return
+            load_lock = self._load_lock(notebook_id)
+
+        with load_lock:
+            try:
+                self._revalidate(notebook_id)
+            except Exception as e:
+                logger.warning(f"Node cache refresh failed for {notebook_id}, invalidating: {e}")
+                self.invalidate(notebook_id)
+
+    def get_deltas(
+        self,
+        notebook_id: str,
+        from_version: int,
+        to_version: int,
+    ) -> Optional[List[NotebookDelta]]:
+        """Get the ordered deltas from from_version up to to_version.
+
+        Args:
+            notebook_id: UUID of the notebook
+            from_version: Version the caller currently holds
+            to_version: Target version
+
+        Returns:
+            List of deltas (empty if the versions are equal), or None if the
+            retained history does not connect the two versions
+        """
+        if from_version == to_version:
+            return []
+
+        with self._lock:
+            entry = self._cache.get(notebook_id)
+            if entry is None:
+                return None
+
+            collecting = from_version == entry.base_version
+            result = []
+            for delta in entry.deltas:
+                if collecting:
+                    result.append(delta)
+                    if delta.version == to_version:
+                        return result
+                elif delta.version == from_version:
+                    collecting = True
+            return None
 
     def invalidate(self, notebook_id: Optional[str] = None) -> None:
         """Invalidate cache for a notebook or all notebooks.
@@ -99,11 +296,13 @@ class NodeCache:
         """
         with self._lock:
             if notebook_id:
-                if notebook_id in self._cache:
-                    del self._cache[notebook_id]
+                self._generations[notebook_id] = self._generations.get(notebook_id, 0) + 1
+                if self._remove(notebook_id):
                     logger.debug(f"Invalidated node cache for notebook {notebook_id}")
             else:
+                self._epoch += 1
                 self._cache.clear()
+                self._total_bytes = 0
                 logger.debug("Invalidated all node caches")
 
     def clear(self) -> None:
@@ -114,31 +313,37 @@ class NodeCache:
         """Get cache statistics.
 
         Returns:
-            Dict with cache stats (notebook_count, total_nodes, oldest_entry)
+            Dict with occupancy (notebook_count, total_nodes, estimated_bytes,
+            oldest_entry_age_sec) and counters (hits, stale_hits, misses,
+            evictions, loads, load_errors, hit_rate, avg/max load latency)
         """
         with self._lock:
-            if not self._cache:
-                return {
-                    "notebook_count": 0,
-                    "total_nodes": 0,
-                    "oldest_entry_age_sec": 0,
-                }
-
             current_time = time.time()
-            oldest_age = 0
-            total_nodes = 0
-
-            for notebook_id, (nodes, timestamp, count) in self._cache.items():
-                age = current_time - timestamp
-                if age > oldest_age:
-                    oldest_age = age
-                total_nodes += len(nodes)
+            oldest_age = max(
+                (current_time - e.loaded_at for e in self._cache.values()),
+                default=0,
+            )
+            lookups = self._hits + self._stale_hits + self._misses
 
             return {
                 "notebook_count": len(self._cache),
-                "total_nodes": total_nodes,
+                "total_nodes": sum(len(e.nodes) for e in self._cache.values()),
+                "estimated_bytes": self._total_bytes,
+                "max_bytes": self._max_bytes,
+                "max_entries": self._max_entries,
                 "oldest_entry_age_sec": int(oldest_age),
                 "ttl_sec": self._ttl,
+                "stale_ttl_sec": self._stale_ttl,
+                "hits": self._hits,
+                "stale_hits": self._stale_hits,
+                "misses": self._misses,
+                "hit_rate": (self._hits + self._stale_hits) / lookups if lookups else 0.0,
+                "evictions": self._evictions,
+                "loads": self._loads,
+                "delta_updates": self._delta_updates,
+                "load_errors": self._load_errors,
+                "avg_load_ms": self._load_time_total_ms / self._loads if self._loads else 0.0,
+                "max_load_ms": self._load_time_max_ms,
             }
 
     @property
@@ -150,3 +355,177 @@ class NodeCache:
     def ttl(self, value: int) -> None:
         """Set the cache TTL in seconds."""
         self._ttl = value
+
+    # =========================================================================
+    # Internals
+    # =========================================================================
+
+    def _load_lock(self, notebook_id: str) -> threading.Lock:
+        """Load lock stripe for a notebook (unrelated notebooks rarely share one)."""
+        return self._load_locks[hash(notebook_id) % _LOAD_LOCK_STRIPES]
+
+    def _lookup(self, notebook_id: str) -> Optional[_CacheEntry]:
+        """Return the entry and mark it most recently used. Caller holds _lock."""
+        entry = self._cache.get(notebook_id)
+        if entry is not None:
+            self._cache.move_to_end(notebook_id)
+        return entry
+
+    def _remove(self, notebook_id: str) -> bool:
+        """Drop an entry. Caller holds _lock."""
+        entry = self._cache.pop(notebook_id, None)
+        if entry is None:
+            return False
+        self._total_bytes -= entry.nbytes
+        return True
+
+    def _load(self, notebook_id: str) -> NotebookNodes:
+        """Load nodes from the vector store and store them. Caller holds the load lock."""
+        with self._lock:
+            generation = (self._epoch, self._generations.get(notebook_id, 0))
+
+        start_time = time.time()
+        try:
+            nodes = self._vector_store.get_nodes_by_notebook_sql(notebook_id)
+        except Exception:
+            with self._lock:
+                self._load_errors += 1
+            raise
+        load_time_ms = (time.time() - start_time) * 1000
+        nbytes = estimate_nodes_bytes(nodes)
+
+        with self._lock:
+            self._loads += 1
+            self._load_time_total_ms += load_time_ms
+            self._load_time_max_ms = max(self._load_time_max_ms, load_time_ms)
+
+            version = next(self._versions)
+            nodes = NotebookNodes(nodes, notebook_id, version, self)
+
+            if generation != (self._epoch, self._generations.get(notebook_id, 0)):
+                # Invalidated while loading - return the data but don't cache it
+                logger.debug(f"Skipping cache store for invalidated notebook {notebook_id}")
+                return nodes
+
+            self._remove(notebook_id)
+            self._cache[notebook_id] = _CacheEntry(nodes, time.time(), nbytes, version)
+            self._total_bytes += nbytes
+            self._evict(keep=notebook_id)
+
+        logger.info(
+            f"Cached {len(nodes)} nodes for notebook {notebook_id} "
+            f"(loaded in {int(load_time_ms)}ms, ~{nbytes // (1024 * 1024)}MB)"
+        )
+        return nodes
+
+    def _revalidate(self, notebook_id: str) -> NotebookNodes:
+        """Diff cached row IDs against the database and apply the change as a delta.
+
+        Falls back to a full load if the entry is gone or the vector store
+        cannot list node IDs. Caller holds the load lock.
+        """
+        with self._lock:
+            entry = self._cache.get(notebook_id)
+            generation = (self._epoch, self._generations.get(notebook_id, 0))
+
+        if entry is None or not hasattr(self._vector_store, "get_notebook_node_ids"):
+            return self._load(notebook_id)
+
+        start_time = time.time()
+        current_ids = self._vector_store.get_notebook_node_ids(notebook_id)
+        if current_ids is None:
+            return self._load(notebook_id)
+
+        current = entry.nodes
+        cached_ids = {node.node_id for node in current}
+        wanted_ids = set(current_ids)
+        added_ids = wanted_ids - cached_ids
+        removed_ids = frozenset(cached_ids - wanted_ids)
+
+        if not added_ids and not removed_ids:
+            with self._lock:
+                if self._cache.get(notebook_id) is entry:
+                    entry.loaded_at = time.time()
+            return current
+
+        added: List[BaseNode] = []
+        if added_ids:
+            columns = self._vector_store.get_notebook_columns(notebook_id, node_ids=list(added_ids))
+            if columns is None:
+                return self._load(notebook_id)
+            added = columns.to_nodes()
+
+        kept = [node for node in current if node.node_id not in removed_ids] if removed_ids else list(current)
+        nbytes = entry.nbytes + estimate_nodes_bytes(added) - estimate_nodes_bytes(
+            [node for node in current if node.node_id in removed_ids]
+        )
+        load_time_ms = (time.time() - start_time) * 1000
+
+        with self._lock:
+            version = next(self._versions)
+            nodes = NotebookNodes(kept + added, notebook_id, version, self)
+
+            if (
+                generation != (self._epoch, self._generations.get(notebook_id, 0))
+                or self._cache.get(notebook_id) is not entry
+            ):
+                logger.debug(f"Skipping delta store for invalidated notebook {notebook_id}")
+                return nodes
+
+            self._delta_updates += 1
+            delta = NotebookDelta(version, added, removed_ids)
+            if len(entry.deltas) == entry.deltas.maxlen:
+                # Oldest delta falls off; its version becomes the new base
+                entry.base_version = entry.deltas[0].version
+            entry.deltas.append(delta)
+            entry.nodes = nodes
+            entry.loaded_at = time.time()
+            self._total_bytes += nbytes - entry.nbytes
+            entry.nbytes = nbytes
+            self._evict(keep=notebook_id)
+
+        logger.info(
+            f"Applied node delta for notebook {notebook_id}: +{len(added)} -{len(removed_ids)} "
+            f"(version {version}, {int(load_time_ms)}ms)"
+        )
+        return nodes
+
+    def _evict(self, keep: str) -> None:
+        """Evict least recently used entries until within budget. Caller holds _lock."""
+        while len(self._cache) > 1 and (
+            len(self._cache) > self._max_entries
+            or (self._max_bytes is not None and self._total_bytes > self._max_bytes)
+        ):
+            victim = next(iter(self._cache))
+            if victim == keep:
+                break
+            self._remove(victim)
+            self._evictions += 1
+            logger.debug(f"Evicted node cache for notebook {victim}")
+
+    def _schedule_refresh(self, notebook_id: str) -> None:
+        """Start one background refresh for a stale entry. Caller holds _lock."""
+        if notebook_id in self._refreshing:
+            return
+        self._refreshing.add(notebook_id)
+        load_lock = self._load_lock(notebook_id)
+
+        def refresh() -> None:
+            try:
+                with load_lock:
+                    with self._lock:
+                        entry = self._cache.get(notebook_id)
+                        if entry is not None and time.time() - entry.loaded_at < self._ttl:
+                            return  # Someone else already refreshed it
+                    self._revalidate(notebook_id)
+            except Exception as e:
+                logger.warning(f"Background node cache refresh failed for {notebook_id}: {e}")
+            finally:
+                with self._lock:
+                    self._refreshing.discard(notebook_id)
+
+        threading.Thread(
+            target=refresh,
+            name=f"node-cache-refresh-{notebook_id[:8]}",
+            daemon=True,
+        ).start()
@@ -8,7 +8,7 @@ Usage:
     # Initialize workers
     transformation_worker = init_transformation_worker(
         db_manager=db_manager,
-        embed_callback=embed_fn,
+        vector_store=vector_store,
     )
 
     raptor_worker = init_raptor_worker(
@@ -22,7 +22,7 @@ Usage:
 
 import logging
 import os
-from typing import Callable, Optional
+from typing import Optional
 
 logger = logging.getLogger(__name__)
 
@@ -34,6 +34,9 @@ def should_skip_background_workers() -> bool:
     - DISABLE_BACKGROUND_WORKERS=true (explicit disable)
     - Multi-worker mode (Gunicorn) - asyncio doesn't fork well
 
+    Jobs are still enqueued in Postgres; run `python -m dbnotebook.worker`
+    (any number of processes) to drain them.
+
     Returns:
         True if workers should be skipped
     """
@@ -43,18 +46,20 @@ def should_skip_background_workers() -> bool:
 
 def init_transformation_worker(
     db_manager,
-    embed_callback: Callable[[str, str, str, str], None],
+    vector_store=None,
     poll_interval: float = 10.0,
     max_concurrent: int = 2,
+    job_queue=None,
 ):
     """Initialize TransformationWorker for AI transformations.
 
     Args:
         db_manager: DatabaseManager instance
-        embed_callback: Callback to embed transformation content
-            Signature: (text, node_type, source_id, notebook_id) -> None
-        poll_interval: Seconds between polling for jobs (default: 10)
+        vector_store: PGVectorStore for transformation embeddings (optional;
+            content is embedded in batches across concurrent jobs)
+        poll_interval: Longest idle wait between lease attempts (default: 10)
         max_concurrent: Maximum concurrent transformations (default: 2)
+        job_queue: Shared JobQueue (created from db_manager if omitted)
 
     Returns:
         TransformationWorker instance, or None if skipped
@@ -72,9 +77,10 @@ def init_transformation_worker(
 
         worker = TransformationWorker(
             db_manager=db_manager,
-            embed_callback=embed_callback,
+            vector_store=vector_store,
             poll_interval=poll_interval,
             max_concurrent=max_concurrent,
+            job_queue=job_queue,
         )
         worker.start()
         logger.info("TransformationWorker started for AI transformations")
@@ -90,15 +96,17 @@ def init_raptor_worker(
     vector_store,
     poll_interval: float = 15.0,
     max_concurrent: int = 1,
+    job_queue=None,
 ):
     """Initialize RAPTORWorker for hierarchical tree building.
 
     Args:
         db_manager: DatabaseManager instance
         vector_store: PGVectorStore instance
-        poll_interval: Seconds between polling for jobs (default: 15)
+        poll_interval: Seconds between sweeps for pending sources (default: 15)
         max_concurrent: Maximum concurrent builds (default: 1)
             Note: Tree building is resource-intensive
+        job_queue: Shared JobQueue (created from db_manager if omitted)
 
     Returns:
         RAPTORWorker instance, or None if skipped
@@ -119,6 +127,7 @@ def init_raptor_worker(
             vector_store=vector_store,
             poll_interval=poll_interval,
             max_concurrent=max_concurrent,
+            job_queue=job_queue,
         )
         worker.start()
         logger.info("RAPTORWorker started for hierarchical tree building")
@@ -158,22 +167,26 @@ def shutdown_workers(
     logger.info("Worker shutdown complete")
 
 
-def create_transformation_callback(transformation_worker):
+def create_transformation_callback(transformation_worker=None, job_queue=None):
     """Create a callback function for queuing transformation jobs.
 
     This callback is passed to LocalDataIngestion to queue transformation
-    jobs when documents are ingested.
+    jobs when documents are ingested. Jobs go to the durable queue, so the
+    callback works even when no worker runs in this process.
 
     Args:
-        transformation_worker: TransformationWorker instance
+        transformation_worker: TransformationWorker instance (its queue is used)
+        job_queue: JobQueue to enqueue into directly
 
     Returns:
-        Callback function, or None if worker not available
+        Callback function, or None if no queue is available
     """
-    if not transformation_worker:
+    if job_queue is None and transformation_worker is not None:
+        job_queue = transformation_worker.job_queue
+    if job_queue is None:
         return None
 
-    from dbnotebook.core.transformations import TransformationJob
+    from dbnotebook.core.transformations import TransformationJob, enqueue_transformation_job
 
     def callback(
         source_id: str,
@@ -188,7 +201,7 @@ def create_transformation_callback(transformation_worker):
             notebook_id=notebook_id,
             file_name=file_name,
         )
-        transformation_worker.queue_job(job)
+        enqueue_transformation_job(job_queue, job)
         logger.debug(f"Queued transformation job for source: {source_id}")
 
     return callback
@@ -1,14 +1,34 @@
 """LLM, embedding, image generation, vision, and web content provider implementations."""
 
-from .ollama import OllamaLLMProvider
-from .openai import OpenAILLMProvider
-from .anthropic import AnthropicLLMProvider
-from .groq import GroqLLMProvider
-from .huggingface import HuggingFaceEmbeddingProvider
-from .gemini_image import GeminiImageProvider
-from .gemini_vision import GeminiVisionProvider
-from .openai_vision import OpenAIVisionProvider
-from .tavily import TavilyProvider
+import importlib
+
+# Imported lazily so one provider module can be used without the others' SDKs
+_EXPORTS = {
+    "OllamaLLMProvider": ".ollama",
+    "OpenAILLMProvider": ".openai",
+    "AnthropicLLMProvider": ".anthropic",
+    "GroqLLMProvider": ".groq",
+    "HuggingFaceEmbeddingProvider": ".huggingface",
+    "GeminiImageProvider": ".gemini_image",
+    "GeminiVisionProvider": ".gemini_vision",
+    "OpenAIVisionProvider": ".openai_vision",
+    "TavilyProvider": ".tavily",
+    "CachedLLM": ".llm_cache",
+    "LLMResponseCache": ".llm_cache",
+    "cached_llm": ".llm_cache",
+    "configure_llm_cache": ".llm_cache",
+    "get_llm_cache": ".llm_cache",
+}
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        module = importlib.import_module(_EXPORTS[name], __name__)
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = [
     "OllamaLLMProvider",
@@ -20,4 +40,9 @@ __all__ = [
     "GeminiVisionProvider",
     "OpenAIVisionProvider",
     "TavilyProvider",
+    "CachedLLM",
+    "LLMResponseCache",
+    "cached_llm",
+    "configure_llm_cache",
+    "get_llm_cache",
 ]
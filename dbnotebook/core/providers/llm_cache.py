@@ -0,0 +1,390 @@
+"""
+Content-addressed cache for deterministic LLM completions.
+
+Background generations (contextual enrichment, transformations, RAPTOR
+summaries) send the same prompts again when a document is re-uploaded or a
+failed job is retried. Completions are keyed by sha256 of
+(provider, model, generation params, prompt) and kept in two tiers:
+
+- In-process LRU of response texts (bounded entry count)
+- Postgres table llm_response_cache, shared across web and worker processes
+
+Entries expire after ttl_hours (0 = never). Each feature opts in separately
+under llm.cache.features in config/dbnotebook.yaml; cached_llm() returns the
+LLM unchanged for features that are off. Streaming and chat calls are never
+cached.
+"""
+
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from llama_index.core.base.llms.types import CompletionResponse
+from sqlalchemy import text
+
+from ..config import get_config_value
+
+logger = logging.getLogger(__name__)
+
+CACHE_TABLE = "llm_response_cache"
+
+# Features that may opt in (llm.cache.features.<name>)
+FEATURE_CONTEXTUAL_RETRIEVAL = "contextual_retrieval"
+FEATURE_TRANSFORMATIONS = "transformations"
+FEATURE_RAPTOR = "raptor"
+
+# LLM attributes that change the completion for a given prompt
+_PARAM_ATTRS = ("temperature", "max_tokens", "num_output", "top_p", "top_k", "context_window")
+
+
+def _cache_config(key: str, default: Any) -> Any:
+    return get_config_value("llm", "cache", key, default=default)
+
+
+def llm_identity(llm: Any) -> Tuple[str, str, Dict[str, Any]]:
+    """(provider, model, generation params) of a LlamaIndex LLM."""
+    class_name = getattr(llm, "class_name", None)
+    provider = class_name() if callable(class_name) else type(llm).__name__
+    model = getattr(llm, "model", None) or getattr(llm, "model_name", None)
+    if not model:
+        metadata = getattr(llm, "metadata", None)
+        model = getattr(metadata, "model_name", None) or "unknown"
+    params = {}
+    for attr in _PARAM_ATTRS:
+        value = getattr(llm, attr, None)
+        if isinstance(value, (int, float, str, bool)):
+            params[attr] = value
+    return provider, str(model), params
+
+
+def cache_key(provider: str, model: str, params: Dict[str, Any], prompt: str) -> str:
+    """sha256 hex digest identifying one completion."""
+    payload = json.dumps(
+        {"provider": provider, "model": model, "params": params},
+        sort_keys=True,
+        default=str,
+    )
+    digest = hashlib.sha256(payload.encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(prompt.encode("utf-8"))
+    return digest.hexdigest()
+
+
+class LLMResponseCache:
+    """
+    Two-tier (LRU + Postgres) store of completion texts keyed by cache_key().
+
+    The Postgres tier is optional: without a session factory the cache is
+    process-local only. Database errors are logged and treated as misses so
+    generation never fails because of the cache.
+    """
+
+    def __init__(
+        self,
+        session_factory=None,
+        max_entries: int = 5000,
+        ttl_hours: float = 720,
+        persistent: bool = True,
+    ) -> None:
+        """
+        Args:
+            session_factory: SQLAlchemy session factory (None = LRU only)
+            max_entries: LRU capacity in responses
+            ttl_hours: Entry lifetime (0 = never expires)
+            persistent: Read/write the Postgres tier when a session factory is set
+        """
+        self._session_factory = session_factory
+        self._max_entries = max_entries
+        self._ttl_seconds = float(ttl_hours) * 3600
+        self._persistent = persistent
+        self._lru: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, int]] = {}
+        self._db_errors = 0
+
+    def configure(self, session_factory, persistent: Optional[bool] = None) -> None:
+        """Attach (or replace) the Postgres tier and make sure its table exists."""
+        self._session_factory = session_factory
+        if persistent is not None:
+            self._persistent = persistent
+        if self._db_enabled:
+            self.ensure_table()
+
+    @property
+    def _db_enabled(self) -> bool:
+        return self._persistent and self._session_factory is not None
+
+    def ensure_table(self) -> None:
+        """Create the cache table if the migration has not been applied."""
+        session = self._session_factory()
+        try:
+            session.execute(text(f"""
+                CREATE TABLE IF NOT EXISTS {CACHE_TABLE} (
+                    cache_key CHAR(64) PRIMARY KEY,
+                    provider TEXT NOT NULL,
+                    model_name TEXT NOT NULL,
+                    feature TEXT,
+                    response TEXT NOT NULL,
+                    created_at TIMESTAMP NOT NULL DEFAULT NOW(),
+                    expires_at TIMESTAMP
+                )
+            """))
+            session.commit()
+        except Exception as e:
+            session.rollback()
+            logger.warning(f"Could not ensure LLM cache table: {e}")
+        finally:
+            session.close()
+
+    # =========================================================================
+    # Lookup / store
+    # =========================================================================
+
+    def get(self, key: str, feature: str) -> Optional[str]:
+        """Return a cached response, checking the LRU then the database."""
+        now = time.time()
+        with self._lock:
+            stats = self._feature_stats(feature)
+            entry = self._lru.get(key)
+            if entry is not None:
+                response, expires = entry
+                if not expires or expires > now:
+                    self._lru.move_to_end(key)
+                    stats["hits"] += 1
+                    return response
+                del self._lru[key]
+
+        response = self._db_get(key) if self._db_enabled else None
+        with self._lock:
+            if response is not None:
+                stats["db_hits"] += 1
+            else:
+                stats["misses"] += 1
+        if response is not None:
+            self._remember(key, response)
+        return response
+
+    def put(self, key: str, response: str, provider: str, model: str, feature: str) -> None:
+        """Store a fresh response in both tiers."""
+        self._remember(key, response)
+        if self._db_enabled:
+            self._db_put(key, response, provider, model, feature)
+        with self._lock:
+            self._feature_stats(feature)["writes"] += 1
+
+    def _feature_stats(self, feature: str) -> Dict[str, int]:
+        stats = self._stats.get(feature)
+        if stats is None:
+            stats = self._stats[feature] = {"hits": 0, "db_hits": 0, "misses": 0, "writes": 0}
+        return stats
+
+    def _remember(self, key: str, response: str) -> None:
+        expires = time.time() + self._ttl_seconds if self._ttl_seconds else 0.0
+        with self._lock:
+            self._lru[key] = (response, expires)
+            self._lru.move_to_end(key)
+            while len(self._lru) > self._max_entries:
+                self._lru.popitem(last=False)
+
+    def _db_get(self, key: str) -> Optional[str]:
+        session = self._session_factory()
+        try:
+            row = session.execute(
+                text(f"""
+                    SELECT response FROM {CACHE_TABLE}
+                    WHERE cache_key = :cache_key
+                    AND (expires_at IS NULL OR expires_at > NOW())
+                """),
+                {"cache_key": key}
+            ).fetchone()
+            return row[0] if row else None
+        except Exception as e:
+            self._db_errors += 1
+            logger.warning(f"LLM cache lookup failed: {e}")
+            return None
+        finally:
+            session.close()
+
+    def _db_put(self, key: str, response: str, provider: str, model: str, feature: str) -> None:
+        session = self._session_factory()
+        try:
+            session.execute(
+                text(f"""
+                    INSERT INTO {CACHE_TABLE}
+                        (cache_key, provider, model_name, feature, response, expires_at)
+                    VALUES (
+                        :cache_key, :provider, :model_name, :feature, :response,
+                        CASE WHEN :ttl_seconds > 0
+                             THEN NOW() + make_interval(secs => :ttl_seconds) END
+                    )
+                    ON CONFLICT (cache_key) DO UPDATE
+                    SET response = EXCLUDED.response,
+                        created_at = NOW(),
+                        expires_at = EXCLUDED.expires_at
+                """),
+                {
+                    "cache_key": key,
+                    "provider": provider,
+                    "model_name": model,
+                    "feature": feature,
+                    "response": response,
+                    "ttl_seconds": self._ttl_seconds,
+                }
+            )
+            session.commit()
+        except Exception as e:
+            session.rollback()
+            self._db_errors += 1
+            logger.warning(f"LLM cache write failed: {e}")
+        finally:
+            session.close()
+
+    def purge_expired(self) -> int:
+        """Delete expired rows from the Postgres tier. Returns rows removed."""
+        if not self._db_enabled:
+            return 0
+        session = self._session_factory()
+        try:
+            result = session.execute(text(f"""
+                DELETE FROM {CACHE_TABLE}
+                WHERE expires_at IS NOT NULL AND expires_at <= NOW()
+            """))
+            session.commit()
+            return result.rowcount
+        except Exception as e:
+            session.rollback()
+            logger.warning(f"LLM cache purge failed: {e}")
+            return 0
+        finally:
+            session.close()
+
+    def clear(self) -> None:
+        """Drop the in-process tier (the Postgres tier is content-addressed and kept)."""
+        with self._lock:
+            self._lru.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters, overall and per feature."""
+        with self._lock:
+            by_feature = {}
+            totals = {"hits": 0, "db_hits": 0, "misses": 0, "writes": 0}
+            for feature, stats in self._stats.items():
+                lookups = stats["hits"] + stats["db_hits"] + stats["misses"]
+                by_feature[feature] = {
+                    **stats,
+                    "hit_rate": (stats["hits"] + stats["db_hits"]) / lookups if lookups else 0.0,
+                }
+                for name in totals:
+                    totals[name] += stats[name]
+            lookups = totals["hits"] + totals["db_hits"] + totals["misses"]
+            return {
+                "entries": len(self._lru),
+                "max_entries": self._max_entries,
+                "ttl_hours": self._ttl_seconds / 3600,
+                "persistent": self._db_enabled,
+                **totals,
+                "hit_rate": (totals["hits"] + totals["db_hits"]) / lookups if lookups else 0.0,
+                "db_errors": self._db_errors,
+                "by_feature": by_feature,
+            }
+
+
+class CachedLLM:
+    """
+    Wraps a LlamaIndex LLM so complete()/acomplete() consult an LLMResponseCache.
+
+    Calls with extra keyword arguments, streaming and chat pass straight
+    through; every other attribute is delegated to the wrapped LLM.
+    """
+
+    def __init__(self, llm: Any, cache: LLMResponseCache, feature: str) -> None:
+        self._llm = llm
+        self._cache = cache
+        self._feature = feature
+
+    @property
+    def wrapped_llm(self) -> Any:
+        """The underlying LlamaIndex LLM."""
+        return self._llm
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._llm, name)
+
+    def _key(self, prompt: str) -> Tuple[str, str, str]:
+        provider, model, params = llm_identity(self._llm)
+        return cache_key(provider, model, params, prompt), provider, model
+
+    def complete(self, prompt: str, formatted: bool = False, **kwargs: Any) -> CompletionResponse:
+        """Completion, served from the cache when the same prompt was seen."""
+        if kwargs:
+            return self._llm.complete(prompt, formatted=formatted, **kwargs)
+        key, provider, model = self._key(prompt)
+        cached = self._cache.get(key, self._feature)
+        if cached is not None:
+            return CompletionResponse(text=cached)
+        response = self._llm.complete(prompt, formatted=formatted)
+        if response.text:
+            self._cache.put(key, response.text, provider, model, self._feature)
+        return response
+
+    async def acomplete(self, prompt: str, formatted: bool = False, **kwargs: Any) -> CompletionResponse:
+        """Async completion, served from the cache when the same prompt was seen."""
+        if kwargs:
+            return await self._llm.acomplete(prompt, formatted=formatted, **kwargs)
+        key, provider, model = self._key(prompt)
+        cached = self._cache.get(key, self._feature)
+        if cached is not None:
+            return CompletionResponse(text=cached)
+        response = await self._llm.acomplete(prompt, formatted=formatted)
+        if response.text:
+            self._cache.put(key, response.text, provider, model, self._feature)
+        return response
+
+
+# Process-wide cache shared by every feature
+_shared_cache: Optional[LLMResponseCache] = None
+_shared_lock = threading.Lock()
+
+
+def get_llm_cache() -> LLMResponseCache:
+    """Get the process-wide LLM response cache (LRU-only until configured)."""
+    global _shared_cache
+    with _shared_lock:
+        if _shared_cache is None:
+            _shared_cache = LLMResponseCache(
+                max_entries=_cache_config("max_entries", 5000),
+                ttl_hours=_cache_config("ttl_hours", 720),
+                persistent=_cache_config("persistent", True),
+            )
+        return _shared_cache
+
+
+def configure_llm_cache(session_factory) -> LLMResponseCache:
+    """Attach the Postgres tier to the process-wide LLM response cache."""
+    cache = get_llm_cache()
+    cache.configure(session_factory)
+    return cache
+
+
+def cached_llm(llm: Any, feature: str) -> Any:
+    """
+    Wrap llm with the shared response cache if the feature has opted in.
+
+    Args:
+        llm: LlamaIndex LLM (or None)
+        feature: Feature name (llm.cache.features.<feature>)
+
+    Returns:
+        CachedLLM, or llm unchanged when caching is off for the feature
+    """
+    if llm is None or isinstance(llm, CachedLLM):
+        return llm
+    if not _cache_config("enabled", True):
+        return llm
+    if not get_config_value("llm", "cache", "features", feature, default=False):
+        return llm
+    return CachedLLM(llm, get_llm_cache(), feature)
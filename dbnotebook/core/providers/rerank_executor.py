@@ -0,0 +1,239 @@
+"""Micro-batching executor for cross-encoder reranking.
+
+Concurrent rerank requests are queued and combined into one forward pass:
+the dispatcher takes the first waiting request, then keeps adding requests
+until the batch holds ``max_batch_pairs`` (query, passage) pairs or
+``max_wait_ms`` has passed since the first one arrived. Each batch runs on a
+free replica from a small pool (one model instance or ONNX session per
+replica), so a replica is never used by two threads at once and other
+replicas keep serving meanwhile. Callers get a ``Future`` per request.
+
+## Usage
+
+    executor = RerankExecutor([cross_encoder], max_batch_pairs=64, max_wait_ms=5)
+    scores = executor.score("query", ["passage 1", "passage 2"])
+    executor.close()
+"""
+
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+@dataclass
+class _RerankRequest:
+    """One caller's (query, passage) pairs and the future for their scores."""
+    pairs: List[Tuple[str, str]]
+    future: Future = field(default_factory=Future)
+    enqueued_at: float = field(default_factory=time.monotonic)
+
+
+class RerankExecutor:
+    """Batch (query, passage) scoring from concurrent callers onto a replica pool.
+
+    Replicas are objects with a ``predict(pairs, batch_size=...)`` method
+    returning one score per pair (e.g. ``sentence_transformers.CrossEncoder``).
+    """
+
+    def __init__(
+        self,
+        replicas: Sequence[Any],
+        max_batch_pairs: int = 64,
+        max_wait_ms: float = 5.0,
+        name: str = "reranker"
+    ):
+        """Initialize the executor and start its dispatcher thread.
+
+        Args:
+            replicas: Model instances; each is used by one batch at a time
+            max_batch_pairs: Pairs per forward pass (a single larger request
+                still runs, alone)
+            max_wait_ms: How long the first request of a batch waits for others
+            name: Name used for threads and logs
+        """
+        if not replicas:
+            raise ValueError("RerankExecutor needs at least one replica")
+
+        self._max_batch_pairs = max(1, int(max_batch_pairs))
+        self._max_wait = max(0.0, float(max_wait_ms)) / 1000.0
+        self._name = name
+
+        self._queue: "queue.Queue" = queue.Queue()
+        self._idle: "queue.Queue" = queue.Queue()
+        for replica in replicas:
+            self._idle.put(replica)
+        self._replica_count = len(replicas)
+        self._workers = ThreadPoolExecutor(
+            max_workers=self._replica_count,
+            thread_name_prefix=f"{name}-replica"
+        )
+
+        self._closed = False
+        self._submit_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            "requests": 0,
+            "batches": 0,
+            "pairs": 0,
+            "errors": 0,
+            "max_batch_pairs_seen": 0,
+            "queue_wait_ms_total": 0.0,
+            "inference_ms_total": 0.0,
+        }
+
+        self._dispatcher = threading.Thread(
+            target=self._dispatch_loop,
+            name=f"{name}-dispatcher",
+            daemon=True
+        )
+        self._dispatcher.start()
+        logger.info(
+            f"Rerank executor '{name}' started: {self._replica_count} replica(s), "
+            f"max_batch_pairs={self._max_batch_pairs}, max_wait_ms={max_wait_ms}"
+        )
+
+    # ========== Public API ==========
+
+    def submit(self, query: str, passages: Sequence[str]) -> Future:
+        """Queue passages for scoring against a query.
+
+        Returns:
+            Future resolving to a list of float scores (one per passage)
+        """
+        request = _RerankRequest(pairs=[(query, p) for p in passages])
+        with self._submit_lock:
+            if self._closed:
+                raise RuntimeError(f"Rerank executor '{self._name}' is closed")
+            if not request.pairs:
+                request.future.set_result([])
+                return request.future
+            self._queue.put(request)
+        return request.future
+
+    def score(
+        self,
+        query: str,
+        passages: Sequence[str],
+        timeout: Optional[float] = None
+    ) -> List[float]:
+        """Score passages against a query, blocking until the batch has run."""
+        return self.submit(query, passages).result(timeout=timeout)
+
+    def close(self) -> None:
+        """Stop accepting requests; queued requests are still scored."""
+        with self._submit_lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(_STOP)
+        self._dispatcher.join()
+        self._workers.shutdown(wait=True)
+        logger.info(f"Rerank executor '{self._name}' closed")
+
+    @property
+    def closed(self) -> bool:
+        """Whether close() has been called."""
+        return self._closed
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get batching statistics."""
+        with self._stats_lock:
+            stats = dict(self._stats)
+        batches = stats["batches"] or 1
+        requests = stats["requests"] or 1
+        stats["replicas"] = self._replica_count
+        stats["queued"] = self._queue.qsize()
+        stats["avg_batch_pairs"] = round(stats["pairs"] / batches, 1)
+        stats["avg_batch_requests"] = round(stats["requests"] / batches, 2)
+        stats["avg_queue_wait_ms"] = round(stats.pop("queue_wait_ms_total") / requests, 2)
+        stats["avg_inference_ms"] = round(stats.pop("inference_ms_total") / batches, 2)
+        return stats
+
+    # ========== Dispatcher ==========
+
+    def _dispatch_loop(self) -> None:
+        """Form batches from the queue and hand them to free replicas.
+
+        close() enqueues a stop marker after the last accepted request, so
+        everything submitted before it is still scored.
+        """
+        carry: Optional[_RerankRequest] = None
+        stopping = False
+
+        while True:
+            first = carry if carry is not None else self._queue.get()
+            carry = None
+            if first is _STOP:
+                break
+
+            # Wait for a free replica first: while all replicas are busy,
+            # requests pile up and the next batch absorbs them
+            replica = self._idle.get()
+
+            batch = [first]
+            pairs = len(first.pairs)
+            deadline = first.enqueued_at + self._max_wait
+            while pairs < self._max_batch_pairs:
+                remaining = deadline - time.monotonic()
+                try:
+                    item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                if pairs + len(item.pairs) > self._max_batch_pairs:
+                    carry = item
+                    break
+                batch.append(item)
+                pairs += len(item.pairs)
+
+            self._workers.submit(self._run_batch, replica, batch, pairs)
+
+            if stopping:
+                break
+
+    def _run_batch(self, replica: Any, batch: List[_RerankRequest], pair_count: int) -> None:
+        """Score one batch on a replica and resolve each request's future."""
+        started = time.monotonic()
+        try:
+            all_pairs = [pair for request in batch for pair in request.pairs]
+            scores = replica.predict(all_pairs, batch_size=max(len(all_pairs), 1))
+            scores = [float(s) for s in scores]
+            if len(scores) != len(all_pairs):
+                raise RuntimeError(
+                    f"Reranker returned {len(scores)} scores for {len(all_pairs)} pairs"
+                )
+            offset = 0
+            for request in batch:
+                end = offset + len(request.pairs)
+                request.future.set_result(scores[offset:end])
+                offset = end
+        except Exception as e:
+            logger.warning(f"Rerank batch of {pair_count} pairs failed: {e}")
+            for request in batch:
+                if not request.future.done():
+                    request.future.set_exception(e)
+            with self._stats_lock:
+                self._stats["errors"] += 1
+        finally:
+            self._idle.put(replica)
+
+        finished = time.monotonic()
+        with self._stats_lock:
+            self._stats["requests"] += len(batch)
+            self._stats["batches"] += 1
+            self._stats["pairs"] += pair_count
+            self._stats["max_batch_pairs_seen"] = max(self._stats["max_batch_pairs_seen"], pair_count)
+            self._stats["queue_wait_ms_total"] += sum(
+                (started - request.enqueued_at) * 1000 for request in batch
+            )
+            self._stats["inference_ms_total"] += (finished - started) * 1000
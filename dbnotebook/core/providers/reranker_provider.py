@@ -6,9 +6,12 @@ and Groq LLM-based reranking for fast cloud-based inference.
 ## Backend Types
 
 ### Local Cross-Encoder (Default)
-- Thread-safe wrapper for SentenceTransformerRerank (ONNX)
+- SentenceTransformerRerank (ONNX) models
 - Models: xsmall (~2s), base (~10s), large (~30s) on CPU
 - Supports HuggingFace IDs and local paths
+- Concurrent requests are micro-batched into shared forward passes on a
+  pool of model replicas (retrieval.reranker.batching); with batching
+  disabled, calls are serialized by a lock
 
 ### Groq LLM Reranker
 - Ultra-fast cloud-based reranking (~300ms)
@@ -28,6 +31,10 @@ and Groq LLM-based reranking for fast cloud-based inference.
     # Process nodes
     reranked_nodes = reranker.postprocess_nodes(nodes, query_bundle)
 
+    # Per-request model without touching the process-wide setting
+    # (local models stay resident in the registry, LRU under a memory budget)
+    reranker = get_reranker(model="large", top_n=10)
+
 ## API Parameter Control
 
 API endpoints accept reranker_model parameter:
@@ -43,13 +50,16 @@ from pathlib import Path
 from typing import Optional, List, Union
 
 from llama_index.core.postprocessor import SentenceTransformerRerank
-from llama_index.core.schema import NodeWithScore, QueryBundle
+from llama_index.core.schema import MetadataMode, NodeWithScore, QueryBundle
+
+from dbnotebook.core.config import get_config_value
+from dbnotebook.core.providers.rerank_executor import RerankExecutor
+from dbnotebook.core.providers.reranker_registry import get_reranker_registry
 
 logger = logging.getLogger(__name__)
 
-# Thread-safe singleton with reentrant lock (RLock allows same thread to acquire multiple times)
+# Guards the runtime reranker settings below (models live in the registry)
 _reranker_lock = threading.RLock()
-_shared_reranker: Optional[SentenceTransformerRerank] = None
 _reranker_config: dict = {}
 _reranker_enabled: bool = True  # Runtime enable/disable flag
 
@@ -204,6 +214,65 @@ class ThreadSafeReranker:
         self._top_n = value
 
 
+class BatchedReranker:
+    """Cross-encoder reranker backed by a shared micro-batching executor.
+
+    Same interface as ThreadSafeReranker, but concurrent calls are combined
+    into batched forward passes on the executor's replica pool instead of
+    waiting on one global lock.
+    """
+
+    def __init__(self, executor: RerankExecutor, top_n: int):
+        self._executor = executor
+        self._top_n = top_n
+
+    def postprocess_nodes(
+        self,
+        nodes: List[NodeWithScore],
+        query_bundle: Optional[QueryBundle] = None,
+        query_str: Optional[str] = None
+    ) -> List[NodeWithScore]:
+        """Rerank nodes through the batching executor.
+
+        Args:
+            nodes: List of nodes with scores to rerank
+            query_bundle: Query bundle for reranking (optional if query_str provided)
+            query_str: Query string (optional if query_bundle provided)
+
+        Returns:
+            Reranked list of nodes, limited to top_n
+        """
+        if not nodes:
+            return nodes
+
+        query = query_str or (query_bundle.query_str if query_bundle else None)
+        if query is None:
+            raise ValueError("Missing query bundle in extra info.")
+
+        passages = [node.node.get_content(metadata_mode=MetadataMode.EMBED) for node in nodes]
+        try:
+            scores = self._executor.score(query, passages)
+        except RuntimeError as e:
+            # Executor was replaced (model switch) between lookup and call
+            logger.warning(f"Reranking skipped ({e}), returning original order")
+            return nodes[:self._top_n]
+
+        for node, score in zip(nodes, scores):
+            node.score = score
+
+        return sorted(nodes, key=lambda x: -x.score if x.score else 0)[:self._top_n]
+
+    @property
+    def top_n(self) -> int:
+        """Get the top_n value."""
+        return self._top_n
+
+    @top_n.setter
+    def top_n(self, value: int) -> None:
+        """Set the top_n value for subsequent calls."""
+        self._top_n = value
+
+
 class GroqReranker:
     """Groq LLM-based reranker with Structured Outputs for reliable scoring.
 
@@ -437,14 +506,92 @@ def _resolve_groq_model(model_suffix: str) -> str:
     return GROQ_MODEL_ALIASES.get(model_suffix, model_suffix)
 
 
+def _groq_reranker(model: str, top_n: int) -> Optional[GroqReranker]:
+    """Create a Groq reranker for a "groq:" model (None if unavailable)."""
+    if not os.getenv("GROQ_API_KEY"):
+        logger.warning(
+            f"GROQ_API_KEY not set for model '{model}', "
+            "falling back to local 'base' reranker"
+        )
+        return None
+    try:
+        # New instance per call (not resident - lightweight)
+        return GroqReranker(model=model[5:], top_n=top_n)
+    except Exception as e:
+        logger.warning(
+            f"Failed to create Groq reranker ({e}), "
+            "falling back to local 'base' reranker"
+        )
+        return None
+
+
+def default_reranker_model() -> str:
+    """Model used when a caller does not pick one.
+
+    Priority: runtime setting (set_reranker_config) > RERANKER_MODEL env var
+    > retrieval.reranker.model config > "base".
+    """
+    return (
+        _reranker_config.get("model")
+        or os.getenv("RERANKER_MODEL", "").strip()
+        or get_config_value("retrieval", "reranker", "model", default="base")
+    )
+
+
+def get_reranker(
+    model: Optional[str] = None,
+    top_n: int = 10
+) -> Optional[Union[BatchedReranker, ThreadSafeReranker, GroqReranker]]:
+    """Get a reranker for one call without changing global reranker state.
+
+    Local models come from the resident model registry, so switching between
+    models per request does not reload them (until evicted by the memory
+    budget).
+
+    Args:
+        model: Model specification (alias, path, HuggingFace ID, "groq:*" or
+            "disabled"); None uses default_reranker_model()
+        top_n: Number of top results to return after reranking
+
+    Returns:
+        Reranker instance, or None if reranking is disabled (globally or by
+        model="disabled") or the model cannot be loaded
+    """
+    if not _reranker_enabled:
+        return None
+
+    model = model or default_reranker_model()
+
+    # Check for groq: prefix - route to Groq reranker
+    if model.lower().startswith("groq:"):
+        groq = _groq_reranker(model, top_n)
+        if groq is not None:
+            return groq
+        model = "base"
+
+    effective_model = resolve_model_path(model)
+    if effective_model is None:
+        return None
+
+    try:
+        resident = get_reranker_registry().acquire(effective_model, top_n)
+    except Exception as e:
+        logger.warning(f"Failed to load reranker {effective_model}: {e}")
+        return None
+
+    if resident.executor is not None:
+        return BatchedReranker(resident.executor, top_n)
+    return ThreadSafeReranker(resident.reranker, resident.lock, top_n)
+
+
 def get_shared_reranker(
     model: str = "base",
     top_n: int = 10
-) -> Optional[Union[ThreadSafeReranker, GroqReranker]]:
+) -> Optional[Union[BatchedReranker, ThreadSafeReranker, GroqReranker]]:
     """Get reranker instance based on model specification.
 
     Supports two backend types:
-    1. Local cross-encoder (default): Thread-safe ONNX models
+    1. Local cross-encoder (default): ONNX models behind a batching executor
     2. Groq LLM: Ultra-fast cloud reranking via "groq:" prefix
 
     Model specification:
@@ -453,6 +600,10 @@ def get_shared_reranker(
     - HuggingFace IDs: "mixedbread-ai/mxbai-rerank-base-v1"
     - Groq models: "groq:scout", "groq:maverick", "groq:llama70b"
 
+    The runtime setting (set_reranker_config) and the RERANKER_MODEL env
+    var take precedence over ``model``. Use get_reranker() to honour a
+    per-request model instead.
+
     Environment variables:
     - RERANKER_MODEL: Default model (overrides parameter default)
     - GROQ_API_KEY: Required for groq: models
@@ -462,9 +613,10 @@ def get_shared_reranker(
         top_n: Number of top results to return after reranking
 
     Returns:
-        Reranker instance (ThreadSafeReranker or GroqReranker), or None if disabled
+        Reranker instance (BatchedReranker, ThreadSafeReranker or GroqReranker),
+        or None if disabled
     """
-    global _shared_reranker, _reranker_config, _reranker_enabled
+    global _reranker_enabled
 
     # RERANKER_MODEL env var overrides parameter default
     env_model = os.getenv("RERANKER_MODEL", "").strip()
@@ -478,68 +630,59 @@ def get_shared_reranker(
     # Use model from config if set, otherwise use parameter
     config_model = _reranker_config.get("model", model)
 
-    # Check for groq: prefix - route to Groq reranker
-    if config_model.lower().startswith("groq:"):
-        groq_model = config_model[5:]  # Remove "groq:" prefix
+    # Handle "disabled" resolution
+    if not config_model.lower().startswith("groq:") and resolve_model_path(config_model) is None:
+        with _reranker_lock:
+            _reranker_enabled = False
+        logger.info("Reranker disabled via model resolution")
+        return None
 
-        # Check for API key
-        api_key = os.getenv("GROQ_API_KEY")
-        if not api_key:
-            logger.warning(
-                f"GROQ_API_KEY not set for model '{config_model}', "
-                "falling back to local 'base' reranker"
-            )
-            config_model = "base"
-        else:
-            # Return new GroqReranker instance (not singleton - lightweight)
-            try:
-                return GroqReranker(model=groq_model, top_n=top_n)
-            except Exception as e:
-                logger.warning(
-                    f"Failed to create Groq reranker ({e}), "
-                    "falling back to local 'base' reranker"
-                )
-                config_model = "base"
+    return get_reranker(config_model, top_n)
 
-    with _reranker_lock:
-        # Resolve to actual path or HuggingFace ID
-        effective_model = resolve_model_path(config_model)
 
-        # Handle "disabled" resolution
-        if effective_model is None:
-            _reranker_enabled = False
-            _shared_reranker = None
-            logger.info("Reranker disabled via model resolution")
-            return None
+def preload_rerankers(models: Optional[List[str]] = None, background: bool = True) -> None:
+    """Load reranker models before the first request.
 
-        # Check if we need to create or recreate the reranker
-        current_resolved = _reranker_config.get("resolved_model")
-        if _shared_reranker is None or current_resolved != effective_model:
-            logger.info(f"Initializing shared reranker: {effective_model}")
-            _shared_reranker = SentenceTransformerRerank(
-                model=effective_model,
-                top_n=top_n
-            )
-            _reranker_config = {
-                "model": config_model,
-                "resolved_model": effective_model,
-                "top_n": top_n
-            }
-            logger.info("Shared reranker initialized successfully")
+    Args:
+        models: Models to load (default retrieval.reranker.registry.preload,
+            or the default model if that is not set)
+        background: Load in a daemon thread so startup is not delayed
+    """
+    if not _reranker_enabled:
+        return
+    if models is None:
+        models = get_config_value(
+            "retrieval", "reranker", "registry", "preload", default=None
+        ) or [default_reranker_model()]
+    local = [m for m in models if m and not m.lower().startswith("groq:")]
+    if not local:
+        return
+
+    def _load():
+        loaded = get_reranker_registry().preload(local, resolve=resolve_model_path)
+        logger.info(f"Preloaded rerankers: {loaded}")
 
-    return ThreadSafeReranker(_shared_reranker, _reranker_lock, top_n)
+    if background:
+        threading.Thread(target=_load, name="reranker-preload", daemon=True).start()
+    else:
+        _load()
+
+
+def get_reranker_registry_stats() -> dict:
+    """Get resident reranker model statistics (loads, evictions, hits, models)."""
+    return get_reranker_registry().get_stats()
 
 
 def clear_shared_reranker() -> None:
-    """Clear the shared reranker instance.
+    """Unload all resident reranker models and reset the runtime setting.
 
     Useful for testing or when you need to release memory.
     """
-    global _shared_reranker, _reranker_config
+    global _reranker_config
     with _reranker_lock:
-        _shared_reranker = None
         _reranker_config = {}
-        logger.debug("Shared reranker cleared")
+    get_reranker_registry().clear()
+    logger.debug("Resident rerankers cleared")
 
 
 def set_reranker_config(
@@ -547,9 +690,11 @@ def set_reranker_config(
     enabled: bool = True,
     top_n: Optional[int] = None
 ) -> dict:
-    """Configure reranker at runtime.
+    """Configure the process-wide reranker default at runtime.
 
-    Allows switching reranker model or disabling reranker entirely without restart.
+    Allows switching the default reranker model or disabling reranker
+    entirely without restart. This is an admin setting; per-request model
+    choices should use get_reranker(model=...) / RetrievalRequest.reranker_model.
     Thread-safe - changes are applied atomically.
 
     Args:
@@ -562,33 +707,25 @@ def set_reranker_config(
     Returns:
         Current configuration after update
     """
-    global _shared_reranker, _reranker_config, _reranker_enabled
+    global _reranker_config, _reranker_enabled
 
     with _reranker_lock:
         _reranker_enabled = enabled
 
         if not enabled:
-            # Disable reranking - clear the instance to free memory
-            _shared_reranker = None
+            # Disable reranking - unload models to free memory
+            get_reranker_registry().clear()
             logger.info("Reranker disabled")
             return get_reranker_config()
 
-        # Check if model change requires reload
-        needs_reload = False
         if model and model != _reranker_config.get("model"):
-            needs_reload = True
             _reranker_config["model"] = model
-            # Clear resolved_model so it gets re-resolved
-            _reranker_config.pop("resolved_model", None)
+            # Models stay resident; the new default loads on next use if needed
+            logger.info(f"Default reranker model changed to {model}")
 
         if top_n is not None:
             _reranker_config["top_n"] = top_n
 
-        if needs_reload:
-            # Force reload on next get_shared_reranker() call
-            _shared_reranker = None
-            logger.info(f"Reranker model changed to {model}, will reload on next use")
-
         return get_reranker_config()
 
 
@@ -609,8 +746,8 @@ def get_reranker_config() -> dict:
         model = _reranker_config.get("model", "base")
         is_groq = model.lower().startswith("groq:")
 
-        resolved = _reranker_config.get("resolved_model")
-        if resolved is None and _reranker_enabled and not is_groq:
+        resolved = None
+        if _reranker_enabled and not is_groq:
             resolved = resolve_model_path(model)
 
         # For Groq models, resolved is the full Groq model ID
@@ -623,7 +760,7 @@ def get_reranker_config() -> dict:
             "model": model,
             "resolved_model": resolved,
             "top_n": _reranker_config.get("top_n", 10),
-            "loaded": _shared_reranker is not None,
+            "loaded": get_reranker_registry().is_resident(resolved),
             "is_local": resolved and os.path.exists(resolved) if resolved and not is_groq else False,
             "is_groq": is_groq
         }
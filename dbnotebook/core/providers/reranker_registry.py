@@ -0,0 +1,294 @@
+"""Resident cross-encoder reranker models, selectable per call.
+
+Keeps several local reranker models loaded at once so requests can use
+different models (e.g. "xsmall" and "large") without reloading. Models are
+loaded on first use (or preloaded at startup), tracked by an estimated size,
+and evicted least-recently-used first when the memory budget is exceeded.
+
+Each resident model owns its own batching executor (or, with batching
+disabled, its own lock), so two models never wait on each other.
+
+Configuration (retrieval.reranker.registry):
+    memory_budget_mb: Total size of resident models before LRU eviction
+    preload: Model aliases/paths to load at startup
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from llama_index.core.postprocessor import SentenceTransformerRerank
+
+from dbnotebook.core.config import get_config_value
+from dbnotebook.core.providers.rerank_executor import RerankExecutor
+
+logger = logging.getLogger(__name__)
+
+# Size guesses (MB) when parameters cannot be inspected, by model name fragment
+_FALLBACK_SIZES_MB = (
+    ("xsmall", 150),
+    ("large", 1700),
+    ("base", 750),
+)
+_DEFAULT_SIZE_MB = 750
+
+
+@dataclass
+class ResidentReranker:
+    """A loaded reranker model and the executor serving it."""
+    model_path: str
+    reranker: SentenceTransformerRerank
+    executor: Optional[RerankExecutor]
+    size_mb: float
+    lock: threading.RLock = field(default_factory=threading.RLock)
+    loaded_at: float = field(default_factory=time.time)
+    last_used: float = field(default_factory=time.time)
+    hits: int = 0
+
+
+def _batching_config(key: str, default: Any) -> Any:
+    return get_config_value("retrieval", "reranker", "batching", key, default=default)
+
+
+def _estimate_size_mb(model_path: str, models: List[Any]) -> float:
+    """Estimate resident memory from parameter sizes (falls back to name heuristics)."""
+    total = 0
+    try:
+        for model in models:
+            module = getattr(model, "model", model)
+            total += sum(p.numel() * p.element_size() for p in module.parameters())
+    except Exception:
+        total = 0
+    if total:
+        return total / (1024 * 1024)
+
+    name = Path(model_path).name.lower()
+    per_replica = next((size for key, size in _FALLBACK_SIZES_MB if key in name), _DEFAULT_SIZE_MB)
+    return float(per_replica * len(models))
+
+
+def load_resident_reranker(model_path: str, top_n: int = 10) -> ResidentReranker:
+    """Load a model (plus replicas) and start its batching executor.
+
+    Args:
+        model_path: Resolved local path or HuggingFace ID
+        top_n: Default top_n for the underlying postprocessor
+    """
+    started = time.time()
+    primary = SentenceTransformerRerank(model=model_path, top_n=top_n)
+    replicas = [primary._model]
+
+    executor = None
+    if _batching_config("enabled", True):
+        for _ in range(max(1, int(_batching_config("replicas", 1))) - 1):
+            replicas.append(SentenceTransformerRerank(model=model_path, top_n=top_n)._model)
+        executor = RerankExecutor(
+            replicas,
+            max_batch_pairs=_batching_config("max_batch_pairs", 64),
+            max_wait_ms=_batching_config("max_wait_ms", 5),
+            name=f"reranker:{Path(model_path).name}"
+        )
+
+    size_mb = _estimate_size_mb(model_path, replicas)
+    logger.info(
+        f"Loaded reranker {model_path} ({len(replicas)} replica(s), ~{size_mb:.0f} MB) "
+        f"in {time.time() - started:.1f}s"
+    )
+    return ResidentReranker(
+        model_path=model_path,
+        reranker=primary,
+        executor=executor,
+        size_mb=size_mb,
+    )
+
+
+class RerankerRegistry:
+    """LRU set of resident reranker models under a memory budget.
+
+    Thread-safe: concurrent requests for the same missing model trigger a
+    single load; requests for models that are already resident never wait
+    on a load in progress.
+    """
+
+    def __init__(self, memory_budget_mb: Optional[float] = None, loader=None):
+        """Initialize the registry.
+
+        Args:
+            memory_budget_mb: Budget for resident models (default from config)
+            loader: Callable (model_path, top_n) -> ResidentReranker
+        """
+        self._budget_mb = float(
+            memory_budget_mb or get_config_value(
+                "retrieval", "reranker", "registry", "memory_budget_mb", default=4096
+            )
+        )
+        self._loader = loader or load_resident_reranker
+        self._models: "OrderedDict[str, ResidentReranker]" = OrderedDict()
+        self._loading: Dict[str, threading.Event] = {}
+        self._lock = threading.Lock()
+        self._stats = {"loads": 0, "load_failures": 0, "evictions": 0, "hits": 0, "misses": 0}
+        self._load_seconds = 0.0
+
+    def acquire(self, model_path: str, top_n: int = 10) -> ResidentReranker:
+        """Get a resident model, loading it (and evicting others) if needed.
+
+        Args:
+            model_path: Resolved local path or HuggingFace ID
+            top_n: Default top_n used if the model has to be loaded
+
+        Raises:
+            Exception: Whatever the loader raised if the model cannot be loaded
+        """
+        while True:
+            with self._lock:
+                resident = self._models.get(model_path)
+                if resident is not None:
+                    self._models.move_to_end(model_path)
+                    resident.hits += 1
+                    resident.last_used = time.time()
+                    self._stats["hits"] += 1
+                    return resident
+                pending = self._loading.get(model_path)
+                if pending is None:
+                    pending = threading.Event()
+                    self._loading[model_path] = pending
+                    self._stats["misses"] += 1
+                    break
+            # Another thread is loading this model: wait, then re-check
+            pending.wait()
+
+        try:
+            started = time.time()
+            resident = self._loader(model_path, top_n)
+            evicted = []
+            with self._lock:
+                self._load_seconds += time.time() - started
+                self._stats["loads"] += 1
+                self._models[model_path] = resident
+                evicted = self._evict_over_budget(keep=model_path)
+            for old in evicted:
+                self._shutdown(old)
+            return resident
+        except Exception:
+            with self._lock:
+                self._stats["load_failures"] += 1
+            raise
+        finally:
+            with self._lock:
+                self._loading.pop(model_path, None)
+            pending.set()
+
+    def _evict_over_budget(self, keep: str) -> List[ResidentReranker]:
+        """Pop least-recently-used models until within budget. Caller holds the lock."""
+        evicted = []
+        total = sum(r.size_mb for r in self._models.values())
+        for path in list(self._models.keys()):
+            if total <= self._budget_mb:
+                break
+            if path == keep:
+                continue
+            old = self._models.pop(path)
+            total -= old.size_mb
+            evicted.append(old)
+            self._stats["evictions"] += 1
+            logger.info(f"Evicted reranker {path} (~{old.size_mb:.0f} MB, {old.hits} hits)")
+        if total > self._budget_mb:
+            logger.warning(
+                f"Resident rerankers use ~{total:.0f} MB, over the {self._budget_mb:.0f} MB budget"
+            )
+        return evicted
+
+    @staticmethod
+    def _shutdown(resident: ResidentReranker) -> None:
+        """Stop a model's executor; queued requests are still scored."""
+        if resident.executor is not None:
+            resident.executor.close()
+
+    def is_resident(self, model_path: Optional[str]) -> bool:
+        """Check whether a model is currently loaded."""
+        with self._lock:
+            return model_path in self._models
+
+    def evict(self, model_path: str) -> bool:
+        """Unload one model. Returns True if it was resident."""
+        with self._lock:
+            resident = self._models.pop(model_path, None)
+            if resident is not None:
+                self._stats["evictions"] += 1
+        if resident is None:
+            return False
+        self._shutdown(resident)
+        return True
+
+    def clear(self) -> None:
+        """Unload all models."""
+        with self._lock:
+            residents = list(self._models.values())
+            self._models.clear()
+        for resident in residents:
+            self._shutdown(resident)
+
+    def preload(self, models: Iterable[str], resolve=None) -> List[str]:
+        """Load models ahead of the first request.
+
+        Args:
+            models: Aliases, local paths or HuggingFace IDs
+            resolve: Optional callable mapping an identifier to a model path
+                (None result means "skip")
+
+        Returns:
+            Model paths that are resident afterwards
+        """
+        loaded = []
+        for model in models:
+            path = resolve(model) if resolve else model
+            if not path:
+                continue
+            try:
+                self.acquire(path)
+                loaded.append(path)
+            except Exception as e:
+                logger.warning(f"Failed to preload reranker {model}: {e}")
+        return loaded
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get load/evict/hit counts and the resident models."""
+        with self._lock:
+            stats = dict(self._stats)
+            residents = list(self._models.values())
+            load_seconds = self._load_seconds
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / lookups, 3) if lookups else 0.0
+        stats["avg_load_seconds"] = round(load_seconds / stats["loads"], 2) if stats["loads"] else 0.0
+        stats["memory_budget_mb"] = self._budget_mb
+        stats["resident_mb"] = round(sum(r.size_mb for r in residents), 1)
+        stats["models"] = [
+            {
+                "model": r.model_path,
+                "size_mb": round(r.size_mb, 1),
+                "hits": r.hits,
+                "loaded_at": r.loaded_at,
+                "last_used": r.last_used,
+                "batching": r.executor.get_stats() if r.executor is not None else None,
+            }
+            for r in reversed(residents)  # Most recently used first
+        ]
+        return stats
+
+
+_registry: Optional[RerankerRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_reranker_registry() -> RerankerRegistry:
+    """Get the process-wide reranker registry."""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = RerankerRegistry()
+    return _registry
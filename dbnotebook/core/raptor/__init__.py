@@ -57,6 +57,7 @@ from .worker import (
     RAPTORJob,
     RAPTORWorker,
     build_raptor_tree_sync,
+    enqueue_raptor_job,
 )
 
 from .retriever import (
@@ -91,6 +92,7 @@ __all__ = [
     "RAPTORJob",
     "RAPTORWorker",
     "build_raptor_tree_sync",
+    "enqueue_raptor_job",
     # Retrieval
     "RAPTORQueryType",
     "RAPTORRetrievalResult",
@@ -8,6 +8,11 @@ Key Features:
 - GMM provides soft clustering (nodes can belong to multiple clusters)
 - Probability thresholds control cluster membership
 - Handles edge cases (small datasets, single clusters)
+- Size tiers: levels with at least fast_path_min_nodes nodes skip UMAP and
+  full-covariance GMM, using (Incremental)PCA followed by a diagonal GMM or
+  MiniBatchKMeans with soft assignments instead
+- Works on float32 matrices end to end (pass embeddings straight from
+  NodeColumns to avoid per-node Python lists)
 
 Reference: https://arxiv.org/abs/2401.18059
 """
@@ -20,6 +25,7 @@ from typing import List, Optional, Tuple
 import numpy as np
 from llama_index.core.schema import BaseNode, TextNode
 
+from ..vector_store.columnar import node_embedding
 from .config import ClusteringConfig, DEFAULT_CONFIG
 
 logger = logging.getLogger(__name__)
@@ -61,6 +67,8 @@ class RAPTORClustering:
         self.config = config or DEFAULT_CONFIG.clustering
         self._umap_model = None
         self._gmm_model = None
+        # Method used for the most recent level, e.g. "umap+gmm" or "pca+gmm_diag"
+        self.last_method: Optional[str] = None
 
     def cluster_nodes(
         self,
@@ -72,7 +80,8 @@ class RAPTORClustering:
 
         Args:
             nodes: List of nodes to cluster
-            embeddings: Pre-computed embeddings (extracted from nodes if None)
+            embeddings: Pre-computed (N, dim) embeddings aligned with nodes,
+                        e.g. NodeColumns.embeddings (extracted from nodes if None)
 
         Returns:
             List of Cluster objects containing grouped nodes
@@ -89,34 +98,49 @@ class RAPTORClustering:
             logger.warning("No embeddings available, returning single cluster")
             return [self._create_single_cluster(nodes)]
 
-        # Reduce dimensionality with UMAP
-        reduced_embeddings = self._reduce_dimensions(embeddings)
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+        if self._use_fast_path(len(nodes)):
+            # Large level: linear-time reduction and clustering
+            reduced_embeddings = self._reduce_dimensions_fast(embeddings)
+            if reduced_embeddings is None:
+                logger.warning("Dimensionality reduction failed, returning single cluster")
+                return [self._create_single_cluster(nodes)]
+            clusters = self._fast_cluster(nodes, reduced_embeddings)
+        else:
+            # Reduce dimensionality with UMAP
+            reduced_embeddings = self._reduce_dimensions(embeddings)
 
-        if reduced_embeddings is None:
-            logger.warning("Dimensionality reduction failed, returning single cluster")
-            return [self._create_single_cluster(nodes)]
+            if reduced_embeddings is None:
+                logger.warning("Dimensionality reduction failed, returning single cluster")
+                return [self._create_single_cluster(nodes)]
 
-        # Perform GMM clustering
-        clusters = self._gmm_cluster(nodes, reduced_embeddings)
+            # Perform GMM clustering
+            self.last_method = "umap+gmm"
+            clusters = self._gmm_cluster(nodes, reduced_embeddings)
 
-        logger.info(f"Created {len(clusters)} clusters from {len(nodes)} nodes")
+        logger.info(f"Created {len(clusters)} clusters from {len(nodes)} nodes ({self.last_method})")
         return clusters
 
     def _extract_embeddings(self, nodes: List[BaseNode]) -> Optional[np.ndarray]:
-        """Extract embeddings from nodes."""
-        embeddings = []
+        """Extract embeddings from nodes into a preallocated float32 matrix."""
+        if not nodes:
+            return None
 
-        for node in nodes:
-            if hasattr(node, 'embedding') and node.embedding is not None:
-                embeddings.append(node.embedding)
-            else:
+        first = node_embedding(nodes[0])
+        if first is None:
+            logger.warning(f"Node {nodes[0].node_id} has no embedding")
+            return None
+
+        embeddings = np.empty((len(nodes), len(first)), dtype=np.float32)
+        for i, node in enumerate(nodes):
+            # Matrix-backed nodes yield their row, so no list is built
+            embedding = node_embedding(node)
+            if embedding is None:
                 logger.warning(f"Node {node.node_id} has no embedding")
                 return None
+            embeddings[i] = embedding
 
-        if not embeddings:
-            return None
-
-        return np.array(embeddings)
+        return embeddings
 
     def _reduce_dimensions(self, embeddings: np.ndarray) -> Optional[np.ndarray]:
         """
@@ -208,6 +232,124 @@ class RAPTORClustering:
             logger.error(f"GMM clustering failed: {e}")
             return [self._create_single_cluster(nodes)]
 
+    # =========================================================================
+    # Fast path for large levels
+    # =========================================================================
+
+    def _use_fast_path(self, n_samples: int) -> bool:
+        threshold = self.config.fast_path_min_nodes
+        return threshold > 0 and n_samples >= threshold
+
+    def _reduce_dimensions_fast(self, embeddings: np.ndarray) -> Optional[np.ndarray]:
+        """
+        Reduce dimensions with randomized PCA or IncrementalPCA.
+
+        Rows are L2-normalized first so Euclidean geometry in the reduced
+        space follows the cosine similarity UMAP is configured with.
+        """
+        try:
+            from sklearn.decomposition import PCA, IncrementalPCA
+
+            n_samples, dim = embeddings.shape
+            norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+            normalized = embeddings / np.maximum(norms, 1e-12)
+
+            n_components = min(self.config.fast_n_components, n_samples - 1, dim)
+            if self.config.fast_reducer == "incremental_pca":
+                batch_size = max(self.config.fast_batch_size, n_components)
+                reducer = IncrementalPCA(n_components=n_components, batch_size=batch_size)
+            else:
+                reducer = PCA(
+                    n_components=n_components,
+                    svd_solver="randomized",
+                    random_state=self.config.random_state,
+                )
+
+            reduced = reducer.fit_transform(normalized).astype(np.float32, copy=False)
+            logger.debug(f"{self.config.fast_reducer} reduced {embeddings.shape} -> {reduced.shape}")
+            return reduced
+
+        except ImportError:
+            logger.error("scikit-learn not installed. Install with: pip install scikit-learn")
+            return None
+        except Exception as e:
+            logger.error(f"Fast dimensionality reduction failed: {e}")
+            return None
+
+    def _fast_cluster(self, nodes: List[BaseNode], embeddings: np.ndarray) -> List[Cluster]:
+        """Cluster a large level with a diagonal GMM or MiniBatchKMeans."""
+        probabilities = self._fast_probabilities(embeddings)
+        if probabilities is None:
+            return [self._create_single_cluster(nodes)]
+        return self._build_clusters_from_probabilities(nodes, probabilities, embeddings)
+
+    def _fast_probabilities(self, embeddings: np.ndarray) -> Optional[np.ndarray]:
+        """
+        Soft cluster assignments for a reduced large level.
+
+        Returns:
+            (N, n_clusters) membership probabilities, or None for a single cluster
+        """
+        try:
+            n_clusters = self._estimate_n_clusters(embeddings.shape[0])
+            if n_clusters <= 1:
+                return None
+
+            reducer = "ipca" if self.config.fast_reducer == "incremental_pca" else "pca"
+            if self.config.fast_clusterer == "minibatch_kmeans":
+                from sklearn.cluster import MiniBatchKMeans
+
+                self.last_method = f"{reducer}+minibatch_kmeans"
+                kmeans = MiniBatchKMeans(
+                    n_clusters=n_clusters,
+                    batch_size=self.config.fast_batch_size,
+                    n_init=self.config.fast_n_init,
+                    random_state=self.config.random_state,
+                )
+                labels = kmeans.fit_predict(embeddings)
+                return self._soft_assign(kmeans.transform(embeddings), labels, embeddings.shape[1])
+
+            from sklearn.mixture import GaussianMixture
+
+            self.last_method = f"{reducer}+gmm_diag"
+            self._gmm_model = GaussianMixture(
+                n_components=n_clusters,
+                covariance_type='diag',
+                n_init=self.config.fast_n_init,
+                random_state=self.config.random_state,
+            )
+            self._gmm_model.fit(embeddings)
+            return self._gmm_model.predict_proba(embeddings)
+
+        except ImportError:
+            logger.error("scikit-learn not installed. Install with: pip install scikit-learn")
+            return None
+        except Exception as e:
+            logger.error(f"Fast clustering failed: {e}")
+            return None
+
+    @staticmethod
+    def _soft_assign(distances: np.ndarray, labels: np.ndarray, dim: int) -> np.ndarray:
+        """
+        Turn k-means centroid distances into membership probabilities.
+
+        Treats each centroid as an isotropic Gaussian whose per-dimension
+        variance is estimated from its members (an equal-weight GMM E-step).
+        """
+        n_clusters = distances.shape[1]
+        sq = distances.astype(np.float64) ** 2
+        variances = np.empty(n_clusters)
+        for k in range(n_clusters):
+            member_sq = sq[labels == k, k]
+            variances[k] = (member_sq.mean() if member_sq.size else sq[:, k].mean()) / dim
+        variances = np.maximum(variances, 1e-12)
+
+        logits = -sq / (2 * variances) - 0.5 * dim * np.log(variances)
+        logits -= logits.max(axis=1, keepdims=True)
+        probabilities = np.exp(logits)
+        probabilities /= probabilities.sum(axis=1, keepdims=True)
+        return probabilities
+
     def _estimate_n_clusters(self, n_samples: int) -> int:
         """
         Estimate optimal number of clusters.
@@ -246,6 +388,7 @@ class RAPTORClustering:
         threshold = self.config.gmm_probability_threshold
 
         clusters = []
+        kept_indices = []
 
         for cluster_idx in range(n_clusters):
             cluster_probs = probabilities[:, cluster_idx]
@@ -280,6 +423,7 @@ class RAPTORClustering:
             )
 
             clusters.append(cluster)
+            kept_indices.append(cluster_idx)
 
         # Handle edge case: no clusters met the size threshold
         if not clusters:
@@ -291,26 +435,16 @@ class RAPTORClustering:
         for cluster in clusters:
             all_clustered_ids.update(cluster.node_ids)
 
-        orphan_nodes = [n for n in nodes if n.node_id not in all_clustered_ids]
-        if orphan_nodes:
-            # Add orphans to their highest-probability cluster
-            for node in orphan_nodes:
-                node_idx = nodes.index(node)
-                best_cluster_idx = np.argmax(probabilities[node_idx])
-
-                # Find or create the target cluster
-                for cluster in clusters:
-                    if cluster.nodes[0].node_id in [nodes[i].node_id for i in
-                        np.where(probabilities[:, best_cluster_idx] >= threshold)[0]]:
-                        cluster.nodes.append(node)
-                        cluster.node_ids.append(node.node_id)
-                        break
-                else:
-                    # Fallback: add to first cluster
-                    clusters[0].nodes.append(node)
-                    clusters[0].node_ids.append(node.node_id)
-
-            logger.debug(f"Added {len(orphan_nodes)} orphan nodes to existing clusters")
+        orphan_indices = [i for i, n in enumerate(nodes) if n.node_id not in all_clustered_ids]
+        if orphan_indices:
+            # Add orphans to their highest-probability surviving cluster
+            best = np.argmax(probabilities[np.ix_(orphan_indices, kept_indices)], axis=1)
+            for node_idx, cluster_pos in zip(orphan_indices, best):
+                node = nodes[node_idx]
+                clusters[cluster_pos].nodes.append(node)
+                clusters[cluster_pos].node_ids.append(node.node_id)
+
+            logger.debug(f"Added {len(orphan_indices)} orphan nodes to existing clusters")
 
         return clusters
 
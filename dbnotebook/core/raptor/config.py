@@ -44,6 +44,14 @@ class ClusteringConfig:
     random_state: int = field(default_factory=lambda: _get(get_clustering_config(), "random_state", 42))
     n_init: int = field(default_factory=lambda: _get(get_clustering_config(), "n_init", 10))
 
+    # Fast path for large levels (skips UMAP and full-covariance GMM)
+    fast_path_min_nodes: int = field(default_factory=lambda: _get(get_clustering_config(), "fast_path_min_nodes", 2000))
+    fast_reducer: str = field(default_factory=lambda: _get(get_clustering_config(), "fast_reducer", "pca"))
+    fast_clusterer: str = field(default_factory=lambda: _get(get_clustering_config(), "fast_clusterer", "gmm_diag"))
+    fast_n_components: int = field(default_factory=lambda: _get(get_clustering_config(), "fast_n_components", 32))
+    fast_n_init: int = field(default_factory=lambda: _get(get_clustering_config(), "fast_n_init", 1))
+    fast_batch_size: int = field(default_factory=lambda: _get(get_clustering_config(), "fast_batch_size", 4096))
+
 
 # Default prompts (used if not in YAML)
 _DEFAULT_CLUSTER_PROMPT = """You are an expert summarizer. Below are related text chunks from a document that have been grouped together by semantic similarity.
@@ -103,6 +111,11 @@ class TreeBuildingConfig:
 
     # Concurrency
     max_concurrent_summaries: int = field(default_factory=lambda: _get(get_tree_building_config(), "max_concurrent_summaries", 3))
+    summaries_per_minute: float = field(default_factory=lambda: _get(get_tree_building_config(), "summaries_per_minute", 0))
+
+    # Incremental maintenance
+    incremental: bool = field(default_factory=lambda: _get(get_tree_building_config(), "incremental", True))
+    notebook_tree: bool = field(default_factory=lambda: _get(get_tree_building_config(), "notebook_tree", False))
 
     # Retry behavior
     max_retries: int = field(default_factory=lambda: _get(get_tree_building_config(), "max_retries", 3))
@@ -17,6 +17,7 @@ from llama_index.core.retrievers import BaseRetriever, QueryFusionRetriever
 from llama_index.core import VectorStoreIndex, Settings
 from llama_index.retrievers.bm25 import BM25Retriever
 
+from ..vector_store.columnar import with_embedding_lists
 from .config import RetrievalConfig, RAPTORConfig, DEFAULT_CONFIG
 
 if TYPE_CHECKING:
@@ -216,7 +217,7 @@ class RAPTORRetriever(BaseRetriever):
         effective_top_k = self.similarity_top_k
 
         # Build index from collected nodes
-        index = VectorStoreIndex(nodes=all_nodes)
+        index = VectorStoreIndex(nodes=with_embedding_lists(all_nodes))
         vector_retriever = index.as_retriever(
             similarity_top_k=effective_top_k
         )
@@ -20,6 +20,7 @@ from typing import List, Optional
 from llama_index.core.llms import LLM
 from llama_index.core.schema import TextNode
 
+from ..providers.llm_cache import FEATURE_RAPTOR, cached_llm
 from .clustering import Cluster
 from .config import SummarizationConfig, DEFAULT_CONFIG
 
@@ -37,20 +38,28 @@ class SummaryNode:
     token_count: int
     source_id: str
     notebook_id: str
+    # Content hash of the cluster's members (incremental rebuilds)
+    membership_hash: str = ""
+    # Embedding carried over from a reused summary (None = embed it)
+    embedding: Optional[List[float]] = None
 
     def to_text_node(self) -> TextNode:
         """Convert to LlamaIndex TextNode with tree metadata."""
+        metadata = {
+            "node_type": "raptor_summary",
+            "tree_level": self.tree_level,
+            "child_node_ids": self.child_node_ids,
+            "cluster_id": self.cluster_id,
+            "source_id": self.source_id,
+            "notebook_id": self.notebook_id,
+        }
+        if self.membership_hash:
+            metadata["membership_hash"] = self.membership_hash
         return TextNode(
             id_=self.node_id,
             text=self.text,
-            metadata={
-                "node_type": "raptor_summary",
-                "tree_level": self.tree_level,
-                "child_node_ids": self.child_node_ids,
-                "cluster_id": self.cluster_id,
-                "source_id": self.source_id,
-                "notebook_id": self.notebook_id,
-            }
+            metadata=metadata,
+            embedding=self.embedding
         )
 
 
@@ -74,7 +83,8 @@ class RAPTORSummarizer:
             llm: LlamaIndex LLM instance for generation
             config: Summarization configuration (uses defaults if None)
         """
-        self.llm = llm
+        # Identical cluster prompts (re-uploads, retried builds) hit the response cache
+        self.llm = cached_llm(llm, FEATURE_RAPTOR)
         self.config = config or DEFAULT_CONFIG.summarization
 
     async def summarize_cluster(
@@ -8,20 +8,29 @@ Key Features:
 - Embedding generation for summary nodes
 - Progress tracking and status updates
 - Integration with vector store
+- Incremental rebuilds: clusters whose member set hashes to an existing
+  summary's membership_hash reuse its text and embedding (no LLM call)
 
 Reference: https://arxiv.org/abs/2401.18059
 """
 
+import asyncio
+import hashlib
 import logging
+import threading
 import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 
+import numpy as np
 from llama_index.core.llms import LLM
 from llama_index.core.embeddings import BaseEmbedding
 from llama_index.core.schema import BaseNode, TextNode
 
+from ..vector_store.columnar import node_embedding
 from .config import RAPTORConfig, DEFAULT_CONFIG
 from .clustering import RAPTORClustering, Cluster
 from .summarizer import RAPTORSummarizer, SummaryNode
@@ -46,6 +55,12 @@ class TreeBuildResult:
 
     # Timing
     build_time_seconds: float = 0.0
+    # Per level: {"cluster_seconds", "summarize_seconds", "embed_seconds", "clusters"}
+    level_timings: Dict[int, Dict[str, float]] = field(default_factory=dict)
+
+    # Incremental builds: summaries generated by the LLM vs reused unchanged
+    llm_summaries: int = 0
+    reused_summaries: int = 0
     started_at: Optional[datetime] = None
     completed_at: Optional[datetime] = None
 
@@ -62,10 +77,56 @@ class TreeBuildResult:
             "levels": self.levels,
             "max_level": self.max_level,
             "build_time_seconds": self.build_time_seconds,
+            "level_timings": self.level_timings,
+            "llm_summaries": self.llm_summaries,
+            "reused_summaries": self.reused_summaries,
             "error": self.error,
         }
 
 
+def membership_hash(nodes: List[BaseNode], tree_level: int) -> str:
+    """
+    Order-independent content hash of a cluster's members at a tree level.
+
+    Member identity is the text itself rather than node IDs, so chunks
+    re-ingested with new row IDs (and summaries reused at a lower level)
+    still produce the same hash.
+    """
+    member_hashes = sorted(
+        hashlib.md5(node.get_content().encode("utf-8")).hexdigest() for node in nodes
+    )
+    return hashlib.md5(f"{tree_level}:{','.join(member_hashes)}".encode("utf-8")).hexdigest()
+
+
+class _RateLimiter:
+    """Spaces calls at least 60 / per_minute seconds apart across threads."""
+
+    def __init__(self, per_minute: float):
+        self._interval = 60.0 / per_minute if per_minute and per_minute > 0 else 0.0
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """Reserve the next slot and return how long to wait for it."""
+        if not self._interval:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self._interval
+        return slot - now
+
+    def acquire(self) -> None:
+        wait = self._reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self) -> None:
+        wait = self._reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
 class RAPTORTreeBuilder:
     """
     Builds hierarchical RAPTOR trees from document chunks.
@@ -99,12 +160,194 @@ class RAPTORTreeBuilder:
         self.clustering = RAPTORClustering(self.config.clustering)
         self.summarizer = RAPTORSummarizer(llm, self.config.summarization)
 
+        # Bounded, rate-limited cluster summarization (shared by sync and async builds)
+        self._max_concurrent = max(1, self.config.tree_building.max_concurrent_summaries)
+        self._rate_limiter = _RateLimiter(self.config.tree_building.summaries_per_minute)
+
+    # =========================================================================
+    # Shared level helpers
+    # =========================================================================
+
+    @staticmethod
+    def _reuse_summary(
+        existing_summaries: Optional[Dict[str, BaseNode]],
+        member_hash: str,
+        tree_level: int,
+        cluster_id: str,
+        child_node_ids: List[str],
+        source_id: str,
+        notebook_id: str
+    ) -> Optional[SummaryNode]:
+        """Rebuild a SummaryNode from an existing summary with the same membership."""
+        existing = existing_summaries.get(member_hash) if existing_summaries else None
+        embedding = node_embedding(existing) if existing is not None else None
+        if embedding is None:
+            return None
+        text = existing.get_content()
+        return SummaryNode(
+            node_id=str(uuid.uuid4()),
+            text=text,
+            child_node_ids=child_node_ids,
+            tree_level=tree_level,
+            cluster_id=cluster_id,
+            token_count=len(text.split()),
+            source_id=source_id,
+            notebook_id=notebook_id,
+            membership_hash=member_hash,
+            embedding=embedding.tolist() if isinstance(embedding, np.ndarray) else embedding
+        )
+
+    def _reuse_clusters(
+        self,
+        clusters: List[Cluster],
+        tree_level: int,
+        source_id: str,
+        notebook_id: str,
+        existing_summaries: Optional[Dict[str, BaseNode]]
+    ) -> Tuple[List[Optional[SummaryNode]], List[str]]:
+        """Resolve unchanged clusters from existing summaries; None marks LLM work."""
+        hashes = [membership_hash(cluster.nodes, tree_level) for cluster in clusters]
+        reused = [
+            self._reuse_summary(
+                existing_summaries, h, tree_level, cluster.cluster_id,
+                cluster.node_ids, source_id, notebook_id
+            )
+            for cluster, h in zip(clusters, hashes)
+        ]
+        return reused, hashes
+
+    def _summarize_clusters(
+        self,
+        clusters: List[Cluster],
+        tree_level: int,
+        source_id: str,
+        notebook_id: str,
+        existing_summaries: Optional[Dict[str, BaseNode]] = None
+    ) -> List[SummaryNode]:
+        """Summarize changed clusters concurrently on a bounded thread pool (order preserved)."""
+        results, hashes = self._reuse_clusters(
+            clusters, tree_level, source_id, notebook_id, existing_summaries
+        )
+        pending = [i for i, summary in enumerate(results) if summary is None]
+
+        def summarize(index: int) -> SummaryNode:
+            self._rate_limiter.acquire()
+            summary = self.summarizer.summarize_cluster_sync(
+                cluster=clusters[index],
+                tree_level=tree_level,
+                source_id=source_id,
+                notebook_id=notebook_id
+            )
+            summary.membership_hash = hashes[index]
+            return summary
+
+        workers = min(self._max_concurrent, len(pending))
+        if workers <= 1:
+            generated = [summarize(i) for i in pending]
+        else:
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="raptor-summarize") as pool:
+                generated = list(pool.map(summarize, pending))
+
+        for index, summary in zip(pending, generated):
+            results[index] = summary
+        return results
+
+    async def _summarize_clusters_async(
+        self,
+        clusters: List[Cluster],
+        tree_level: int,
+        source_id: str,
+        notebook_id: str,
+        existing_summaries: Optional[Dict[str, BaseNode]] = None
+    ) -> List[SummaryNode]:
+        """Async counterpart of _summarize_clusters, bounded by a semaphore."""
+        results, hashes = self._reuse_clusters(
+            clusters, tree_level, source_id, notebook_id, existing_summaries
+        )
+        pending = [i for i, summary in enumerate(results) if summary is None]
+        semaphore = asyncio.Semaphore(self._max_concurrent)
+
+        async def summarize(index: int) -> SummaryNode:
+            async with semaphore:
+                await self._rate_limiter.acquire_async()
+                summary = await self.summarizer.summarize_cluster(
+                    cluster=clusters[index],
+                    tree_level=tree_level,
+                    source_id=source_id,
+                    notebook_id=notebook_id
+                )
+            summary.membership_hash = hashes[index]
+            return summary
+
+        generated = await asyncio.gather(*(summarize(i) for i in pending))
+        for index, summary in zip(pending, generated):
+            results[index] = summary
+        return results
+
+    def _embed_summaries(self, summary_nodes: List[SummaryNode]) -> List[TextNode]:
+        """Embed a level's new summaries in one batched call and return embedded TextNodes.
+
+        Reused summaries keep their stored embedding. The same TextNode
+        objects are stored and fed to the next level's clustering, so each
+        summary is converted and embedded exactly once.
+        """
+        pending = [sn for sn in summary_nodes if sn.embedding is None]
+        if pending:
+            embeddings = self.embed_model.get_text_embedding_batch(
+                [sn.text for sn in pending],
+                show_progress=False
+            )
+            for summary_node, embedding in zip(pending, embeddings):
+                summary_node.embedding = embedding
+        return [sn.to_text_node() for sn in summary_nodes]
+
+    @staticmethod
+    def _count_reuse(result: "TreeBuildResult", summary_nodes: List[SummaryNode]) -> None:
+        """Tally reused vs generated summaries (call before _embed_summaries)."""
+        reused = sum(1 for sn in summary_nodes if sn.embedding is not None)
+        result.reused_summaries += reused
+        result.llm_summaries += len(summary_nodes) - reused
+
+    @staticmethod
+    def _to_summary_nodes(
+        nodes: List[TextNode],
+        tree_level: int,
+        source_id: str,
+        notebook_id: str
+    ) -> List[SummaryNode]:
+        """Reconstruct SummaryNodes from the top level for root summarization."""
+        return [
+            SummaryNode(
+                node_id=node.node_id,
+                text=node.get_content(),
+                child_node_ids=node.metadata.get("child_node_ids", []),
+                tree_level=node.metadata.get("tree_level", tree_level),
+                cluster_id=node.metadata.get("cluster_id", ""),
+                token_count=len(node.get_content().split()),
+                source_id=source_id,
+                notebook_id=notebook_id
+            )
+            for node in nodes
+        ]
+
+    @staticmethod
+    def _log_level_timing(level: int, timing: Dict[str, float], summaries: int) -> None:
+        logger.info(
+            f"Level {level}: created {summaries} summary nodes "
+            f"from {int(timing['clusters'])} clusters "
+            f"(cluster {timing['cluster_seconds']:.2f}s, "
+            f"summarize {timing['summarize_seconds']:.2f}s, "
+            f"embed {timing['embed_seconds']:.2f}s)"
+        )
+
     def build_tree(
         self,
         chunks: List[BaseNode],
         source_id: str,
         notebook_id: str,
-        progress_callback: Optional[callable] = None
+        progress_callback: Optional[callable] = None,
+        embeddings: Optional[np.ndarray] = None,
+        existing_summaries: Optional[Dict[str, BaseNode]] = None
     ) -> TreeBuildResult:
         """
         Build RAPTOR tree from document chunks.
@@ -114,6 +357,11 @@ class RAPTORTreeBuilder:
             source_id: Source document ID
             notebook_id: Notebook ID
             progress_callback: Optional callback(stage, progress, message)
+            embeddings: Optional float32 (N, dim) matrix aligned with chunks
+                        (e.g. NodeColumns.embeddings); chunks then need no
+                        embedding lists of their own
+            existing_summaries: Embedded summaries keyed by membership_hash
+                        (incremental rebuild); matching clusters skip the LLM
 
         Returns:
             TreeBuildResult with summary nodes and statistics
@@ -151,6 +399,7 @@ class RAPTORTreeBuilder:
             # Build tree recursively
             all_summary_nodes = []
             current_level_nodes = chunks
+            current_embeddings = embeddings
             current_level = 0
             levels = {0: len(chunks)}
 
@@ -169,7 +418,9 @@ class RAPTORTreeBuilder:
                     )
 
                 # Cluster current level nodes
-                clusters = self.clustering.cluster_nodes(current_level_nodes)
+                level_start = time.perf_counter()
+                clusters = self.clustering.cluster_nodes(current_level_nodes, current_embeddings)
+                cluster_seconds = time.perf_counter() - level_start
 
                 if len(clusters) <= 1 and current_level > 1:
                     # Only one cluster - create root and stop
@@ -183,41 +434,33 @@ class RAPTORTreeBuilder:
                         f"Level {current_level}: summarizing {len(clusters)} clusters"
                     )
 
-                # Summarize each cluster
-                level_summary_nodes = []
-                for cluster in clusters:
-                    summary_node = self.summarizer.summarize_cluster_sync(
-                        cluster=cluster,
-                        tree_level=current_level,
-                        source_id=source_id,
-                        notebook_id=notebook_id
-                    )
-                    level_summary_nodes.append(summary_node)
-
-                # Generate embeddings for summary nodes
-                summary_texts = [sn.text for sn in level_summary_nodes]
-                embeddings = self.embed_model.get_text_embedding_batch(
-                    summary_texts,
-                    show_progress=False
+                # Summarize clusters concurrently (bounded, rate-limited)
+                summarize_start = time.perf_counter()
+                level_summary_nodes = self._summarize_clusters(
+                    clusters, current_level, source_id, notebook_id, existing_summaries
                 )
+                self._count_reuse(result, level_summary_nodes)
+                summarize_seconds = time.perf_counter() - summarize_start
 
-                # Convert to TextNodes with embeddings
-                for i, summary_node in enumerate(level_summary_nodes):
-                    text_node = summary_node.to_text_node()
-                    text_node.embedding = embeddings[i]
-                    all_summary_nodes.append(text_node)
+                # Embed the whole level in one batched call
+                embed_start = time.perf_counter()
+                level_text_nodes = self._embed_summaries(level_summary_nodes)
+                all_summary_nodes.extend(level_text_nodes)
 
                 levels[current_level] = len(level_summary_nodes)
-                logger.info(
-                    f"Level {current_level}: created {len(level_summary_nodes)} summary nodes "
-                    f"from {len(clusters)} clusters"
+                result.level_timings[current_level] = {
+                    "cluster_seconds": cluster_seconds,
+                    "summarize_seconds": summarize_seconds,
+                    "embed_seconds": time.perf_counter() - embed_start,
+                    "clusters": len(clusters),
+                }
+                self._log_level_timing(
+                    current_level, result.level_timings[current_level], len(level_summary_nodes)
                 )
 
-                # Prepare for next level
-                # Convert SummaryNodes to TextNodes for clustering
-                current_level_nodes = [sn.to_text_node() for sn in level_summary_nodes]
-                for i, node in enumerate(current_level_nodes):
-                    node.embedding = embeddings[i]
+                # Embedded summaries are the next level's clustering input
+                current_level_nodes = level_text_nodes
+                current_embeddings = None
 
             # Create root node if we have multiple summaries at the top level
             if len(current_level_nodes) > 1:
@@ -226,34 +469,39 @@ class RAPTORTreeBuilder:
                 if progress_callback:
                     progress_callback("root", 0.9, "Creating root summary node")
 
-                # Get the SummaryNodes we just created (convert back)
-                top_level_summaries = []
-                for node in current_level_nodes:
-                    # Reconstruct SummaryNode for root summarization
-                    sn = SummaryNode(
-                        node_id=node.node_id,
-                        text=node.get_content(),
-                        child_node_ids=node.metadata.get("child_node_ids", []),
-                        tree_level=node.metadata.get("tree_level", current_level - 1),
-                        cluster_id=node.metadata.get("cluster_id", ""),
-                        token_count=len(node.get_content().split()),
+                # Reconstruct SummaryNodes for root summarization
+                top_level_summaries = self._to_summary_nodes(
+                    current_level_nodes, current_level - 1, source_id, notebook_id
+                )
+
+                summarize_start = time.perf_counter()
+                root_hash = membership_hash(current_level_nodes, current_level)
+                root_summary = self._reuse_summary(
+                    existing_summaries, root_hash, current_level, f"root_{source_id}",
+                    [sn.node_id for sn in top_level_summaries], source_id, notebook_id
+                )
+                if root_summary is None:
+                    self._rate_limiter.acquire()
+                    root_summary = self.summarizer.summarize_summaries_sync(
+                        summary_nodes=top_level_summaries,
+                        tree_level=current_level,
                         source_id=source_id,
                         notebook_id=notebook_id
                     )
-                    top_level_summaries.append(sn)
-
-                root_summary = self.summarizer.summarize_summaries_sync(
-                    summary_nodes=top_level_summaries,
-                    tree_level=current_level,
-                    source_id=source_id,
-                    notebook_id=notebook_id
-                )
+                    root_summary.membership_hash = root_hash
+                self._count_reuse(result, [root_summary])
+                summarize_seconds = time.perf_counter() - summarize_start
 
                 # Generate embedding for root
-                root_embedding = self.embed_model.get_text_embedding(root_summary.text)
-                root_text_node = root_summary.to_text_node()
-                root_text_node.embedding = root_embedding
+                embed_start = time.perf_counter()
+                root_text_node = self._embed_summaries([root_summary])[0]
                 root_text_node.metadata["tree_root_id"] = root_text_node.node_id
+                result.level_timings[current_level] = {
+                    "cluster_seconds": 0.0,
+                    "summarize_seconds": summarize_seconds,
+                    "embed_seconds": time.perf_counter() - embed_start,
+                    "clusters": 1,
+                }
 
                 all_summary_nodes.append(root_text_node)
                 levels[current_level] = 1
@@ -285,7 +533,8 @@ class RAPTORTreeBuilder:
                 f"RAPTOR tree built: {result.total_nodes} total nodes, "
                 f"{len(all_summary_nodes)} summaries, "
                 f"max level {result.max_level}, "
-                f"time {result.build_time_seconds:.2f}s"
+                f"time {result.build_time_seconds:.2f}s, "
+                f"{result.reused_summaries} reused / {result.llm_summaries} generated"
             )
 
         except Exception as e:
@@ -303,7 +552,9 @@ class RAPTORTreeBuilder:
         chunks: List[BaseNode],
         source_id: str,
         notebook_id: str,
-        progress_callback: Optional[callable] = None
+        progress_callback: Optional[callable] = None,
+        embeddings: Optional[np.ndarray] = None,
+        existing_summaries: Optional[Dict[str, BaseNode]] = None
     ) -> TreeBuildResult:
         """
         Async version of build_tree.
@@ -335,6 +586,7 @@ class RAPTORTreeBuilder:
             # Build tree recursively
             all_summary_nodes = []
             current_level_nodes = chunks
+            current_embeddings = embeddings
             current_level = 0
             levels = {0: len(chunks)}
 
@@ -345,73 +597,73 @@ class RAPTORTreeBuilder:
                 current_level += 1
 
                 # Cluster current level nodes
-                clusters = self.clustering.cluster_nodes(current_level_nodes)
+                level_start = time.perf_counter()
+                clusters = self.clustering.cluster_nodes(current_level_nodes, current_embeddings)
+                cluster_seconds = time.perf_counter() - level_start
 
                 if len(clusters) <= 1 and current_level > 1:
                     break
 
-                # Summarize each cluster (async)
-                import asyncio
-                summary_tasks = [
-                    self.summarizer.summarize_cluster(
-                        cluster=cluster,
-                        tree_level=current_level,
-                        source_id=source_id,
-                        notebook_id=notebook_id
-                    )
-                    for cluster in clusters
-                ]
-                level_summary_nodes = await asyncio.gather(*summary_tasks)
-
-                # Generate embeddings for summary nodes
-                summary_texts = [sn.text for sn in level_summary_nodes]
-                embeddings = self.embed_model.get_text_embedding_batch(
-                    summary_texts,
-                    show_progress=False
+                # Summarize clusters (async, bounded, rate-limited)
+                summarize_start = time.perf_counter()
+                level_summary_nodes = await self._summarize_clusters_async(
+                    clusters, current_level, source_id, notebook_id, existing_summaries
                 )
+                self._count_reuse(result, level_summary_nodes)
+                summarize_seconds = time.perf_counter() - summarize_start
 
-                # Convert to TextNodes with embeddings
-                for i, summary_node in enumerate(level_summary_nodes):
-                    text_node = summary_node.to_text_node()
-                    text_node.embedding = embeddings[i]
-                    all_summary_nodes.append(text_node)
+                # Embed the whole level in one batched call
+                embed_start = time.perf_counter()
+                level_text_nodes = self._embed_summaries(level_summary_nodes)
+                all_summary_nodes.extend(level_text_nodes)
 
                 levels[current_level] = len(level_summary_nodes)
+                result.level_timings[current_level] = {
+                    "cluster_seconds": cluster_seconds,
+                    "summarize_seconds": summarize_seconds,
+                    "embed_seconds": time.perf_counter() - embed_start,
+                    "clusters": len(clusters),
+                }
 
-                # Prepare for next level
-                current_level_nodes = [sn.to_text_node() for sn in level_summary_nodes]
-                for i, node in enumerate(current_level_nodes):
-                    node.embedding = embeddings[i]
+                # Embedded summaries are the next level's clustering input
+                current_level_nodes = level_text_nodes
+                current_embeddings = None
 
             # Create root node if needed
             if len(current_level_nodes) > 1:
                 current_level += 1
 
-                top_level_summaries = []
-                for node in current_level_nodes:
-                    sn = SummaryNode(
-                        node_id=node.node_id,
-                        text=node.get_content(),
-                        child_node_ids=node.metadata.get("child_node_ids", []),
-                        tree_level=node.metadata.get("tree_level", current_level - 1),
-                        cluster_id=node.metadata.get("cluster_id", ""),
-                        token_count=len(node.get_content().split()),
+                top_level_summaries = self._to_summary_nodes(
+                    current_level_nodes, current_level - 1, source_id, notebook_id
+                )
+
+                summarize_start = time.perf_counter()
+                root_hash = membership_hash(current_level_nodes, current_level)
+                root_summary = self._reuse_summary(
+                    existing_summaries, root_hash, current_level, f"root_{source_id}",
+                    [sn.node_id for sn in top_level_summaries], source_id, notebook_id
+                )
+                if root_summary is None:
+                    await self._rate_limiter.acquire_async()
+                    root_summary = await self.summarizer.summarize_summaries(
+                        summary_nodes=top_level_summaries,
+                        tree_level=current_level,
                         source_id=source_id,
                         notebook_id=notebook_id
                     )
-                    top_level_summaries.append(sn)
-
-                root_summary = await self.summarizer.summarize_summaries(
-                    summary_nodes=top_level_summaries,
-                    tree_level=current_level,
-                    source_id=source_id,
-                    notebook_id=notebook_id
-                )
+                    root_summary.membership_hash = root_hash
+                self._count_reuse(result, [root_summary])
+                summarize_seconds = time.perf_counter() - summarize_start
 
-                root_embedding = self.embed_model.get_text_embedding(root_summary.text)
-                root_text_node = root_summary.to_text_node()
-                root_text_node.embedding = root_embedding
+                embed_start = time.perf_counter()
+                root_text_node = self._embed_summaries([root_summary])[0]
                 root_text_node.metadata["tree_root_id"] = root_text_node.node_id
+                result.level_timings[current_level] = {
+                    "cluster_seconds": 0.0,
+                    "summarize_seconds": summarize_seconds,
+                    "embed_seconds": time.perf_counter() - embed_start,
+                    "clusters": 1,
+                }
 
                 all_summary_nodes.append(root_text_node)
                 levels[current_level] = 1
@@ -1,7 +1,8 @@
 """Background worker for RAPTOR tree building.
 
 Processes RAPTOR jobs asynchronously:
-1. Polls for sources with pending RAPTOR status
+1. Leases jobs from the durable job queue (sources with pending RAPTOR
+   status are swept into the queue)
 2. Retrieves chunks from vector store
 3. Builds hierarchical tree using clustering and summarization
 4. Stores summary nodes back to vector store
@@ -13,15 +14,18 @@ import logging
 import threading
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Optional, List, Callable, TYPE_CHECKING
+from typing import Dict, Optional, List, Callable, Tuple, TYPE_CHECKING
 from uuid import UUID
 
+import numpy as np
+
 from llama_index.core import Settings
 from llama_index.core.schema import BaseNode
 from sqlalchemy.orm import Session
 
 from ..db import DatabaseManager
 from ..db.models import NotebookSource
+from ..jobs import JOB_RAPTOR, Job, JobQueue, JobRunner, PermanentJobError
 from .config import RAPTORConfig, DEFAULT_CONFIG
 from .tree_builder import RAPTORTreeBuilder, TreeBuildResult
 
@@ -31,6 +35,150 @@ if TYPE_CHECKING:
 logger = logging.getLogger(__name__)
 
 
+def _load_source_chunks(
+    vector_store: "PGVectorStore",
+    notebook_id: str,
+    source_id: str
+) -> Tuple[List[BaseNode], Optional[np.ndarray]]:
+    """
+    Load a source's level 0 chunks with their float32 embedding matrix.
+
+    Nodes are materialized without embedding lists; clustering reads the
+    matrix directly. Rows with NULL embeddings are dropped.
+    """
+    columns = vector_store.get_columns_by_tree_level(
+        notebook_id=notebook_id,
+        tree_level=0,
+        source_ids=[source_id]
+    )
+    if columns is None or len(columns) == 0:
+        return [], None
+
+    keep = np.flatnonzero(columns.has_embedding)
+    if len(keep) < len(columns):
+        logger.warning(f"Skipping {len(columns) - len(keep)} chunks without embeddings for {source_id}")
+    nodes = [columns.node(int(i), include_embedding=False) for i in keep]
+    return nodes, columns.embeddings[keep]
+
+
+def notebook_tree_source_id(notebook_id: str) -> str:
+    """source_id under which a notebook-level tree's summaries are stored."""
+    return f"notebook:{notebook_id}"
+
+
+def _load_existing_summaries(
+    vector_store: "PGVectorStore",
+    notebook_id: str,
+    source_id: Optional[str] = None
+) -> Dict[str, BaseNode]:
+    """
+    Map membership_hash -> stored summary (with embedding) for incremental builds.
+
+    Source trees look across the whole notebook, so a re-uploaded document
+    (new source_id, mostly unchanged text) reuses the old version's summaries.
+    """
+    columns = vector_store.get_hashed_summary_columns(notebook_id, source_id)
+    if columns is None:
+        return {}
+    existing: Dict[str, BaseNode] = {}
+    for i in np.flatnonzero(columns.has_embedding):
+        node = columns.node(int(i))
+        member_hash = node.metadata.get("membership_hash")
+        if member_hash:
+            existing.setdefault(member_hash, node)
+    return existing
+
+
+def _store_tree_nodes(
+    vector_store: "PGVectorStore",
+    summary_nodes: List[BaseNode],
+    notebook_id: str,
+    source_id: str
+) -> int:
+    """
+    Replace a source's stored tree (levels >= 1) with freshly built summary nodes.
+
+    The old tree is deleted and the new one inserted in one transaction, so
+    a failure keeps the old tree (the exception propagates).
+    """
+    # Group by tree level for efficient storage
+    nodes_by_level: Dict[int, List[BaseNode]] = {}
+    for node in summary_nodes:
+        level = node.metadata.get("tree_level", 1)
+        nodes_by_level.setdefault(level, []).append(node)
+
+    tree_root_id = summary_nodes[0].metadata.get("tree_root_id") if summary_nodes else None
+
+    # Rebuilds replace the previous tree instead of adding a second one
+    stored = vector_store.replace_tree_nodes(
+        nodes_by_level=nodes_by_level,
+        notebook_id=notebook_id,
+        source_id=source_id,
+        tree_root_id=tree_root_id
+    )
+    for level, nodes in sorted(nodes_by_level.items()):
+        logger.debug(f"Stored {len(nodes)} nodes at level {level}")
+    return stored
+
+
+def build_notebook_tree(
+    vector_store: "PGVectorStore",
+    builder: RAPTORTreeBuilder,
+    notebook_id: str
+) -> TreeBuildResult:
+    """
+    Build or refresh the notebook-level tree over every source tree's top level.
+
+    Leaves are the top-level summaries of each active source. Clusters whose
+    members did not change keep their summaries, so adding a source only
+    re-summarizes the clusters it joins and their ancestors.
+
+    Args:
+        vector_store: Vector store holding the source trees
+        builder: Tree builder (LLM, embed model, config)
+        notebook_id: Notebook to maintain
+
+    Returns:
+        TreeBuildResult for the notebook tree
+    """
+    tree_source_id = notebook_tree_source_id(notebook_id)
+    columns = vector_store.get_source_top_summary_columns(
+        notebook_id, exclude_source_id=tree_source_id
+    )
+    keep = np.flatnonzero(columns.has_embedding) if columns is not None else []
+    leaves = [columns.node(int(i), include_embedding=False) for i in keep]
+    if not leaves:
+        return TreeBuildResult(
+            success=False,
+            source_id=tree_source_id,
+            notebook_id=notebook_id,
+            error="No source trees found"
+        )
+
+    result = builder.build_tree(
+        chunks=leaves,
+        source_id=tree_source_id,
+        notebook_id=notebook_id,
+        embeddings=columns.embeddings[keep],
+        existing_summaries=_load_existing_summaries(vector_store, notebook_id, tree_source_id)
+    )
+    if result.success:
+        try:
+            stored = _store_tree_nodes(vector_store, result.summary_nodes, notebook_id, tree_source_id)
+        except Exception as e:
+            # The previous notebook tree stays in place
+            logger.error(f"Error storing notebook tree for {notebook_id}: {e}")
+            result.success = False
+            result.error = f"Storing tree failed: {e}"
+            return result
+        logger.info(
+            f"Notebook tree for {notebook_id}: {len(leaves)} source summaries, "
+            f"{stored} nodes stored, {result.reused_summaries} reused / "
+            f"{result.llm_summaries} generated"
+        )
+    return result
+
+
 @dataclass
 class RAPTORJob:
     """A job to build RAPTOR tree for a source."""
@@ -39,10 +187,23 @@ class RAPTORJob:
     file_name: str
 
 
+def enqueue_raptor_job(job_queue: JobQueue, job: RAPTORJob, priority: int = 0) -> Optional[str]:
+    """Enqueue a tree build on the durable job queue (no-op if one is active)."""
+    return job_queue.enqueue(
+        JOB_RAPTOR,
+        source_id=job.source_id,
+        notebook_id=job.notebook_id,
+        payload={"file_name": job.file_name},
+        priority=priority,
+    )
+
+
 class RAPTORWorker:
     """Background worker for building RAPTOR trees.
 
-    Runs in a background thread, processing RAPTOR jobs from a queue.
+    Runs in a background thread, leasing RAPTOR jobs from the durable job
+    queue. Several workers (threads, processes or hosts) can share the queue;
+    each job is leased by exactly one of them.
     """
 
     def __init__(
@@ -52,6 +213,7 @@ class RAPTORWorker:
         config: Optional[RAPTORConfig] = None,
         poll_interval: float = 10.0,
         max_concurrent: int = 1,  # Tree building is resource-intensive
+        job_queue: Optional[JobQueue] = None,
     ):
         """Initialize the RAPTOR worker.
 
@@ -59,20 +221,22 @@ class RAPTORWorker:
             db_manager: Database manager for accessing sources
             vector_store: Vector store for retrieving chunks and storing summaries
             config: RAPTOR configuration
-            poll_interval: Seconds between polling for new jobs
+            poll_interval: Seconds between sweeps for pending sources
+                (new jobs wake the worker immediately via NOTIFY)
             max_concurrent: Maximum concurrent tree builds
+            job_queue: Shared job queue (created from db_manager if omitted)
         """
         self.db = db_manager
         self.vector_store = vector_store
         self.config = config or DEFAULT_CONFIG
         self.poll_interval = poll_interval
         self.max_concurrent = max_concurrent
+        self.job_queue = job_queue or JobQueue(db_manager.get_session_maker())
 
-        self._queue: asyncio.Queue = None
         self._running = False
         self._thread: Optional[threading.Thread] = None
         self._loop: Optional[asyncio.AbstractEventLoop] = None
-        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._runner: Optional[JobRunner] = None
 
         # LLM and embed model from Settings (set by pipeline)
         self._llm = None
@@ -86,87 +250,74 @@ class RAPTORWorker:
             return
 
         self._running = True
+        self._runner = JobRunner(
+            self.job_queue,
+            job_types=[JOB_RAPTOR],
+            handler=self._handle_job,
+            max_concurrent=self.max_concurrent,
+            poll_interval=self.poll_interval,
+            engine=self.db.engine,
+            sweep=self._enqueue_pending,
+        )
         self._thread = threading.Thread(target=self._run_loop, daemon=True)
         self._thread.start()
         logger.info("RAPTOR worker started")
 
     def stop(self):
-        """Stop the background worker."""
+        """Stop the background worker.
+
+        Builds still in progress are abandoned; their leases expire and
+        another worker picks them up.
+        """
         self._running = False
+        if self._runner:
+            self._runner.stop()
         if self._loop:
             self._loop.call_soon_threadsafe(self._loop.stop)
         if self._thread:
             self._thread.join(timeout=5.0)
         logger.info("RAPTOR worker stopped")
 
-    def queue_job(self, job: RAPTORJob):
-        """Queue a RAPTOR job for processing."""
-        if self._queue and self._loop:
-            self._loop.call_soon_threadsafe(
-                self._queue.put_nowait, job
-            )
-            logger.info(f"Queued RAPTOR job for source: {job.source_id}")
+    def queue_job(self, job: RAPTORJob, priority: int = 0) -> bool:
+        """Queue a RAPTOR job for processing.
+
+        Returns:
+            True if a new job was enqueued (False if one is already active)
+        """
+        return enqueue_raptor_job(self.job_queue, job, priority) is not None
 
     def _run_loop(self):
         """Run the async event loop in the background thread."""
         self._loop = asyncio.new_event_loop()
         asyncio.set_event_loop(self._loop)
-        self._queue = asyncio.Queue()
-        self._semaphore = asyncio.Semaphore(self.max_concurrent)
 
         try:
-            self._loop.run_until_complete(self._main_loop())
+            self._loop.run_until_complete(self._runner.run())
         except Exception as e:
             logger.error(f"RAPTOR worker loop error: {e}")
         finally:
             self._loop.close()
 
-    async def _main_loop(self):
-        """Main processing loop."""
-        # Start polling task
-        poll_task = asyncio.create_task(self._poll_pending())
-
-        while self._running:
-            try:
-                # Wait for job from queue with timeout
-                job = await asyncio.wait_for(
-                    self._queue.get(),
-                    timeout=self.poll_interval
-                )
-                # Process job with semaphore for concurrency control
-                asyncio.create_task(self._process_with_semaphore(job))
-            except asyncio.TimeoutError:
-                continue
-            except Exception as e:
-                logger.error(f"Error in RAPTOR main loop: {e}")
-
-        poll_task.cancel()
-
-    async def _poll_pending(self):
-        """Poll database for pending RAPTOR builds."""
-        while self._running:
-            try:
-                pending = self._get_pending_sources()
-                for source_data in pending:
-                    job = RAPTORJob(
-                        source_id=source_data["source_id"],
-                        notebook_id=source_data["notebook_id"],
-                        file_name=source_data["file_name"],
-                    )
-                    await self._queue.put(job)
-
-                await asyncio.sleep(self.poll_interval)
-            except Exception as e:
-                logger.error(f"Error polling pending RAPTOR jobs: {e}")
-                await asyncio.sleep(self.poll_interval)
-
-    async def _process_with_semaphore(self, job: RAPTORJob):
-        """Process job with semaphore for concurrency control."""
-        async with self._semaphore:
-            await self._process_job(job)
+    def _enqueue_pending(self):
+        """Enqueue sources with pending RAPTOR status (idempotent per source)."""
+        for source_data in self._get_pending_sources(limit=100):
+            enqueue_raptor_job(self.job_queue, RAPTORJob(**source_data))
+
+    async def _handle_job(self, job: Job):
+        """Run a leased queue job."""
+        await self._process_job(RAPTORJob(
+            source_id=job.source_id,
+            notebook_id=job.notebook_id,
+            file_name=job.payload.get("file_name", ""),
+        ))
 
     async def _process_job(self, job: RAPTORJob):
-        """Process a single RAPTOR job."""
+        """Process a single RAPTOR job.
+
+        Raises:
+            PermanentJobError: For failures a retry cannot fix
+            Exception: Any other failure (the job is retried with backoff)
+        """
         source_id = job.source_id
         logger.info(f"Building RAPTOR tree for source: {source_id} ({job.file_name})")
 
@@ -179,20 +330,23 @@ class RAPTORWorker:
                 self._init_tree_builder()
 
             if not self._tree_builder:
-                logger.error("Failed to initialize tree builder")
-                self._update_status(source_id, "failed", "Tree builder not available")
-                return
+                raise PermanentJobError("Tree builder not available")
 
-            # Get chunks from vector store
-            chunks = self._get_source_chunks(source_id, job.notebook_id)
+            # Get chunks (and their float32 embedding matrix) from vector store
+            chunks, embeddings = self._get_source_chunks(source_id, job.notebook_id)
 
             if not chunks:
-                logger.warning(f"No chunks found for source: {source_id}")
-                self._update_status(source_id, "failed", "No chunks found")
-                return
+                raise PermanentJobError("No chunks found")
 
             logger.info(f"Found {len(chunks)} chunks for {job.file_name}")
 
+            # Summaries of unchanged clusters are reused instead of re-summarized
+            existing_summaries = None
+            if self.config.tree_building.incremental:
+                existing_summaries = await asyncio.to_thread(
+                    _load_existing_summaries, self.vector_store, job.notebook_id
+                )
+
             # Build the tree
             result = await asyncio.to_thread(
                 self._tree_builder.build_tree,
@@ -200,33 +354,47 @@ class RAPTORWorker:
                 source_id=source_id,
                 notebook_id=job.notebook_id,
                 progress_callback=lambda stage, progress, msg:
-                    logger.debug(f"RAPTOR [{source_id[:8]}] {stage}: {progress:.0%} - {msg}")
+                    logger.debug(f"RAPTOR [{source_id[:8]}] {stage}: {progress:.0%} - {msg}"),
+                embeddings=embeddings,
+                existing_summaries=existing_summaries
             )
 
             if not result.success:
-                self._update_status(source_id, "failed", result.error)
-                return
+                raise RuntimeError(result.error or "Tree build failed")
 
-            # Store summary nodes in vector store
-            if result.summary_nodes:
-                stored = self._store_summary_nodes(
-                    result.summary_nodes,
-                    job.notebook_id,
-                    source_id
-                )
-                logger.info(f"Stored {stored} summary nodes for {job.file_name}")
+            # Store summary nodes in vector store (replacing any previous tree)
+            stored = self._store_summary_nodes(
+                result.summary_nodes,
+                job.notebook_id,
+                source_id
+            )
+            logger.info(f"Stored {stored} summary nodes for {job.file_name}")
 
             # Update status to completed
             self._update_status(source_id, "completed")
             logger.info(
                 f"Completed RAPTOR tree for {job.file_name}: "
                 f"{result.total_nodes} total nodes, {result.max_level} levels, "
-                f"{result.build_time_seconds:.1f}s"
+                f"{result.build_time_seconds:.1f}s, "
+                f"{result.reused_summaries} summaries reused, {result.llm_summaries} generated"
             )
+            for level, timing in sorted(result.level_timings.items()):
+                logger.info(
+                    f"  level {level}: {int(timing['clusters'])} clusters, "
+                    f"cluster {timing['cluster_seconds']:.2f}s, "
+                    f"summarize {timing['summarize_seconds']:.2f}s, "
+                    f"embed {timing['embed_seconds']:.2f}s"
+                )
+
+            if self.config.tree_building.notebook_tree:
+                await asyncio.to_thread(
+                    build_notebook_tree, self.vector_store, self._tree_builder, job.notebook_id
+                )
 
         except Exception as e:
             logger.error(f"Failed to build RAPTOR tree for {source_id}: {e}", exc_info=True)
             self._update_status(source_id, "failed", str(e))
+            raise
 
     def _init_tree_builder(self):
         """Initialize the tree builder with current LLM and embed model."""
@@ -257,19 +425,13 @@ class RAPTORWorker:
         self,
         source_id: str,
         notebook_id: str
-    ) -> List[BaseNode]:
-        """Get chunks for a source from the vector store."""
+    ) -> Tuple[List[BaseNode], Optional[np.ndarray]]:
+        """Get chunks for a source and their embedding matrix from the vector store."""
         try:
-            # Get level 0 nodes (original chunks) for this source
-            nodes = self.vector_store.get_nodes_by_tree_level(
-                notebook_id=notebook_id,
-                tree_level=0,
-                source_ids=[source_id]
-            )
-            return nodes
+            return _load_source_chunks(self.vector_store, notebook_id, source_id)
         except Exception as e:
             logger.error(f"Error getting chunks for {source_id}: {e}")
-            return []
+            return [], None
 
     def _store_summary_nodes(
         self,
@@ -277,41 +439,11 @@ class RAPTORWorker:
         notebook_id: str,
         source_id: str
     ) -> int:
-        """Store summary nodes in the vector store."""
-        try:
-            # Summary nodes are already TextNode objects from tree_builder
-            text_nodes = summary_nodes
-
-            if not text_nodes:
-                return 0
-
-            # Group by tree level for efficient storage
-            nodes_by_level = {}
-            for node in text_nodes:
-                level = node.metadata.get("tree_level", 1)
-                if level not in nodes_by_level:
-                    nodes_by_level[level] = []
-                nodes_by_level[level].append(node)
-
-            total_stored = 0
-            tree_root_id = text_nodes[0].metadata.get("tree_root_id") if text_nodes else None
-
-            for level, nodes in sorted(nodes_by_level.items()):
-                stored = self.vector_store.add_tree_nodes(
-                    nodes=nodes,
-                    notebook_id=notebook_id,
-                    source_id=source_id,
-                    tree_level=level,
-                    tree_root_id=tree_root_id
-                )
-                total_stored += stored
-                logger.debug(f"Stored {stored} nodes at level {level}")
+        """Store summary nodes in the vector store, replacing the source's old tree.
 
-            return total_stored
-
-        except Exception as e:
-            logger.error(f"Error storing summary nodes: {e}")
-            return 0
+        Raises on failure so the job is marked failed; the old tree is kept.
+        """
+        return _store_tree_nodes(self.vector_store, summary_nodes, notebook_id, source_id)
 
     def _get_pending_sources(self, limit: int = 5) -> List[dict]:
         """Get sources with pending RAPTOR status."""
@@ -400,11 +532,7 @@ def build_raptor_tree_sync(
     builder = RAPTORTreeBuilder(llm, embed_model, config)
 
     # Get chunks
-    chunks = vector_store.get_nodes_by_tree_level(
-        notebook_id=notebook_id,
-        tree_level=0,
-        source_ids=[source_id]
-    )
+    chunks, embeddings = _load_source_chunks(vector_store, notebook_id, source_id)
 
     if not chunks:
         return TreeBuildResult(
@@ -417,34 +545,28 @@ def build_raptor_tree_sync(
             error="No chunks found for source"
         )
 
+    existing_summaries = None
+    if config.tree_building.incremental:
+        existing_summaries = _load_existing_summaries(vector_store, notebook_id)
+
     result = builder.build_tree(
         chunks=chunks,
         source_id=source_id,
-        notebook_id=notebook_id
+        notebook_id=notebook_id,
+        embeddings=embeddings,
+        existing_summaries=existing_summaries
     )
 
-    # Store summary nodes if successful
-    if result.success and result.summary_nodes:
-        # Summary nodes are already TextNode objects from tree_builder
-        text_nodes = result.summary_nodes
-        if text_nodes:
-            nodes_by_level = {}
-            for node in text_nodes:
-                level = node.metadata.get("tree_level", 1)
-                if level not in nodes_by_level:
-                    nodes_by_level[level] = []
-                nodes_by_level[level].append(node)
-
-            tree_root_id = text_nodes[0].metadata.get("tree_root_id") if text_nodes else None
-
-            for level, nodes in sorted(nodes_by_level.items()):
-                vector_store.add_tree_nodes(
-                    nodes=nodes,
-                    notebook_id=notebook_id,
-                    source_id=source_id,
-                    tree_level=level,
-                    tree_root_id=tree_root_id
-                )
+    # Store summary nodes if successful (replacing any previous tree)
+    if result.success:
+        try:
+            _store_tree_nodes(vector_store, result.summary_nodes, notebook_id, source_id)
+        except Exception as e:
+            logger.error(f"Error storing tree for {source_id}: {e}")
+            result.success = False
+            result.error = f"Storing tree failed: {e}"
+    if result.success and config.tree_building.notebook_tree:
+        build_notebook_tree(vector_store, builder, notebook_id)
 
     # Update database status
     status = "completed" if result.success else "failed"
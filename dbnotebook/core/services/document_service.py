@@ -197,12 +197,10 @@ class DocumentService(BaseService, IDocumentService):
                         "but PostgreSQL deletion succeeded"
                     )
 
-            # Clear retriever cache to ensure deleted document isn't used in follow-up queries
-            if self.pipeline._engine and hasattr(self.pipeline._engine, '_retriever'):
-                retriever = self.pipeline._engine._retriever
-                if retriever and hasattr(retriever, 'clear_cache'):
-                    retriever.clear_cache()
-                    self.logger.debug(f"Cleared retriever cache after deleting document {source_id}")
+            # Drop the deleted nodes from cached notebook indexes (applied as a delta)
+            if hasattr(self.pipeline, 'refresh_node_cache'):
+                self.pipeline.refresh_node_cache(notebook_id)
+                self.logger.debug(f"Refreshed node cache after deleting document {source_id}")
 
             self.logger.info(f"Deleted document {source_id} from notebook {notebook_id}")
             return True
@@ -253,12 +251,11 @@ class DocumentService(BaseService, IDocumentService):
                 self.logger.warning(f"Document {source_id} not found")
                 return False
 
-            # Clear retriever cache since active documents affect retrieval
-            if self.pipeline._engine and hasattr(self.pipeline._engine, '_retriever'):
-                retriever = self.pipeline._engine._retriever
-                if retriever and hasattr(retriever, 'clear_cache'):
-                    retriever.clear_cache()
-                    self.logger.debug(f"Cleared retriever cache after toggling document {source_id}")
+            # Hide/show the source's nodes in cached notebook indexes (applied as a delta)
+            changed_notebook_id = updated_doc.get("notebook_id") or notebook_id
+            if changed_notebook_id and hasattr(self.pipeline, 'refresh_node_cache'):
+                self.pipeline.refresh_node_cache(changed_notebook_id)
+                self.logger.debug(f"Refreshed node cache after toggling document {source_id}")
 
             self.logger.info(f"Updated document {source_id} active status to {active}")
             return True
@@ -1422,6 +1422,7 @@ RESPOND ONLY WITH JSON, NO MARKDOWN FORMATTING."""
                     try:
                         from llama_index.core import VectorStoreIndex
                         from llama_index.core.retrievers import VectorIndexRetriever
+                        from ..vector_store.columnar import with_embedding_lists
 
                         # Get a few relevant nodes
                         nodes = self.pipeline._vector_store.get_nodes_by_notebook_sql(
@@ -1430,7 +1431,7 @@ RESPOND ONLY WITH JSON, NO MARKDOWN FORMATTING."""
 
                         if nodes:
                             # Create a quick index for semantic search
-                            index = VectorStoreIndex(nodes=nodes)
+                            index = VectorStoreIndex(nodes=with_embedding_lists(nodes))
                             retriever = VectorIndexRetriever(
                                 index=index,
                                 similarity_top_k=2
@@ -20,9 +20,8 @@ from llama_index.core import Settings
 from llama_index.core.schema import NodeWithScore, QueryBundle, TextNode
 
 from dbnotebook.core.providers.reranker_provider import (
-    get_shared_reranker,
+    get_reranker,
     is_reranker_enabled,
-    set_reranker_config,
 )
 from dbnotebook.core.config import get_config_value
 from .base import BaseService
@@ -48,6 +47,7 @@ class RetrievalRequest:
     min_raptor_score: float = 0.3
     source_ids: Optional[List[str]] = None
     language: str = "eng"
+    query_embedding: Optional[List[float]] = None  # Precomputed; skips embedding
 
     @classmethod
     def for_chat_v2(
@@ -57,6 +57,7 @@ class RetrievalRequest:
         max_sources: int = 6,
         use_raptor: bool = True,
         use_reranker: bool = True,
+        reranker_model: Optional[str] = None,
     ) -> "RetrievalRequest":
         """Factory for Chat V2 retrieval with sensible defaults.
 
@@ -68,6 +69,7 @@ class RetrievalRequest:
             max_sources: Maximum number of source chunks to return
             use_raptor: Whether to include RAPTOR summaries in retrieval
             use_reranker: Whether to apply reranker
+            reranker_model: Reranker model for this request (None = default)
 
         Returns:
             Configured RetrievalRequest
@@ -91,6 +93,7 @@ class RetrievalRequest:
             notebook_id=notebook_id,
             use_raptor=use_raptor and config_use_raptor,
             use_reranker=use_reranker and config_force_reranker,
+            reranker_model=reranker_model,
             top_k=max_sources,
             raptor_top_k=config_raptor_top_k,
             min_raptor_score=config_min_raptor_score,
@@ -246,35 +249,50 @@ class RetrievalService(BaseService):
         if embed_model is None:
             embed_model = Settings.embed_model
 
-        # Early return if no nodes
-        if not nodes:
+        # Early return if no nodes (server-side retrieval doesn't need them)
+        from dbnotebook.core.stateless import StageGraph, use_server_side_retrieval
+        if not nodes and not use_server_side_retrieval(vector_store, retriever_factory):
             logger.debug(f"No nodes for notebook {request.notebook_id}")
             return RetrievalResult(
                 strategy_used="empty",
                 timings={"total_ms": 0},
             )
 
-        # Step 1: Get chunks via fast_retrieve pattern
-        t1 = time.time()
-        chunks = self._retrieve_chunks(
-            request=request,
-            nodes=nodes,
-            llm=llm,
-            vector_store=vector_store,
-            retriever_factory=retriever_factory,
+        # Steps 1-2: embed the query once, then fetch chunks and RAPTOR
+        # summaries concurrently with the shared embedding
+        graph = StageGraph(timings, label="retrieval")
+        graph.add(
+            "query_embedding",
+            lambda: request.query_embedding or self._embed_query(request.query, embed_model),
         )
-        timings["chunk_retrieval_ms"] = int((time.time() - t1) * 1000)
-
-        # Step 2: Get RAPTOR summaries if enabled
-        raptor_summaries = []
-        if request.use_raptor:
-            t2 = time.time()
-            raptor_summaries = self._retrieve_raptor_summaries(
+        graph.add(
+            "chunks",
+            lambda query_embedding: self._retrieve_chunks(
                 request=request,
+                nodes=nodes,
+                llm=llm,
                 vector_store=vector_store,
-                embed_model=embed_model,
+                retriever_factory=retriever_factory,
+                query_embedding=query_embedding,
+            ),
+            deps=("query_embedding",),
+            timing_key="chunk_retrieval_ms",
+        )
+        if request.use_raptor:
+            graph.add(
+                "raptor",
+                lambda query_embedding: self._retrieve_raptor_summaries(
+                    request=request,
+                    vector_store=vector_store,
+                    embed_model=embed_model,
+                    query_embedding=query_embedding,
+                ),
+                deps=("query_embedding",),
+                timing_key="raptor_retrieval_ms",
             )
-            timings["raptor_retrieval_ms"] = int((time.time() - t2) * 1000)
+        results = graph.run()
+        chunks = results["chunks"]
+        raptor_summaries = results.get("raptor") or []
 
         # Step 3: Combine and optionally rerank
         strategy_used = "hybrid" if chunks else "simple"
@@ -307,6 +325,17 @@ class RetrievalService(BaseService):
             timings=timings,
         )
 
+    def _embed_query(self, query: str, embed_model: Any) -> Optional[List[float]]:
+        """Embed the query once for all retrieval stages.
+
+        Returns None on failure; stages then embed on their own.
+        """
+        try:
+            return embed_model.get_query_embedding(query)
+        except Exception as e:
+            logger.warning(f"Query embedding failed: {e}")
+            return None
+
     def _retrieve_chunks(
         self,
         request: RetrievalRequest,
@@ -314,6 +343,7 @@ class RetrievalService(BaseService):
         llm: Any,
         vector_store: Any,
         retriever_factory: Any,
+        query_embedding: Optional[List[float]] = None,
     ) -> List[NodeWithScore]:
         """Retrieve chunks using the fast_retrieve pattern.
 
@@ -323,6 +353,7 @@ class RetrievalService(BaseService):
             llm: LLM instance
             vector_store: PGVectorStore instance
             retriever_factory: LocalRetriever instance
+            query_embedding: Precomputed query embedding (None = embed in retriever)
 
         Returns:
             List of NodeWithScore for retrieved chunks
@@ -341,6 +372,7 @@ class RetrievalService(BaseService):
                 source_ids=request.source_ids,
                 top_k=request.top_k,
                 language=request.language,
+                query_embedding=query_embedding,
             )
         except Exception as e:
             logger.warning(f"Chunk retrieval failed: {e}", exc_info=True)
@@ -351,6 +383,7 @@ class RetrievalService(BaseService):
         request: RetrievalRequest,
         vector_store: Any,
         embed_model: Any,
+        query_embedding: Optional[List[float]] = None,
     ) -> List[Tuple[TextNode, float]]:
         """Retrieve RAPTOR hierarchical summaries.
 
@@ -358,6 +391,7 @@ class RetrievalService(BaseService):
             request: RetrievalRequest with query and configuration
             vector_store: PGVectorStore with get_top_raptor_summaries method
             embed_model: Embedding model for query embedding
+            query_embedding: Precomputed query embedding (None = embed here)
 
         Returns:
             List of (TextNode, score) tuples
@@ -367,8 +401,8 @@ class RetrievalService(BaseService):
             return []
 
         try:
-            # Get query embedding
-            query_embedding = embed_model.get_query_embedding(request.query)
+            if query_embedding is None:
+                query_embedding = embed_model.get_query_embedding(request.query)
 
             # Retrieve RAPTOR summaries
             raptor_results = vector_store.get_top_raptor_summaries(
@@ -417,9 +451,9 @@ class RetrievalService(BaseService):
             logger.debug("Reranker disabled globally")
             return chunks, raptor_summaries, False
 
-        # Get shared reranker
-        reranker = get_shared_reranker(
-            model=request.reranker_model or "base",
+        # Per-request model from the resident registry (None = default model)
+        reranker = get_reranker(
+            model=request.reranker_model,
             top_n=request.top_k + request.raptor_top_k,  # Room for both types
         )
 
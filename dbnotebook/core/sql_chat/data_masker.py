@@ -3,13 +3,17 @@ Data Masking for Chat with Data.
 
 Applies column-level masking policies to query results.
 Supports masking (****), redaction (remove), and hashing (anonymization).
+Columnar results are masked per column: redacted columns are dropped,
+masked/hashed columns are computed once per distinct value, and all other
+columns are shared with the input without copying.
 """
 
 import hashlib
 import logging
 import re
-from typing import Any, Dict, List, Optional, Set
+from typing import Any, Callable, Dict, List, Optional, Set, Union
 
+from dbnotebook.core.sql_chat.result_set import ColumnarResult
 from dbnotebook.core.sql_chat.types import MaskingPolicy
 
 logger = logging.getLogger(__name__)
@@ -53,17 +57,17 @@ class DataMasker:
 
     def apply(
         self,
-        results: List[Dict[str, Any]],
+        results: Union[ColumnarResult, List[Dict[str, Any]]],
         policy: Optional[MaskingPolicy]
-    ) -> List[Dict[str, Any]]:
+    ) -> Union[ColumnarResult, List[Dict[str, Any]]]:
         """Apply masking policy to query results.
 
         Args:
-            results: Query result rows
+            results: Query result (ColumnarResult or list of row dicts)
             policy: Masking policy (mask, redact, hash columns)
 
         Returns:
-            Masked results
+            Masked results (same representation as the input)
         """
         if not policy:
             return results
@@ -71,6 +75,9 @@ class DataMasker:
         if not results:
             return results
 
+        if isinstance(results, ColumnarResult):
+            return self.apply_columnar(results, policy)
+
         # Build column sets for efficient lookup (case-insensitive)
         mask_cols = {c.lower() for c in policy.mask_columns}
         redact_cols = {c.lower() for c in policy.redact_columns}
@@ -102,6 +109,56 @@ class DataMasker:
 
         return masked_results
 
+    def apply_columnar(
+        self,
+        results: ColumnarResult,
+        policy: MaskingPolicy
+    ) -> ColumnarResult:
+        """Apply masking policy column-by-column.
+
+        Args:
+            results: Columnar query result
+            policy: Masking policy (mask, redact, hash columns)
+
+        Returns:
+            New ColumnarResult sharing all unmasked columns with the input
+        """
+        mask_cols = {c.lower() for c in policy.mask_columns}
+        redact_cols = {c.lower() for c in policy.redact_columns}
+        hash_cols = {c.lower() for c in policy.hash_columns}
+
+        drop = []
+        replace = {}
+        for name, column in zip(results.names, results.columns):
+            col_lower = name.lower()
+            if col_lower in redact_cols:
+                drop.append(name)
+            elif col_lower in mask_cols:
+                replace[name] = self._map_distinct(column, self._mask_value)
+            elif col_lower in hash_cols:
+                replace[name] = self._map_distinct(column, self._hash_value)
+
+        if not drop and not replace:
+            return results
+        return results.with_columns(replace=replace, drop=drop)
+
+    @staticmethod
+    def _map_distinct(column, fn: Callable[[Any], Any]) -> List[Any]:
+        """Apply fn once per distinct value of a column (NumPy array or list)."""
+        values = column.tolist() if hasattr(column, "tolist") else column
+        memo: Dict[Any, Any] = {}
+        out = []
+        for value in values:
+            try:
+                mapped = memo[value]
+            except KeyError:
+                mapped = memo[value] = fn(value)
+            except TypeError:
+                # Unhashable value (JSON/array column)
+                mapped = fn(value)
+            out.append(mapped)
+        return out
+
     def _mask_value(self, value: Any) -> str:
         """Mask a value while preserving type hint.
 
@@ -212,9 +269,12 @@ class DataMasker:
         if not results:
             return {"rows": 0, "masked": [], "redacted": [], "hashed": []}
 
-        all_columns = set()
-        for row in results:
-            all_columns.update(row.keys())
+        if isinstance(results, ColumnarResult):
+            all_columns = set(results.names)
+        else:
+            all_columns = set()
+            for row in results:
+                all_columns.update(row.keys())
 
         masked = []
         redacted = []
@@ -6,15 +6,21 @@ Executes SQL queries with safety guarantees:
 - Row limits
 - Timeout handling
 - Error recovery
+
+Rows are fetched through server-side cursors (yield_per) in chunks and
+stored column-wise (ColumnarResult) instead of one dict per row.
 """
 
+import itertools
 import logging
 import time
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 from sqlalchemy import text
 from sqlalchemy.engine import Engine
 
+from dbnotebook.core.config import get_config_value
+from dbnotebook.core.sql_chat.result_set import ColumnarResult
 from dbnotebook.core.sql_chat.types import (
     ColumnInfo,
     QueryResult,
@@ -40,16 +46,26 @@ class SafeQueryExecutor:
     def __init__(
         self,
         max_rows: int = 10000,
-        query_timeout_seconds: int = 30
+        query_timeout_seconds: int = 30,
+        fetch_chunk_rows: Optional[int] = None,
+        max_stream_rows: Optional[int] = None
     ):
         """Initialize safe query executor.
 
         Args:
             max_rows: Maximum rows to return
             query_timeout_seconds: Query timeout in seconds
+            fetch_chunk_rows: Rows per server-side cursor fetch
+            max_stream_rows: Row cap for streamed (exported) results
         """
         self.max_rows = max_rows
         self.query_timeout_seconds = query_timeout_seconds
+        self.fetch_chunk_rows = fetch_chunk_rows or get_config_value(
+            "sql_chat", "query", "fetch_chunk_rows", default=1000
+        )
+        self.max_stream_rows = max_stream_rows or get_config_value(
+            "sql_chat", "query", "max_stream_rows", default=1000000
+        )
         self._validator = QueryValidator()
 
     def execute_readonly(
@@ -90,22 +106,22 @@ class SafeQueryExecutor:
 
         try:
             with engine.connect() as conn:
-                # Set statement timeout (PostgreSQL specific)
-                if engine.dialect.name == 'postgresql':
-                    timeout_ms = self.query_timeout_seconds * 1000
-                    conn.execute(text(f"SET statement_timeout = {timeout_ms}"))
-
-                # Execute query
-                result = conn.execute(text(sql_with_limit), params or {})
+                self._set_timeout(conn)
 
-                # Fetch all rows (up to limit)
-                rows = result.fetchall()
+                # Execute with a server-side cursor and transpose each
+                # fetched chunk straight into column buffers
+                result = conn.execution_options(yield_per=self.fetch_chunk_rows).execute(
+                    text(sql_with_limit), params or {}
+                )
+                partitions = result.partitions(self.fetch_chunk_rows)
+                first = next(partitions, [])
 
-                # Get column info
+                # Get column info (available once the cursor has fetched)
                 columns = self._extract_column_info(result)
 
-                # Convert to dicts
-                data = [dict(row._mapping) for row in rows]
+                data = ColumnarResult.from_chunks(
+                    list(result.keys()), itertools.chain([first], partitions)
+                )
 
                 # IMPORTANT: Do NOT commit - rollback to ensure read-only
                 conn.rollback()
@@ -123,13 +139,7 @@ class SafeQueryExecutor:
 
         except Exception as e:
             execution_time_ms = (time.time() - start_time) * 1000
-            error_message = str(e)
-
-            # Check for common error types
-            if "statement_timeout" in error_message.lower():
-                error_message = f"Query timed out after {self.query_timeout_seconds} seconds"
-            elif "permission denied" in error_message.lower():
-                error_message = "Permission denied - check database user permissions"
+            error_message = self._friendly_error(e)
 
             logger.error(f"Query execution failed: {error_message}")
 
@@ -143,11 +153,89 @@ class SafeQueryExecutor:
                 error_message=error_message,
             )
 
-    def _ensure_limit(self, sql: str) -> str:
+    def stream_readonly(
+        self,
+        engine: Engine,
+        sql: str,
+        params: Optional[Dict[str, Any]] = None,
+        chunk_rows: Optional[int] = None
+    ) -> Tuple[List[ColumnInfo], Iterator[ColumnarResult]]:
+        """Execute a read-only query and stream results in columnar chunks.
+
+        The first chunk is fetched before returning, so errors surface here
+        and time-to-first-row does not depend on the total row count. The
+        connection stays open until the iterator is exhausted or closed.
+
+        Args:
+            engine: SQLAlchemy engine
+            sql: SQL query to execute
+            params: Optional query parameters
+            chunk_rows: Rows per chunk (default fetch_chunk_rows)
+
+        Returns:
+            Tuple of (column info, iterator of ColumnarResult chunks)
+
+        Raises:
+            ValueError: If the SQL fails validation or execution
+        """
+        is_valid, error = self._validator.validate_generated_sql(sql)
+        if not is_valid:
+            raise ValueError(error)
+
+        chunk_rows = chunk_rows or self.fetch_chunk_rows
+        sql_with_limit = self._ensure_limit(sql, self.max_stream_rows)
+
+        conn = engine.connect()
+        try:
+            self._set_timeout(conn)
+            result = conn.execution_options(yield_per=chunk_rows).execute(
+                text(sql_with_limit), params or {}
+            )
+            partitions = result.partitions(chunk_rows)
+            first = next(partitions, [])
+            columns = self._extract_column_info(result)
+            names = list(result.keys())
+        except Exception as e:
+            conn.close()
+            raise ValueError(self._friendly_error(e)) from e
+
+        def _chunks() -> Iterator[ColumnarResult]:
+            try:
+                for rows in itertools.chain([first], partitions):
+                    if rows:
+                        yield ColumnarResult.from_rows(names, rows)
+            finally:
+                # Read-only: never commit
+                try:
+                    conn.rollback()
+                finally:
+                    conn.close()
+
+        return columns, _chunks()
+
+    def _set_timeout(self, conn) -> None:
+        """Set statement timeout (PostgreSQL specific)."""
+        if conn.dialect.name == 'postgresql':
+            timeout_ms = self.query_timeout_seconds * 1000
+            conn.execute(text(f"SET statement_timeout = {timeout_ms}"))
+
+    def _friendly_error(self, e: Exception) -> str:
+        """Map common database errors to user-facing messages."""
+        error_message = str(e)
+
+        # Check for common error types
+        if "statement_timeout" in error_message.lower():
+            error_message = f"Query timed out after {self.query_timeout_seconds} seconds"
+        elif "permission denied" in error_message.lower():
+            error_message = "Permission denied - check database user permissions"
+        return error_message
+
+    def _ensure_limit(self, sql: str, max_rows: Optional[int] = None) -> str:
         """Add LIMIT clause if not present.
 
         Args:
             sql: SQL query
+            max_rows: Limit to add (default max_rows)
 
         Returns:
             SQL with LIMIT added if needed
@@ -160,7 +248,7 @@ class SafeQueryExecutor:
 
         # Add LIMIT to prevent unbounded results
         sql_trimmed = sql.rstrip().rstrip(';')
-        return f"{sql_trimmed} LIMIT {self.max_rows}"
+        return f"{sql_trimmed} LIMIT {max_rows or self.max_rows}"
 
     def _extract_column_info(self, result) -> List[ColumnInfo]:
         """Extract column metadata from result.
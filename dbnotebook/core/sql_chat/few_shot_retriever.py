@@ -4,17 +4,23 @@ Few-Shot Retriever for Chat with Data.
 Retrieves similar SQL examples from local PGVectorStore for few-shot prompting.
 Supports:
 - Pure vector similarity search (default)
-- Hybrid BM25+vector search with optional reranking (RAG integration)
+- Hybrid BM25+vector search with optional reranking (RAG integration):
+  top-N by ANN (vector index) and top-N by full-text search (GIN index on
+  the stored search_tsv column), fused with Reciprocal Rank Fusion
 - Domain and complexity filtering
+- LRU cache of query embeddings for repeated questions
 """
 
 import logging
 import os
+import threading
+from collections import OrderedDict
 from typing import List, Optional
 
 from sqlalchemy import text
 
 from dbnotebook.core.config import get_config_value
+from dbnotebook.core.sql_chat.few_shot_setup import FewShotSetup
 from dbnotebook.core.sql_chat.types import FewShotExample
 
 logger = logging.getLogger(__name__)
@@ -39,6 +45,14 @@ def _get_rag_config() -> dict:
         "rerank_top_k": get_config_value("sql_chat", "few_shot", "rag_integration", "rerank_top_k", default=15),
         "bm25_weight": get_config_value("sql_chat", "few_shot", "rag_integration", "weights", "bm25", default=0.3),
         "vector_weight": get_config_value("sql_chat", "few_shot", "rag_integration", "weights", "vector", default=0.7),
+        "candidates": get_config_value("sql_chat", "few_shot", "rag_integration", "candidates", default=50),
+        "rrf_k": get_config_value("sql_chat", "few_shot", "rag_integration", "rrf_k", default=60),
+        "ivfflat_probes": get_config_value(
+            "sql_chat", "few_shot", "rag_integration", "ivfflat_probes", default=10
+        ),
+        "embedding_cache_size": get_config_value(
+            "sql_chat", "few_shot", "rag_integration", "embedding_cache_size", default=256
+        ),
     }
 
 
@@ -59,18 +73,24 @@ class FewShotRetriever:
         self,
         db_manager,
         embed_model,
+        use_reranker: Optional[bool] = None,
     ):
         """Initialize few-shot retriever.
 
         Args:
             db_manager: Database manager for PGVectorStore access
             embed_model: Embedding model for query embedding
+            use_reranker: Override rag_integration.use_reranker
         """
         self._db_manager = db_manager
         self._embed_model = embed_model
         self._examples_available: Optional[bool] = None  # Cache availability check
         self._rag_config = _get_rag_config()
+        if use_reranker is not None:
+            self._rag_config["use_reranker"] = use_reranker
         self._reranker = None
+        self._embedding_cache: "OrderedDict[str, list]" = OrderedDict()
+        self._embedding_cache_lock = threading.Lock()
 
         # Initialize reranker if enabled
         # Uses dedicated reranker if SQL_RERANKER_MODEL is set, otherwise shared
@@ -122,6 +142,42 @@ class FewShotRetriever:
 
         return self._examples_available
 
+    def _embed_query(self, query: str) -> list:
+        """Embed a query, reusing embeddings of recently seen queries.
+
+        SQL Chat retrieves examples more than once per question (generation
+        and confidence scoring), and analysts often repeat questions.
+        """
+        max_size = self._rag_config["embedding_cache_size"]
+        with self._embedding_cache_lock:
+            embedding = self._embedding_cache.get(query)
+            if embedding is not None:
+                self._embedding_cache.move_to_end(query)
+                return embedding
+
+        embedding = self._embed_model.get_text_embedding(query)
+
+        if max_size > 0:
+            with self._embedding_cache_lock:
+                self._embedding_cache[query] = embedding
+                while len(self._embedding_cache) > max_size:
+                    self._embedding_cache.popitem(last=False)
+        return embedding
+
+    def _set_ivfflat_probes(self, session, filtered: bool) -> None:
+        """Set ivfflat.probes for the rest of the session's transaction.
+
+        IVFFlat applies WHERE filters after scanning the probed lists, so a
+        domain or complexity filter over a few lists can leave far fewer rows
+        than requested. Filtered searches probe every list (exact); unfiltered
+        ones use the configured probe count.
+        """
+        probes = FewShotSetup.IVFFLAT_LISTS if filtered else self._rag_config["ivfflat_probes"]
+        session.execute(
+            text("SELECT set_config('ivfflat.probes', :probes, true)"),
+            {"probes": str(max(1, probes))},
+        )
+
     def _hybrid_search(
         self,
         query: str,
@@ -130,10 +186,13 @@ class FewShotRetriever:
         domain_hint: Optional[str] = None,
         complexity_hint: Optional[str] = None,
     ) -> List[FewShotExample]:
-        """Perform hybrid BM25+vector search.
+        """Perform hybrid BM25+vector search with Reciprocal Rank Fusion.
 
-        Uses PostgreSQL full-text search for keyword matching (BM25-like)
-        combined with vector similarity for semantic matching.
+        Builds two small candidate sets instead of scoring the whole table:
+        top-N by vector distance (served by the IVFFlat index, see
+        _set_ivfflat_probes for filtered searches) and top-N by
+        ts_rank over the stored, GIN-indexed search_tsv column. Candidates
+        are fused with weighted RRF: w / (rrf_k + rank) summed per list.
 
         Args:
             query: User's natural language query
@@ -143,74 +202,83 @@ class FewShotRetriever:
             complexity_hint: Optional complexity filter
 
         Returns:
-            List of FewShotExample with combined scores
+            List of FewShotExample ordered by fused rank (similarity holds
+            the cosine similarity, so thresholds keep their meaning)
         """
         embedding_str = "[" + ",".join(str(x) for x in query_embedding) + "]"
         bm25_weight = self._rag_config["bm25_weight"]
         vector_weight = self._rag_config["vector_weight"]
         rerank_top_k = self._rag_config["rerank_top_k"] if self._reranker else top_k
+        candidates = max(self._rag_config["candidates"], rerank_top_k)
 
-        # Build hybrid search SQL
-        # Uses PostgreSQL ts_rank for BM25-like ranking with full-text search
-        # Combines with vector similarity using weighted average
-        domain_filter = ""
-        complexity_filter = ""
+        filters = ""
         params = {
             "embedding": embedding_str,
             "query": query,
             "bm25_weight": bm25_weight,
             "vector_weight": vector_weight,
+            "rrf_k": self._rag_config["rrf_k"],
+            "candidates": candidates,
             "limit": rerank_top_k,
         }
 
         if domain_hint:
-            domain_filter = "AND (domain = :domain OR domain = 'general')"
+            filters += " AND (domain = :domain OR domain = 'general')"
             params["domain"] = domain_hint.lower()
 
         if complexity_hint:
-            complexity_filter = "AND complexity = :complexity"
+            filters += " AND complexity = :complexity"
             params["complexity"] = complexity_hint
 
         sql = f"""
-            WITH scored AS (
+            WITH ann AS (
+                SELECT id, row_number() OVER (ORDER BY distance) AS rank
+                FROM (
+                    SELECT id, embedding <=> CAST(:embedding AS vector) AS distance
+                    FROM sql_few_shot_examples
+                    WHERE embedding IS NOT NULL {filters}
+                    ORDER BY embedding <=> CAST(:embedding AS vector)
+                    LIMIT :candidates
+                ) nearest
+            ),
+            fts AS (
+                SELECT id, bm25_score, row_number() OVER (ORDER BY bm25_score DESC) AS rank
+                FROM (
+                    SELECT id, ts_rank(search_tsv, q) AS bm25_score
+                    FROM sql_few_shot_examples, plainto_tsquery('english', :query) q
+                    WHERE search_tsv @@ q {filters}
+                    ORDER BY bm25_score DESC
+                    LIMIT :candidates
+                ) matched
+            ),
+            fused AS (
                 SELECT
-                    id,
-                    sql_prompt,
-                    sql_query,
-                    sql_context,
-                    complexity,
-                    domain,
-                    -- BM25-like score using PostgreSQL full-text search
-                    ts_rank(
-                        to_tsvector('english', sql_prompt || ' ' || COALESCE(sql_query, '')),
-                        plainto_tsquery('english', :query)
-                    ) as bm25_score,
-                    -- Vector similarity score (cosine similarity)
-                    1 - (embedding <=> CAST(:embedding AS vector)) as vector_score
-                FROM sql_few_shot_examples
-                WHERE embedding IS NOT NULL
-                {domain_filter}
-                {complexity_filter}
+                    COALESCE(ann.id, fts.id) AS id,
+                    COALESCE(fts.bm25_score, 0) AS bm25_score,
+                    COALESCE(:vector_weight / (:rrf_k + ann.rank), 0)
+                        + COALESCE(:bm25_weight / (:rrf_k + fts.rank), 0) AS rrf_score
+                FROM ann
+                FULL OUTER JOIN fts ON ann.id = fts.id
             )
             SELECT
-                id,
-                sql_prompt,
-                sql_query,
-                sql_context,
-                complexity,
-                domain,
-                bm25_score,
-                vector_score,
-                -- Combined hybrid score using weighted average
-                -- Normalize BM25 score (typically 0-1 range with ts_rank)
-                (LEAST(bm25_score, 1.0) * :bm25_weight + vector_score * :vector_weight) as similarity
-            FROM scored
-            ORDER BY similarity DESC
+                e.id,
+                e.sql_prompt,
+                e.sql_query,
+                e.sql_context,
+                e.complexity,
+                e.domain,
+                f.bm25_score,
+                f.rrf_score,
+                COALESCE(1 - (e.embedding <=> CAST(:embedding AS vector)), 0) AS similarity
+            FROM fused f
+            JOIN sql_few_shot_examples e ON e.id = f.id
+            ORDER BY f.rrf_score DESC
             LIMIT :limit
         """
 
         try:
             with self._db_manager.get_session() as session:
+                self._set_ivfflat_probes(session, filtered=bool(filters))
                 result = session.execute(text(sql), params)
                 examples = []
                 for row in result:
@@ -226,7 +294,8 @@ class FewShotRetriever:
 
                 logger.debug(
                     f"Hybrid search retrieved {len(examples)} examples "
-                    f"(bm25_w={bm25_weight}, vector_w={vector_weight})"
+                    f"(RRF over {candidates} ANN + {candidates} FTS candidates, "
+                    f"bm25_w={bm25_weight}, vector_w={vector_weight})"
                 )
                 return examples
 
@@ -324,8 +393,8 @@ class FewShotRetriever:
             return []
 
         try:
-            # Embed the query
-            query_embedding = self._embed_model.get_text_embedding(query)
+            # Embed the query (cached for repeated questions)
+            query_embedding = self._embed_query(query)
 
             # Use hybrid search if RAG integration is enabled
             if self._rag_config["enabled"]:
@@ -427,6 +496,7 @@ class FewShotRetriever:
             }
 
         with self._db_manager.get_session() as session:
+            self._set_ivfflat_probes(session, filtered=bool(domain_hint or complexity_hint))
             result = session.execute(text(sql), params)
             examples = []
             for row in result:
@@ -33,6 +33,7 @@ class FewShotSetup:
     DATASET_NAME = "gretelai/synthetic_text_to_sql"
     BATCH_SIZE = 100  # Embedding batch size
     MIN_REQUIRED_EXAMPLES = 50000  # Minimum for setup to be considered complete
+    IVFFLAT_LISTS = 100  # Lists in the embedding index (probing all of them is exact)
 
     def __init__(
         self,
@@ -177,7 +178,8 @@ class FewShotSetup:
                 else:
                     logger.debug(f"Embedding column already has correct dimension: {required_dim}")
 
-                # Ensure IVFFlat index exists
+                # Ensure full-text column and IVFFlat index exist
+                self._ensure_search_column(session)
                 self._ensure_vector_index(session)
                 return True
 
@@ -185,6 +187,32 @@ class FewShotSetup:
             logger.error(f"Failed to ensure embedding column: {e}")
             return False
 
+    def _ensure_search_column(self, session) -> None:
+        """Create the stored full-text column and its GIN index if missing.
+
+        search_tsv is a generated column, so inserts need no changes and
+        hybrid search never parses text at query time.
+
+        Args:
+            session: Database session
+        """
+        try:
+            session.execute(text("""
+                ALTER TABLE sql_few_shot_examples
+                ADD COLUMN IF NOT EXISTS search_tsv tsvector
+                GENERATED ALWAYS AS (
+                    to_tsvector('english', sql_prompt || ' ' || COALESCE(sql_query, ''))
+                ) STORED
+            """))
+            session.execute(text("""
+                CREATE INDEX IF NOT EXISTS idx_few_shot_search_tsv
+                ON sql_few_shot_examples USING GIN (search_tsv)
+            """))
+            session.commit()
+        except Exception as e:
+            logger.warning(f"Failed to create full-text search column: {e}")
+            session.rollback()
+
     def _ensure_vector_index(self, session) -> None:
         """Create IVFFlat index if it doesn't exist.
 
@@ -218,10 +246,10 @@ class FewShotSetup:
             logger.info("Creating IVFFlat vector index...")
             # Increase work memory for index creation
             session.execute(text("SET maintenance_work_mem = '256MB'"))
-            session.execute(text("""
+            session.execute(text(f"""
                 CREATE INDEX idx_few_shot_embedding ON sql_few_shot_examples
                 USING ivfflat (embedding vector_cosine_ops)
-                WITH (lists = 100)
+                WITH (lists = {self.IVFFLAT_LISTS})
             """))
             session.commit()
             logger.info("Vector index created successfully")
@@ -0,0 +1,302 @@
+"""
+Semantic NL→SQL Cache for Chat with Data.
+
+Two cache levels, both scoped to a connection and its schema fingerprint
+(so any schema change makes old entries unreachable):
+
+1. SQL cache: normalized question (exact) or embedding-similar question
+   -> validated SQL. A hit skips schema linking, dictionary retrieval and
+   LLM SQL generation/correction.
+2. Result cache (optional, short TTL): SQL -> unmasked rows plus the
+   generated explanation. A hit also skips execution and the explanation
+   LLM call.
+
+Caches are in-process, like SQL Chat sessions themselves.
+"""
+
+import logging
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from dbnotebook.core.config import get_config_value
+from dbnotebook.core.sql_chat.types import ColumnInfo, ConfidenceScore
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+_TRAILING_PUNCT = re.compile(r"[\s?.!;]+$")
+# Numbers and quoted strings must match exactly for a semantic hit
+# ("top 5 ..." must not reuse the SQL for "top 10 ...")
+_LITERALS = re.compile(r"\d+(?:\.\d+)?|'[^']*'|\"[^\"]*\"")
+
+
+@dataclass
+class CachedSQL:
+    """Validated SQL for a question."""
+    sql: str
+    question: str
+    embedding: Optional[np.ndarray] = None
+    confidence: Optional[ConfidenceScore] = None
+    literals: Tuple[str, ...] = ()
+    created_at: float = field(default_factory=time.time)
+    hits: int = 0
+    similarity: float = 1.0  # Set on lookup (1.0 for exact matches)
+
+
+@dataclass
+class CachedResult:
+    """Executed result for a SQL statement (before masking)."""
+    data: Sequence[Dict[str, Any]]
+    columns: List[ColumnInfo]
+    row_count: int
+    explanation: Optional[str]
+    expires_at: float
+
+
+class SQLQueryCache:
+    """Two-level NL→SQL / SQL→result cache keyed by connection + schema fingerprint."""
+
+    def __init__(
+        self,
+        embed_model=None,
+        max_entries: Optional[int] = None,
+        similarity_threshold: Optional[float] = None,
+        result_cache_enabled: Optional[bool] = None,
+        result_ttl_seconds: Optional[int] = None,
+        result_max_entries: Optional[int] = None,
+        result_max_rows: Optional[int] = None
+    ):
+        """Initialize the query cache.
+
+        Args:
+            embed_model: Embedding model for similar-question matching
+                (exact normalized matching only if None)
+            max_entries: Maximum cached questions (LRU)
+            similarity_threshold: Cosine similarity needed for a semantic hit
+            result_cache_enabled: Enable the level-2 result cache
+            result_ttl_seconds: Result cache TTL
+            result_max_entries: Maximum cached results (LRU)
+            result_max_rows: Larger results are not cached
+        """
+        def cfg(*keys, default):
+            return get_config_value("sql_chat", "query_cache", *keys, default=default)
+
+        self.enabled = cfg("enabled", default=True)
+        self._embed_model = embed_model if cfg("semantic_matching", default=True) else None
+        self._max_entries = max_entries or cfg("max_entries", default=1000)
+        self._threshold = similarity_threshold or cfg("similarity_threshold", default=0.95)
+        self._result_enabled = (
+            result_cache_enabled if result_cache_enabled is not None
+            else cfg("result_cache", "enabled", default=True)
+        )
+        self._result_ttl = result_ttl_seconds or cfg("result_cache", "ttl_seconds", default=120)
+        self._result_max_entries = result_max_entries or cfg("result_cache", "max_entries", default=200)
+        self._result_max_rows = result_max_rows or cfg("result_cache", "max_rows", default=10000)
+
+        # (connection_id, fingerprint, normalized question) -> CachedSQL
+        self._sql: "OrderedDict[Tuple[str, str, str], CachedSQL]" = OrderedDict()
+        # (connection_id, fingerprint, sql) -> CachedResult
+        self._results: "OrderedDict[Tuple[str, str, str], CachedResult]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {
+            "sql_hits": 0,
+            "sql_semantic_hits": 0,
+            "sql_misses": 0,
+            "result_hits": 0,
+            "result_misses": 0,
+        }
+
+    @staticmethod
+    def normalize(question: str) -> str:
+        """Normalize a question for exact matching."""
+        return _TRAILING_PUNCT.sub("", _WHITESPACE.sub(" ", question.strip().lower()))
+
+    @staticmethod
+    def literals(question: str) -> Tuple[str, ...]:
+        """Sorted numeric and quoted literals in a question."""
+        return tuple(sorted(_LITERALS.findall(question.lower())))
+
+    def embed(self, question: str) -> Optional[np.ndarray]:
+        """Unit-normalized question embedding (None if unavailable)."""
+        if self._embed_model is None:
+            return None
+        try:
+            vec = np.asarray(self._embed_model.get_query_embedding(question), dtype=np.float32)
+            norm = np.linalg.norm(vec)
+            return vec / norm if norm else None
+        except Exception as e:
+            logger.debug(f"Query cache embedding failed: {e}")
+            return None
+
+    # ========== Level 1: question -> SQL ==========
+
+    def lookup_sql(
+        self,
+        connection_id: str,
+        fingerprint: str,
+        question: str
+    ) -> Tuple[Optional[CachedSQL], Optional[np.ndarray]]:
+        """Find cached SQL for a question.
+
+        Returns:
+            Tuple of (cache entry or None, question embedding if one was
+            computed - pass it to put_sql to avoid re-embedding)
+        """
+        if not self.enabled or not fingerprint:
+            return None, None
+
+        key = (connection_id, fingerprint, self.normalize(question))
+        with self._lock:
+            entry = self._sql.get(key)
+            if entry is not None:
+                self._sql.move_to_end(key)
+                entry.hits += 1
+                entry.similarity = 1.0
+                self._stats["sql_hits"] += 1
+                return entry, None
+            literals = self.literals(question)
+            candidates = [
+                (k, e) for k, e in self._sql.items()
+                if k[0] == connection_id and k[1] == fingerprint
+                and e.embedding is not None and e.literals == literals
+            ]
+
+        embedding = self.embed(question)
+        if embedding is not None and candidates:
+            matrix = np.stack([e.embedding for _, e in candidates])
+            scores = matrix @ embedding
+            best = int(np.argmax(scores))
+            if scores[best] >= self._threshold:
+                best_key, entry = candidates[best]
+                with self._lock:
+                    if best_key in self._sql:
+                        self._sql.move_to_end(best_key)
+                    entry.hits += 1
+                    entry.similarity = float(scores[best])
+                    self._stats["sql_hits"] += 1
+                    self._stats["sql_semantic_hits"] += 1
+                logger.debug(
+                    f"Query cache semantic hit ({entry.similarity:.3f}): "
+                    f"'{question[:50]}' ~ '{entry.question[:50]}'"
+                )
+                return entry, embedding
+
+        with self._lock:
+            self._stats["sql_misses"] += 1
+        return None, embedding
+
+    def put_sql(
+        self,
+        connection_id: str,
+        fingerprint: str,
+        question: str,
+        sql: str,
+        confidence: Optional[ConfidenceScore] = None,
+        embedding: Optional[np.ndarray] = None
+    ) -> None:
+        """Cache validated SQL for a question."""
+        if not self.enabled or not fingerprint or not sql:
+            return
+        if embedding is None:
+            embedding = self.embed(question)
+
+        key = (connection_id, fingerprint, self.normalize(question))
+        with self._lock:
+            self._sql[key] = CachedSQL(
+                sql=sql,
+                question=question,
+                embedding=embedding,
+                confidence=confidence,
+                literals=self.literals(question),
+            )
+            self._sql.move_to_end(key)
+            while len(self._sql) > self._max_entries:
+                self._sql.popitem(last=False)
+
+    def discard_sql(self, entry: CachedSQL) -> None:
+        """Drop a cached question (e.g. its SQL failed on re-execution)."""
+        with self._lock:
+            for key in [k for k, e in self._sql.items() if e is entry]:
+                del self._sql[key]
+
+    # ========== Level 2: SQL -> result ==========
+
+    def get_result(self, connection_id: str, fingerprint: str, sql: str) -> Optional[CachedResult]:
+        """Get a fresh cached result for SQL (None if disabled, missing or expired)."""
+        if not self.enabled or not self._result_enabled or not fingerprint:
+            return None
+        key = (connection_id, fingerprint, sql)
+        with self._lock:
+            entry = self._results.get(key)
+            if entry is not None and entry.expires_at > time.time():
+                self._results.move_to_end(key)
+                self._stats["result_hits"] += 1
+                return entry
+            if entry is not None:
+                del self._results[key]
+            self._stats["result_misses"] += 1
+        return None
+
+    def put_result(
+        self,
+        connection_id: str,
+        fingerprint: str,
+        sql: str,
+        data: Sequence[Dict[str, Any]],
+        columns: List[ColumnInfo],
+        row_count: int,
+        explanation: Optional[str] = None
+    ) -> None:
+        """Cache an executed (unmasked) result for a short TTL."""
+        if not self.enabled or not self._result_enabled or not fingerprint:
+            return
+        if row_count > self._result_max_rows:
+            return
+        key = (connection_id, fingerprint, sql)
+        with self._lock:
+            self._results[key] = CachedResult(
+                data=data,
+                columns=columns,
+                row_count=row_count,
+                explanation=explanation,
+                expires_at=time.time() + self._result_ttl,
+            )
+            self._results.move_to_end(key)
+            while len(self._results) > self._result_max_entries:
+                self._results.popitem(last=False)
+
+    # ========== Maintenance ==========
+
+    def invalidate(self, connection_id: str) -> int:
+        """Drop all entries for a connection (schema refresh, connection change).
+
+        Returns:
+            Number of entries removed
+        """
+        with self._lock:
+            sql_keys = [k for k in self._sql if k[0] == connection_id]
+            result_keys = [k for k in self._results if k[0] == connection_id]
+            for k in sql_keys:
+                del self._sql[k]
+            for k in result_keys:
+                del self._results[k]
+        removed = len(sql_keys) + len(result_keys)
+        if removed:
+            logger.debug(f"Query cache invalidated {removed} entries for {connection_id}")
+        return removed
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["sql_entries"] = len(self._sql)
+            stats["result_entries"] = len(self._results)
+        lookups = stats["sql_hits"] + stats["sql_misses"]
+        stats["sql_hit_rate"] = round(stats["sql_hits"] / lookups, 3) if lookups else 0.0
+        return stats
@@ -0,0 +1,268 @@
+"""
+Columnar query results for Chat with Data.
+
+Stores SQL results column-by-column instead of one dict per row:
+- Homogeneous int/float/bool columns are packed into NumPy arrays
+- Other columns stay as plain lists (shared, not copied, by masking)
+- Rows are materialized as dicts only on access, so existing consumers
+  (validators, response generation, JSON routes) keep working
+
+Also provides NDJSON and Arrow IPC encoders for streaming results to clients.
+"""
+
+import io
+import json
+import logging
+from collections.abc import Sequence
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# NumPy dtypes used for packing columns whose values are all the same scalar type
+_PACKED_DTYPES = (
+    (bool, np.bool_),
+    (int, np.int64),
+    (float, np.float64),
+)
+
+Column = Union[np.ndarray, List[Any]]
+
+
+def _pack_column(values: List[Any]) -> Column:
+    """Pack a column into a NumPy array when every value shares one scalar type."""
+    if not values:
+        return values
+    first = type(values[0])
+    for py_type, dtype in _PACKED_DTYPES:
+        if first is py_type and all(type(v) is py_type for v in values):
+            try:
+                return np.asarray(values, dtype=dtype)
+            except OverflowError:
+                return values
+    return values
+
+
+def _to_python(value: Any) -> Any:
+    """Convert NumPy scalars back to Python scalars for JSON and dict rows."""
+    return value.item() if isinstance(value, np.generic) else value
+
+
+class ColumnarResult(Sequence):
+    """Column-oriented query result that behaves like a list of row dicts.
+
+    Attributes:
+        names: Column names in result order
+        columns: One column (NumPy array or list) per name
+    """
+
+    def __init__(self, names: List[str], columns: List[Column]):
+        if len(names) != len(columns):
+            raise ValueError("names and columns must have the same length")
+        self.names = list(names)
+        self.columns = list(columns)
+        self._length = len(columns[0]) if columns else 0
+
+    # ========== Construction ==========
+
+    @classmethod
+    def from_rows(cls, names: List[str], rows: Iterable[Iterable[Any]]) -> "ColumnarResult":
+        """Build from row tuples (e.g. a fetchmany() chunk)."""
+        buffers: List[List[Any]] = [[] for _ in names]
+        appends = [buf.append for buf in buffers]
+        for row in rows:
+            for append, value in zip(appends, row):
+                append(value)
+        return cls(names, [_pack_column(buf) for buf in buffers])
+
+    @classmethod
+    def from_chunks(cls, names: List[str], chunks: Iterable[Iterable[Iterable[Any]]]) -> "ColumnarResult":
+        """Build from a stream of row chunks (server-side cursor partitions).
+
+        Rows are transposed into per-column buffers as each chunk arrives, so
+        only one chunk of row tuples is alive at a time.
+        """
+        buffers: List[List[Any]] = [[] for _ in names]
+        appends = [buf.append for buf in buffers]
+        for chunk in chunks:
+            for row in chunk:
+                for append, value in zip(appends, row):
+                    append(value)
+        return cls(names, [_pack_column(buf) for buf in buffers])
+
+    @classmethod
+    def from_records(cls, records: List[Dict[str, Any]]) -> "ColumnarResult":
+        """Build from a list of row dicts (keys of the first row define columns)."""
+        if not records:
+            return cls([], [])
+        names = list(records[0].keys())
+        return cls.from_rows(names, ([row.get(n) for n in names] for row in records))
+
+    # ========== Sequence of row dicts ==========
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._row(i) for i in range(*index.indices(self._length))]
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("row index out of range")
+        return self._row(index)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for i in range(self._length):
+            yield self._row(i)
+
+    def __bool__(self) -> bool:
+        return self._length > 0
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, (list, ColumnarResult)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"ColumnarResult(columns={self.names}, rows={self._length})"
+
+    def _row(self, i: int) -> Dict[str, Any]:
+        return {name: _to_python(col[i]) for name, col in zip(self.names, self.columns)}
+
+    def to_records(self) -> List[Dict[str, Any]]:
+        """Materialize all rows as dicts (JSON responses)."""
+        py_columns = [col.tolist() if isinstance(col, np.ndarray) else col for col in self.columns]
+        return [dict(zip(self.names, values)) for values in zip(*py_columns)]
+
+    # ========== Column operations ==========
+
+    def column(self, name: str) -> Column:
+        """Get a column by name."""
+        return self.columns[self.names.index(name)]
+
+    def with_columns(
+        self,
+        replace: Optional[Dict[str, Column]] = None,
+        drop: Optional[Iterable[str]] = None
+    ) -> "ColumnarResult":
+        """New result with some columns replaced or dropped (others are shared)."""
+        replace = replace or {}
+        drop = set(drop or [])
+        names, columns = [], []
+        for name, col in zip(self.names, self.columns):
+            if name in drop:
+                continue
+            names.append(name)
+            columns.append(replace.get(name, col))
+        return ColumnarResult(names, columns)
+
+    def nbytes(self) -> int:
+        """Approximate memory held by column containers (excluding shared objects)."""
+        total = 0
+        for col in self.columns:
+            if isinstance(col, np.ndarray):
+                total += col.nbytes
+            else:
+                total += 8 * len(col) + 56
+        return total
+
+    # ========== Streaming encoders ==========
+
+    def iter_ndjson(
+        self,
+        encoder: Optional[json.JSONEncoder] = None,
+        chunk_rows: int = 1000
+    ) -> Iterator[str]:
+        """Yield NDJSON text, one string per chunk_rows rows.
+
+        Args:
+            encoder: JSON encoder handling non-JSON types (UUID, Decimal, ...)
+            chunk_rows: Rows per yielded string
+        """
+        encoder = encoder or json.JSONEncoder()
+        for start in range(0, self._length, chunk_rows):
+            stop = min(start + chunk_rows, self._length)
+            py_columns = [
+                col[start:stop].tolist() if isinstance(col, np.ndarray) else col[start:stop]
+                for col in self.columns
+            ]
+            yield "".join(
+                encoder.encode(dict(zip(self.names, values))) + "\n"
+                for values in zip(*py_columns)
+            )
+
+    def to_arrow(self):
+        """Convert to a pyarrow RecordBatch (requires pyarrow)."""
+        import pyarrow as pa
+
+        arrays = []
+        for col in self.columns:
+            if isinstance(col, np.ndarray):
+                arrays.append(pa.array(col))
+                continue
+            try:
+                arrays.append(pa.array(col))
+            except (pa.ArrowInvalid, pa.ArrowTypeError):
+                # Mixed or unsupported types: ship as strings
+                arrays.append(pa.array([None if v is None else str(v) for v in col], type=pa.string()))
+        return pa.RecordBatch.from_arrays(arrays, names=self.names)
+
+
+def arrow_available() -> bool:
+    """Check whether pyarrow is installed for Arrow IPC streaming."""
+    try:
+        import pyarrow  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+class _DrainingSink(io.RawIOBase):
+    """Write-only file that hands back bytes written since the last drain."""
+
+    def __init__(self):
+        super().__init__()
+        self._parts: List[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._parts.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data, self._parts = b"".join(self._parts), []
+        return data
+
+
+def iter_arrow_ipc(chunks: Iterable[ColumnarResult]) -> Iterator[bytes]:
+    """Encode result chunks as an Arrow IPC stream, yielding bytes per chunk.
+
+    The schema is taken from the first chunk; later chunks are cast to it.
+    """
+    import pyarrow as pa
+
+    sink = _DrainingSink()
+    writer = None
+    for chunk in chunks:
+        batch = chunk.to_arrow()
+        if writer is None:
+            writer = pa.ipc.new_stream(sink, batch.schema)
+        elif batch.schema != writer.schema:
+            batch = pa.Table.from_batches([batch]).cast(writer.schema).to_batches()[0]
+        writer.write_batch(batch)
+        yield sink.drain()
+    if writer is not None:
+        writer.close()
+        tail = sink.drain()
+        if tail:
+            yield tail
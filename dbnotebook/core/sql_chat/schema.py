@@ -8,12 +8,16 @@ Includes fingerprinting for fast change detection.
 
 import hashlib
 import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from sqlalchemy import inspect, text
 from sqlalchemy.engine import Engine
 
+from dbnotebook.core.config import get_config_value
 from dbnotebook.core.sql_chat.types import (
     ColumnInfo,
     ForeignKey,
@@ -39,14 +43,30 @@ class SchemaIntrospector:
     - Balances accuracy with performance
     """
 
-    def __init__(self, cache_ttl_seconds: int = 300):
+    def __init__(
+        self,
+        cache_ttl_seconds: int = 300,
+        sample_workers: Optional[int] = None,
+        tablesample_min_rows: Optional[int] = None
+    ):
         """Initialize schema introspector.
 
         Args:
             cache_ttl_seconds: Cache TTL in seconds (default 5 minutes)
+            sample_workers: Threads (one pooled connection each) for per-table
+                sampling and row counts
+            tablesample_min_rows: Row estimate above which PostgreSQL samples
+                with TABLESAMPLE SYSTEM instead of reading the first rows
         """
         self._cache: Dict[str, Tuple[SchemaInfo, str, datetime]] = {}  # conn_id -> (schema, fingerprint, timestamp)
         self._cache_ttl = cache_ttl_seconds
+        self._sample_workers = sample_workers or get_config_value(
+            "sql_chat", "schema", "sample_workers", default=8
+        )
+        self._tablesample_min_rows = tablesample_min_rows or get_config_value(
+            "sql_chat", "schema", "tablesample_min_rows", default=100000
+        )
+        self._max_sample_values = get_config_value("sql_chat", "schema", "max_sample_values", default=5)
 
     def get_fingerprint(self, engine: Engine) -> str:
         """Get fast fingerprint for schema change detection (~10ms).
@@ -121,15 +141,22 @@ class SchemaIntrospector:
         engine: Engine,
         connection_id: str,
         force_refresh: bool = False,
-        include_samples: bool = False
+        include_samples: bool = False,
+        progress_callback: Optional[Callable[[str, int, int], None]] = None
     ) -> SchemaInfo:
         """Extract complete database schema with fingerprint-based caching.
 
+        Columns, keys and approximate row counts come from a handful of bulk
+        catalog queries (PostgreSQL, MySQL); other dialects fall back to
+        per-table inspection. Samples are fetched concurrently, one query
+        per table. Per-phase timings are recorded on SchemaInfo.timings.
+
         Args:
             engine: SQLAlchemy engine
             connection_id: Connection ID for caching
             force_refresh: Force full introspection even if fingerprint matches
             include_samples: Include sample values for columns (slow, default False)
+            progress_callback: Optional callback(phase, done, total)
 
         Returns:
             SchemaInfo with tables and relationships
@@ -150,16 +177,229 @@ class SchemaIntrospector:
                     logger.info(f"Schema fingerprint changed for {connection_id}, refreshing")
 
         logger.info(f"Introspecting schema for {connection_id}")
+        start = time.perf_counter()
+
+        tables, relationships, timings = self._load_catalog(engine, progress_callback)
+
+        if include_samples:
+            phase_start = time.perf_counter()
+            samples = self._map_tables(
+                engine,
+                tables,
+                lambda conn, table: self._sample_table(conn, table, self._max_sample_values),
+                phase="samples",
+                progress_callback=progress_callback,
+            )
+            for table in tables:
+                table.sample_values = samples.get(table.name) or {}
+            timings["samples_seconds"] = time.perf_counter() - phase_start
+
+        # Get database name
+        db_name = ""
+        try:
+            db_name = engine.url.database or ""
+        except Exception:
+            pass
+
+        # Cache schema with fingerprint
+        phase_start = time.perf_counter()
+        fingerprint = self.get_fingerprint(engine)
+        timings["fingerprint_seconds"] = time.perf_counter() - phase_start
+        timings["total_seconds"] = time.perf_counter() - start
+
+        schema = SchemaInfo(
+            tables=tables,
+            relationships=relationships,
+            cached_at=datetime.utcnow(),
+            database_name=db_name,
+            timings=timings,
+        )
+        self._cache[connection_id] = (schema, fingerprint, datetime.utcnow())
+
+        logger.info(
+            f"Schema introspected: {len(tables)} tables, {len(relationships)} relationships in "
+            f"{timings['total_seconds']:.2f}s ("
+            + ", ".join(f"{k[:-8]} {v:.2f}s" for k, v in timings.items() if k != "total_seconds")
+            + ")"
+        )
+
+        return schema
 
+    # ========== Bulk catalog queries ==========
+
+    def _load_catalog(
+        self,
+        engine: Engine,
+        progress_callback: Optional[Callable[[str, int, int], None]] = None
+    ) -> Tuple[List[TableInfo], List[ForeignKey], Dict[str, float]]:
+        """Load tables, columns, keys and row counts for the default schema.
+
+        Returns:
+            Tuple of (tables, relationships, phase timings)
+        """
+        dialect = engine.dialect.name
+        bulk = {
+            'postgresql': self._catalog_postgresql,
+            'mysql': self._catalog_mysql,
+        }.get(dialect)
+
+        if bulk is not None:
+            try:
+                with engine.connect() as conn:
+                    return bulk(conn, progress_callback)
+            except Exception as e:
+                logger.warning(f"Bulk catalog query failed on {dialect}, inspecting per table: {e}")
+
+        return self._catalog_generic(engine, progress_callback)
+
+    def _catalog_postgresql(self, conn, progress_callback=None):
+        """Three catalog statements: tables + row estimates, columns, PK/FK columns."""
+        timings: Dict[str, float] = {}
+
+        phase_start = time.perf_counter()
+        table_rows = conn.execute(text("""
+            SELECT c.relname,
+                   COALESCE(NULLIF(c.reltuples, -1)::bigint, s.n_live_tup),
+                   obj_description(c.oid, 'pg_class')
+            FROM pg_class c
+            JOIN pg_namespace n ON n.oid = c.relnamespace
+            LEFT JOIN pg_stat_user_tables s ON s.relid = c.oid
+            WHERE n.nspname = current_schema()
+            AND c.relkind IN ('r', 'p')
+            ORDER BY c.relname
+        """)).fetchall()
+        column_rows = conn.execute(text("""
+            SELECT c.relname, a.attname, format_type(a.atttypid, a.atttypmod),
+                   NOT a.attnotnull, col_description(c.oid, a.attnum)
+            FROM pg_class c
+            JOIN pg_namespace n ON n.oid = c.relnamespace
+            JOIN pg_attribute a ON a.attrelid = c.oid AND a.attnum > 0 AND NOT a.attisdropped
+            WHERE n.nspname = current_schema()
+            AND c.relkind IN ('r', 'p')
+            ORDER BY c.relname, a.attnum
+        """)).fetchall()
+        timings["catalog_seconds"] = time.perf_counter() - phase_start
+
+        phase_start = time.perf_counter()
+        key_rows = conn.execute(text("""
+            SELECT con.contype, c.relname, a.attname, rc.relname, ra.attname
+            FROM pg_constraint con
+            JOIN pg_class c ON c.oid = con.conrelid
+            JOIN pg_namespace n ON n.oid = c.relnamespace
+            CROSS JOIN LATERAL unnest(con.conkey, COALESCE(con.confkey, con.conkey))
+                WITH ORDINALITY AS k(attnum, ref_attnum, ord)
+            JOIN pg_attribute a ON a.attrelid = con.conrelid AND a.attnum = k.attnum
+            LEFT JOIN pg_class rc ON rc.oid = con.confrelid
+            LEFT JOIN pg_attribute ra ON ra.attrelid = con.confrelid AND ra.attnum = k.ref_attnum
+            WHERE n.nspname = current_schema()
+            AND con.contype IN ('p', 'f')
+            ORDER BY c.relname, con.conname, k.ord
+        """)).fetchall()
+        timings["keys_seconds"] = time.perf_counter() - phase_start
+
+        tables = self._build_tables(table_rows, column_rows)
+        relationships = self._apply_keys(tables, key_rows)
+        if progress_callback:
+            progress_callback("catalog", len(tables), len(tables))
+        return list(tables.values()), relationships, timings
+
+    def _catalog_mysql(self, conn, progress_callback=None):
+        """Three information_schema statements for the current database."""
+        timings: Dict[str, float] = {}
+
+        phase_start = time.perf_counter()
+        table_rows = conn.execute(text("""
+            SELECT table_name, table_rows, table_comment
+            FROM information_schema.tables
+            WHERE table_schema = DATABASE() AND table_type = 'BASE TABLE'
+            ORDER BY table_name
+        """)).fetchall()
+        column_rows = conn.execute(text("""
+            SELECT c.table_name, c.column_name, c.column_type,
+                   c.is_nullable = 'YES', NULLIF(c.column_comment, '')
+            FROM information_schema.columns c
+            JOIN information_schema.tables t
+              ON t.table_schema = c.table_schema AND t.table_name = c.table_name
+            WHERE c.table_schema = DATABASE() AND t.table_type = 'BASE TABLE'
+            ORDER BY c.table_name, c.ordinal_position
+        """)).fetchall()
+        timings["catalog_seconds"] = time.perf_counter() - phase_start
+
+        phase_start = time.perf_counter()
+        key_rows = conn.execute(text("""
+            SELECT CASE WHEN constraint_name = 'PRIMARY' THEN 'p' ELSE 'f' END,
+                   table_name, column_name, referenced_table_name, referenced_column_name
+            FROM information_schema.key_column_usage
+            WHERE table_schema = DATABASE()
+            AND (constraint_name = 'PRIMARY' OR referenced_table_name IS NOT NULL)
+            ORDER BY table_name, constraint_name, ordinal_position
+        """)).fetchall()
+        timings["keys_seconds"] = time.perf_counter() - phase_start
+
+        tables = self._build_tables(table_rows, column_rows)
+        relationships = self._apply_keys(tables, key_rows)
+        if progress_callback:
+            progress_callback("catalog", len(tables), len(tables))
+        return list(tables.values()), relationships, timings
+
+    @staticmethod
+    def _build_tables(table_rows, column_rows) -> Dict[str, TableInfo]:
+        """Assemble TableInfo objects from (name, row estimate, comment) and column rows."""
+        tables: Dict[str, TableInfo] = {}
+        for name, row_count, comment in table_rows:
+            tables[name] = TableInfo(
+                name=name,
+                columns=[],
+                row_count=int(row_count) if row_count is not None and row_count >= 0 else None,
+                comment=comment or None,
+            )
+        for table_name, col_name, col_type, nullable, comment in column_rows:
+            table = tables.get(table_name)
+            if table is not None:
+                table.columns.append(ColumnInfo(
+                    name=col_name,
+                    type=str(col_type).upper(),
+                    nullable=bool(nullable),
+                    primary_key=False,
+                    comment=comment,
+                ))
+        return tables
+
+    @staticmethod
+    def _apply_keys(tables: Dict[str, TableInfo], key_rows) -> List[ForeignKey]:
+        """Mark PK columns and FK references from (kind, table, column, ref_table, ref_column) rows."""
+        relationships: List[ForeignKey] = []
+        for kind, table_name, col_name, ref_table, ref_column in key_rows:
+            table = tables.get(table_name)
+            if table is None:
+                continue
+            column = next((c for c in table.columns if c.name == col_name), None)
+            if kind == 'p':
+                if column is not None:
+                    column.primary_key = True
+                continue
+            relationships.append(ForeignKey(
+                from_table=table_name,
+                from_column=col_name,
+                to_table=ref_table or '',
+                to_column=ref_column or '',
+            ))
+            if column is not None:
+                column.foreign_key = f"{ref_table or ''}.{ref_column or ''}"
+        return relationships
+
+    def _catalog_generic(self, engine: Engine, progress_callback=None):
+        """Per-table inspector path for dialects without a bulk catalog query (SQLite)."""
+        timings: Dict[str, float] = {}
         inspector = inspect(engine)
         tables: List[TableInfo] = []
         relationships: List[ForeignKey] = []
 
-        # Get all table names
+        phase_start = time.perf_counter()
         table_names = inspector.get_table_names()
         logger.debug(f"Found {len(table_names)} tables")
 
-        for table_name in table_names:
+        for i, table_name in enumerate(table_names):
             # Get columns
             columns = []
             for col in inspector.get_columns(table_name):
@@ -179,154 +419,174 @@ class SchemaIntrospector:
 
             # Get foreign keys
             for fk in inspector.get_foreign_keys(table_name):
-                for i, col in enumerate(fk.get('constrained_columns', [])):
+                for j, col in enumerate(fk.get('constrained_columns', [])):
                     ref_cols = fk.get('referred_columns', [])
-                    if i < len(ref_cols):
+                    if j < len(ref_cols):
                         relationships.append(ForeignKey(
                             from_table=table_name,
                             from_column=col,
                             to_table=fk.get('referred_table', ''),
-                            to_column=ref_cols[i],
+                            to_column=ref_cols[j],
                         ))
                         # Update column foreign key reference
                         for c in columns:
                             if c.name == col:
-                                c.foreign_key = f"{fk.get('referred_table', '')}.{ref_cols[i]}"
-
-            # Get row count (approximate for large tables)
-            row_count = self._get_row_count(engine, table_name)
-
-            # Get sample values only if requested (slow for remote DBs)
-            if include_samples:
-                sample_values = self._get_sample_values(engine, table_name, columns)
-            else:
-                sample_values = {}
-
-            tables.append(TableInfo(
-                name=table_name,
-                columns=columns,
-                row_count=row_count,
-                sample_values=sample_values,
-            ))
-
-        # Get database name
-        db_name = ""
-        try:
-            db_name = engine.url.database or ""
-        except Exception:
-            pass
-
-        schema = SchemaInfo(
-            tables=tables,
-            relationships=relationships,
-            cached_at=datetime.utcnow(),
-            database_name=db_name,
+                                c.foreign_key = f"{fk.get('referred_table', '')}.{ref_cols[j]}"
+
+            tables.append(TableInfo(name=table_name, columns=columns))
+            if progress_callback:
+                progress_callback("catalog", i + 1, len(table_names))
+        timings["catalog_seconds"] = time.perf_counter() - phase_start
+
+        phase_start = time.perf_counter()
+        counts = self._map_tables(
+            engine,
+            tables,
+            lambda conn, table: self._count_rows(conn, table),
+            phase="row_counts",
+            progress_callback=progress_callback,
         )
+        for table in tables:
+            table.row_count = counts.get(table.name)
+        timings["row_counts_seconds"] = time.perf_counter() - phase_start
 
-        # Cache schema with fingerprint
-        fingerprint = self.get_fingerprint(engine)
-        self._cache[connection_id] = (schema, fingerprint, datetime.utcnow())
-
-        logger.info(f"Schema introspected: {len(tables)} tables, {len(relationships)} relationships")
+        return tables, relationships, timings
 
-        return schema
+    # ========== Concurrent per-table queries ==========
 
-    def _get_row_count(self, engine: Engine, table_name: str) -> Optional[int]:
-        """Get approximate row count for table.
+    def _map_tables(
+        self,
+        engine: Engine,
+        tables: List[TableInfo],
+        fn: Callable[[Any, TableInfo], Any],
+        phase: str,
+        progress_callback: Optional[Callable[[str, int, int], None]] = None
+    ) -> Dict[str, Any]:
+        """Run fn(connection, table) for every table on a bounded thread pool.
 
-        Uses EXPLAIN for PostgreSQL (fast), COUNT(*) for others.
-
-        Args:
-            engine: SQLAlchemy engine
-            table_name: Table name
+        Each worker thread checks out one pooled connection and reuses it for
+        all of its tables. Failures are logged and the table is skipped.
 
         Returns:
-            Row count or None if unavailable
+            Mapping of table name -> fn result
         """
-        try:
-            dialect = engine.dialect.name
+        if not tables:
+            return {}
+
+        # SQLite connections are not shareable across threads
+        workers = 1 if engine.dialect.name == 'sqlite' else max(1, self._sample_workers)
+        workers = min(workers, len(tables))
+        local = threading.local()
+        opened: List[Any] = []
+        opened_lock = threading.Lock()
+
+        def _connection():
+            conn = getattr(local, "conn", None)
+            if conn is None:
+                conn = engine.connect()
+                local.conn = conn
+                with opened_lock:
+                    opened.append(conn)
+            return conn
+
+        def _run(table: TableInfo):
+            conn = _connection()
+            try:
+                return table.name, fn(conn, table)
+            except Exception as e:
+                logger.debug(f"{phase} failed for {table.name}: {e}")
+                try:
+                    conn.rollback()
+                except Exception:
+                    pass
+                return table.name, None
 
-            if dialect == 'postgresql':
-                # Use pg_class for fast approximate count
-                sql = text("""
-                    SELECT CAST(reltuples AS bigint) AS count
-                    FROM pg_class
-                    WHERE relname = :table_name
-                """)
-                with engine.connect() as conn:
-                    result = conn.execute(sql, {"table_name": table_name})
-                    row = result.fetchone()
-                    if row and row[0] > 0:
-                        return int(row[0])
+        results: Dict[str, Any] = {}
+        report_every = max(1, len(tables) // 10)
+        try:
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="schema") as pool:
+                for done, (name, value) in enumerate(pool.map(_run, tables), start=1):
+                    results[name] = value
+                    if progress_callback:
+                        progress_callback(phase, done, len(tables))
+                    if done % report_every == 0 or done == len(tables):
+                        logger.debug(f"Schema {phase}: {done}/{len(tables)} tables")
+        finally:
+            for conn in opened:
+                try:
+                    conn.close()
+                except Exception:
+                    pass
+        return results
 
-            # Fallback: actual count (limit for safety)
-            sql = text(f"SELECT COUNT(*) FROM {table_name}")  # noqa: S608
-            with engine.connect() as conn:
-                result = conn.execute(sql)
-                row = result.fetchone()
-                return int(row[0]) if row else None
+    def _count_rows(self, conn, table: TableInfo) -> Optional[int]:
+        """Exact row count (only used where the catalog has no estimate)."""
+        table_sql = conn.dialect.identifier_preparer.quote(table.name)
+        row = conn.execute(text(f"SELECT COUNT(*) FROM {table_sql}")).fetchone()  # noqa: S608
+        return int(row[0]) if row else None
 
-        except Exception as e:
-            logger.debug(f"Could not get row count for {table_name}: {e}")
-            return None
+    def _sample_table(self, conn, table: TableInfo, limit: int = 5) -> Dict[str, List[Any]]:
+        """Get up to limit distinct non-null values per column with one query.
 
-    def _get_sample_values(
-        self,
-        engine: Engine,
-        table_name: str,
-        columns: List[ColumnInfo],
-        limit: int = 5
-    ) -> Dict[str, List[Any]]:
-        """Get sample values for each column.
+        Reads a block of rows (TABLESAMPLE on large PostgreSQL tables so the
+        sample is spread across the table) and picks distinct values per
+        column client-side, instead of one SELECT DISTINCT per column.
 
         Useful for LLM context (e.g., "US" -> "United States" disambiguation).
-
-        Args:
-            engine: SQLAlchemy engine
-            table_name: Table name
-            columns: List of columns
-            limit: Number of sample values per column
-
-        Returns:
-            Dict mapping column name to list of sample values
         """
-        samples: Dict[str, List[Any]] = {}
+        # Skip only truly binary/large object columns
+        # NOTE: TEXT columns are allowed - they often contain valuable
+        # entity names (customer_name, employee_name, etc.) for SQL Chat
+        columns = [
+            col for col in table.columns
+            if not any(t in col.type.lower() for t in ['blob', 'bytea', 'clob', 'binary'])
+        ]
+        if not columns:
+            return {}
+
+        quote = conn.dialect.identifier_preparer.quote
+        select_list = ", ".join(quote(col.name) for col in columns)
+        table_sql = quote(table.name)
+        sample_rows = max(limit * 20, 100)
+
+        rows = []
+        if (conn.dialect.name == 'postgresql' and table.row_count
+                and table.row_count > self._tablesample_min_rows):
+            percent = min(100.0, max(0.001, 100.0 * sample_rows * 5 / table.row_count))
+            rows = conn.execute(
+                text(f"SELECT {select_list} FROM {table_sql} "  # noqa: S608
+                     f"TABLESAMPLE SYSTEM ({percent:.4f}) LIMIT :limit"),
+                {"limit": sample_rows}
+            ).fetchall()
+        if not rows:
+            rows = conn.execute(
+                text(f"SELECT {select_list} FROM {table_sql} LIMIT :limit"),  # noqa: S608
+                {"limit": sample_rows}
+            ).fetchall()
 
-        try:
-            # Get distinct values for each column (all columns, 5 rows each)
-            for col in columns:
-                # Skip only truly binary/large object columns
-                # NOTE: TEXT columns are allowed - they often contain valuable
-                # entity names (customer_name, employee_name, etc.) for SQL Chat
-                type_lower = col.type.lower()
-                if any(t in type_lower for t in ['blob', 'bytea', 'clob', 'binary']):
+        samples: Dict[str, List[Any]] = {}
+        for idx, col in enumerate(columns):
+            values: List[Any] = []
+            seen = set()
+            for row in rows:
+                val = row[idx]
+                if val is None:
                     continue
-
                 try:
-                    sql = text(f"""
-                        SELECT DISTINCT "{col.name}"
-                        FROM "{table_name}"
-                        WHERE "{col.name}" IS NOT NULL
-                        LIMIT :limit
-                    """)  # noqa: S608
-                    with engine.connect() as conn:
-                        result = conn.execute(sql, {"limit": limit})
-                        values = []
-                        for row in result:
-                            val = row[0]
-                            # Truncate long text values
-                            if isinstance(val, str) and len(val) > 50:
-                                val = val[:47] + "..."
-                            values.append(val)
-                        if values:
-                            samples[col.name] = values
-                except Exception:
-                    # Skip columns that fail (e.g., reserved keywords)
+                    key = val if not isinstance(val, (list, dict)) else repr(val)
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                except TypeError:
                     pass
-
-        except Exception as e:
-            logger.debug(f"Could not get sample values for {table_name}: {e}")
-
+                # Truncate long text values
+                if isinstance(val, str) and len(val) > 50:
+                    val = val[:47] + "..."
+                values.append(val)
+                if len(values) >= limit:
+                    break
+            if values:
+                samples[col.name] = values
         return samples
 
     def get_table_info(
@@ -474,6 +734,22 @@ class SchemaIntrospector:
                 logger.debug(f"Cached schema expired for {connection_id} (age: {age:.1f}s)")
         return None
 
+    def get_cached_fingerprint(self, connection_id: str) -> str:
+        """Get the fingerprint recorded with the cached schema ("" if none).
+
+        After has_schema_changed() returns False this is the current
+        fingerprint, without another catalog round trip.
+
+        Args:
+            connection_id: Connection ID
+
+        Returns:
+            Fingerprint string or ""
+        """
+        if connection_id in self._cache:
+            return self._cache[connection_id][1] or ""
+        return ""
+
     def has_schema_changed(self, engine: Engine, connection_id: str) -> bool:
         """Check if schema has changed since last introspection.
 
@@ -516,19 +792,14 @@ class SchemaIntrospector:
         """
         lines = [f"# Database Schema: {connection_name}\n"]
 
-        inspector = inspect(engine)
-        table_names = inspector.get_table_names()
+        tables, relationships, _ = self._load_catalog(engine)
 
-        for table_name in table_names:
-            lines.append(f"## Table: {table_name}")
+        for table in tables:
+            lines.append(f"## Table: {table.name}")
 
-            # Get columns
-            columns = inspector.get_columns(table_name)
-            pk_cols = set(inspector.get_pk_constraint(table_name).get('constrained_columns', []))
-
-            for col in columns:
-                parts = [f"- **{col['name']}** ({col['type']}"]
-                if col['name'] in pk_cols:
+            for col in table.columns:
+                parts = [f"- **{col.name}** ({col.type}"]
+                if col.primary_key:
                     parts.append(", PK")
                 parts.append(")")
                 lines.append("".join(parts))
@@ -537,14 +808,10 @@ class SchemaIntrospector:
 
         # Add relationships section
         lines.append("## Relationships")
-        for table_name in table_names:
-            for fk in inspector.get_foreign_keys(table_name):
-                for i, col in enumerate(fk.get('constrained_columns', [])):
-                    ref_cols = fk.get('referred_columns', [])
-                    if i < len(ref_cols):
-                        lines.append(f"- {table_name}.{col} → {fk['referred_table']}.{ref_cols[i]}")
+        for fk in relationships:
+            lines.append(f"- {fk.from_table}.{fk.from_column} → {fk.to_table}.{fk.to_column}")
 
-        logger.info(f"Generated schema dictionary for {connection_name}: {len(table_names)} tables")
+        logger.info(f"Generated schema dictionary for {connection_name}: {len(tables)} tables")
         return "\n".join(lines)
 
     def generate_sample_values(
@@ -568,47 +835,48 @@ class SchemaIntrospector:
         """
         lines = [f"# Sample Data: {connection_name}\n"]
 
-        inspector = inspect(engine)
-        table_names = inspector.get_table_names()
-        tables_sampled = 0
+        tables = [TableInfo(name=name, columns=[]) for name in inspect(engine).get_table_names()]
 
-        for table_name in table_names:
-            try:
-                # ONE query per table - much faster than per-column
-                sql = text(f'SELECT * FROM "{table_name}" LIMIT :limit')  # noqa: S608
-                with engine.connect() as conn:
-                    result = conn.execute(sql, {"limit": limit})
-                    rows = result.fetchall()
-                    columns = list(result.keys())
+        def _sample(conn, table: TableInfo):
+            # ONE query per table - much faster than per-column
+            table_sql = conn.dialect.identifier_preparer.quote(table.name)
+            result = conn.execute(
+                text(f"SELECT * FROM {table_sql} LIMIT :limit"),  # noqa: S608
+                {"limit": limit}
+            )
+            return list(result.keys()), result.fetchall()
 
-                if not rows:
-                    continue
+        samples = self._map_tables(engine, tables, _sample, phase="sample_rows")
+        tables_sampled = 0
 
-                tables_sampled += 1
-                lines.append(f"## Table: {table_name} ({len(rows)} sample rows)\n")
-
-                # Header row
-                lines.append("| " + " | ".join(columns) + " |")
-                lines.append("| " + " | ".join(["---"] * len(columns)) + " |")
-
-                # Data rows
-                for row in rows:
-                    values = []
-                    for val in row:
-                        if val is None:
-                            values.append("NULL")
-                        elif isinstance(val, str) and len(val) > 30:
-                            values.append(val[:27] + "...")
-                        else:
-                            # Escape pipe characters in markdown
-                            val_str = str(val).replace("|", "\\|")
-                            values.append(val_str)
-                    lines.append("| " + " | ".join(values) + " |")
-
-                lines.append("")
+        for table in tables:
+            sampled = samples.get(table.name)
+            if not sampled or not sampled[1]:
+                continue
+            columns, rows = sampled
+
+            tables_sampled += 1
+            lines.append(f"## Table: {table.name} ({len(rows)} sample rows)\n")
+
+            # Header row
+            lines.append("| " + " | ".join(columns) + " |")
+            lines.append("| " + " | ".join(["---"] * len(columns)) + " |")
+
+            # Data rows
+            for row in rows:
+                values = []
+                for val in row:
+                    if val is None:
+                        values.append("NULL")
+                    elif isinstance(val, str) and len(val) > 30:
+                        values.append(val[:27] + "...")
+                    else:
+                        # Escape pipe characters in markdown
+                        val_str = str(val).replace("|", "\\|")
+                        values.append(val_str)
+                lines.append("| " + " | ".join(values) + " |")
 
-            except Exception as e:
-                logger.debug(f"Could not sample {table_name}: {e}")
+            lines.append("")
 
-        logger.info(f"Generated sample values for {connection_name}: {tables_sampled}/{len(table_names)} tables")
+        logger.info(f"Generated sample values for {connection_name}: {tables_sampled}/{len(tables)} tables")
         return "\n".join(lines)
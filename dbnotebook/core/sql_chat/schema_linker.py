@@ -4,18 +4,44 @@ Schema Linker for SQL Chat.
 Identifies relevant tables for a natural language query using
 embedding similarity. This pre-filtering step reduces hallucination
 by focusing the LLM on the most relevant subset of the schema.
+
+Table (and optionally column) descriptions are embedded in one batch and
+kept as a normalized float32 matrix per connection, so linking is a single
+matrix-vector product plus argpartition. Embeddings are persisted in
+Postgres with a hash of each description: after a restart or a schema
+change only descriptions that actually changed are re-embedded.
 """
 
+import hashlib
 import logging
-from typing import List, Optional, Set, Tuple
+import threading
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Set, Tuple
 
 import numpy as np
 from llama_index.core.embeddings import BaseEmbedding
+from sqlalchemy import text
 
+from dbnotebook.core.config import get_config_value
 from dbnotebook.core.sql_chat.types import SchemaInfo, TableInfo
 
 logger = logging.getLogger(__name__)
 
+EMBEDDING_TABLE = "sql_schema_embeddings"
+
+
+@dataclass
+class _LinkIndex:
+    """Normalized embedding matrices for one connection's schema."""
+    schema: SchemaInfo                      # Schema object the index was built from
+    digest: str                             # Hash over all item keys + description hashes
+                                            # ("" while some items lack a vector)
+    table_names: List[str]
+    table_matrix: np.ndarray                # (n_tables, dim)
+    column_matrix: Optional[np.ndarray]     # (n_columns, dim)
+    column_owner: Optional[np.ndarray]      # Row in table_matrix for each column
+    vectors: Dict[str, Tuple[str, np.ndarray]]  # item key -> (description hash, vector)
+
 
 class SchemaLinker:
     """Pre-filter relevant tables before SQL generation.
@@ -38,7 +64,9 @@ class SchemaLinker:
         self,
         embed_model: BaseEmbedding,
         top_k: int = 5,
-        similarity_threshold: float = 0.3
+        similarity_threshold: float = 0.3,
+        session_factory=None,
+        column_embeddings: Optional[bool] = None
     ):
         """Initialize schema linker.
 
@@ -46,13 +74,54 @@ class SchemaLinker:
             embed_model: Embedding model for similarity computation
             top_k: Number of top tables to select
             similarity_threshold: Minimum similarity score to include
+            session_factory: SQLAlchemy session factory for persisted
+                embeddings (in-memory only if None)
+            column_embeddings: Also score tables by their best-matching
+                column description (default sql_chat.schema_linking.column_embeddings)
         """
         self._embed_model = embed_model
         self._top_k = top_k
         self._similarity_threshold = similarity_threshold
-
-        # Cache for table embeddings (connection_id -> {table_name: embedding})
-        self._embedding_cache: dict = {}
+        self._column_embeddings = (
+            column_embeddings if column_embeddings is not None
+            else get_config_value("sql_chat", "schema_linking", "column_embeddings", default=True)
+        )
+        self._model_name = getattr(embed_model, "model_name", None) or type(embed_model).__name__
+
+        self._session_factory = None
+        if session_factory is not None and get_config_value(
+            "sql_chat", "schema_linking", "persist", default=True
+        ):
+            self._session_factory = session_factory
+            self.ensure_table()
+
+        # connection_id -> embedding matrices for the current schema
+        self._embedding_cache: Dict[str, _LinkIndex] = {}
+        self._lock = threading.Lock()
+
+    def ensure_table(self) -> None:
+        """Create the schema embedding table if the migration has not been applied."""
+        session = self._session_factory()
+        try:
+            session.execute(text(f"""
+                CREATE TABLE IF NOT EXISTS {EMBEDDING_TABLE} (
+                    connection_id TEXT NOT NULL,
+                    model_name TEXT NOT NULL,
+                    item_key TEXT NOT NULL,
+                    description_hash CHAR(32) NOT NULL,
+                    schema_fingerprint TEXT,
+                    embedding BYTEA NOT NULL,
+                    updated_at TIMESTAMP NOT NULL DEFAULT NOW(),
+                    PRIMARY KEY (connection_id, model_name, item_key)
+                )
+            """))
+            session.commit()
+        except Exception as e:
+            session.rollback()
+            logger.warning(f"Could not create {EMBEDDING_TABLE}, using in-memory embeddings: {e}")
+            self._session_factory = None
+        finally:
+            session.close()
 
     def link_tables(
         self,
@@ -60,7 +129,8 @@ class SchemaLinker:
         schema: SchemaInfo,
         connection_id: Optional[str] = None,
         top_k: Optional[int] = None,
-        expand_with_fk: bool = True
+        expand_with_fk: bool = True,
+        fingerprint: Optional[str] = None
     ) -> List[str]:
         """Identify relevant tables for a query.
 
@@ -70,6 +140,7 @@ class SchemaLinker:
             connection_id: Optional connection ID for embedding caching
             top_k: Override default top_k
             expand_with_fk: Whether to expand with FK-related tables
+            fingerprint: Schema fingerprint stored with persisted embeddings
 
         Returns:
             List of relevant table names
@@ -83,31 +154,14 @@ class SchemaLinker:
         if len(schema.tables) <= k:
             return [t.name for t in schema.tables]
 
-        # Get or compute table embeddings
-        table_embeddings = self._get_table_embeddings(schema, connection_id)
-
-        # Compute query embedding
-        query_embedding = self._embed_model.get_text_embedding(query)
-
-        # Compute similarities
-        similarities = []
-        for table in schema.tables:
-            table_emb = table_embeddings.get(table.name)
-            if table_emb is not None:
-                similarity = self._cosine_similarity(query_embedding, table_emb)
-                similarities.append((table.name, similarity))
-            else:
-                similarities.append((table.name, 0.0))
-
-        # Sort by similarity descending
-        similarities.sort(key=lambda x: x[1], reverse=True)
+        scored = self._score(query, schema, connection_id, fingerprint, k)
 
         # Always select top-k tables (threshold is for additional expansion, not filtering)
         # This ensures we always have enough context for SQL generation
-        selected = [table_name for table_name, score in similarities[:k]]
+        selected = [table_name for table_name, score in scored]
 
         logger.info(f"Schema linking: {len(selected)} tables selected from {len(schema.tables)}")
-        logger.info(f"Top tables: {[(t, f'{s:.3f}') for t, s in similarities[:k]]}")
+        logger.info(f"Top tables: {[(t, f'{s:.3f}') for t, s in scored]}")
 
         # Expand with FK-related tables
         if expand_with_fk:
@@ -115,45 +169,245 @@ class SchemaLinker:
 
         return selected
 
-    def _get_table_embeddings(
+    def _score(
         self,
+        query: str,
         schema: SchemaInfo,
-        connection_id: Optional[str]
-    ) -> dict:
-        """Get or compute embeddings for all tables.
-
-        Args:
-            schema: Database schema
-            connection_id: Optional connection ID for caching
+        connection_id: Optional[str],
+        fingerprint: Optional[str],
+        k: Optional[int] = None
+    ) -> List[Tuple[str, float]]:
+        """Score tables against a query, best first (top k only if k is given).
 
-        Returns:
-            Dict mapping table name to embedding
+        A table's score is the cosine similarity of its description, or of
+        its best-matching column description if that is higher.
         """
+        index = self._get_index(schema, connection_id, fingerprint)
+
+        try:
+            query_vec = np.asarray(self._embed_model.get_text_embedding(query), dtype=np.float32)
+        except Exception as e:
+            logger.warning(f"Failed to embed schema linking query: {e}")
+            query_vec = np.zeros(0, dtype=np.float32)
+        norm = np.linalg.norm(query_vec)
+        # No usable vectors (embedding failed): every table scores 0
+        if (
+            norm == 0 or index.table_matrix.shape[0] == 0
+            or index.table_matrix.shape[1] != query_vec.shape[0]
+        ):
+            return [(name, 0.0) for name in index.table_names[:k]]
+        query_vec /= norm
+
+        scores = index.table_matrix @ query_vec
+        if index.column_matrix is not None and len(index.column_owner):
+            np.maximum.at(scores, index.column_owner, index.column_matrix @ query_vec)
+
+        n = len(scores)
+        if k is not None and k < n:
+            top = np.argpartition(-scores, k - 1)[:k]
+            order = top[np.argsort(-scores[top], kind="stable")]
+        else:
+            order = np.argsort(-scores, kind="stable")
+        return [(index.table_names[i], float(scores[i])) for i in order]
+
+    # ========== Embedding index ==========
+
+    def _describe(self, schema: SchemaInfo) -> List[Tuple[str, str, int]]:
+        """Item key, description and owning table position for everything embedded."""
+        items = []
+        for position, table in enumerate(schema.tables):
+            items.append((table.name, self._create_table_description(table), position))
+        if self._column_embeddings:
+            for position, table in enumerate(schema.tables):
+                for col in table.columns:
+                    items.append((
+                        f"{table.name}.{col.name}",
+                        self._create_column_description(table, col),
+                        position,
+                    ))
+        return items
+
+    def _get_index(
+        self,
+        schema: SchemaInfo,
+        connection_id: Optional[str],
+        fingerprint: Optional[str]
+    ) -> _LinkIndex:
+        """Get the embedding index for a schema, embedding only changed items."""
         cache_key = connection_id or "default"
 
-        # Check cache
-        if cache_key in self._embedding_cache:
-            cached = self._embedding_cache[cache_key]
-            # Verify cache is still valid (same tables)
-            if set(cached.keys()) == {t.name for t in schema.tables}:
-                return cached
-
-        # Compute embeddings for all tables
-        embeddings = {}
-        for table in schema.tables:
-            desc = self._create_table_description(table)
-            try:
-                emb = self._embed_model.get_text_embedding(desc)
-                embeddings[table.name] = emb
-            except Exception as e:
-                logger.warning(f"Failed to embed table {table.name}: {e}")
-                embeddings[table.name] = None
-
-        # Cache embeddings
-        self._embedding_cache[cache_key] = embeddings
-        logger.debug(f"Computed embeddings for {len(embeddings)} tables")
+        with self._lock:
+            cached = self._embedding_cache.get(cache_key)
+        if cached is not None and cached.digest and cached.schema is schema:
+            return cached
+
+        items = self._describe(schema)
+        hashes = [hashlib.md5(desc.encode("utf-8")).hexdigest() for _, desc, _ in items]
+        digest = hashlib.md5(
+            "\n".join(f"{key}:{h}" for (key, _, _), h in zip(items, hashes)).encode("utf-8")
+        ).hexdigest()
+
+        if cached is not None and cached.digest == digest:
+            cached.schema = schema
+            return cached
+
+        # Reuse vectors whose description is unchanged: in memory first, then Postgres
+        known: Dict[str, Tuple[str, np.ndarray]] = dict(cached.vectors) if cached else {}
+        if connection_id and self._session_factory is not None:
+            wanted = {key for (key, _, _), h in zip(items, hashes) if known.get(key, ("",))[0] != h}
+            if wanted:
+                known.update(self._load_persisted(connection_id))
+
+        vectors: Dict[str, Tuple[str, np.ndarray]] = {}
+        missing = []
+        for (key, desc, _), h in zip(items, hashes):
+            entry = known.get(key)
+            if entry is not None and entry[0] == h:
+                vectors[key] = entry
+            else:
+                missing.append((key, desc, h))
+
+        if missing:
+            computed = self._embed_batch([desc for _, desc, _ in missing])
+            for (key, _, h), vec in zip(missing, computed):
+                if vec is not None:
+                    vectors[key] = (h, vec)
+            logger.info(
+                f"Schema linking: embedded {len(missing)} of {len(items)} descriptions "
+                f"for {cache_key}"
+            )
+            if connection_id and self._session_factory is not None:
+                fresh = {key: vectors[key] for key, _, _ in missing if key in vectors}
+                self._persist(connection_id, fingerprint, fresh, keep={key for key, _, _ in items})
+
+        if len(vectors) < len(items):
+            # Leave the digest empty so the next call retries the missing items
+            logger.warning(
+                f"Schema linking: {len(items) - len(vectors)} descriptions have no embedding "
+                f"for {cache_key}; will retry"
+            )
+            digest = ""
+        index = self._build_index(schema, items, vectors, digest)
+        with self._lock:
+            self._embedding_cache[cache_key] = index
+        return index
+
+    def _embed_batch(self, descriptions: List[str]) -> List[Optional[np.ndarray]]:
+        """Embed descriptions in one batch call, unit-normalized."""
+        try:
+            raw = self._embed_model.get_text_embedding_batch(descriptions)
+        except Exception as e:
+            logger.warning(f"Failed to embed {len(descriptions)} schema descriptions: {e}")
+            return [None] * len(descriptions)
+        matrix = np.asarray(raw, dtype=np.float32)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return list(matrix / norms)
+
+    def _build_index(
+        self,
+        schema: SchemaInfo,
+        items: List[Tuple[str, str, int]],
+        vectors: Dict[str, Tuple[str, np.ndarray]],
+        digest: str
+    ) -> _LinkIndex:
+        """Stack item vectors into table and column matrices."""
+        dim = next((len(v) for _, v in vectors.values()), 0)
+        zero = np.zeros(dim, dtype=np.float32)
+        n_tables = len(schema.tables)
+
+        # Tables whose embedding failed keep a zero row (score 0)
+        table_matrix = np.stack(
+            [vectors.get(key, (None, zero))[1] for key, _, _ in items[:n_tables]]
+        ) if dim else np.zeros((n_tables, 0), dtype=np.float32)
+
+        column_items = [(key, owner) for key, _, owner in items[n_tables:] if key in vectors]
+        column_matrix = column_owner = None
+        if column_items and dim:
+            column_matrix = np.stack([vectors[key][1] for key, _ in column_items])
+            column_owner = np.fromiter((owner for _, owner in column_items), dtype=np.intp)
+
+        return _LinkIndex(
+            schema=schema,
+            digest=digest,
+            table_names=[t.name for t in schema.tables],
+            table_matrix=np.ascontiguousarray(table_matrix, dtype=np.float32),
+            column_matrix=column_matrix,
+            column_owner=column_owner,
+            vectors=vectors,
+        )
 
-        return embeddings
+    def _load_persisted(self, connection_id: str) -> Dict[str, Tuple[str, np.ndarray]]:
+        """Load persisted embeddings for a connection (item key -> (hash, vector))."""
+        session = self._session_factory()
+        try:
+            rows = session.execute(
+                text(f"""
+                    SELECT item_key, description_hash, embedding FROM {EMBEDDING_TABLE}
+                    WHERE connection_id = :connection_id AND model_name = :model_name
+                """),
+                {"connection_id": connection_id, "model_name": self._model_name}
+            ).fetchall()
+            return {
+                row[0]: (row[1], np.frombuffer(bytes(row[2]), dtype="<f4"))
+                for row in rows
+            }
+        except Exception as e:
+            logger.warning(f"Failed to load schema embeddings for {connection_id}: {e}")
+            return {}
+        finally:
+            session.close()
+
+    def _persist(
+        self,
+        connection_id: str,
+        fingerprint: Optional[str],
+        vectors: Dict[str, Tuple[str, np.ndarray]],
+        keep: Set[str]
+    ) -> None:
+        """Upsert new embeddings and drop those for items no longer in the schema."""
+        keys = list(vectors.keys())
+        session = self._session_factory()
+        try:
+            params = {"connection_id": connection_id, "model_name": self._model_name}
+            if keys:
+                session.execute(
+                    text(f"""
+                        INSERT INTO {EMBEDDING_TABLE}
+                            (connection_id, model_name, item_key, description_hash,
+                             schema_fingerprint, embedding)
+                        SELECT :connection_id, :model_name, k, h, :fingerprint, e
+                        FROM unnest(
+                            CAST(:keys AS text[]), CAST(:hashes AS text[]), CAST(:blobs AS bytea[])
+                        ) AS t(k, h, e)
+                        ON CONFLICT (connection_id, model_name, item_key) DO UPDATE
+                        SET description_hash = EXCLUDED.description_hash,
+                            schema_fingerprint = EXCLUDED.schema_fingerprint,
+                            embedding = EXCLUDED.embedding,
+                            updated_at = NOW()
+                    """),
+                    {
+                        **params,
+                        "fingerprint": fingerprint,
+                        "keys": keys,
+                        "hashes": [vectors[k][0] for k in keys],
+                        "blobs": [np.asarray(vectors[k][1], dtype="<f4").tobytes() for k in keys],
+                    }
+                )
+            session.execute(
+                text(f"""
+                    DELETE FROM {EMBEDDING_TABLE}
+                    WHERE connection_id = :connection_id AND model_name = :model_name
+                    AND NOT (item_key = ANY(CAST(:keep AS text[])))
+                """),
+                {**params, "keep": list(keep)}
+            )
+            session.commit()
+        except Exception as e:
+            session.rollback()
+            logger.warning(f"Failed to persist schema embeddings for {connection_id}: {e}")
+        finally:
+            session.close()
 
     def _create_table_description(self, table: TableInfo) -> str:
         """Create description string for table embedding.
@@ -188,27 +442,25 @@ class SchemaLinker:
 
         return ' '.join(parts)
 
-    def _cosine_similarity(self, vec1: List[float], vec2: List[float]) -> float:
-        """Compute cosine similarity between two vectors.
+    def _create_column_description(self, table: TableInfo, column) -> str:
+        """Create description string for a column embedding.
 
         Args:
-            vec1: First vector
-            vec2: Second vector
+            table: Table the column belongs to
+            column: Column information
 
         Returns:
-            Cosine similarity (0 to 1)
+            Description string optimized for embedding
         """
-        a = np.array(vec1)
-        b = np.array(vec2)
-
-        dot_product = np.dot(a, b)
-        norm_a = np.linalg.norm(a)
-        norm_b = np.linalg.norm(b)
-
-        if norm_a == 0 or norm_b == 0:
-            return 0.0
-
-        return float(dot_product / (norm_a * norm_b))
+        parts = [table.name, column.name.replace('_', ' ')]
+        type_lower = column.type.lower()
+        if 'timestamp' in type_lower or 'date' in type_lower:
+            parts.append('date time')
+        elif 'money' in type_lower or 'decimal' in type_lower:
+            parts.append('amount price')
+        if column.comment:
+            parts.append(column.comment)
+        return ' '.join(parts)
 
     def _expand_with_fk_tables(
         self,
@@ -281,7 +533,8 @@ class SchemaLinker:
         self,
         query: str,
         schema: SchemaInfo,
-        connection_id: Optional[str] = None
+        connection_id: Optional[str] = None,
+        fingerprint: Optional[str] = None
     ) -> List[Tuple[str, float]]:
         """Get similarity scores for all tables.
 
@@ -291,6 +544,7 @@ class SchemaLinker:
             query: Natural language query
             schema: Database schema
             connection_id: Optional connection ID for caching
+            fingerprint: Schema fingerprint stored with persisted embeddings
 
         Returns:
             List of (table_name, similarity_score) sorted by score
@@ -298,34 +552,32 @@ class SchemaLinker:
         if not schema.tables:
             return []
 
-        # Get or compute table embeddings
-        table_embeddings = self._get_table_embeddings(schema, connection_id)
-
-        # Compute query embedding
-        query_embedding = self._embed_model.get_text_embedding(query)
-
-        # Compute similarities
-        scores = []
-        for table in schema.tables:
-            table_emb = table_embeddings.get(table.name)
-            if table_emb is not None:
-                similarity = self._cosine_similarity(query_embedding, table_emb)
-                scores.append((table.name, similarity))
-            else:
-                scores.append((table.name, 0.0))
-
-        # Sort by score descending
-        scores.sort(key=lambda x: x[1], reverse=True)
-
-        return scores
+        return self._score(query, schema, connection_id, fingerprint)
 
-    def clear_cache(self, connection_id: Optional[str] = None) -> None:
+    def clear_cache(self, connection_id: Optional[str] = None, persisted: bool = False) -> None:
         """Clear embedding cache.
 
         Args:
             connection_id: Specific connection to clear, or None for all
+            persisted: Also delete the connection's persisted embeddings
+                (e.g. the connection was deleted)
         """
-        if connection_id:
-            self._embedding_cache.pop(connection_id, None)
-        else:
-            self._embedding_cache.clear()
+        with self._lock:
+            if connection_id:
+                self._embedding_cache.pop(connection_id, None)
+            else:
+                self._embedding_cache.clear()
+
+        if persisted and connection_id and self._session_factory is not None:
+            session = self._session_factory()
+            try:
+                session.execute(
+                    text(f"DELETE FROM {EMBEDDING_TABLE} WHERE connection_id = :connection_id"),
+                    {"connection_id": connection_id}
+                )
+                session.commit()
+            except Exception as e:
+                session.rollback()
+                logger.warning(f"Failed to delete schema embeddings for {connection_id}: {e}")
+            finally:
+                session.close()
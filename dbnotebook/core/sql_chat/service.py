@@ -12,7 +12,7 @@ import time
 import uuid
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 from llama_index.core.embeddings import BaseEmbedding
 from llama_index.core.llms.llm import LLM
@@ -26,9 +26,11 @@ from dbnotebook.core.sql_chat.executor import SafeQueryExecutor
 from dbnotebook.core.sql_chat.few_shot_retriever import FewShotRetriever
 from dbnotebook.core.sql_chat.intent_classifier import IntentClassifier
 from dbnotebook.core.sql_chat.memory import SQLChatMemory
+from dbnotebook.core.sql_chat.query_cache import CachedSQL, SQLQueryCache
 from dbnotebook.core.sql_chat.query_engine import TextToSQLEngine
 from dbnotebook.core.sql_chat.response_generator import ResponseGenerator
 from dbnotebook.core.sql_chat.schema import SchemaIntrospector
+from dbnotebook.core.sql_chat.result_set import ColumnarResult
 from dbnotebook.core.sql_chat.semantic_inspector import SemanticInspector
 from dbnotebook.core.sql_chat.telemetry import TelemetryLogger
 from dbnotebook.core.sql_chat.types import (
@@ -118,12 +120,18 @@ class SQLChatService(BaseService):
 
         # New components for enhanced SQL Chat
         self._dictionary_generator = DictionaryGenerator()
-        self._schema_linker = SchemaLinker(self._embed_model)
+        self._schema_linker = SchemaLinker(
+            self._embed_model,
+            session_factory=db_manager.get_session_maker() if db_manager else None
+        )
         self._result_validator = ResultValidator()
         # Query decomposer uses per-request LLM
         self._query_decomposer = None  # Created per-request
         self._query_learner = QueryLearner(db_manager, notebook_manager)
 
+        # Semantic NL->SQL cache (+ short-TTL result cache), shared across sessions
+        self._query_cache = SQLQueryCache(embed_model=self._embed_model)
+
         # Session storage
         self._sessions: Dict[str, SQLChatSession] = {}
         self._session_memories: Dict[str, SQLChatMemory] = {}
@@ -292,6 +300,8 @@ class SQLChatService(BaseService):
         # Clean up query engine
         self._query_engine.remove_query_engine(connection_id)
         self._schema.clear_cache(connection_id)
+        self._query_cache.invalidate(connection_id)
+        self._schema_linker.clear_cache(connection_id, persisted=True)
         self._connections.disconnect(connection_id)
         return True
 
@@ -477,6 +487,7 @@ class SQLChatService(BaseService):
 
         # Force refresh schema from database
         schema = self._schema.introspect(engine, connection_id, force_refresh=True)
+        self._query_cache.invalidate(connection_id)
 
         # Recreate query engine with fresh schema
         self._query_engine.remove_query_engine(connection_id)
@@ -600,6 +611,7 @@ class SQLChatService(BaseService):
                 if self._schema.has_schema_changed(engine, session.connection_id):
                     logger.info(f"Schema changed for {session.connection_id}, refreshing")
                     fresh_schema = self._schema.introspect(engine, session.connection_id, force_refresh=True)
+                    self._query_cache.invalidate(session.connection_id)
                     session.schema = fresh_schema
                     self._query_engine.remove_query_engine(session.connection_id)
                     self._query_engine.create_query_engine(session.connection_id, engine, fresh_schema)
@@ -627,13 +639,28 @@ class SQLChatService(BaseService):
                     )
             timings["3_schema_check_ms"] = int((time.time() - t3) * 1000)
 
+            # Step 3.55: Semantic NL->SQL cache (same question + unchanged schema)
+            t_cache = time.time()
+            fingerprint = self._schema.get_cached_fingerprint(session.connection_id) if engine else ""
+            cached_sql, query_embedding = self._query_cache.lookup_sql(
+                session.connection_id, fingerprint, nl_query
+            )
+            timings["3_query_cache_lookup_ms"] = int((time.time() - t_cache) * 1000)
+            if cached_sql:
+                cached_result = await self._execute_cached_sql(
+                    session, nl_query, cached_sql, engine, fingerprint, intent,
+                    memory, request_llm, start_time, timings, user_id
+                )
+                if cached_result is not None:
+                    return cached_result
+
             # Step 3.6: Schema linking - pre-filter relevant tables
             t4 = time.time()
             focused_schema = session.schema
             relevant_table_names = []
             if session.schema and len(session.schema.tables) > self._schema_linker._top_k:
                 relevant_tables = self._schema_linker.link_tables(
-                    nl_query, session.schema, session.connection_id
+                    nl_query, session.schema, session.connection_id, fingerprint=fingerprint
                 )
                 focused_schema = self._schema_linker.filter_schema(session.schema, relevant_tables)
                 relevant_table_names = relevant_tables  # link_tables returns List[str]
@@ -724,6 +751,7 @@ class SQLChatService(BaseService):
 
             # Step 7: Apply data masking
             t9 = time.time()
+            unmasked_data = result.data
             conn = self._connections.get_connection(session.connection_id)
             if conn and conn.masking_policy and result.success:
                 result.data = self._data_masker.apply(result.data, conn.masking_policy)
@@ -783,6 +811,17 @@ class SQLChatService(BaseService):
                 )
             timings["11_response_generation_ms"] = int((time.time() - t11) * 1000)
 
+            # Step 9.5: Populate the query cache with the validated SQL/result
+            if result.success and inspection_passed:
+                self._query_cache.put_sql(
+                    session.connection_id, fingerprint, nl_query, result.sql_generated,
+                    confidence=result.confidence, embedding=query_embedding
+                )
+                self._query_cache.put_result(
+                    session.connection_id, fingerprint, result.sql_generated,
+                    unmasked_data, result.columns, result.row_count, result.explanation
+                )
+
             # Set total execution time and timings on result
             result.execution_time_ms = int((time.time() - start_time) * 1000)
             result.timings = timings
@@ -825,6 +864,116 @@ class SQLChatService(BaseService):
                 error_message=str(e)
             )
 
+    async def _execute_cached_sql(
+        self,
+        session: SQLChatSession,
+        nl_query: str,
+        cached: CachedSQL,
+        engine,
+        fingerprint: str,
+        intent,
+        memory: Optional[SQLChatMemory],
+        request_llm: LLM,
+        start_time: float,
+        timings: Dict[str, int],
+        user_id: Optional[str] = None
+    ) -> Optional[QueryResult]:
+        """Answer a query from the NL->SQL cache without SQL generation.
+
+        Uses the cached result (and its explanation) when still fresh,
+        otherwise re-executes the cached SQL. Returns None if the cached SQL
+        no longer executes, so the caller falls back to the full pipeline.
+        """
+        timings["sql_cache_hit"] = 1
+        session.status = "executing"
+
+        t8 = time.time()
+        cached_result = self._query_cache.get_result(session.connection_id, fingerprint, cached.sql)
+        if cached_result:
+            timings["result_cache_hit"] = 1
+            result = QueryResult(
+                success=True,
+                sql_generated=cached.sql,
+                data=cached_result.data,
+                columns=cached_result.columns,
+                row_count=cached_result.row_count,
+                execution_time_ms=0,
+                explanation=cached_result.explanation,
+            )
+        else:
+            result = self._executor.execute_readonly(engine, cached.sql)
+            if not result.success:
+                logger.info(f"Cached SQL failed on re-execution, regenerating: {result.error_message}")
+                self._query_cache.discard_sql(cached)
+                del timings["sql_cache_hit"]
+                return None
+        timings["8_sql_execution_ms"] = int((time.time() - t8) * 1000)
+
+        # Apply data masking (cached rows are stored unmasked)
+        t9 = time.time()
+        unmasked_data = result.data
+        conn = self._connections.get_connection(session.connection_id)
+        if conn and conn.masking_policy:
+            result.data = self._data_masker.apply(result.data, conn.masking_policy)
+        timings["9_data_masking_ms"] = int((time.time() - t9) * 1000)
+
+        validation_issues = self._result_validator.validate(
+            nl_query, result.sql_generated, result.data, session.schema
+        )
+        if validation_issues:
+            result.validation_warnings = [
+                {"severity": i.severity.value, "message": i.message, "suggestion": i.suggestion}
+                for i in validation_issues
+            ]
+
+        result.confidence = cached.confidence
+        result.intent = intent
+
+        # Fresh rows need a fresh explanation
+        query_logger = getattr(self._pipeline, '_query_logger', None)
+        if not cached_result:
+            t11 = time.time()
+            response_gen = self._get_response_generator(request_llm)
+            result.explanation = response_gen.generate(
+                user_query=nl_query,
+                sql=result.sql_generated,
+                data=result.data,
+                columns=[c.name for c in result.columns],
+                row_count=result.row_count,
+                query_logger=query_logger,
+                user_id=user_id or session.user_id,
+                session_id=session.session_id
+            )
+            timings["11_response_generation_ms"] = int((time.time() - t11) * 1000)
+            self._query_cache.put_result(
+                session.connection_id, fingerprint, result.sql_generated,
+                unmasked_data, result.columns, result.row_count, result.explanation
+            )
+
+        result.execution_time_ms = int((time.time() - start_time) * 1000)
+        result.timings = timings
+        logger.info(
+            f"Query cache hit (similarity {cached.similarity:.3f}, "
+            f"result {'cached' if cached_result else 'executed'}) in {result.execution_time_ms}ms"
+        )
+
+        self._telemetry.log_from_result(
+            session.session_id, nl_query, result, intent.intent.value
+        )
+
+        if memory:
+            memory.add_exchange(nl_query, result.sql_generated, result)
+
+        session.status = "complete"
+        session.last_query_at = datetime.utcnow()
+        session.query_history.append(result)
+
+        return result
+
+    def get_query_cache_stats(self) -> Dict[str, Any]:
+        """Get NL->SQL and result cache statistics."""
+        return self._query_cache.get_stats()
+
     async def _execute_refinement(
         self,
         session: SQLChatSession,
@@ -928,6 +1077,58 @@ class SQLChatService(BaseService):
         session = self.get_session(session_id, user_id)
         return session.query_history if session else []
 
+    def stream_query_results(
+        self,
+        session_id: str,
+        user_id: Optional[str] = None,
+        history_index: int = -1,
+        chunk_rows: Optional[int] = None
+    ) -> Tuple[List[Any], Iterator[ColumnarResult]]:
+        """Re-run a query from session history and stream masked result chunks.
+
+        Uses a server-side cursor, so the full (export-sized) result is never
+        held in memory and the first chunk arrives after one fetch.
+
+        Args:
+            session_id: Session ID
+            user_id: Optional user ID for access validation
+            history_index: Query history position (default: latest query)
+            chunk_rows: Rows per chunk
+
+        Returns:
+            Tuple of (column info, iterator of ColumnarResult chunks)
+
+        Raises:
+            ValueError: If the session, query or connection is not available
+        """
+        session = self.get_session(session_id, user_id)
+        if not session:
+            raise ValueError("Session not found")
+
+        try:
+            entry = session.query_history[history_index]
+        except IndexError:
+            raise ValueError("Query not found in session history")
+        if not entry.success or not entry.sql_generated:
+            raise ValueError("Query did not complete successfully")
+
+        engine = self._connections.get_engine(session.connection_id)
+        if not engine:
+            raise ValueError("Connection not available")
+
+        columns, chunks = self._executor.stream_readonly(
+            engine, entry.sql_generated, chunk_rows=chunk_rows
+        )
+
+        conn = self._connections.get_connection(session.connection_id)
+        policy = conn.masking_policy if conn else None
+        if policy:
+            redacted = {c.lower() for c in policy.redact_columns}
+            columns = [c for c in columns if c.name.lower() not in redacted]
+            chunks = (self._data_masker.apply_columnar(chunk, policy) for chunk in chunks)
+
+        return columns, chunks
+
     # ========== Utilities ==========
 
     def get_schema_formatted(
@@ -1216,7 +1417,8 @@ class SQLChatService(BaseService):
             return []
 
         return self._schema_linker.get_table_scores(
-            query, session.schema, session.connection_id
+            query, session.schema, session.connection_id,
+            fingerprint=self._schema.get_cached_fingerprint(session.connection_id)
         )
 
     def get_learned_join_patterns(
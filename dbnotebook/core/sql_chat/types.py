@@ -8,7 +8,7 @@ masking policies, and session management.
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
-from typing import Any, Dict, List, Literal, Optional
+from typing import Any, Dict, List, Literal, Optional, Sequence
 
 
 # Type aliases
@@ -122,6 +122,7 @@ class SchemaInfo:
     relationships: List[ForeignKey] = field(default_factory=list)
     cached_at: Optional[datetime] = None
     database_name: str = ""
+    timings: Dict[str, float] = field(default_factory=dict)  # introspection phase -> seconds
 
 
 @dataclass
@@ -156,7 +157,7 @@ class QueryResult:
     """Result of SQL query execution."""
     success: bool
     sql_generated: str
-    data: List[Dict[str, Any]]
+    data: Sequence[Dict[str, Any]]  # ColumnarResult for executed queries
     columns: List[ColumnInfo]
     row_count: int
     execution_time_ms: float
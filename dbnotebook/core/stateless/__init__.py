@@ -30,6 +30,8 @@ from .retrieval import (
     enhanced_retrieve,
     get_raptor_summaries,
     create_retriever,
+    use_server_side_retrieval,
+    server_side_retrieve,
 )
 from .context import (
     build_hierarchical_context,
@@ -50,6 +52,10 @@ from .query_utils import (
     expand_query_with_history,
     expand_query_with_history_timed,
 )
+from .stage_graph import (
+    StageGraph,
+    get_stage_pool,
+)
 
 __all__ = [
     # Retrieval
@@ -57,6 +63,8 @@ __all__ = [
     "enhanced_retrieve",
     "get_raptor_summaries",
     "create_retriever",
+    "use_server_side_retrieval",
+    "server_side_retrieve",
     # Context
     "build_hierarchical_context",
     "build_context_with_history",
@@ -72,4 +80,7 @@ __all__ = [
     # Query Utils
     "expand_query_with_history",
     "expand_query_with_history_timed",
+    # Stage execution
+    "StageGraph",
+    "get_stage_pool",
 ]
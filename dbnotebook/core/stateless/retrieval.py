@@ -74,6 +74,7 @@ def fast_retrieve(
     source_ids: Optional[List[str]] = None,
     top_k: int = 6,
     language: str = "eng",
+    query_embedding: Optional[List[float]] = None,
 ) -> List[NodeWithScore]:
     """Fast retrieval using the API pattern - no global state.
 
@@ -90,10 +91,15 @@ def fast_retrieve(
         source_ids: Optional list of source IDs to filter
         top_k: Maximum number of results to return
         language: Language code for prompts
+        query_embedding: Precomputed query embedding; retrievers reuse it
+            instead of embedding the query again
 
     Returns:
         List of NodeWithScore containing relevant chunks
 
+    When server-side hybrid retrieval is enabled (retrieval.server_side),
+    ranking runs in Postgres and ``nodes`` may be empty.
+
     Example:
         nodes = pipeline._get_cached_nodes(notebook_id)
         results = fast_retrieve(
@@ -104,6 +110,17 @@ def fast_retrieve(
             retriever_factory=pipeline._engine._retriever,
         )
     """
+    if use_server_side_retrieval(vector_store, retriever_factory):
+        return server_side_retrieve(
+            query=query,
+            notebook_id=notebook_id,
+            vector_store=vector_store,
+            retriever_factory=retriever_factory,
+            llm=llm,
+            top_k=top_k,
+            query_embedding=query_embedding,
+        )
+
     if not nodes:
         logger.debug(f"No nodes found for notebook {notebook_id}")
         return []
@@ -121,7 +138,7 @@ def fast_retrieve(
         )
 
         # Retrieve relevant chunks
-        query_bundle = QueryBundle(query_str=query)
+        query_bundle = QueryBundle(query_str=query, embedding=query_embedding)
         retrieval_results = retriever.retrieve(query_bundle)
 
         # Limit to top_k
@@ -132,6 +149,67 @@ def fast_retrieve(
         return []
 
 
+def use_server_side_retrieval(vector_store: Any, retriever_factory: Any) -> bool:
+    """Check whether retrieval should run in Postgres instead of over cached nodes.
+
+    Callers can use this to skip loading notebook nodes entirely.
+
+    Args:
+        vector_store: PGVectorStore instance
+        retriever_factory: LocalRetriever instance
+
+    Returns:
+        True if server-side hybrid retrieval is enabled and supported
+    """
+    return (
+        retriever_factory is not None and
+        hasattr(retriever_factory, "supports_server_side") and
+        retriever_factory.supports_server_side(vector_store)
+    )
+
+
+def server_side_retrieve(
+    query: str,
+    notebook_id: str,
+    vector_store: Any,
+    retriever_factory: Any,
+    llm: Optional[Any] = None,
+    top_k: int = 6,
+    query_embedding: Optional[List[float]] = None,
+) -> List[NodeWithScore]:
+    """Hybrid retrieval executed in Postgres (ANN + full-text, RRF-fused).
+
+    Returns only the top-k nodes, so memory per query does not grow with
+    notebook size.
+
+    Args:
+        query: User's query string
+        notebook_id: UUID of the notebook to query
+        vector_store: PGVectorStore instance with hybrid_search method
+        retriever_factory: LocalRetriever instance
+        llm: LLM instance (defaults to Settings.llm)
+        top_k: Maximum number of results to return
+        query_embedding: Precomputed query embedding (None = embed here)
+
+    Returns:
+        List of NodeWithScore containing relevant chunks
+    """
+    try:
+        retriever = retriever_factory.get_server_side_retriever(
+            llm=unwrap_llm(llm or Settings.llm),
+            vector_store=vector_store,
+            notebook_id=notebook_id,
+        )
+        retrieval_results = retriever.retrieve(
+            QueryBundle(query_str=query, embedding=query_embedding)
+        )
+        return retrieval_results[:top_k]
+
+    except Exception as e:
+        logger.warning(f"Server-side retrieval failed [{type(e).__name__}]: {e}", exc_info=True)
+        return []
+
+
 def enhanced_retrieve(
     nodes: List[TextNode],
     query: str,
@@ -147,6 +225,8 @@ def enhanced_retrieve(
     raptor_top_k: int = 5,
     min_raptor_score: float = 0.3,
     language: str = "eng",
+    reranker_model: Optional[str] = None,
+    query_embedding: Optional[List[float]] = None,
 ) -> Tuple[List[NodeWithScore], List[Tuple[TextNode, float]], dict]:
     """Enhanced retrieval with RAPTOR-aware reranking.
 
@@ -173,6 +253,10 @@ def enhanced_retrieve(
         raptor_top_k: Maximum number of RAPTOR summaries
         min_raptor_score: Minimum score for RAPTOR summaries
         language: Language code for prompts
+        reranker_model: Reranker model for this call (None = default model);
+            does not change the process-wide reranker setting
+        query_embedding: Precomputed query embedding shared by chunk and
+            RAPTOR retrieval (None = embedded once inside)
 
     Returns:
         Tuple of (chunks, raptor_summaries, metadata_dict)
@@ -203,11 +287,13 @@ def enhanced_retrieve(
         notebook_id=notebook_id,
         use_raptor=use_raptor,
         use_reranker=use_reranker,
+        reranker_model=reranker_model,
         top_k=top_k,
         raptor_top_k=raptor_top_k,
         min_raptor_score=min_raptor_score,
         source_ids=source_ids,
         language=language,
+        query_embedding=query_embedding,
     )
 
     # Create service and execute
@@ -0,0 +1,178 @@
+"""Concurrent stage execution for the chat request path.
+
+A request is described as named stages with dependencies; stages whose
+dependencies are done run concurrently on a process-wide thread pool.
+Each stage receives its dependencies' results as keyword arguments.
+
+Timings are written into the caller's ``timings`` dict:
+- one ``<timing_key>`` entry per stage (milliseconds)
+- ``critical_path_ms``: wall time of the graph
+- ``critical_path``: stage names on the longest dependency chain
+- ``stage_sum_ms``: what the stages would have taken run one after another
+(graph-level keys get a ``<label>_`` prefix when a label is given)
+
+The waiting thread runs queued stages itself instead of blocking on them,
+so graphs nested inside other graphs' stages cannot deadlock the pool.
+
+Usage:
+    graph = StageGraph(timings)
+    graph.add("history", load_history, timing_key="2a_load_history_ms")
+    graph.add("expanded", lambda history: expand(query, history), deps=("history",))
+    graph.add("nodes", load_nodes, timing_key="3_node_cache_ms")
+    results = graph.run()
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from dbnotebook.core.config import get_config_value
+
+logger = logging.getLogger(__name__)
+
+_pool: Optional[ThreadPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def get_stage_pool() -> ThreadPoolExecutor:
+    """Get the shared stage thread pool (retrieval.chat_v2.stage_workers threads)."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                workers = get_config_value("retrieval", "chat_v2", "stage_workers", default=32)
+                _pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="chat-stage")
+    return _pool
+
+
+@dataclass
+class _Stage:
+    name: str
+    fn: Callable[..., Any]
+    deps: Tuple[str, ...]
+    timing_key: Optional[str]
+    result: Any = None
+    error: Optional[BaseException] = None
+    started: float = 0.0
+    finished: float = 0.0
+    done: bool = field(default=False)
+
+
+class StageGraph:
+    """Run request stages as a dependency graph on a shared thread pool."""
+
+    def __init__(
+        self,
+        timings: Optional[Dict[str, Any]] = None,
+        label: Optional[str] = None,
+        pool: Optional[ThreadPoolExecutor] = None
+    ):
+        """Initialize an empty graph.
+
+        Args:
+            timings: Dict to record stage and critical-path timings into
+            label: Prefix for the graph-level timing keys (e.g. "retrieval"
+                gives "retrieval_critical_path_ms")
+            pool: Thread pool (default: the shared stage pool)
+        """
+        self._timings = timings if timings is not None else {}
+        self._prefix = f"{label}_" if label else ""
+        self._pool = pool
+        self._stages: Dict[str, _Stage] = {}
+
+    def add(
+        self,
+        name: str,
+        fn: Callable[..., Any],
+        deps: Sequence[str] = (),
+        timing_key: Optional[str] = None
+    ) -> "StageGraph":
+        """Add a stage.
+
+        Args:
+            name: Stage name (key in run() results, keyword for dependents)
+            fn: Callable taking one keyword argument per dependency
+            deps: Names of stages that must finish first (added earlier)
+            timing_key: Timings entry for this stage (default "<name>_ms")
+        """
+        if name in self._stages:
+            raise ValueError(f"Duplicate stage: {name}")
+        missing = [d for d in deps if d not in self._stages]
+        if missing:
+            raise ValueError(f"Stage {name} depends on unknown stages: {missing}")
+        self._stages[name] = _Stage(name, fn, tuple(deps), timing_key or f"{name}_ms")
+        return self
+
+    def run(self) -> Dict[str, Any]:
+        """Run all stages and return their results by name.
+
+        Raises:
+            The first stage exception, after stages already running finish
+        """
+        pool = self._pool or get_stage_pool()
+        graph_start = time.perf_counter()
+        running: Dict[str, Future] = {}
+        failed: Optional[_Stage] = None
+
+        while True:
+            if failed is None:
+                for stage in self._stages.values():
+                    if (
+                        not stage.done and stage.name not in running
+                        and all(self._stages[d].done for d in stage.deps)
+                    ):
+                        running[stage.name] = pool.submit(self._execute, stage)
+            if not running:
+                break
+
+            # Run a stage that no worker has picked up yet on this thread
+            stolen = next((n for n, f in running.items() if f.cancel()), None)
+            if stolen is not None:
+                self._execute(self._stages[stolen])
+            else:
+                wait(list(running.values()), return_when=FIRST_COMPLETED)
+
+            for name in [n for n, f in running.items() if f.done()]:
+                del running[name]
+                stage = self._stages[name]
+                stage.done = True
+                if stage.error is not None and failed is None:
+                    failed = stage
+
+        self._record_timings(graph_start)
+        if failed is not None:
+            raise failed.error
+        return {name: stage.result for name, stage in self._stages.items()}
+
+    def _execute(self, stage: _Stage) -> None:
+        stage.started = time.perf_counter()
+        try:
+            stage.result = stage.fn(**{d: self._stages[d].result for d in stage.deps})
+        except BaseException as e:  # Re-raised from run()
+            stage.error = e
+        finally:
+            stage.finished = time.perf_counter()
+
+    def _record_timings(self, graph_start: float) -> None:
+        finished = [s for s in self._stages.values() if s.finished]
+        if not finished:
+            return
+
+        for stage in finished:
+            self._timings[stage.timing_key] = int((stage.finished - stage.started) * 1000)
+
+        # Walk back from the last stage to finish through its latest dependency
+        path: List[str] = []
+        stage = max(finished, key=lambda s: s.finished)
+        while stage is not None:
+            path.append(stage.name)
+            deps = [self._stages[d] for d in stage.deps if self._stages[d].finished]
+            stage = max(deps, key=lambda s: s.finished) if deps else None
+
+        end = max(s.finished for s in finished)
+        self._timings[f"{self._prefix}critical_path_ms"] = int((end - graph_start) * 1000)
+        self._timings[f"{self._prefix}critical_path"] = list(reversed(path))
+        self._timings[f"{self._prefix}stage_sum_ms"] = int(sum(s.finished - s.started for s in finished) * 1000)
@@ -16,6 +16,7 @@ from llama_index.retrievers.bm25 import BM25Retriever
 from ..interfaces import RetrievalStrategy
 from ..prompt import get_query_gen_prompt
 from ...setting import get_settings, RAGSettings
+from ..vector_store.columnar import with_embedding_lists
 
 logger = logging.getLogger(__name__)
 
@@ -124,7 +125,7 @@ class HybridRetrievalStrategy(RetrievalStrategy):
             return
 
         self._nodes = nodes
-        self._index = VectorStoreIndex(nodes=nodes)
+        self._index = VectorStoreIndex(nodes=with_embedding_lists(nodes))
         self._retriever = self._create_retriever()
         logger.debug(f"Built hybrid index with {len(nodes)} nodes")
 
@@ -194,7 +195,7 @@ class HybridRetrievalStrategy(RetrievalStrategy):
             filtered_nodes = self._filter_nodes(filters)
             if filtered_nodes:
                 # Rebuild index with filtered nodes
-                self._index = VectorStoreIndex(nodes=filtered_nodes)
+                self._index = VectorStoreIndex(nodes=with_embedding_lists(filtered_nodes))
                 self._retriever = self._create_retriever()
 
         results = self._retriever.retrieve(query)
@@ -9,6 +9,7 @@ from llama_index.retrievers.bm25 import BM25Retriever
 
 from ..interfaces import RetrievalStrategy
 from ...setting import get_settings, RAGSettings
+from ..vector_store.columnar import with_embedding_lists
 
 logger = logging.getLogger(__name__)
 
@@ -59,7 +60,7 @@ class KeywordRetrievalStrategy(RetrievalStrategy):
 
         self._nodes = nodes
         # BM25 requires a VectorStoreIndex for initialization
-        self._index = VectorStoreIndex(nodes=nodes)
+        self._index = VectorStoreIndex(nodes=with_embedding_lists(nodes))
         self._retriever = self._create_retriever()
         logger.debug(f"Built keyword index with {len(nodes)} nodes")
 
@@ -89,7 +90,7 @@ class KeywordRetrievalStrategy(RetrievalStrategy):
             filtered_nodes = self._filter_nodes(filters)
             if filtered_nodes:
                 # Rebuild index with filtered nodes
-                self._index = VectorStoreIndex(nodes=filtered_nodes)
+                self._index = VectorStoreIndex(nodes=with_embedding_lists(filtered_nodes))
                 self._retriever = self._create_retriever()
 
         results = self._retriever.retrieve(query)
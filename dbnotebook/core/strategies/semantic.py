@@ -9,6 +9,7 @@ from llama_index.core.schema import BaseNode, NodeWithScore
 
 from ..interfaces import RetrievalStrategy
 from ...setting import get_settings, RAGSettings
+from ..vector_store.columnar import with_embedding_lists
 
 logger = logging.getLogger(__name__)
 
@@ -62,7 +63,7 @@ class SemanticRetrievalStrategy(RetrievalStrategy):
             return
 
         self._nodes = nodes
-        self._index = VectorStoreIndex(nodes=nodes)
+        self._index = VectorStoreIndex(nodes=with_embedding_lists(nodes))
         self._retriever = self._create_retriever()
         logger.debug(f"Built semantic index with {len(nodes)} nodes")
 
@@ -93,7 +94,7 @@ class SemanticRetrievalStrategy(RetrievalStrategy):
             filtered_nodes = self._filter_nodes(filters)
             if filtered_nodes:
                 # Rebuild index with filtered nodes
-                self._index = VectorStoreIndex(nodes=filtered_nodes)
+                self._index = VectorStoreIndex(nodes=with_embedding_lists(filtered_nodes))
                 self._retriever = self._create_retriever()
 
         results = self._retriever.retrieve(query)
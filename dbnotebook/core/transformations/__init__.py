@@ -7,7 +7,14 @@ Provides:
 """
 
 from .transformation_service import TransformationService, TransformationResult, generate_transformations_sync
-from .worker import TransformationWorker, TransformationJob, process_source_transformations
+from .worker import (
+    TransformationWorker,
+    TransformationJob,
+    build_transformation_nodes,
+    embed_transformation_nodes,
+    enqueue_transformation_job,
+    process_source_transformations,
+)
 from .prompts import DENSE_SUMMARY_PROMPT, KEY_INSIGHTS_PROMPT, REFLECTION_QUESTIONS_PROMPT
 
 __all__ = [
@@ -16,6 +23,9 @@ __all__ = [
     "generate_transformations_sync",
     "TransformationWorker",
     "TransformationJob",
+    "build_transformation_nodes",
+    "embed_transformation_nodes",
+    "enqueue_transformation_job",
     "process_source_transformations",
     "DENSE_SUMMARY_PROMPT",
     "KEY_INSIGHTS_PROMPT",
@@ -17,6 +17,8 @@ from llama_index.core import Settings
 from llama_index.core.llms import LLM
 from llama_index.core.schema import TextNode
 
+from ..providers.llm_cache import FEATURE_CONTEXTUAL_RETRIEVAL, cached_llm
+
 logger = logging.getLogger(__name__)
 
 # Maximum characters for chunk content in context generation
@@ -90,7 +92,7 @@ class ContextualRetrievalService:
     @property
     def llm(self) -> LLM:
         """Get the LLM to use for context generation."""
-        return self._llm or Settings.llm
+        return cached_llm(self._llm or Settings.llm, FEATURE_CONTEXTUAL_RETRIEVAL)
 
     async def enrich_chunk(
         self,
@@ -17,6 +17,7 @@ from typing import List, Optional
 from llama_index.core import Settings
 from llama_index.core.llms import LLM
 
+from ..providers.llm_cache import FEATURE_TRANSFORMATIONS, cached_llm
 from .prompts import (
     DENSE_SUMMARY_PROMPT,
     KEY_INSIGHTS_PROMPT,
@@ -70,7 +71,7 @@ class TransformationService:
     @property
     def llm(self) -> LLM:
         """Get the LLM to use for transformations."""
-        return self._llm or Settings.llm
+        return cached_llm(self._llm or Settings.llm, FEATURE_TRANSFORMATIONS)
 
     async def generate_all(
         self,
@@ -1,26 +1,35 @@
 """Background worker for processing AI transformations.
 
 Processes transformation jobs asynchronously:
-1. Polls for pending transformations
+1. Leases jobs (document text in the payload) from the durable job queue
 2. Generates summaries, insights, and questions
-3. Stores embeddings for transformation content
+3. Embeds transformation content in batches across concurrent jobs and
+   stores it with one bulk insert
 4. Updates source records with results
 """
 
 import asyncio
 import logging
 import threading
+import time
+import uuid
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Optional, List, Callable
+from typing import Dict, Optional, List, Callable, Tuple, TYPE_CHECKING
 from uuid import UUID
 
+from llama_index.core import Settings
+from llama_index.core.schema import TextNode
 from sqlalchemy.orm import Session
 
 from ..db import DatabaseManager
 from ..db.models import NotebookSource
+from ..jobs import JOB_TRANSFORMATION, Job, JobQueue, JobRunner, PermanentJobError
 from .transformation_service import TransformationService, TransformationResult
 
+if TYPE_CHECKING:
+    from ..vector_store import PGVectorStore
+
 logger = logging.getLogger(__name__)
 
 
@@ -33,41 +42,181 @@ class TransformationJob:
     file_name: str
 
 
+def enqueue_transformation_job(
+    job_queue: JobQueue,
+    job: TransformationJob,
+    priority: int = 0
+) -> Optional[str]:
+    """Enqueue transformations on the durable job queue (no-op if one is active).
+
+    The document text travels in the job payload so any worker process can
+    run the job.
+    """
+    return job_queue.enqueue(
+        JOB_TRANSFORMATION,
+        source_id=job.source_id,
+        notebook_id=job.notebook_id,
+        payload={"file_name": job.file_name, "document_text": job.document_text},
+        priority=priority,
+    )
+
+
+def build_transformation_nodes(
+    job: TransformationJob,
+    result: TransformationResult
+) -> List[TextNode]:
+    """Turn a source's summary, insights and questions into retrievable nodes."""
+    items: List[Tuple[str, str]] = []
+    if result.dense_summary:
+        items.append((result.dense_summary, "summary"))
+    items.extend((insight, "insight") for insight in result.key_insights or [])
+    items.extend((question, "question") for question in result.reflection_questions or [])
+
+    return [
+        TextNode(
+            text=text,
+            id_=str(uuid.uuid4()),
+            metadata={
+                "source_id": job.source_id,
+                "notebook_id": job.notebook_id,
+                "node_type": node_type,
+                "file_name": job.file_name,  # Parent document name for source display
+            }
+        )
+        for text, node_type in items
+        if text
+    ]
+
+
+def embed_transformation_nodes(
+    vector_store: "PGVectorStore",
+    nodes: List[TextNode],
+    embed_model=None
+) -> Dict[str, float]:
+    """Embed transformation nodes in one batch and insert them in one bulk write.
+
+    Args:
+        vector_store: Destination vector store
+        nodes: Nodes from build_transformation_nodes (any number of sources)
+        embed_model: Embedding model (defaults to Settings.embed_model)
+
+    Returns:
+        Timings: embed_seconds, insert_seconds, nodes, stored
+    """
+    embed_model = embed_model or Settings.embed_model
+    if not nodes:
+        return {"embed_seconds": 0.0, "insert_seconds": 0.0, "nodes": 0, "stored": 0}
+    if embed_model is None:
+        raise RuntimeError("No embed model available for transformation embedding")
+
+    start = time.perf_counter()
+    embeddings = embed_model.get_text_embedding_batch([node.text for node in nodes])
+    for node, embedding in zip(nodes, embeddings):
+        node.embedding = embedding
+    embed_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    stored = vector_store.add_transformation_nodes(nodes)
+    insert_seconds = time.perf_counter() - start
+
+    return {
+        "embed_seconds": embed_seconds,
+        "insert_seconds": insert_seconds,
+        "nodes": len(nodes),
+        "stored": stored,
+    }
+
+
+class _EmbedBatcher:
+    """Coalesces transformation nodes from concurrent jobs into one embed/insert.
+
+    Jobs submit their nodes and await the shared flush, which runs when
+    max_jobs have submitted or max_wait seconds after the first submission.
+    """
+
+    def __init__(self, flush: Callable[[List[TextNode]], Dict[str, float]], max_jobs: int, max_wait: float):
+        self._flush = flush
+        self.max_jobs = max(1, max_jobs)
+        self.max_wait = max_wait
+        self._pending: List[Tuple[List[TextNode], asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    async def submit(self, nodes: List[TextNode]) -> Dict[str, float]:
+        """Queue nodes for the next batch and wait for its timings."""
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((nodes, future))
+        if len(self._pending) >= self.max_jobs:
+            self._flush_now()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.max_wait, self._flush_now)
+        return await future
+
+    def _flush_now(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            asyncio.ensure_future(self._run(batch))
+
+    async def _run(self, batch: List[Tuple[List[TextNode], asyncio.Future]]) -> None:
+        nodes = [node for job_nodes, _ in batch for node in job_nodes]
+        try:
+            timings = await asyncio.to_thread(self._flush, nodes)
+            timings["jobs"] = len(batch)
+            for _, future in batch:
+                if not future.done():
+                    future.set_result(dict(timings))
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+
+
 class TransformationWorker:
     """Background worker for processing document transformations.
 
-    Runs in a background thread, processing transformation jobs from a queue.
+    Runs in a background thread, leasing transformation jobs from the
+    durable job queue shared with other worker processes.
     """
 
     def __init__(
         self,
         db_manager: DatabaseManager,
         transformation_service: Optional[TransformationService] = None,
-        embed_callback: Optional[Callable[[str, str, str, str], None]] = None,
+        vector_store: Optional["PGVectorStore"] = None,
         poll_interval: float = 5.0,
         max_concurrent: int = 2,
+        job_queue: Optional[JobQueue] = None,
+        embed_batch_wait: float = 1.0,
     ):
         """Initialize the transformation worker.
 
         Args:
             db_manager: Database manager for accessing sources
             transformation_service: Service for generating transformations
-            embed_callback: Optional callback to embed transformation text
-                           Signature: (text, node_type, source_id, notebook_id) -> None
-            poll_interval: Seconds between polling for new jobs
+            vector_store: Optional vector store; when set, transformation
+                content is embedded (Settings.embed_model) and stored for retrieval
+            poll_interval: Longest idle wait between lease attempts
+                (new jobs wake the worker immediately via NOTIFY)
             max_concurrent: Maximum concurrent transformation jobs
+            job_queue: Shared job queue (created from db_manager if omitted)
+            embed_batch_wait: Seconds to hold finished jobs' texts so
+                concurrent jobs share one embedding batch and one insert
         """
         self.db = db_manager
         self.service = transformation_service or TransformationService()
-        self.embed_callback = embed_callback
+        self.vector_store = vector_store
         self.poll_interval = poll_interval
         self.max_concurrent = max_concurrent
+        self.job_queue = job_queue or JobQueue(db_manager.get_session_maker())
+        self.embed_batch_wait = embed_batch_wait
+        self._embed_batcher: Optional[_EmbedBatcher] = None
 
-        self._queue: asyncio.Queue = None
         self._running = False
         self._thread: Optional[threading.Thread] = None
         self._loop: Optional[asyncio.AbstractEventLoop] = None
-        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._runner: Optional[JobRunner] = None
 
     def start(self):
         """Start the background worker thread."""
@@ -76,6 +225,14 @@ class TransformationWorker:
             return
 
         self._running = True
+        self._runner = JobRunner(
+            self.job_queue,
+            job_types=[JOB_TRANSFORMATION],
+            handler=self._handle_job,
+            max_concurrent=self.max_concurrent,
+            poll_interval=self.poll_interval,
+            engine=self.db.engine,
+        )
         self._thread = threading.Thread(target=self._run_loop, daemon=True)
         self._thread.start()
         logger.info("Transformation worker started")
@@ -83,81 +240,50 @@ class TransformationWorker:
     def stop(self):
         """Stop the background worker."""
         self._running = False
+        if self._runner:
+            self._runner.stop()
         if self._loop:
             self._loop.call_soon_threadsafe(self._loop.stop)
         if self._thread:
             self._thread.join(timeout=5.0)
         logger.info("Transformation worker stopped")
 
-    def queue_job(self, job: TransformationJob):
-        """Queue a transformation job for processing."""
-        if self._queue and self._loop:
-            self._loop.call_soon_threadsafe(
-                self._queue.put_nowait, job
-            )
-            logger.info(f"Queued transformation job for source: {job.source_id}")
+    def queue_job(self, job: TransformationJob, priority: int = 0) -> bool:
+        """Queue a transformation job for processing.
+
+        Returns:
+            True if a new job was enqueued (False if one is already active)
+        """
+        return enqueue_transformation_job(self.job_queue, job, priority) is not None
 
     def _run_loop(self):
         """Run the async event loop in the background thread."""
         self._loop = asyncio.new_event_loop()
         asyncio.set_event_loop(self._loop)
-        self._queue = asyncio.Queue()
-        self._semaphore = asyncio.Semaphore(self.max_concurrent)
 
         try:
-            self._loop.run_until_complete(self._main_loop())
+            self._loop.run_until_complete(self._runner.run())
         except Exception as e:
             logger.error(f"Worker loop error: {e}")
         finally:
             self._loop.close()
 
-    async def _main_loop(self):
-        """Main processing loop."""
-        # Start polling task
-        poll_task = asyncio.create_task(self._poll_pending())
-
-        while self._running:
-            try:
-                # Wait for job from queue with timeout
-                job = await asyncio.wait_for(
-                    self._queue.get(),
-                    timeout=self.poll_interval
-                )
-                # Process job with semaphore for concurrency control
-                asyncio.create_task(self._process_with_semaphore(job))
-            except asyncio.TimeoutError:
-                continue
-            except Exception as e:
-                logger.error(f"Error in main loop: {e}")
-
-        poll_task.cancel()
-
-    async def _poll_pending(self):
-        """Poll database for pending transformations."""
-        while self._running:
-            try:
-                pending = self._get_pending_sources()
-                for source_data in pending:
-                    job = TransformationJob(
-                        source_id=source_data["source_id"],
-                        document_text=source_data.get("document_text", ""),
-                        notebook_id=source_data["notebook_id"],
-                        file_name=source_data["file_name"],
-                    )
-                    await self._queue.put(job)
-
-                await asyncio.sleep(self.poll_interval)
-            except Exception as e:
-                logger.error(f"Error polling pending: {e}")
-                await asyncio.sleep(self.poll_interval)
-
-    async def _process_with_semaphore(self, job: TransformationJob):
-        """Process job with semaphore for concurrency control."""
-        async with self._semaphore:
-            await self._process_job(job)
+    async def _handle_job(self, job: Job):
+        """Run a leased queue job."""
+        await self._process_job(TransformationJob(
+            source_id=job.source_id,
+            document_text=job.payload.get("document_text", ""),
+            notebook_id=job.notebook_id,
+            file_name=job.payload.get("file_name", ""),
+        ))
 
     async def _process_job(self, job: TransformationJob):
-        """Process a single transformation job."""
+        """Process a single transformation job.
+
+        Raises:
+            PermanentJobError: For failures a retry cannot fix
+            Exception: Any other failure (the job is retried with backoff)
+        """
         source_id = job.source_id
         logger.info(f"Processing transformation for source: {source_id} ({job.file_name})")
 
@@ -167,21 +293,18 @@ class TransformationWorker:
 
             # Generate transformations
             if not job.document_text:
-                logger.warning(f"No document text for source: {source_id}")
-                self._update_status(source_id, "failed", "No document text available")
-                return
+                raise PermanentJobError("No document text available")
 
             result = await self.service.generate_all(job.document_text)
 
             if not result.success:
-                self._update_status(source_id, "failed", result.error)
-                return
+                raise RuntimeError(result.error or "Transformation failed")
 
             # Store transformations in database
             self._store_transformations(source_id, result)
 
             # Optionally embed transformation content
-            if self.embed_callback:
+            if self.vector_store is not None:
                 await self._embed_transformations(job, result)
 
             # Update status to completed
@@ -191,27 +314,7 @@ class TransformationWorker:
         except Exception as e:
             logger.error(f"Failed to process transformation for {source_id}: {e}")
             self._update_status(source_id, "failed", str(e))
-
-    def _get_pending_sources(self, limit: int = 10) -> List[dict]:
-        """Get sources with pending transformation status."""
-        try:
-            with self.db.get_session() as session:
-                sources = session.query(NotebookSource).filter(
-                    NotebookSource.transformation_status == "pending"
-                ).limit(limit).all()
-
-                return [
-                    {
-                        "source_id": str(s.source_id),
-                        "notebook_id": str(s.notebook_id),
-                        "file_name": s.file_name,
-                        "document_text": "",  # Will be loaded separately if needed
-                    }
-                    for s in sources
-                ]
-        except Exception as e:
-            logger.error(f"Error getting pending sources: {e}")
-            return []
+            raise
 
     def _update_status(
         self,
@@ -263,40 +366,29 @@ class TransformationWorker:
         job: TransformationJob,
         result: TransformationResult
     ):
-        """Embed transformation content for retrieval."""
-        if not self.embed_callback:
+        """Embed transformation content for retrieval.
+
+        Nodes from jobs finishing together are embedded with a single
+        get_text_embedding_batch call and written with one bulk insert.
+        """
+        nodes = build_transformation_nodes(job, result)
+        if not nodes:
             return
 
-        try:
-            # Embed summary
-            if result.dense_summary:
-                self.embed_callback(
-                    result.dense_summary,
-                    "summary",
-                    job.source_id,
-                    job.notebook_id
-                )
-
-            # Embed each insight
-            if result.key_insights:
-                for i, insight in enumerate(result.key_insights):
-                    self.embed_callback(
-                        insight,
-                        "insight",
-                        job.source_id,
-                        job.notebook_id
-                    )
-
-            # Embed each question
-            if result.reflection_questions:
-                for i, question in enumerate(result.reflection_questions):
-                    self.embed_callback(
-                        question,
-                        "question",
-                        job.source_id,
-                        job.notebook_id
-                    )
+        if self._embed_batcher is None:
+            self._embed_batcher = _EmbedBatcher(
+                lambda batch: embed_transformation_nodes(self.vector_store, batch),
+                max_jobs=self.max_concurrent,
+                max_wait=self.embed_batch_wait,
+            )
 
+        try:
+            timings = await self._embed_batcher.submit(nodes)
+            logger.info(
+                f"Embedded {len(nodes)} transformation nodes for {job.source_id}: "
+                f"embed {timings['embed_seconds']:.2f}s, insert {timings['insert_seconds']:.2f}s "
+                f"(batch of {int(timings['nodes'])} nodes from {int(timings['jobs'])} jobs)"
+            )
         except Exception as e:
             logger.error(f"Error embedding transformations for {job.source_id}: {e}")
 
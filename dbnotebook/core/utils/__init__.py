@@ -4,5 +4,7 @@ This package contains shared utility functions used across the codebase.
 """
 
 from .llm_utils import unwrap_llm
+from .text_utils import bm25_tokenize
+from .file_utils import hash_file
 
-__all__ = ["unwrap_llm"]
+__all__ = ["unwrap_llm", "bm25_tokenize", "hash_file"]
@@ -0,0 +1,46 @@
+"""File utility functions for upload handling.
+
+Uploads used to be hashed twice with 4 KB reads and then read fully into
+memory for a third hash at registration. hash_file() computes the digest and
+size in one streamed pass with a reusable large buffer, so the result can be
+passed through instead of re-reading the file.
+"""
+
+import hashlib
+from typing import Tuple
+
+# 1 MiB reads keep syscall overhead negligible for multi-hundred-MB files
+HASH_BUFFER_SIZE = 1 << 20
+
+
+def hash_file(
+    file_path: str,
+    algorithm: str = "sha256",
+    buffer_size: int = HASH_BUFFER_SIZE,
+) -> Tuple[str, int]:
+    """Hash a file in a single streamed pass.
+
+    Args:
+        file_path: Path to the file
+        algorithm: hashlib algorithm name
+        buffer_size: Read buffer size in bytes
+
+    Returns:
+        (hex digest, size in bytes)
+
+    Example:
+        >>> from dbnotebook.core.utils import hash_file
+        >>> digest, size = hash_file("uploads/report.pdf")
+    """
+    digest = hashlib.new(algorithm)
+    buffer = bytearray(buffer_size)
+    view = memoryview(buffer)
+    size = 0
+    with open(file_path, "rb", buffering=0) as f:
+        while True:
+            read = f.readinto(buffer)
+            if not read:
+                break
+            digest.update(view[:read])
+            size += read
+    return digest.hexdigest(), size
@@ -0,0 +1,47 @@
+"""Text tokenization shared by the BM25 indexes.
+
+The in-memory NotebookIndex and the persistent Postgres BM25 index must
+tokenize identically at index and query time, so both use bm25_tokenize().
+"""
+
+import re
+from typing import List
+
+try:
+    import Stemmer  # PyStemmer, installed with llama-index-retrievers-bm25
+    _STEMMER = Stemmer.Stemmer("english")
+except ImportError:  # pragma: no cover - optional
+    _STEMMER = None
+
+_TOKEN_PATTERN = re.compile(r"(?u)\b\w\w+\b")
+
+# Same spirit as the bm25s English stopword list used by BM25Retriever
+_STOPWORDS = frozenset("""
+a about above after again against all am an and any are as at be because been
+before being below between both but by can did do does doing down during each
+few for from further had has have having he her here hers herself him himself
+his how i if in into is it its itself just me more most my myself no nor not
+now of off on once only or other our ours ourselves out over own same she
+should so some such than that the their theirs them themselves then there
+these they this those through to too under until up very was we were what
+when where which while who whom why will with you your yours yourself
+yourselves
+""".split())
+
+# Okapi BM25 parameters (bm25s defaults)
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+# Terms longer than this are dropped (hashes, base64 blobs, URLs)
+MAX_TERM_LENGTH = 64
+
+
+def bm25_tokenize(text: str) -> List[str]:
+    """Lowercase, split into word tokens, drop stopwords and stem."""
+    tokens = [
+        t for t in _TOKEN_PATTERN.findall(text.lower())
+        if t not in _STOPWORDS and len(t) <= MAX_TERM_LENGTH
+    ]
+    if _STEMMER is not None and tokens:
+        tokens = _STEMMER.stemWords(tokens)
+    return tokens
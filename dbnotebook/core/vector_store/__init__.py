@@ -1,9 +1,12 @@
 from .base import IVectorStore
 from .vector_store import LocalVectorStore
 from .pg_vector_store import PGVectorStore
+from .columnar import ColumnarNode, NodeColumns
 
 __all__ = [
     "IVectorStore",
     "LocalVectorStore",
     "PGVectorStore",
+    "ColumnarNode",
+    "NodeColumns",
 ]
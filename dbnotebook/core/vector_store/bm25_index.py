@@ -0,0 +1,350 @@
+"""
+Persistent BM25 inverted index stored in PostgreSQL.
+
+BM25Retriever.from_defaults() re-tokenizes a notebook's entire corpus every
+time a retriever is built. This index is written once, when chunks are
+stored, and queried in SQL:
+
+    bm25_documents(node_id, notebook_id, source_id, doc_len)
+    bm25_postings(notebook_id, term, node_id, tf)
+
+node_id references the embeddings table row ID with ON DELETE CASCADE, so
+every delete path (document, notebook, RAPTOR tree) removes postings too.
+Document frequency, corpus size and average length are computed at query
+time from indexed aggregates; only the top-k rows' text is read back.
+"""
+
+import logging
+from collections import Counter
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import text
+
+from ..utils.text_utils import BM25_B, BM25_K1, bm25_tokenize
+
+logger = logging.getLogger(__name__)
+
+DOCUMENTS_TABLE = "bm25_documents"
+POSTINGS_TABLE = "bm25_postings"
+
+
+class PGBM25Index:
+    """
+    BM25 inverted index over an embeddings table.
+
+    Maintained by PGVectorStore on every node insert; rows deleted from the
+    embeddings table cascade to the index.
+    """
+
+    def __init__(self, session_factory, embeddings_table: str) -> None:
+        """
+        Args:
+            session_factory: SQLAlchemy session factory
+            embeddings_table: Embeddings table name (e.g. data_embeddings)
+        """
+        self._session_factory = session_factory
+        self._embeddings_table = embeddings_table
+        # Notebooks verified complete (no unindexed rows) in this process
+        self._complete_notebooks: Set[str] = set()
+
+    def ensure_tables(self) -> None:
+        """Create index tables if the migration has not been applied."""
+        session = self._session_factory()
+        try:
+            session.execute(text(f"""
+                CREATE TABLE IF NOT EXISTS {DOCUMENTS_TABLE} (
+                    node_id BIGINT PRIMARY KEY
+                        REFERENCES {self._embeddings_table}(id) ON DELETE CASCADE,
+                    notebook_id TEXT NOT NULL,
+                    source_id TEXT,
+                    doc_len INTEGER NOT NULL
+                )
+            """))
+            session.execute(text(f"""
+                CREATE INDEX IF NOT EXISTS idx_{DOCUMENTS_TABLE}_notebook
+                ON {DOCUMENTS_TABLE} (notebook_id)
+            """))
+            session.execute(text(f"""
+                CREATE TABLE IF NOT EXISTS {POSTINGS_TABLE} (
+                    notebook_id TEXT NOT NULL,
+                    term TEXT NOT NULL,
+                    node_id BIGINT NOT NULL
+                        REFERENCES {DOCUMENTS_TABLE}(node_id) ON DELETE CASCADE,
+                    tf INTEGER NOT NULL,
+                    PRIMARY KEY (notebook_id, term, node_id)
+                )
+            """))
+            session.execute(text(f"""
+                CREATE INDEX IF NOT EXISTS idx_{POSTINGS_TABLE}_node
+                ON {POSTINGS_TABLE} (node_id)
+            """))
+            session.commit()
+        except Exception as e:
+            session.rollback()
+            logger.warning(f"Could not ensure BM25 index tables: {e}")
+        finally:
+            session.close()
+
+    # =========================================================================
+    # Maintenance
+    # =========================================================================
+
+    def index_rows(self, rows: Sequence[Tuple[int, str, Optional[str], str]]) -> int:
+        """
+        Tokenize and index embeddings-table rows.
+
+        Rows already indexed are replaced. Postings are written with one
+        array-unnest INSERT per table instead of per-row statements.
+
+        Args:
+            rows: (row_id, notebook_id, source_id, text) tuples
+
+        Returns:
+            Number of rows indexed
+        """
+        if not rows:
+            return 0
+
+        doc_ids, doc_notebooks, doc_sources, doc_lens = [], [], [], []
+        post_notebooks, post_terms, post_ids, post_tfs = [], [], [], []
+        for row_id, notebook_id, source_id, content in rows:
+            if not notebook_id:
+                continue
+            terms = Counter(bm25_tokenize(content or ""))
+            doc_ids.append(int(row_id))
+            doc_notebooks.append(notebook_id)
+            doc_sources.append(source_id)
+            doc_lens.append(sum(terms.values()))
+            for term, tf in terms.items():
+                post_notebooks.append(notebook_id)
+                post_terms.append(term)
+                post_ids.append(int(row_id))
+                post_tfs.append(tf)
+
+        if not doc_ids:
+            return 0
+
+        session = self._session_factory()
+        try:
+            session.execute(
+                text(f"DELETE FROM {DOCUMENTS_TABLE} WHERE node_id = ANY(CAST(:ids AS bigint[]))"),
+                {"ids": doc_ids}
+            )
+            session.execute(
+                text(f"""
+                    INSERT INTO {DOCUMENTS_TABLE} (node_id, notebook_id, source_id, doc_len)
+                    SELECT * FROM unnest(
+                        CAST(:ids AS bigint[]), CAST(:notebooks AS text[]),
+                        CAST(:sources AS text[]), CAST(:lens AS int[])
+                    )
+                """),
+                {"ids": doc_ids, "notebooks": doc_notebooks, "sources": doc_sources, "lens": doc_lens}
+            )
+            if post_ids:
+                session.execute(
+                    text(f"""
+                        INSERT INTO {POSTINGS_TABLE} (notebook_id, term, node_id, tf)
+                        SELECT * FROM unnest(
+                            CAST(:notebooks AS text[]), CAST(:terms AS text[]),
+                            CAST(:ids AS bigint[]), CAST(:tfs AS int[])
+                        )
+                    """),
+                    {"notebooks": post_notebooks, "terms": post_terms, "ids": post_ids, "tfs": post_tfs}
+                )
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+        logger.debug(f"BM25 indexed {len(doc_ids)} rows ({len(post_ids)} postings)")
+        return len(doc_ids)
+
+    def index_node_ids(self, node_ids: Sequence[str]) -> int:
+        """
+        Index rows by their LlamaIndex node_id (the embeddings.node_id column).
+
+        Used right after LlamaIndex inserts nodes, when only node IDs are known.
+
+        Args:
+            node_ids: LlamaIndex node IDs of freshly inserted rows
+
+        Returns:
+            Number of rows indexed
+        """
+        if not node_ids:
+            return 0
+        session = self._session_factory()
+        try:
+            rows = session.execute(
+                text(f"""
+                    SELECT id, metadata_->>'notebook_id', metadata_->>'source_id', text
+                    FROM {self._embeddings_table}
+                    WHERE node_id = ANY(CAST(:node_ids AS varchar[]))
+                    AND metadata_->>'notebook_id' IS NOT NULL
+                """),
+                {"node_ids": list(node_ids)}
+            ).fetchall()
+        finally:
+            session.close()
+        return self.index_rows(rows)
+
+    def ensure_notebook_indexed(self, notebook_id: str, batch_size: int = 1000) -> int:
+        """
+        Backfill rows of a notebook that predate the index.
+
+        Checked once per notebook per process; afterwards every write path
+        keeps the index complete.
+
+        Args:
+            notebook_id: Notebook to verify
+            batch_size: Rows tokenized per INSERT batch
+
+        Returns:
+            Number of rows backfilled
+        """
+        if notebook_id in self._complete_notebooks:
+            return 0
+
+        total = 0
+        while True:
+            session = self._session_factory()
+            try:
+                rows = session.execute(
+                    text(f"""
+                        SELECT e.id, e.metadata_->>'notebook_id', e.metadata_->>'source_id', e.text
+                        FROM {self._embeddings_table} e
+                        WHERE e.metadata_->>'notebook_id' = :notebook_id
+                        AND NOT EXISTS (
+                            SELECT 1 FROM {DOCUMENTS_TABLE} d WHERE d.node_id = e.id
+                        )
+                        LIMIT :limit
+                    """),
+                    {"notebook_id": notebook_id, "limit": batch_size}
+                ).fetchall()
+            finally:
+                session.close()
+
+            if not rows:
+                break
+            total += self.index_rows(rows)
+
+        if total:
+            logger.info(f"BM25 index backfilled {total} rows for notebook {notebook_id}")
+        self._complete_notebooks.add(notebook_id)
+        return total
+
+    def forget_notebook(self, notebook_id: Optional[str] = None) -> None:
+        """Drop the per-process completeness flag (e.g. after bulk deletes)."""
+        if notebook_id:
+            self._complete_notebooks.discard(notebook_id)
+        else:
+            self._complete_notebooks.clear()
+
+    # =========================================================================
+    # Search
+    # =========================================================================
+
+    def search(
+        self,
+        notebook_id: str,
+        query_str: str,
+        top_k: int = 20,
+    ) -> List[Tuple[int, str, Optional[str], float]]:
+        """
+        Score a query with Okapi BM25 entirely in SQL.
+
+        Only postings for the query terms are touched. Inactive sources
+        (notebook_sources.active = false) are excluded from both scoring and
+        corpus statistics.
+
+        Args:
+            notebook_id: Notebook to search
+            query_str: Raw query text
+            top_k: Number of results
+
+        Returns:
+            (row_id, text, metadata_json_text, score) tuples, best first
+        """
+        terms = Counter(bm25_tokenize(query_str))
+        if not terms:
+            return []
+
+        session = self._session_factory()
+        try:
+            result = session.execute(
+                text(f"""
+                    WITH live AS (
+                        SELECT d.node_id, d.doc_len
+                        FROM {DOCUMENTS_TABLE} d
+                        LEFT JOIN notebook_sources ns
+                            ON d.source_id = ns.source_id::text
+                        WHERE d.notebook_id = :notebook_id
+                        AND (ns.active = true OR ns.active IS NULL)
+                    ),
+                    stats AS (
+                        SELECT COUNT(*)::float AS n,
+                               GREATEST(COALESCE(AVG(doc_len), 1), 1)::float AS avgdl
+                        FROM live
+                    ),
+                    matches AS (
+                        SELECT p.term, p.node_id, p.tf, l.doc_len, q.qtf
+                        FROM {POSTINGS_TABLE} p
+                        JOIN unnest(CAST(:terms AS text[]), CAST(:qtfs AS int[])) AS q(term, qtf)
+                            ON p.term = q.term
+                        JOIN live l ON l.node_id = p.node_id
+                        WHERE p.notebook_id = :notebook_id
+                    ),
+                    df AS (
+                        SELECT term, COUNT(*)::float AS df FROM matches GROUP BY term
+                    ),
+                    scored AS (
+                        SELECT m.node_id,
+                               SUM(
+                                   m.qtf
+                                   * ln(1 + (s.n - df.df + 0.5) / (df.df + 0.5))
+                                   * m.tf * (:k1 + 1)
+                                   / (m.tf + :k1 * (1 - :b + :b * m.doc_len / s.avgdl))
+                               ) AS score
+                        FROM matches m
+                        JOIN df ON df.term = m.term
+                        CROSS JOIN stats s
+                        GROUP BY m.node_id
+                        ORDER BY score DESC
+                        LIMIT :top_k
+                    )
+                    SELECT e.id, e.text, e.metadata_::text, scored.score
+                    FROM scored
+                    JOIN {self._embeddings_table} e ON e.id = scored.node_id
+                    ORDER BY scored.score DESC
+                """),
+                {
+                    "notebook_id": notebook_id,
+                    "terms": list(terms.keys()),
+                    "qtfs": list(terms.values()),
+                    "k1": BM25_K1,
+                    "b": BM25_B,
+                    "top_k": top_k,
+                }
+            )
+            return [(row[0], row[1], row[2], float(row[3])) for row in result]
+        finally:
+            session.close()
+
+    def get_stats(self, notebook_id: str) -> Dict[str, int]:
+        """Get document and posting counts for a notebook's index."""
+        session = self._session_factory()
+        try:
+            row = session.execute(
+                text(f"""
+                    SELECT
+                        (SELECT COUNT(*) FROM {DOCUMENTS_TABLE} WHERE notebook_id = :notebook_id),
+                        (SELECT COUNT(*) FROM {POSTINGS_TABLE} WHERE notebook_id = :notebook_id),
+                        (SELECT COUNT(DISTINCT term) FROM {POSTINGS_TABLE} WHERE notebook_id = :notebook_id)
+                """),
+                {"notebook_id": notebook_id}
+            ).fetchone()
+            return {"documents": row[0], "postings": row[1], "terms": row[2]}
+        finally:
+            session.close()
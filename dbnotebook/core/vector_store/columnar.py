@@ -0,0 +1,331 @@
+"""
+Columnar node storage with binary pgvector decoding.
+
+Loading a notebook through the text representation of pgvector
+('[0.1, 0.2, ...]' parsed with json.loads) creates one boxed Python float
+per dimension per row. For 50k chunks at 768 dims that is ~38M objects.
+
+This module selects embeddings with vector_send() (pgvector's binary wire
+format: int16 dim, int16 unused, dim x float32 big-endian) and decodes a
+whole batch of rows into one contiguous float32 matrix with a single
+np.frombuffer call. Text and metadata stay in flat per-column lists, and
+TextNode objects are only built on request. Materialized nodes are
+ColumnarNodes: they point at their row of the shared matrix and leave
+.embedding unset. Code that needs vectors reads them with node_embedding()
+(a matrix row, no list), and code handing nodes to a VectorStoreIndex passes
+them through with_embedding_lists() so nothing is re-embedded.
+"""
+
+import json
+import logging
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Union
+
+import numpy as np
+from llama_index.core.schema import BaseNode, TextNode
+from pydantic import PrivateAttr, field_serializer
+
+logger = logging.getLogger(__name__)
+
+# vector_send() header: int16 dimension + int16 unused
+VECTOR_HEADER_BYTES = 4
+
+
+def decode_vector_batch(buffers: Sequence[Optional[bytes]], dim: int) -> np.ndarray:
+    """
+    Decode pgvector binary buffers into an (N, dim) float32 matrix.
+
+    All rows share the same layout, so the buffers are joined and viewed as
+    big-endian float32 in one shot; the header occupies the first 4-byte
+    column and is sliced away. NULL embeddings become zero rows.
+
+    Args:
+        buffers: vector_send() outputs (bytes/memoryview) or None
+        dim: Embedding dimension
+
+    Returns:
+        Native-endian float32 array of shape (len(buffers), dim)
+    """
+    row_bytes = VECTOR_HEADER_BYTES + dim * 4
+    empty = bytes(row_bytes)
+    joined = b"".join(
+        bytes(buf) if buf is not None and len(buf) == row_bytes else empty
+        for buf in buffers
+    )
+    matrix = np.frombuffer(joined, dtype=">f4").reshape(len(buffers), dim + 1)
+    return matrix[:, 1:].astype(np.float32)
+
+
+def vector_dim(buffer: bytes) -> int:
+    """Read the dimension from a vector_send() buffer header."""
+    return int.from_bytes(bytes(buffer[:2]), "big")
+
+
+class ColumnarNode(TextNode):
+    """
+    TextNode whose embedding lives in a row of a shared float32 matrix.
+
+    .embedding stays None while the node is matrix-backed; read the vector
+    with embedding_row (or node_embedding()). Assigning .embedding stores it
+    like a plain TextNode and detaches the node from the matrix. Serialized
+    forms (model_dump, to_dict, to_json, pickle) carry the row as a list.
+    """
+
+    _matrix: Optional[np.ndarray] = PrivateAttr(default=None)
+    _row: int = PrivateAttr(default=-1)
+
+    @classmethod
+    def from_row(cls, matrix: np.ndarray, row: int, **kwargs: Any) -> "ColumnarNode":
+        """Create a node backed by matrix[row]; kwargs go to TextNode."""
+        node = cls(**kwargs)
+        # Bypass pydantic's __setattr__, which dominates per-node build time
+        node.__pydantic_private__.update(_matrix=matrix, _row=row)
+        return node
+
+    @property
+    def embedding_row(self) -> Optional[np.ndarray]:
+        """The node's matrix row (a view), or None if not matrix-backed."""
+        if self.embedding is not None:
+            return None
+        # Read the private attrs directly; pydantic's __getattr__ is slow
+        private = self.__pydantic_private__
+        matrix = private.get("_matrix")
+        return matrix[private["_row"]] if matrix is not None else None
+
+    @field_serializer("embedding")
+    def _serialize_embedding(self, embedding: Optional[List[float]]) -> Optional[List[float]]:
+        if embedding is not None:
+            return embedding
+        row = self.embedding_row
+        return row.tolist() if row is not None else None
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Unpickling re-runs __init__ from __dict__ and drops private attrs,
+        # so the embedding has to travel as a list
+        state = super().__getstate__()
+        row = self.embedding_row
+        if row is not None:
+            state["__dict__"] = {**state["__dict__"], "embedding": row.tolist()}
+        return state
+
+
+def _row(node: BaseNode) -> Optional[np.ndarray]:
+    """A node's matrix row, or None for plain (list-embedded) nodes."""
+    return node.embedding_row if isinstance(node, ColumnarNode) else None
+
+
+def node_embedding(node: BaseNode) -> Optional[Union[np.ndarray, List[float]]]:
+    """
+    A node's embedding without building a list for matrix-backed nodes.
+
+    Returns:
+        The matrix row for ColumnarNodes, node.embedding otherwise
+    """
+    row = _row(node)
+    return row if row is not None else node.embedding
+
+
+def with_embedding_lists(nodes: Sequence[BaseNode]) -> List[BaseNode]:
+    """
+    Nodes with .embedding populated, for consumers that read it directly.
+
+    VectorStoreIndex re-embeds any node whose .embedding is None, so
+    matrix-backed ColumnarNodes are replaced by copies that carry their row
+    as a list. Plain nodes are passed through; the inputs are not modified.
+
+    Args:
+        nodes: Nodes, possibly matrix-backed (e.g. from the NodeCache)
+
+    Returns:
+        List of nodes in the same order
+    """
+    result: List[BaseNode] = []
+    for node in nodes:
+        row = _row(node)
+        result.append(node if row is None else node.model_copy(update={"embedding": row.tolist()}))
+    return result
+
+
+def embedding_dim(nodes: Iterable[BaseNode]) -> int:
+    """Dimension of the first embedded node (0 if none is embedded)."""
+    for node in nodes:
+        embedding = node_embedding(node)
+        if embedding is not None and len(embedding):
+            return len(embedding)
+    return 0
+
+
+def embedding_block(nodes: Sequence[BaseNode], dim: int) -> np.ndarray:
+    """
+    Stack node embeddings into an (N, dim) float32 matrix.
+
+    Matrix-backed ColumnarNodes are copied row to row without building Python
+    lists; other nodes use their embedding list. Missing or mismatched
+    embeddings become zero rows.
+
+    Args:
+        nodes: Nodes to stack
+        dim: Embedding dimension
+
+    Returns:
+        Float32 array of shape (len(nodes), dim)
+    """
+    block = np.zeros((len(nodes), dim), dtype=np.float32)
+    for i, node in enumerate(nodes):
+        row = _row(node)
+        if row is not None:
+            if row.shape[0] == dim:
+                block[i] = row
+            continue
+        embedding = node.embedding
+        if embedding and len(embedding) == dim:
+            block[i] = embedding
+    return block
+
+
+class NodeColumns:
+    """
+    Column-oriented node set: ids, texts, raw metadata and one embedding matrix.
+
+    Per-node TextNode objects are materialized lazily via node() / to_nodes(),
+    and Python embedding lists only via embedding() or with_embedding_lists(),
+    so callers that only need the matrix (clustering, similarity scoring, the
+    in-memory notebook index) never pay for them.
+
+    Attributes:
+        ids: Row IDs as strings
+        texts: Chunk text
+        embeddings: float32 array of shape (N, dim)
+        has_embedding: bool array, False where the row's embedding was NULL
+    """
+
+    __slots__ = ("ids", "texts", "_metadata_raw", "embeddings", "has_embedding")
+
+    def __init__(
+        self,
+        ids: List[str],
+        texts: List[str],
+        metadata_raw: List[Any],
+        embeddings: np.ndarray,
+        has_embedding: Optional[np.ndarray] = None,
+    ) -> None:
+        self.ids = ids
+        self.texts = texts
+        self._metadata_raw = metadata_raw
+        self.embeddings = embeddings
+        self.has_embedding = (
+            has_embedding if has_embedding is not None
+            else np.ones(len(ids), dtype=bool)
+        )
+
+    @classmethod
+    def empty(cls, dim: int = 0) -> "NodeColumns":
+        """Create an empty column set."""
+        return cls([], [], [], np.zeros((0, dim), dtype=np.float32))
+
+    @classmethod
+    def from_rows(
+        cls,
+        row_batches: Iterable[Sequence[tuple]],
+        dim: Optional[int] = None,
+    ) -> "NodeColumns":
+        """
+        Build columns from batches of (id, text, metadata, vector_send bytes) rows.
+
+        Each batch is decoded in one vectorized step, then the batch matrices
+        are stacked once at the end.
+
+        Args:
+            row_batches: Iterable of row batches (e.g. Result.partitions())
+            dim: Embedding dimension; read from the first non-NULL row if None
+
+        Returns:
+            NodeColumns holding all rows
+        """
+        ids: List[str] = []
+        texts: List[str] = []
+        metadata_raw: List[Any] = []
+        matrices: List[np.ndarray] = []
+        present: List[np.ndarray] = []
+
+        for batch in row_batches:
+            if not batch:
+                continue
+            buffers = []
+            for node_id, text_content, metadata, embedding in batch:
+                ids.append(str(node_id))
+                texts.append(text_content or "")
+                metadata_raw.append(metadata)
+                buffers.append(embedding)
+                if dim is None and embedding is not None:
+                    dim = vector_dim(embedding)
+
+            if dim is None:
+                # Every row so far is NULL - keep placeholders until dim is known
+                matrices.append(np.zeros((len(buffers), 0), dtype=np.float32))
+            else:
+                matrices.append(decode_vector_batch(buffers, dim))
+            row_bytes = VECTOR_HEADER_BYTES + (dim or 0) * 4
+            present.append(np.array(
+                [b is not None and (dim is None or len(b) == row_bytes) for b in buffers],
+                dtype=bool,
+            ))
+
+        if not ids:
+            return cls.empty(dim or 0)
+
+        dim = dim or 0
+        matrices = [
+            m if m.shape[1] == dim else np.zeros((m.shape[0], dim), dtype=np.float32)
+            for m in matrices
+        ]
+        embeddings = matrices[0] if len(matrices) == 1 else np.vstack(matrices)
+        return cls(ids, texts, metadata_raw, embeddings, np.concatenate(present))
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @property
+    def dim(self) -> int:
+        """Embedding dimension."""
+        return self.embeddings.shape[1] if self.embeddings.ndim == 2 else 0
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory held by the columns (matrix + text)."""
+        text_bytes = sum(len(t) for t in self.texts)
+        return int(self.embeddings.nbytes) + text_bytes
+
+    def metadata(self, i: int) -> Dict[str, Any]:
+        """Get parsed metadata for row i (a fresh dict on every call)."""
+        raw = self._metadata_raw[i]
+        if isinstance(raw, str):
+            return json.loads(raw)
+        return dict(raw) if raw else {}
+
+    def embedding(self, i: int) -> Optional[List[float]]:
+        """Get row i's embedding as a Python list (built on demand)."""
+        if not self.has_embedding[i]:
+            return None
+        return self.embeddings[i].tolist()
+
+    def node(self, i: int, include_embedding: bool = True) -> TextNode:
+        """Materialize row i as a TextNode (a matrix-backed ColumnarNode if embedded)."""
+        if not include_embedding or not self.has_embedding[i]:
+            return TextNode(id_=self.ids[i], text=self.texts[i], metadata=self.metadata(i))
+        return ColumnarNode.from_row(
+            self.embeddings, i, id_=self.ids[i], text=self.texts[i], metadata=self.metadata(i)
+        )
+
+    def to_nodes(self, include_embeddings: bool = True) -> List[TextNode]:
+        """
+        Materialize all rows as TextNodes.
+
+        Args:
+            include_embeddings: Back the nodes with the embedding matrix
+                                (needed when they feed a vector index,
+                                otherwise skip it)
+
+        Returns:
+            List of TextNode objects in row order
+        """
+        return [self.node(i, include_embeddings) for i in range(len(self.ids))]
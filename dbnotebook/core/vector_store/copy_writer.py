@@ -0,0 +1,204 @@
+"""
+Bulk node writer using COPY ... FROM STDIN (FORMAT binary).
+
+LlamaIndex's PGVectorStore.add() inserts through the ORM, binding each
+embedding as a text literal. For ingestion batches of hundreds of chunks the
+binary COPY protocol is much cheaper: embeddings are sent as pgvector's
+binary representation (int16 dim, int16 unused, dim x float32 big-endian),
+encoded for the whole batch with one NumPy conversion.
+
+Rows are written in the same shape LlamaIndex writes them (text without
+metadata, metadata_ from node_to_metadata_dict with the node content
+serialized), so every loader reads them back unchanged.
+"""
+
+import io
+import json
+import logging
+import struct
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+from llama_index.core.schema import BaseNode, MetadataMode
+from llama_index.core.vector_stores.utils import node_to_metadata_dict
+from sqlalchemy import text
+
+from .columnar import node_embedding
+
+logger = logging.getLogger(__name__)
+
+# Binary COPY framing: signature, flags, header extension length / trailer
+PGCOPY_HEADER = b"PGCOPY\n\xff\r\n\x00" + struct.pack(">ii", 0, 0)
+PGCOPY_TRAILER = struct.pack(">h", -1)
+
+COPY_COLUMNS = ("text", "metadata_", "node_id", "embedding")
+
+# jsonb binary input is a version byte followed by the JSON text
+JSONB_VERSION = b"\x01"
+
+
+def _field(value: Optional[bytes]) -> bytes:
+    if value is None:
+        return struct.pack(">i", -1)
+    return struct.pack(">i", len(value)) + value
+
+
+def encode_copy_rows(nodes: Sequence[BaseNode], jsonb_metadata: bool = True) -> bytes:
+    """
+    Encode nodes as a binary COPY payload for COPY_COLUMNS.
+
+    Args:
+        nodes: Nodes with embeddings of equal dimension
+        jsonb_metadata: metadata_ column is jsonb (else json)
+
+    Returns:
+        Complete COPY payload (header, tuples, trailer)
+    """
+    embeddings = [node_embedding(node) for node in nodes]
+    dim = len(embeddings[0]) if embeddings and embeddings[0] is not None else 0
+    matrix = np.asarray(embeddings, dtype=">f4").reshape(len(nodes), dim)
+    vector_header = struct.pack(">hh", dim, 0)
+    field_count = struct.pack(">h", len(COPY_COLUMNS))
+    metadata_prefix = JSONB_VERSION if jsonb_metadata else b""
+
+    buf = io.BytesIO()
+    buf.write(PGCOPY_HEADER)
+    for i, node in enumerate(nodes):
+        metadata = node_to_metadata_dict(node, remove_text=True, flat_metadata=False)
+        buf.write(field_count)
+        buf.write(_field(node.get_content(metadata_mode=MetadataMode.NONE).encode("utf-8")))
+        buf.write(_field(metadata_prefix + json.dumps(metadata).encode("utf-8")))
+        buf.write(_field(node.node_id.encode("utf-8")))
+        buf.write(_field(vector_header + matrix[i].tobytes()))
+    buf.write(PGCOPY_TRAILER)
+    return buf.getvalue()
+
+
+class PGCopyWriter:
+    """Writes embedded nodes into the embeddings table with binary COPY."""
+
+    def __init__(self, session_factory, embeddings_table: str) -> None:
+        """
+        Args:
+            session_factory: SQLAlchemy session factory (psycopg2 driver)
+            embeddings_table: Embeddings table name (e.g. data_embeddings)
+        """
+        self._session_factory = session_factory
+        self._embeddings_table = embeddings_table
+        self._column_types: Optional[Dict[str, str]] = None
+
+    def _get_column_types(self, session) -> Dict[str, str]:
+        if self._column_types is None:
+            rows = session.execute(
+                text("""
+                    SELECT column_name, data_type FROM information_schema.columns
+                    WHERE table_name = :table
+                """),
+                {"table": self._embeddings_table}
+            ).fetchall()
+            if not rows:
+                raise RuntimeError(f"Table {self._embeddings_table} does not exist yet")
+            self._column_types = {row[0]: row[1] for row in rows}
+        return self._column_types
+
+    @staticmethod
+    def can_write(nodes: Sequence[BaseNode]) -> bool:
+        """Whether every node carries an embedding of the same dimension."""
+        embeddings = [node_embedding(node) for node in nodes]
+        if not embeddings or embeddings[0] is None or not len(embeddings[0]):
+            return False
+        dim = len(embeddings[0])
+        return all(embedding is not None and len(embedding) == dim for embedding in embeddings)
+
+    def write(self, nodes: List[BaseNode]) -> int:
+        """
+        COPY nodes in a single transaction.
+
+        Any failure (e.g. a unique violation from a concurrent upload) rolls
+        back the whole batch, so callers can safely retry with row inserts.
+
+        Args:
+            nodes: Embedded nodes (see can_write)
+
+        Returns:
+            Number of rows written
+        """
+        if not nodes:
+            return 0
+        session = self._session_factory()
+        try:
+            self.copy(session, nodes)
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+        return len(nodes)
+
+    def copy(self, session, nodes: List[BaseNode]) -> int:
+        """
+        COPY nodes inside the caller's transaction (no commit).
+
+        Args:
+            session: Open SQLAlchemy session (psycopg2 driver)
+            nodes: Embedded nodes (see can_write)
+
+        Returns:
+            Number of rows written
+        """
+        if not nodes:
+            return 0
+        column_types = self._get_column_types(session)
+        payload = encode_copy_rows(nodes, jsonb_metadata=column_types.get("metadata_") == "jsonb")
+        raw = session.connection().connection
+        cursor = raw.cursor()
+        try:
+            cursor.copy_expert(
+                f"COPY {self._embeddings_table} ({', '.join(COPY_COLUMNS)}) "
+                f"FROM STDIN WITH (FORMAT binary)",
+                io.BytesIO(payload),
+            )
+        finally:
+            cursor.close()
+
+        logger.debug(f"COPY wrote {len(nodes)} rows ({len(payload) / 1024:.0f} KiB)")
+        return len(nodes)
+
+
+def insert_rows(session, embeddings_table: str, nodes: Sequence[BaseNode]) -> int:
+    """
+    Insert nodes with plain INSERTs inside the caller's transaction (no commit).
+
+    Slower than COPY but works for any node set, including nodes without
+    embeddings or with mixed dimensions.
+
+    Args:
+        session: Open SQLAlchemy session
+        embeddings_table: Embeddings table name
+        nodes: Nodes to insert
+
+    Returns:
+        Number of rows written
+    """
+    if not nodes:
+        return 0
+    params = []
+    for node in nodes:
+        embedding = node_embedding(node)
+        params.append({
+            "text": node.get_content(metadata_mode=MetadataMode.NONE),
+            "metadata": json.dumps(node_to_metadata_dict(node, remove_text=True, flat_metadata=False)),
+            "node_id": node.node_id,
+            # pgvector parses its text form, e.g. '[0.1,0.2]'
+            "embedding": "[" + ",".join(str(float(v)) for v in embedding) + "]"
+            if embedding is not None else None,
+        })
+    session.execute(
+        text(f"""
+            INSERT INTO {embeddings_table} ({', '.join(COPY_COLUMNS)})
+            VALUES (:text, :metadata, :node_id, :embedding)
+        """),
+        params
+    )
+    return len(nodes)
@@ -11,11 +11,12 @@ Benefits:
 """
 
 import os
+import re
 import logging
 from typing import List, Optional, Dict, Any, Callable, Tuple
 
 from llama_index.core import VectorStoreIndex, StorageContext
-from llama_index.core.schema import BaseNode, TextNode
+from llama_index.core.schema import BaseNode, TextNode, NodeWithScore
 from llama_index.core.vector_stores import VectorStoreQuery, MetadataFilters, MetadataFilter
 from llama_index.vector_stores.postgres import PGVectorStore as LlamaPGVectorStore
 from dotenv import load_dotenv
@@ -24,6 +25,9 @@ from sqlalchemy.orm import sessionmaker
 
 from ...setting import get_settings, RAGSettings
 from .base import IVectorStore
+from .bm25_index import PGBM25Index
+from .columnar import NodeColumns, decode_vector_batch, vector_dim, with_embedding_lists
+from .copy_writer import PGCopyWriter, insert_rows
 
 load_dotenv()
 
@@ -160,6 +164,32 @@ class PGVectorStore(IVectorStore):
         # Ensure indexes exist for fast metadata filtering
         self._ensure_metadata_indexes()
 
+        # Full-text search column for server-side hybrid retrieval
+        self._text_search_config = self._setting.retriever.text_search_config
+        if not re.fullmatch(r"[a-z_]+", self._text_search_config):
+            logger.warning(
+                f"Invalid text_search_config '{self._text_search_config}', using 'english'"
+            )
+            self._text_search_config = "english"
+        self._has_text_search = (
+            self._setting.retriever.server_side_hybrid and self._detect_text_search_column()
+        )
+        # pgvector >= 0.8 can keep scanning HNSW until filters leave enough rows
+        self._hnsw_iterative_scan = (
+            self._has_text_search and self._pgvector_version() >= (0, 8)
+        )
+
+        # Persistent BM25 inverted index, maintained on every add_nodes()
+        self._bm25_index: Optional[PGBM25Index] = None
+        if self._setting.retriever.persistent_bm25:
+            self._bm25_index = PGBM25Index(self._session_factory, self._actual_table_name)
+            self._bm25_index.ensure_tables()
+
+        # Binary COPY writer for embedded ingestion batches
+        self._copy_writer: Optional[PGCopyWriter] = None
+        if self._setting.ingestion.copy_writer:
+            self._copy_writer = PGCopyWriter(self._session_factory, self._actual_table_name)
+
     @classmethod
     def from_session_factory(
         cls,
@@ -230,6 +260,56 @@ class PGVectorStore(IVectorStore):
             # Table might not exist yet - that's OK
             logger.debug(f"Could not create metadata indexes (table may not exist yet): {e}")
 
+    def _detect_text_search_column(self) -> bool:
+        """Check for the generated tsvector column used by hybrid_search().
+
+        The column is added by the add_hybrid_search_tsv migration, not here:
+        adding a stored generated column rewrites the whole table under an
+        ACCESS EXCLUSIVE lock. Without it, server-side hybrid mode stays off.
+        """
+        try:
+            session = self._session_factory()
+            try:
+                found = session.execute(
+                    text("""
+                        SELECT 1 FROM information_schema.columns
+                        WHERE table_name = :table_name
+                        AND column_name = 'text_search_tsv'
+                    """),
+                    {"table_name": self._actual_table_name}
+                ).first() is not None
+            finally:
+                session.close()
+        except Exception as e:
+            logger.warning(f"Could not check for text search column: {e}")
+            found = False
+        if not found:
+            logger.warning(
+                f"{self._actual_table_name}.text_search_tsv is missing; server-side hybrid "
+                f"retrieval is disabled until 'alembic upgrade head' has been run"
+            )
+        return found
+
+    def _pgvector_version(self) -> tuple:
+        """Installed pgvector extension version as an int tuple, (0,) if unknown."""
+        try:
+            session = self._session_factory()
+            try:
+                version = session.execute(
+                    text("SELECT extversion FROM pg_extension WHERE extname = 'vector'")
+                ).scalar()
+            finally:
+                session.close()
+            return tuple(int(part) for part in re.findall(r"\d+", version or "")) or (0,)
+        except Exception as e:
+            logger.debug(f"Could not read pgvector version: {e}")
+            return (0,)
+
+    @property
+    def supports_hybrid_search(self) -> bool:
+        """Whether hybrid_search() can run (server-side mode on and column present)."""
+        return self._has_text_search
+
     def _create_vector_store(self) -> LlamaPGVectorStore:
         """Create LlamaIndex PGVectorStore instance."""
         return LlamaPGVectorStore.from_params(
@@ -254,7 +334,8 @@ class PGVectorStore(IVectorStore):
     def add_nodes(
         self,
         nodes: List[BaseNode],
-        notebook_id: Optional[str] = None
+        notebook_id: Optional[str] = None,
+        raise_errors: bool = False
     ) -> int:
         """
         Add nodes to the vector store incrementally with duplicate detection.
@@ -265,6 +346,8 @@ class PGVectorStore(IVectorStore):
         Args:
             nodes: List of nodes to add
             notebook_id: Optional notebook ID to set on all nodes
+            raise_errors: Re-raise insert errors instead of returning 0
+                          (lets callers retry or fail the upload)
 
         Returns:
             Number of nodes actually added (after deduplication)
@@ -290,7 +373,8 @@ class PGVectorStore(IVectorStore):
                 logger.info(f"Filtered {len(nodes) - len(unique_nodes)} duplicate nodes")
 
             # Add only unique nodes to pgvector store
-            self._vector_store.add(unique_nodes)
+            self._insert_nodes(unique_nodes)
+            self._index_bm25(unique_nodes)
 
             # Invalidate cache
             self._index_cache = None
@@ -308,6 +392,8 @@ class PGVectorStore(IVectorStore):
                 else:
                     error_msg = f"{type(e).__name__}: {error_msg[:150]}... [truncated]"
             logger.error(f"Error adding nodes to pgvector: {error_msg}")
+            if raise_errors:
+                raise
             return 0
 
     def query(
@@ -538,6 +624,9 @@ class PGVectorStore(IVectorStore):
             logger.debug("Using cached vector index")
             return self._index_cache
 
+        # VectorStoreIndex re-embeds nodes whose .embedding is unset
+        nodes = with_embedding_lists(nodes)
+
         try:
             # Create storage context with pgvector store
             storage_context = StorageContext.from_defaults(
@@ -577,6 +666,17 @@ class PGVectorStore(IVectorStore):
             self._cached_node_count = len(nodes)
             return index
 
+    def _insert_nodes(self, nodes: List[BaseNode]) -> None:
+        """Insert nodes with binary COPY when possible, else via LlamaIndex."""
+        if self._copy_writer is not None and PGCopyWriter.can_write(nodes):
+            try:
+                self._copy_writer.write(nodes)
+                return
+            except Exception as e:
+                # COPY is all-or-nothing, so retrying with row inserts is safe
+                logger.warning(f"COPY insert failed, falling back to row inserts: {str(e)[:200]}")
+        self._vector_store.add(with_embedding_lists(nodes))
+
     def _filter_duplicate_nodes(
         self,
         nodes: List[BaseNode],
@@ -1033,61 +1133,189 @@ class PGVectorStore(IVectorStore):
             notebook_id: Notebook UUID to filter by
 
         Returns:
-            List of nodes belonging to the specified notebook (active sources only)
+            List of nodes belonging to the specified notebook (active sources
+            only); embedded nodes are ColumnarNodes backed by one float32
+            matrix, with .embedding unset (see columnar.node_embedding)
+        """
+        columns = self.get_notebook_columns(notebook_id)
+        return columns.to_nodes() if columns is not None else []
+
+    def get_notebook_node_count(self, notebook_id: str) -> int:
+        """
+        Count a notebook's stored nodes (all sources, active or not).
+
+        Args:
+            notebook_id: Notebook UUID
+
+        Returns:
+            Row count, or 0 on error
+        """
+        try:
+            session = self._session_factory()
+            try:
+                return session.execute(
+                    text(f"""
+                        SELECT COUNT(*) FROM {self._actual_table_name}
+                        WHERE metadata_->>'notebook_id' = :notebook_id
+                    """),
+                    {"notebook_id": notebook_id}
+                ).scalar() or 0
+            finally:
+                session.close()
+        except Exception as e:
+            logger.error(f"Error counting notebook nodes in pgvector: {e}")
+            return 0
+
+    def get_source_leaf_count(self, source_id: str) -> int:
+        """
+        Count the stored chunk (tree_level 0) nodes of one document.
+
+        RAPTOR summaries are excluded so the result can be compared with the
+        document's registered chunk_count.
+
+        Args:
+            source_id: Document source UUID
+
+        Returns:
+            Row count, or 0 on error
+        """
+        try:
+            session = self._session_factory()
+            try:
+                return session.execute(
+                    text(f"""
+                        SELECT COUNT(*) FROM {self._actual_table_name}
+                        WHERE metadata_->>'source_id' = :source_id
+                          AND (metadata_->>'tree_level' = '0' OR metadata_->>'tree_level' IS NULL)
+                    """),
+                    {"source_id": source_id}
+                ).scalar() or 0
+            finally:
+                session.close()
+        except Exception as e:
+            logger.error(f"Error counting document nodes in pgvector: {e}")
+            return 0
+
+    def get_notebook_columns(
+        self,
+        notebook_id: str,
+        node_ids: Optional[List[str]] = None,
+    ) -> Optional[NodeColumns]:
+        """
+        Load a notebook's active nodes in columnar form.
+
+        Embeddings are decoded from pgvector's binary format straight into one
+        contiguous float32 matrix (N x dim); no per-node objects are created
+        until the caller asks for them via NodeColumns.to_nodes()/node().
+
+        Args:
+            notebook_id: Notebook UUID to filter by
+            node_ids: Optional row IDs to restrict the load to (delta loads)
+
+        Returns:
+            NodeColumns for the notebook's active sources, or None on error
         """
+        params: Dict[str, Any] = {"notebook_id": notebook_id}
+        id_condition = ""
+        if node_ids is not None:
+            if not node_ids:
+                return NodeColumns.empty()
+            id_condition = "AND e.id = ANY(CAST(:node_ids AS bigint[]))"
+            params["node_ids"] = [int(i) for i in node_ids]
+
         try:
             session = self._session_factory()
             try:
                 # Join with notebook_sources to filter by active status
                 # This respects the eye icon toggle in the UI
-                result = session.execute(
-                    text(f"""
-                        SELECT e.id, e.text, e.metadata_, e.embedding
+                columns = self._load_columns(
+                    session,
+                    f"""
+                        SELECT e.id, e.text, e.metadata_::text, vector_send(e.embedding)
                         FROM {self._actual_table_name} e
                         LEFT JOIN notebook_sources ns
                             ON e.metadata_->>'source_id' = ns.source_id::text
                         WHERE e.metadata_->>'notebook_id' = :notebook_id
                         AND (ns.active = true OR ns.active IS NULL)
-                    """),
-                    {"notebook_id": notebook_id}
+                        {id_condition}
+                    """,
+                    params
                 )
-                rows = result.fetchall()
 
-                nodes = []
-                for row in rows:
-                    node_id, text_content, metadata, embedding = row
+                logger.debug(f"Loaded {len(columns)} nodes for notebook {notebook_id}")
+                return columns
+            finally:
+                session.close()
 
-                    if isinstance(metadata, str):
-                        import json
-                        metadata = json.loads(metadata)
+        except Exception as e:
+            logger.error(f"Error loading notebook nodes from pgvector: {e}")
+            return None
 
-                    # Parse embedding - pgvector returns as string representation
-                    parsed_embedding = None
-                    if embedding is not None:
-                        if isinstance(embedding, str):
-                            import json
-                            parsed_embedding = json.loads(embedding)
-                        elif hasattr(embedding, 'tolist'):
-                            parsed_embedding = embedding.tolist()
-                        else:
-                            parsed_embedding = list(embedding)
+    def get_notebook_node_ids(self, notebook_id: str) -> Optional[List[str]]:
+        """
+        Get the row IDs of a notebook's active nodes (no text or embeddings).
 
-                    node = TextNode(
-                        id_=str(node_id),
-                        text=text_content or "",
-                        metadata=metadata or {},
-                        embedding=parsed_embedding
-                    )
-                    nodes.append(node)
+        Used to revalidate cached notebooks by diffing ID sets, so only added
+        rows need to be loaded and removed rows dropped.
 
-                logger.debug(f"Loaded {len(nodes)} nodes for notebook {notebook_id}")
-                return nodes
+        Args:
+            notebook_id: Notebook UUID to filter by
+
+        Returns:
+            List of row IDs as strings, or None on error
+        """
+        try:
+            session = self._session_factory()
+            try:
+                result = session.execute(
+                    text(f"""
+                        SELECT e.id
+                        FROM {self._actual_table_name} e
+                        LEFT JOIN notebook_sources ns
+                            ON e.metadata_->>'source_id' = ns.source_id::text
+                        WHERE e.metadata_->>'notebook_id' = :notebook_id
+                        AND (ns.active = true OR ns.active IS NULL)
+                    """),
+                    {"notebook_id": notebook_id}
+                )
+                return [str(row[0]) for row in result]
             finally:
                 session.close()
 
         except Exception as e:
-            logger.error(f"Error loading notebook nodes from pgvector: {e}")
-            return []
+            logger.error(f"Error loading notebook node IDs from pgvector: {e}")
+            return None
+
+    def _load_columns(
+        self,
+        session,
+        sql: str,
+        params: Dict[str, Any],
+        batch_size: int = 2000,
+    ) -> NodeColumns:
+        """
+        Stream (id, text, metadata, vector_send(embedding)) rows into NodeColumns.
+
+        Uses a server-side cursor so only batch_size raw rows are held at once;
+        each batch is decoded into the float32 matrix in a single step.
+
+        Args:
+            session: Open SQLAlchemy session
+            sql: SELECT returning id, text, metadata text, binary embedding
+            params: Bind parameters
+            batch_size: Rows fetched and decoded per batch
+
+        Returns:
+            NodeColumns with all matching rows
+        """
+        result = session.execute(
+            text(sql),
+            params,
+            execution_options={"stream_results": True, "max_row_buffer": batch_size},
+        )
+        return NodeColumns.from_rows(
+            result.partitions(batch_size),
+        )
 
     def get_nodes_by_notebook_and_types(
         self,
@@ -1122,8 +1350,8 @@ class PGVectorStore(IVectorStore):
                     for i, t in enumerate(node_types):
                         params[f"type_{i}"] = t
 
-                    query = text(f"""
-                        SELECT e.id, e.text, e.metadata_, e.embedding
+                    query = f"""
+                        SELECT e.id, e.text, e.metadata_::text, vector_send(e.embedding)
                         FROM {self._actual_table_name} e
                         LEFT JOIN notebook_sources ns
                             ON COALESCE(
@@ -1136,13 +1364,13 @@ class PGVectorStore(IVectorStore):
                             OR e.metadata_->>'node_type' IS NULL
                         )
                         AND (ns.active = true OR ns.active IS NULL)
-                    """)
+                    """
                 else:
                     # No type filter - get all nodes
                     # Join with notebook_sources to filter by active status
                     params = {"notebook_id": notebook_id}
-                    query = text(f"""
-                        SELECT e.id, e.text, e.metadata_, e.embedding
+                    query = f"""
+                        SELECT e.id, e.text, e.metadata_::text, vector_send(e.embedding)
                         FROM {self._actual_table_name} e
                         LEFT JOIN notebook_sources ns
                             ON COALESCE(
@@ -1151,37 +1379,9 @@ class PGVectorStore(IVectorStore):
                             ) = ns.source_id::text
                         WHERE e.metadata_->>'notebook_id' = :notebook_id
                         AND (ns.active = true OR ns.active IS NULL)
-                    """)
-
-                result = session.execute(query, params)
-                rows = result.fetchall()
+                    """
 
-                nodes = []
-                for row in rows:
-                    node_id, text_content, metadata, embedding = row
-
-                    if isinstance(metadata, str):
-                        import json
-                        metadata = json.loads(metadata)
-
-                    # Parse embedding - pgvector returns as string representation
-                    parsed_embedding = None
-                    if embedding is not None:
-                        if isinstance(embedding, str):
-                            import json
-                            parsed_embedding = json.loads(embedding)
-                        elif hasattr(embedding, 'tolist'):
-                            parsed_embedding = embedding.tolist()
-                        else:
-                            parsed_embedding = list(embedding)
-
-                    node = TextNode(
-                        id_=str(node_id),
-                        text=text_content or "",
-                        metadata=metadata or {},
-                        embedding=parsed_embedding
-                    )
-                    nodes.append(node)
+                nodes = self._load_columns(session, query, params).to_nodes()
 
                 type_str = str(node_types) if node_types else "all"
                 logger.debug(f"Loaded {len(nodes)} nodes for notebook {notebook_id} (types: {type_str})")
@@ -1196,18 +1396,19 @@ class PGVectorStore(IVectorStore):
     def add_transformation_nodes(
         self,
         nodes: List[BaseNode],
-        notebook_id: str,
-        source_id: str
+        notebook_id: Optional[str] = None,
+        source_id: Optional[str] = None
     ) -> int:
         """
         Add transformation nodes (summary, insights, questions) to the vector store.
 
-        Handles proper node_type metadata assignment.
+        Nodes from several sources are written in one bulk insert; duplicate
+        detection runs once per notebook.
 
         Args:
             nodes: List of nodes with node_type in metadata
-            notebook_id: Notebook UUID for the nodes
-            source_id: Source document UUID
+            notebook_id: Notebook UUID to set on all nodes (None = keep each node's)
+            source_id: Source UUID to set on all nodes (None = keep each node's)
 
         Returns:
             Number of nodes successfully added
@@ -1215,14 +1416,40 @@ class PGVectorStore(IVectorStore):
         if not nodes:
             return 0
 
-        # Ensure metadata is set correctly
+        # Ensure metadata is set correctly; node_type should already be set by caller
+        by_notebook: Dict[Optional[str], List[BaseNode]] = {}
         for node in nodes:
-            if hasattr(node, 'metadata'):
+            if notebook_id:
                 node.metadata["notebook_id"] = notebook_id
+            if source_id:
                 node.metadata["source_id"] = source_id
-                # node_type should already be set by caller
+            by_notebook.setdefault(node.metadata.get("notebook_id"), []).append(node)
 
-        return self.add_nodes(nodes, notebook_id=notebook_id)
+        try:
+            unique_nodes = [
+                node
+                for nb_id, nb_nodes in by_notebook.items()
+                for node in self._filter_duplicate_nodes(nb_nodes, nb_id)
+            ]
+            if not unique_nodes:
+                return 0
+
+            self._insert_nodes(unique_nodes)
+            self._index_bm25(unique_nodes)
+
+            # Invalidate cache
+            self._index_cache = None
+            self._cached_node_count = 0
+
+            logger.debug(
+                f"Added {len(unique_nodes)} transformation nodes "
+                f"across {len(by_notebook)} notebooks"
+            )
+            return len(unique_nodes)
+
+        except Exception as e:
+            logger.error(f"Error adding transformation nodes: {type(e).__name__}: {str(e)[:150]}")
+            return 0
 
     # =========================================================================
     # RAPTOR Tree Methods (Hierarchical Retrieval Support)
@@ -1249,6 +1476,29 @@ class PGVectorStore(IVectorStore):
         Returns:
             List of nodes at the specified tree level
         """
+        columns = self.get_columns_by_tree_level(notebook_id, tree_level, source_ids)
+        return columns.to_nodes() if columns is not None else []
+
+    def get_columns_by_tree_level(
+        self,
+        notebook_id: str,
+        tree_level: int,
+        source_ids: Optional[List[str]] = None
+    ) -> Optional[NodeColumns]:
+        """
+        Get nodes at a specific tree level in columnar form.
+
+        Used by RAPTOR tree building, which clusters the float32 embedding
+        matrix directly instead of per-node embedding lists.
+
+        Args:
+            notebook_id: Notebook UUID to filter by
+            tree_level: Tree level to retrieve (0=chunks, 1+=summaries)
+            source_ids: Optional list of source IDs to filter by
+
+        Returns:
+            NodeColumns at the specified tree level, or None on error
+        """
         try:
             session = self._session_factory()
             try:
@@ -1266,43 +1516,42 @@ class PGVectorStore(IVectorStore):
                     for i, src in enumerate(source_ids):
                         params[f"src_{i}"] = src
 
-                    result = session.execute(
-                        text(f"""
-                            SELECT e.id, e.text, e.metadata_, e.embedding
+                    columns = self._load_columns(
+                        session,
+                        f"""
+                            SELECT e.id, e.text, e.metadata_::text, vector_send(e.embedding)
                             FROM {self._actual_table_name} e
                             WHERE e.metadata_->>'notebook_id' = :notebook_id
                             AND {level_condition}
                             AND e.metadata_->>'source_id' IN ({placeholders})
-                        """),
+                        """,
                         params
                     )
                 else:
                     # Filter by notebook and level only
-                    result = session.execute(
-                        text(f"""
-                            SELECT e.id, e.text, e.metadata_, e.embedding
+                    columns = self._load_columns(
+                        session,
+                        f"""
+                            SELECT e.id, e.text, e.metadata_::text, vector_send(e.embedding)
                             FROM {self._actual_table_name} e
                             WHERE e.metadata_->>'notebook_id' = :notebook_id
                             AND {level_condition}
-                        """),
+                        """,
                         {"notebook_id": notebook_id, "tree_level": str(tree_level)}
                     )
 
-                rows = result.fetchall()
-                nodes = self._rows_to_nodes(rows)
-
                 logger.debug(
-                    f"Retrieved {len(nodes)} nodes at tree_level={tree_level} "
+                    f"Retrieved {len(columns)} nodes at tree_level={tree_level} "
                     f"for notebook {notebook_id}"
                 )
-                return nodes
+                return columns
 
             finally:
                 session.close()
 
         except Exception as e:
             logger.error(f"Error getting nodes by tree level: {e}")
-            return []
+            return None
 
     def get_nodes_by_tree_levels(
         self,
@@ -1344,30 +1593,31 @@ class PGVectorStore(IVectorStore):
                     for i, src in enumerate(source_ids):
                         params[f"src_{i}"] = src
 
-                    result = session.execute(
-                        text(f"""
-                            SELECT e.id, e.text, e.metadata_, e.embedding
+                    columns = self._load_columns(
+                        session,
+                        f"""
+                            SELECT e.id, e.text, e.metadata_::text, vector_send(e.embedding)
                             FROM {self._actual_table_name} e
                             WHERE e.metadata_->>'notebook_id' = :notebook_id
                             AND {level_condition}
                             AND e.metadata_->>'source_id' IN ({src_placeholders})
-                        """),
+                        """,
                         params
                     )
                 else:
                     # Filter by notebook and levels only
-                    result = session.execute(
-                        text(f"""
-                            SELECT e.id, e.text, e.metadata_, e.embedding
+                    columns = self._load_columns(
+                        session,
+                        f"""
+                            SELECT e.id, e.text, e.metadata_::text, vector_send(e.embedding)
                             FROM {self._actual_table_name} e
                             WHERE e.metadata_->>'notebook_id' = :notebook_id
                             AND {level_condition}
-                        """),
+                        """,
                         params
                     )
 
-                rows = result.fetchall()
-                nodes = self._rows_to_nodes(rows)
+                nodes = columns.to_nodes()
 
                 logger.debug(
                     f"Retrieved {len(nodes)} nodes at levels {tree_levels} "
@@ -1406,7 +1656,18 @@ class PGVectorStore(IVectorStore):
         if not nodes:
             return 0
 
-        # Set tree metadata on all nodes
+        self._set_tree_metadata(nodes, notebook_id, source_id, tree_level, tree_root_id)
+        return self.add_nodes(nodes, notebook_id=notebook_id)
+
+    @staticmethod
+    def _set_tree_metadata(
+        nodes: List[BaseNode],
+        notebook_id: str,
+        source_id: str,
+        tree_level: int,
+        tree_root_id: Optional[str] = None
+    ) -> None:
+        """Set RAPTOR tree metadata on nodes in place."""
         for node in nodes:
             if hasattr(node, 'metadata'):
                 node.metadata["notebook_id"] = notebook_id
@@ -1416,7 +1677,69 @@ class PGVectorStore(IVectorStore):
                 if tree_root_id:
                     node.metadata["tree_root_id"] = tree_root_id
 
-        return self.add_nodes(nodes, notebook_id=notebook_id)
+    def replace_tree_nodes(
+        self,
+        nodes_by_level: Dict[int, List[BaseNode]],
+        notebook_id: str,
+        source_id: str,
+        tree_root_id: Optional[str] = None
+    ) -> int:
+        """
+        Replace a source's RAPTOR tree (levels >= 1) in one transaction.
+
+        Unlike add_tree_nodes(), summaries skip the notebook-wide text dedup
+        of add_nodes(): a summary reused from another source's tree has the
+        same text as a stored node but must still exist in this tree, or its
+        parents' child_node_ids point at nothing. Readers see either the old
+        tree or the new one, and a failed insert keeps the old tree.
+
+        Args:
+            nodes_by_level: Summary nodes keyed by tree level (>= 1)
+            notebook_id: Notebook UUID
+            source_id: Source document UUID (or the notebook tree's source ID)
+            tree_root_id: Optional root node ID for tree traversal
+
+        Returns:
+            Number of nodes stored
+
+        Raises:
+            Exception: The delete or an insert failed (rolled back)
+        """
+        all_nodes: List[BaseNode] = []
+        for level, nodes in sorted(nodes_by_level.items()):
+            self._set_tree_metadata(nodes, notebook_id, source_id, level, tree_root_id)
+            all_nodes.extend(nodes)
+
+        session = self._session_factory()
+        try:
+            deleted = session.execute(
+                text(f"""
+                    DELETE FROM {self._actual_table_name}
+                    WHERE metadata_->>'source_id' = :source_id
+                    AND (metadata_->>'tree_level')::int >= 1
+                """),
+                {"source_id": source_id}
+            ).rowcount
+            if self._copy_writer is not None and PGCopyWriter.can_write(all_nodes):
+                self._copy_writer.copy(session, all_nodes)
+            else:
+                insert_rows(session, self._actual_table_name, all_nodes)
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+        self._index_bm25(all_nodes)
+        self._index_cache = None
+        self._cached_node_count = 0
+
+        logger.info(
+            f"Replaced tree for source {source_id}: {deleted} old nodes, "
+            f"{len(all_nodes)} new nodes"
+        )
+        return len(all_nodes)
 
     def delete_tree_nodes(
         self,
@@ -1464,6 +1787,102 @@ class PGVectorStore(IVectorStore):
             logger.error(f"Error deleting tree nodes: {e}")
             return 0
 
+    def get_hashed_summary_columns(
+        self,
+        notebook_id: str,
+        source_id: Optional[str] = None
+    ) -> Optional[NodeColumns]:
+        """
+        Load RAPTOR summaries that carry a membership_hash (incremental rebuilds).
+
+        Args:
+            notebook_id: Notebook UUID to filter by
+            source_id: Optional source to restrict to (None = whole notebook)
+
+        Returns:
+            NodeColumns of hashed summaries, or None on error
+        """
+        params: Dict[str, Any] = {"notebook_id": notebook_id}
+        source_condition = ""
+        if source_id:
+            source_condition = "AND e.metadata_->>'source_id' = :source_id"
+            params["source_id"] = source_id
+
+        try:
+            session = self._session_factory()
+            try:
+                return self._load_columns(
+                    session,
+                    f"""
+                        SELECT e.id, e.text, e.metadata_::text, vector_send(e.embedding)
+                        FROM {self._actual_table_name} e
+                        WHERE e.metadata_->>'notebook_id' = :notebook_id
+                        AND (e.metadata_->>'tree_level')::int >= 1
+                        AND e.metadata_->>'membership_hash' IS NOT NULL
+                        {source_condition}
+                    """,
+                    params
+                )
+            finally:
+                session.close()
+
+        except Exception as e:
+            logger.error(f"Error loading hashed RAPTOR summaries: {e}")
+            return None
+
+    def get_source_top_summary_columns(
+        self,
+        notebook_id: str,
+        exclude_source_id: Optional[str] = None
+    ) -> Optional[NodeColumns]:
+        """
+        Load the top-level summaries of every source tree in a notebook.
+
+        These are the leaves of the notebook-level RAPTOR tree. Sources too
+        small to have a tree contribute nothing.
+
+        Args:
+            notebook_id: Notebook UUID to filter by
+            exclude_source_id: Source ID to leave out (the notebook tree itself)
+
+        Returns:
+            NodeColumns of top-level summaries, or None on error
+        """
+        try:
+            session = self._session_factory()
+            try:
+                return self._load_columns(
+                    session,
+                    f"""
+                        WITH tops AS (
+                            SELECT metadata_->>'source_id' AS source_id,
+                                   MAX((metadata_->>'tree_level')::int) AS top_level
+                            FROM {self._actual_table_name}
+                            WHERE metadata_->>'notebook_id' = :notebook_id
+                            AND (metadata_->>'tree_level')::int >= 1
+                            AND metadata_->>'source_id' IS DISTINCT FROM :exclude_source_id
+                            GROUP BY metadata_->>'source_id'
+                        )
+                        SELECT e.id, e.text, e.metadata_::text, vector_send(e.embedding)
+                        FROM {self._actual_table_name} e
+                        JOIN tops t
+                            ON e.metadata_->>'source_id' = t.source_id
+                            AND (e.metadata_->>'tree_level')::int = t.top_level
+                        LEFT JOIN notebook_sources ns
+                            ON t.source_id = ns.source_id::text
+                        WHERE e.metadata_->>'notebook_id' = :notebook_id
+                        AND (ns.active = true OR ns.active IS NULL)
+                        ORDER BY e.id
+                    """,
+                    {"notebook_id": notebook_id, "exclude_source_id": exclude_source_id}
+                )
+            finally:
+                session.close()
+
+        except Exception as e:
+            logger.error(f"Error loading source top-level summaries: {e}")
+            return None
+
     def get_tree_stats(
         self,
         source_id: str
@@ -1556,10 +1975,14 @@ class PGVectorStore(IVectorStore):
             if isinstance(metadata, str):
                 metadata = json.loads(metadata)
 
-            # Parse embedding
+            # Parse embedding (text, binary vector_send(), or array)
             parsed_embedding = None
             if embedding is not None:
-                if isinstance(embedding, str):
+                if isinstance(embedding, (bytes, memoryview)):
+                    parsed_embedding = decode_vector_batch(
+                        [embedding], vector_dim(embedding)
+                    )[0].tolist()
+                elif isinstance(embedding, str):
                     parsed_embedding = json.loads(embedding)
                 elif hasattr(embedding, 'tolist'):
                     parsed_embedding = embedding.tolist()
@@ -1651,6 +2074,237 @@ class PGVectorStore(IVectorStore):
             logger.warning(f"RAPTOR summary retrieval failed: {e}")
             return []  # Graceful fallback - continue without summaries
 
+    # =========================================================================
+    # Server-Side Hybrid Retrieval
+    # =========================================================================
+
+    def hybrid_search(
+        self,
+        notebook_id: str,
+        query_str: str,
+        query_embedding: List[float],
+        top_k: int = 10,
+        candidate_k: int = 50,
+        rrf_k: int = 60,
+        weights: Optional[List[float]] = None,
+    ) -> List[NodeWithScore]:
+        """
+        Hybrid ANN + full-text search fused with RRF, executed entirely in SQL.
+
+        Two candidate sets are ranked inside Postgres:
+        - Vector: HNSW cosine ANN (<=>) over the notebook's active sources
+        - Text: ts_rank_cd over the generated text_search_tsv column
+        and fused with Reciprocal Rank Fusion:
+            score = w_text / (rrf_k + text_rank) + w_vector / (rrf_k + vector_rank)
+
+        Only the top_k fused rows (without embeddings) are returned, so memory
+        per query is bounded by top_k regardless of notebook size.
+
+        HNSW applies the notebook filter after the index scan, so the vector
+        leg uses iterative scans where pgvector supports them and is re-run as
+        an exact scan whenever it yields fewer than candidate_k rows.
+
+        Args:
+            notebook_id: Notebook UUID to filter by
+            query_str: Query text for full-text ranking
+            query_embedding: Query vector for ANN ranking
+            top_k: Number of fused results to return
+            candidate_k: Candidates taken from each leg before fusion
+            rrf_k: RRF rank constant (60 per the original RRF paper)
+            weights: Optional [text_weight, vector_weight] (same order as
+                     retriever_weights [BM25, Vector]); defaults to [1.0, 1.0]
+
+        Returns:
+            List of NodeWithScore sorted by fused score
+        """
+        text_weight, vector_weight = weights or [1.0, 1.0]
+        candidate_k = max(candidate_k, top_k)
+
+        try:
+            session = self._session_factory()
+            try:
+                # HNSW returns at most ef_search rows and the notebook filter is
+                # applied afterwards, so a small notebook in a large table can
+                # come back with far fewer than candidate_k vector candidates.
+                # pgvector >= 0.8 keeps scanning the graph until the filter is
+                # satisfied; older versions fall back to an exact scan below.
+                if self._hnsw_iterative_scan:
+                    session.execute(
+                        text("SELECT set_config('hnsw.iterative_scan', 'relaxed_order', true)")
+                    )
+                session.execute(
+                    text("SELECT set_config('hnsw.ef_search', :ef_search, true)"),
+                    {"ef_search": str(max(candidate_k * 2, 40))}
+                )
+
+                embedding_str = '[' + ','.join(str(x) for x in query_embedding) + ']'
+
+                query = text(f"""
+                    WITH vector_candidates AS (
+                        SELECT e.id,
+                               ROW_NUMBER() OVER (
+                                   ORDER BY e.embedding <=> CAST(:embedding AS vector)
+                               ) AS rank
+                        FROM {self._actual_table_name} e
+                        LEFT JOIN notebook_sources ns
+                            ON e.metadata_->>'source_id' = ns.source_id::text
+                        WHERE e.metadata_->>'notebook_id' = :notebook_id
+                        AND (ns.active = true OR ns.active IS NULL)
+                        ORDER BY e.embedding <=> CAST(:embedding AS vector)
+                        LIMIT :candidate_k
+                    ),
+                    text_candidates AS (
+                        SELECT e.id,
+                               ROW_NUMBER() OVER (
+                                   ORDER BY ts_rank_cd(e.text_search_tsv, q.query) DESC
+                               ) AS rank
+                        FROM {self._actual_table_name} e
+                        CROSS JOIN websearch_to_tsquery(
+                            '{self._text_search_config}', :query_str
+                        ) AS q(query)
+                        LEFT JOIN notebook_sources ns
+                            ON e.metadata_->>'source_id' = ns.source_id::text
+                        WHERE e.metadata_->>'notebook_id' = :notebook_id
+                        AND (ns.active = true OR ns.active IS NULL)
+                        AND e.text_search_tsv @@ q.query
+                        ORDER BY ts_rank_cd(e.text_search_tsv, q.query) DESC
+                        LIMIT :candidate_k
+                    ),
+                    fused AS (
+                        SELECT COALESCE(v.id, t.id) AS id,
+                               COALESCE(:vector_weight / (:rrf_k + v.rank), 0.0)
+                               + COALESCE(:text_weight / (:rrf_k + t.rank), 0.0) AS score
+                        FROM vector_candidates v
+                        FULL OUTER JOIN text_candidates t ON v.id = t.id
+                    )
+                    SELECT e.id, e.text, e.metadata_, f.score,
+                           (SELECT COUNT(*) FROM vector_candidates) AS vector_hits
+                    FROM fused f
+                    JOIN {self._actual_table_name} e ON e.id = f.id
+                    ORDER BY f.score DESC
+                    LIMIT :top_k
+                """)
+                params = {
+                    "notebook_id": notebook_id,
+                    "embedding": embedding_str,
+                    "query_str": query_str,
+                    "candidate_k": candidate_k,
+                    "top_k": top_k,
+                    "rrf_k": float(rrf_k),
+                    "text_weight": float(text_weight),
+                    "vector_weight": float(vector_weight),
+                }
+                rows = session.execute(query, params).fetchall()
+
+                vector_hits = rows[0][4] if rows else 0
+                if vector_hits < candidate_k:
+                    # Too few ANN rows survived the filter (or the notebook is
+                    # small): rank the notebook's rows exactly instead. Bitmap
+                    # scans on the notebook_id index stay enabled.
+                    session.execute(text("SELECT set_config('enable_indexscan', 'off', true)"))
+                    rows = session.execute(query, params).fetchall()
+                    logger.debug(
+                        f"Hybrid search: {vector_hits} ANN candidates < {candidate_k}, "
+                        f"re-ranked notebook {notebook_id} with an exact scan"
+                    )
+                session.commit()
+
+                results = []
+                for row in rows:
+                    node_id, text_content, metadata, score, _ = row
+
+                    if isinstance(metadata, str):
+                        import json
+                        metadata = json.loads(metadata)
+
+                    node = TextNode(
+                        id_=str(node_id),
+                        text=text_content or "",
+                        metadata=metadata or {},
+                    )
+                    results.append(NodeWithScore(node=node, score=float(score)))
+
+                logger.debug(
+                    f"Hybrid search returned {len(results)} nodes for notebook {notebook_id}"
+                )
+                return results
+
+            finally:
+                session.close()
+
+        except Exception as e:
+            logger.error(f"Server-side hybrid search failed: {e}")
+            return []
+
+    # =========================================================================
+    # Persistent BM25 Index
+    # =========================================================================
+
+    @property
+    def has_bm25_index(self) -> bool:
+        """Whether the persistent BM25 index is enabled."""
+        return self._bm25_index is not None
+
+    def _index_bm25(self, nodes: List[BaseNode]) -> None:
+        """Add freshly inserted nodes to the BM25 index (never fails the insert)."""
+        if self._bm25_index is None or not nodes:
+            return
+        try:
+            self._bm25_index.index_node_ids([node.node_id for node in nodes])
+        except Exception as e:
+            # The notebook will be backfilled on its next BM25 search
+            logger.warning(f"BM25 indexing failed for {len(nodes)} nodes: {e}")
+            for notebook_id in {node.metadata.get("notebook_id") for node in nodes}:
+                if notebook_id:
+                    self._bm25_index.forget_notebook(notebook_id)
+
+    def bm25_search(
+        self,
+        notebook_id: str,
+        query_str: str,
+        top_k: int = 20,
+    ) -> List[NodeWithScore]:
+        """
+        Keyword search against the persistent BM25 index.
+
+        Scores only the postings of the query terms in SQL; chunk text is read
+        for the top_k results only. Rows stored before the index existed are
+        backfilled on the first search of each notebook.
+
+        Args:
+            notebook_id: Notebook to search (active sources only)
+            query_str: Query text
+            top_k: Number of results
+
+        Returns:
+            List of NodeWithScore (without embeddings), best first
+        """
+        if self._bm25_index is None:
+            return []
+
+        try:
+            self._bm25_index.ensure_notebook_indexed(notebook_id)
+            rows = self._bm25_index.search(notebook_id, query_str, top_k=top_k)
+        except Exception as e:
+            logger.error(f"Error in BM25 search: {e}")
+            return []
+
+        import json
+
+        results = []
+        for row_id, text_content, metadata, score in rows:
+            if isinstance(metadata, str):
+                metadata = json.loads(metadata)
+            node = TextNode(
+                id_=str(row_id),
+                text=text_content or "",
+                metadata=metadata or {},
+            )
+            results.append(NodeWithScore(node=node, score=score))
+
+        logger.debug(f"BM25 search returned {len(results)} results for notebook {notebook_id}")
+        return results
+
     def __del__(self):
         """Clean up resources on deletion."""
         if self._owns_pool and hasattr(self, '_engine'):
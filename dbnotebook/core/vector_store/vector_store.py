@@ -10,6 +10,7 @@ from dotenv import load_dotenv
 import chromadb
 
 from ...setting import get_settings, RAGSettings
+from .columnar import with_embedding_lists
 
 load_dotenv()
 
@@ -94,6 +95,9 @@ class LocalVectorStore:
             logger.debug("Using cached vector index")
             return self._index_cache
 
+        # VectorStoreIndex re-embeds nodes whose .embedding is unset
+        nodes = with_embedding_lists(nodes)
+
         # Create new index
         try:
             if self._persist:
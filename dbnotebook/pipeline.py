@@ -1,8 +1,7 @@
 import logging
 import os
-import threading
 import time
-from typing import Optional, Dict, Tuple, List
+from typing import Optional, Dict, List
 
 from llama_index.core import Settings
 from llama_index.core.schema import TextNode
@@ -18,13 +17,22 @@ from .core import (
     get_system_prompt
 )
 from .core.db import DatabaseManager
+from .core.embedding import (
+    configure_embedding_cache,
+    get_embedding_cache,
+    get_query_embedding_cache,
+)
+from .core.providers.llm_cache import configure_llm_cache, get_llm_cache
 from .core.notebook import NotebookManager
 from .core.conversation import ConversationStore
 from .core.observability import QueryLogger, get_token_counter
-from .core.transformations import TransformationWorker, TransformationJob
-from .core.raptor import RAPTORWorker, RAPTORJob
+from .core.jobs import JobQueue
+from .core.transformations import TransformationWorker, TransformationJob, enqueue_transformation_job
+from .core.raptor import RAPTORWorker, RAPTORJob, enqueue_raptor_job
 from .core.memory import SessionMemoryService
 from .core.constants import DEFAULT_USER_ID
+from .core.config import get_config_value
+from .core.pipeline import NodeCache, should_skip_background_workers
 from .core.utils import unwrap_llm
 from .setting import get_settings, QueryTimeSettings
 
@@ -70,8 +78,18 @@ class LocalRAGPipeline:
     def __init__(
         self,
         host: str = "host.docker.internal",
-        database_url: Optional[str] = None
+        database_url: Optional[str] = None,
+        start_workers: Optional[bool] = None
     ) -> None:
+        """
+        Args:
+            host: Ollama / service host
+            database_url: PostgreSQL URL (notebook features and workers need it)
+            start_workers: Run RAPTOR/transformation workers in this process.
+                None follows DISABLE_BACKGROUND_WORKERS. Jobs are queued in
+                Postgres either way, so a separate `python -m dbnotebook.worker`
+                process can drain them.
+        """
         self._host = host
         self._ollama_host = os.getenv("OLLAMA_HOST", host)
         self._language = "eng"
@@ -97,12 +115,6 @@ class LocalRAGPipeline:
         )
         logger.info("Session memory service initialized")
 
-        # Node cache for performance optimization (avoids reloading nodes from DB)
-        # Cache format: {notebook_id: (nodes, timestamp, node_count)}
-        self._node_cache: Dict[str, Tuple[List[TextNode], float, int]] = {}
-        self._node_cache_ttl = 300  # 5 minutes TTL
-        self._node_cache_lock = threading.Lock()  # Thread-safe cache access for multi-user
-
         # Sales mode components (optional, disabled by default)
         # These are legacy components for sales enablement features that are not currently implemented
         self._query_classifier = None  # Optional: Query classification for sales mode
@@ -115,6 +127,7 @@ class LocalRAGPipeline:
         self._query_logger: Optional[QueryLogger] = None
         self._transformation_worker: Optional[TransformationWorker] = None
         self._raptor_worker: Optional[RAPTORWorker] = None
+        self._job_queue: Optional[JobQueue] = None
         if database_url:
             # Increased pool size for better concurrency under load
             # pool_size=20: 20 persistent connections
@@ -130,6 +143,13 @@ class LocalRAGPipeline:
             self._notebook_manager = NotebookManager(self._db_manager)
             self._conversation_store = ConversationStore(self._db_manager)
             self._query_logger = QueryLogger(db_manager=self._db_manager)
+            # Share cached document and query embeddings across processes via Postgres
+            configure_embedding_cache(self._db_manager.get_session_maker())
+            # Share deterministic background LLM completions the same way
+            configure_llm_cache(self._db_manager.get_session_maker())
+            # Durable job queue shared by all web and worker processes
+            self._job_queue = JobQueue(self._db_manager.get_session_maker())
+            self._job_queue.ensure_table()
             logger.info(f"Database initialized with notebook management, conversation persistence, and query logging")
         else:
             # Initialize in-memory query logger even without database
@@ -147,22 +167,37 @@ class LocalRAGPipeline:
             host=host
         )
 
+        # Node cache for performance optimization (avoids reloading nodes from DB)
+        # Bounded LRU with per-notebook single-flight loads for multi-user access
+        max_memory_mb = get_config_value("retrieval", "node_cache", "max_memory_mb", default=2048)
+        self._node_cache = NodeCache(
+            self._vector_store,
+            ttl=get_config_value("retrieval", "node_cache", "ttl_seconds", default=300),
+            stale_ttl=get_config_value("retrieval", "node_cache", "stale_ttl_seconds", default=60),
+            max_entries=get_config_value("retrieval", "node_cache", "max_entries", default=64),
+            max_bytes=max_memory_mb * 1024 * 1024 if max_memory_mb else None,
+        )
+
         # Initialize TransformationWorker for AI transformations (if database available)
-        # Skip in multi-worker mode (Gunicorn) - asyncio doesn't fork well
-        transformation_callback = None
-        skip_background_workers = os.getenv("DISABLE_BACKGROUND_WORKERS", "").lower() in ("true", "1", "yes")
-        if self._db_manager and not skip_background_workers:
+        # Jobs go through the Postgres queue, so with workers disabled here
+        # (e.g. Gunicorn) a separate worker process picks them up
+        if start_workers is None:
+            start_workers = not should_skip_background_workers()
+        if self._db_manager and start_workers:
             self._transformation_worker = TransformationWorker(
                 db_manager=self._db_manager,
-                embed_callback=self._embed_transformation,  # Will embed transformation content
+                vector_store=self._vector_store,  # Embeds transformation content in batches
                 poll_interval=10.0,
                 max_concurrent=2,
+                job_queue=self._job_queue,
             )
             self._transformation_worker.start()
             logger.info("TransformationWorker started for AI transformations")
-        elif skip_background_workers:
-            logger.info("TransformationWorker disabled (DISABLE_BACKGROUND_WORKERS=true)")
+        elif self._db_manager:
+            logger.info("TransformationWorker not started in this process (jobs stay queued)")
 
+        transformation_callback = None
+        if self._job_queue:
             # Create callback for ingestion to queue transformation jobs
             def transformation_callback(source_id: str, document_text: str, notebook_id: str, file_name: str):
                 """Queue a transformation job when a document is ingested."""
@@ -172,7 +207,7 @@ class LocalRAGPipeline:
                     notebook_id=notebook_id,
                     file_name=file_name,
                 )
-                self._transformation_worker.queue_job(job)
+                enqueue_transformation_job(self._job_queue, job)
                 logger.debug(f"Queued transformation job for source: {source_id}")
 
         self._ingestion = LocalDataIngestion(
@@ -202,18 +237,18 @@ class LocalRAGPipeline:
         )
 
         # Initialize RAPTORWorker for hierarchical tree building (if database available)
-        # Skip in multi-worker mode (Gunicorn) - asyncio doesn't fork well
-        if self._db_manager and not skip_background_workers:
+        if self._db_manager and start_workers:
             self._raptor_worker = RAPTORWorker(
                 db_manager=self._db_manager,
                 vector_store=self._vector_store,
-                poll_interval=15.0,  # Check for pending trees every 15 seconds
+                poll_interval=15.0,  # Sweep for pending trees every 15 seconds
                 max_concurrent=1,  # Tree building is resource-intensive
+                job_queue=self._job_queue,
             )
             self._raptor_worker.start()
             logger.info("RAPTORWorker started for hierarchical tree building")
-        elif skip_background_workers:
-            logger.info("RAPTORWorker disabled (DISABLE_BACKGROUND_WORKERS=true)")
+        elif self._db_manager:
+            logger.info("RAPTORWorker not started in this process (jobs stay queued)")
 
         logger.info(f"Pipeline initialized - Host: {host}")
         logger.debug(f"LLM Model: {self._model_name or self._settings.ollama.llm}")
@@ -308,8 +343,9 @@ class LocalRAGPipeline:
 
         Caches nodes per notebook with TTL to avoid repeated DB queries.
         Cache is invalidated when:
-        - TTL expires (5 minutes)
-        - Node count changes (document added/removed)
+        - TTL expires (5 minutes, served stale briefly while refreshing)
+        - Explicitly invalidated (document added/removed)
+        - Evicted under the node cache memory budget
 
         Thread-safe for multi-user concurrent access.
 
@@ -319,30 +355,7 @@ class LocalRAGPipeline:
         Returns:
             List of TextNode objects for the notebook
         """
-        with self._node_cache_lock:
-            current_time = time.time()
-
-            # Check cache
-            if notebook_id in self._node_cache:
-                nodes, timestamp, cached_count = self._node_cache[notebook_id]
-
-                # Check TTL
-                if current_time - timestamp < self._node_cache_ttl:
-                    logger.debug(f"Cache hit for notebook {notebook_id}: {len(nodes)} nodes")
-                    return nodes
-                else:
-                    logger.debug(f"Cache expired for notebook {notebook_id}")
-
-            # Cache miss - load from DB
-            start_time = time.time()
-            nodes = self._vector_store.get_nodes_by_notebook_sql(notebook_id)
-            load_time_ms = int((time.time() - start_time) * 1000)
-
-            # Store in cache
-            self._node_cache[notebook_id] = (nodes, current_time, len(nodes))
-            logger.info(f"Cached {len(nodes)} nodes for notebook {notebook_id} (loaded in {load_time_ms}ms)")
-
-            return nodes
+        return self._node_cache.get(notebook_id)
 
     def invalidate_node_cache(self, notebook_id: Optional[str] = None) -> None:
         """
@@ -354,14 +367,35 @@ class LocalRAGPipeline:
         Args:
             notebook_id: Specific notebook to invalidate, or None for all
         """
-        with self._node_cache_lock:
-            if notebook_id:
-                if notebook_id in self._node_cache:
-                    del self._node_cache[notebook_id]
-                    logger.debug(f"Invalidated node cache for notebook {notebook_id}")
-            else:
-                self._node_cache.clear()
-                logger.debug("Invalidated all node caches")
+        self._node_cache.invalidate(notebook_id)
+
+    def refresh_node_cache(self, notebook_id: str) -> None:
+        """
+        Apply database changes for a notebook to its cached nodes as a delta.
+
+        Call after nodes are stored, deleted or hidden/shown. Cached retrieval
+        indexes catch up from the resulting delta instead of rebuilding.
+
+        Args:
+            notebook_id: Notebook whose nodes changed
+        """
+        self._node_cache.refresh(notebook_id)
+
+    def get_node_cache_stats(self) -> Dict:
+        """Get node cache statistics (occupancy, hit/miss/eviction counts, load latency)."""
+        return self._node_cache.get_stats()
+
+    def get_embedding_cache_stats(self) -> Dict:
+        """Get embedding cache statistics (LRU occupancy, LRU/database hits, misses)."""
+        return get_embedding_cache().get_stats()
+
+    def get_query_embedding_cache_stats(self) -> Dict:
+        """Get query embedding cache statistics (LRU occupancy, LRU/shared hits, hit rate)."""
+        return get_query_embedding_cache().get_stats()
+
+    def get_llm_cache_stats(self) -> Dict:
+        """Get LLM response cache statistics (overall and per-feature hit rates)."""
+        return get_llm_cache().get_stats()
 
     def set_model_name(self, model_name: str) -> None:
         self._model_name = model_name
@@ -453,86 +487,6 @@ class LocalRAGPipeline:
         """Check if an embedding model exists on Ollama."""
         return LocalEmbedding.check_model_exist(self._ollama_host, model_name)
 
-    def _embed_transformation(
-        self,
-        text: str,
-        node_type: str,
-        source_id: str,
-        notebook_id: str
-    ) -> None:
-        """
-        Embed transformation content and store in vector store.
-
-        Called by TransformationWorker after generating transformations.
-        This allows transformation content (summaries, insights, questions)
-        to be retrieved alongside regular document chunks.
-
-        Args:
-            text: The transformation text to embed
-            node_type: Type of transformation ("summary", "insight", "question")
-            source_id: Source document UUID
-            notebook_id: Notebook UUID for filtering
-        """
-        try:
-            from llama_index.core.schema import TextNode
-            from uuid import UUID
-            import uuid
-
-            # Look up the source document to get file_name
-            file_name = None
-            if self._db_manager:
-                try:
-                    with self._db_manager.get_session() as session:
-                        from .core.db.models import NotebookSource
-                        source = session.query(NotebookSource).filter(
-                            NotebookSource.source_id == UUID(source_id)
-                        ).first()
-                        if source:
-                            file_name = source.file_name
-                except Exception as e:
-                    logger.warning(f"Could not lookup file_name for source {source_id}: {e}")
-
-            # Create a TextNode with transformation metadata including file_name
-            node = TextNode(
-                text=text,
-                id_=str(uuid.uuid4()),
-                metadata={
-                    "source_id": source_id,
-                    "notebook_id": notebook_id,
-                    "node_type": node_type,
-                    "file_name": file_name,  # Parent document name for source display
-                }
-            )
-
-            # Generate embedding for the node using Settings.embed_model
-            embed_model = Settings.embed_model
-            if embed_model:
-                try:
-                    # Generate embedding for this node
-                    embedding = embed_model.get_text_embedding(text)
-                    node.embedding = embedding
-                    logger.debug(f"Generated embedding for {node_type} (dim={len(embedding)})")
-                except Exception as e:
-                    logger.error(f"Error generating embedding for {node_type}: {e}")
-                    return  # Don't add node without embedding
-            else:
-                logger.warning("No embed model available for transformation embedding")
-                return
-
-            # Add to vector store with proper metadata
-            if hasattr(self._vector_store, 'add_transformation_nodes'):
-                self._vector_store.add_transformation_nodes(
-                    nodes=[node],
-                    notebook_id=notebook_id,
-                    source_id=source_id
-                )
-                logger.debug(f"Embedded {node_type} for source {source_id}")
-            else:
-                logger.warning("Vector store does not support add_transformation_nodes")
-
-        except Exception as e:
-            logger.error(f"Error embedding transformation for source {source_id}: {e}")
-
     def store_nodes(
         self,
         input_files: Optional[list[str]] = None,
@@ -557,12 +511,14 @@ class LocalRAGPipeline:
         self._ingestion.store_nodes(
             input_files=input_files,
             notebook_id=notebook_id,
-            user_id=user_id
+            user_id=user_id,
+            # Cached notebooks pick up each written batch as it lands
+            on_batch_stored=self.refresh_node_cache,
         )
 
-        # Invalidate node cache for this notebook (nodes have changed)
+        # Apply the new nodes to the cached notebook as a delta
         if notebook_id:
-            self.invalidate_node_cache(notebook_id)
+            self.refresh_node_cache(notebook_id)
 
         logger.info("Document processing complete")
 
@@ -1829,6 +1785,11 @@ Refined Implementation Plan:"""
         """Get the RAPTORWorker instance for API integration."""
         return self._raptor_worker
 
+    @property
+    def job_queue(self) -> Optional[JobQueue]:
+        """Get the durable background job queue (None without a database)."""
+        return self._job_queue
+
     def queue_raptor_build(self, source_id: str, notebook_id: str, file_name: str) -> bool:
         """Queue a RAPTOR tree build for a source.
 
@@ -1838,10 +1799,10 @@ Refined Implementation Plan:"""
             file_name: File name for logging
 
         Returns:
-            True if job was queued successfully
+            True if job was queued successfully (or is already queued)
         """
-        if not self._raptor_worker:
-            logger.warning("RAPTOR worker not available")
+        if not self._job_queue:
+            logger.warning("RAPTOR job queue not available (no database)")
             return False
 
         job = RAPTORJob(
@@ -1849,7 +1810,7 @@ Refined Implementation Plan:"""
             notebook_id=notebook_id,
             file_name=file_name
         )
-        self._raptor_worker.queue_job(job)
+        enqueue_raptor_job(self._job_queue, job)
         return True
 
     def shutdown(self) -> None:
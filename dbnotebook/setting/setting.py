@@ -120,6 +120,26 @@ class RetrieverSettings(BaseModel):
         default_factory=lambda: _get(get_retriever_settings(), "fusion_mode", "dist_based_score"),
         description="Fusion mode"
     )
+    server_side_hybrid: bool = Field(
+        default_factory=lambda: _get(_get(get_retriever_settings(), "server_side", {}), "enabled", False),
+        description="Run hybrid retrieval in Postgres instead of loading notebook nodes"
+    )
+    server_side_candidate_k: int = Field(
+        default_factory=lambda: _get(_get(get_retriever_settings(), "server_side", {}), "candidate_k", 50),
+        description="Candidates per leg (ANN and full-text) before RRF fusion"
+    )
+    rrf_k: int = Field(
+        default_factory=lambda: _get(_get(get_retriever_settings(), "server_side", {}), "rrf_k", 60),
+        description="Reciprocal Rank Fusion constant"
+    )
+    text_search_config: str = Field(
+        default_factory=lambda: _get(_get(get_retriever_settings(), "server_side", {}), "text_search_config", "english"),
+        description="Postgres text search configuration for full-text ranking"
+    )
+    persistent_bm25: bool = Field(
+        default_factory=lambda: _get(_get(get_retriever_settings(), "bm25_index", {}), "enabled", True),
+        description="Use the persistent Postgres BM25 index for the keyword leg"
+    )
 
 
 class IngestionSettings(BaseModel):
@@ -137,6 +157,62 @@ class IngestionSettings(BaseModel):
         default_factory=lambda: _get(get_embedding_config(), "cache_folder", "data/huggingface"),
         description="Cache folder"
     )
+    embed_cache_enabled: bool = Field(
+        default_factory=lambda: _get(_get(get_embedding_config(), "cache", {}), "enabled", True),
+        description="Reuse embeddings of identical text (keyed by model + md5)"
+    )
+    embed_cache_max_entries: int = Field(
+        default_factory=lambda: _get(_get(get_embedding_config(), "cache", {}), "max_entries", 20000),
+        description="In-process embedding cache capacity (vectors)"
+    )
+    embed_cache_persistent: bool = Field(
+        default_factory=lambda: _get(_get(get_embedding_config(), "cache", {}), "persistent", True),
+        description="Share cached embeddings through the Postgres embedding_cache table"
+    )
+    embed_query_cache_enabled: bool = Field(
+        default_factory=lambda: _get(_get(_get(get_embedding_config(), "cache", {}), "query", {}), "enabled", True),
+        description="Reuse query embeddings (keyed by model + normalized query)"
+    )
+    embed_query_cache_max_entries: int = Field(
+        default_factory=lambda: _get(_get(_get(get_embedding_config(), "cache", {}), "query", {}), "max_entries", 5000),
+        description="In-process query embedding cache capacity (vectors)"
+    )
+    embed_query_cache_shared: bool = Field(
+        default_factory=lambda: _get(_get(_get(get_embedding_config(), "cache", {}), "query", {}), "shared", True),
+        description="Share query embeddings across workers through the UNLOGGED query_embedding_cache table"
+    )
+    pipeline_batch_size: int = Field(
+        default_factory=lambda: _get(_get(load_ingestion_config(), "pipeline", {}), "batch_size", 256),
+        description="Chunks per embed/write batch in streaming ingestion"
+    )
+    pipeline_queue_depth: int = Field(
+        default_factory=lambda: _get(_get(load_ingestion_config(), "pipeline", {}), "queue_depth", 2),
+        description="Batches buffered between ingestion stages (bounds peak memory)"
+    )
+    pipeline_retries: int = Field(
+        default_factory=lambda: _get(_get(load_ingestion_config(), "pipeline", {}), "retries", 3),
+        description="Attempts per embed/write batch (exponential backoff) before its files fail"
+    )
+    copy_writer: bool = Field(
+        default_factory=lambda: _get(_get(load_ingestion_config(), "pipeline", {}), "copy_writer", True),
+        description="Write embedded chunks with binary COPY instead of row inserts"
+    )
+    parse_processes_enabled: bool = Field(
+        default_factory=lambda: _get(_get(load_ingestion_config(), "parsing", {}), "process_pool", True),
+        description="Extract PDF/DOCX/PPTX in worker processes"
+    )
+    parse_processes: int = Field(
+        default_factory=lambda: _get(_get(load_ingestion_config(), "parsing", {}), "max_workers", 0),
+        description="Parse worker processes (0 = CPU count)"
+    )
+    parse_pages_per_task: int = Field(
+        default_factory=lambda: _get(_get(load_ingestion_config(), "parsing", {}), "pages_per_task", 16),
+        description="PDF pages per parse task"
+    )
+    parse_min_pages_to_split: int = Field(
+        default_factory=lambda: _get(_get(load_ingestion_config(), "parsing", {}), "min_pages_to_split", 32),
+        description="PDFs with fewer pages are parsed as one task"
+    )
     chunk_size: int = Field(
         default_factory=lambda: _get(get_chunking_config(), "chunk_size", 512),
         description="Document chunk size"
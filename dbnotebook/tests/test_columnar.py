@@ -0,0 +1,56 @@
+"""Tests for matrix-backed ColumnarNodes."""
+
+import json
+import pickle
+
+import pytest
+
+np = pytest.importorskip("numpy")
+columnar = pytest.importorskip("dbnotebook.core.vector_store.columnar")
+
+
+def _columns():
+    embeddings = np.arange(6, dtype=np.float32).reshape(2, 3)
+    return columnar.NodeColumns(
+        ids=["a", "b"],
+        texts=["alpha", "beta"],
+        metadata_raw=['{"source_id": "s1"}', None],
+        embeddings=embeddings,
+    )
+
+
+def test_node_is_matrix_backed_without_embedding_list():
+    columns = _columns()
+    node = columns.node(1)
+
+    assert isinstance(node, columnar.ColumnarNode)
+    assert node.embedding is None
+    assert node.embedding_row.tolist() == [3.0, 4.0, 5.0]
+    assert np.shares_memory(columnar.node_embedding(node), columns.embeddings)
+
+
+def test_serialization_carries_the_row():
+    node = _columns().node(0)
+
+    assert node.model_dump()["embedding"] == [0.0, 1.0, 2.0]
+    assert node.to_dict()["embedding"] == [0.0, 1.0, 2.0]
+    assert json.loads(node.to_json())["embedding"] == [0.0, 1.0, 2.0]
+    assert pickle.loads(pickle.dumps(node)).embedding == [0.0, 1.0, 2.0]
+
+
+def test_assigned_embedding_detaches_from_matrix():
+    node = _columns().node(0)
+    node.embedding = [9.0, 9.0, 9.0]
+
+    assert node.embedding_row is None
+    assert node.model_dump()["embedding"] == [9.0, 9.0, 9.0]
+
+
+def test_with_embedding_lists_copies_matrix_backed_nodes():
+    nodes = _columns().to_nodes()
+    listed = columnar.with_embedding_lists(nodes)
+
+    assert [n.embedding for n in listed] == [[0.0, 1.0, 2.0], [3.0, 4.0, 5.0]]
+    assert [n.node_id for n in listed] == ["a", "b"]
+    assert all(n.embedding is None for n in nodes)
+    assert columnar.embedding_block(nodes, 3).tolist() == columnar.embedding_block(listed, 3).tolist()
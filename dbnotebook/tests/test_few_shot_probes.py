@@ -0,0 +1,52 @@
+"""Tests for IVFFlat probe settings in few-shot retrieval."""
+
+import contextlib
+
+import pytest
+
+few_shot = pytest.importorskip("dbnotebook.core.sql_chat.few_shot_retriever")
+
+
+class FakeSession:
+    def __init__(self):
+        self.statements = []
+
+    def execute(self, statement, params=None):
+        self.statements.append((str(statement), params))
+        return []
+
+
+class FakeDBManager:
+    def __init__(self):
+        self.session = FakeSession()
+
+    @contextlib.contextmanager
+    def get_session(self):
+        yield self.session
+
+
+def _retriever():
+    instance = object.__new__(few_shot.FewShotRetriever)
+    instance._db_manager = FakeDBManager()
+    instance._rag_config = {"ivfflat_probes": 10}
+    return instance
+
+
+def _probes(instance):
+    statements = instance._db_manager.session.statements
+    assert "ivfflat.probes" in statements[0][0]
+    return statements[0][1]["probes"]
+
+
+def test_filtered_search_probes_every_list():
+    instance = _retriever()
+    instance._vector_only_search([0.1, 0.2], top_k=5, domain_hint="finance")
+
+    assert _probes(instance) == str(few_shot.FewShotSetup.IVFFLAT_LISTS)
+
+
+def test_unfiltered_search_uses_configured_probes():
+    instance = _retriever()
+    instance._vector_only_search([0.1, 0.2], top_k=5)
+
+    assert _probes(instance) == "10"
@@ -0,0 +1,54 @@
+"""Tests for skipping re-uploads of already ingested documents."""
+
+import pytest
+
+ingestion = pytest.importorskip("dbnotebook.core.ingestion.ingestion")
+
+
+class FakeNotebookManager:
+    def __init__(self, chunk_count):
+        self.chunk_count = chunk_count
+
+    def find_document_by_hash(self, notebook_id, file_hash):
+        return {"source_id": "src", "file_name": "doc.pdf", "chunk_count": self.chunk_count}
+
+
+class FakeVectorStore:
+    def __init__(self, leaves):
+        self.leaves = leaves
+        self.deleted = []
+
+    def get_source_leaf_count(self, source_id):
+        return self.leaves
+
+    def delete_document_nodes(self, source_id):
+        self.deleted.append(source_id)
+        return True
+
+
+def _ingestion(chunk_count, leaves):
+    instance = object.__new__(ingestion.LocalDataIngestion)
+    instance._notebook_manager = FakeNotebookManager(chunk_count)
+    instance._vector_store = FakeVectorStore(leaves)
+    return instance
+
+
+def test_fully_stored_document_is_skipped():
+    instance = _ingestion(chunk_count=10, leaves=10)
+
+    assert instance._find_ingested_duplicate("nb", "hash")["source_id"] == "src"
+    assert instance._vector_store.deleted == []
+
+
+def test_partially_stored_document_is_reprocessed():
+    instance = _ingestion(chunk_count=10, leaves=4)
+
+    assert instance._find_ingested_duplicate("nb", "hash") is None
+    assert instance._vector_store.deleted == ["src"]
+
+
+def test_unembedded_document_is_reprocessed():
+    instance = _ingestion(chunk_count=10, leaves=0)
+
+    assert instance._find_ingested_duplicate("nb", "hash") is None
+    assert instance._vector_store.deleted == []
@@ -0,0 +1,30 @@
+"""Tests for ParsePool page-range extraction."""
+
+import sys
+import types
+
+import pytest
+
+parse_pool = pytest.importorskip("dbnotebook.core.ingestion.parse_pool")
+
+
+def _fake_pymupdf4llm(failing_page):
+    def to_markdown(file_path, pages):
+        if failing_page in pages:
+            raise ValueError("damaged xref")
+        return f"pages {pages[0]}-{pages[-1]}"
+
+    return types.SimpleNamespace(to_markdown=to_markdown)
+
+
+def test_page_range_extracts(monkeypatch):
+    monkeypatch.setitem(sys.modules, "pymupdf4llm", _fake_pymupdf4llm(failing_page=99))
+    text, seconds = parse_pool._read_pdf_pages("doc.pdf", [0, 1, 2])
+    assert text == "pages 0-2"
+    assert seconds >= 0
+
+
+def test_failed_page_range_raises(monkeypatch):
+    monkeypatch.setitem(sys.modules, "pymupdf4llm", _fake_pymupdf4llm(failing_page=17))
+    with pytest.raises(RuntimeError, match="pages 16-31 of doc.pdf"):
+        parse_pool._read_pdf_pages("doc.pdf", list(range(16, 32)))
@@ -0,0 +1,52 @@
+"""Tests for RAPTORClustering size tiers."""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("sklearn")
+clustering_module = pytest.importorskip("dbnotebook.core.raptor.clustering")
+config_module = pytest.importorskip("dbnotebook.core.raptor.config")
+schema = pytest.importorskip("llama_index.core.schema")
+
+
+def _nodes(n, dim=16, k=4, seed=0):
+    """n nodes drawn around k well-separated centers."""
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((k, dim)) * 5
+    points = centers[rng.integers(0, k, size=n)] + rng.standard_normal((n, dim))
+    return [
+        schema.TextNode(id_=f"n{i}", text=f"chunk {i}", embedding=point.tolist())
+        for i, point in enumerate(points)
+    ]
+
+
+def _cluster(nodes, fast_path_min_nodes):
+    config = config_module.ClusteringConfig(fast_path_min_nodes=fast_path_min_nodes)
+    clustering = clustering_module.RAPTORClustering(config)
+    clusters = clustering.cluster_nodes(nodes)
+    return clustering, clusters
+
+
+def _assert_covers(nodes, clusters):
+    assert clusters
+    clustered = {node_id for cluster in clusters for node_id in cluster.node_ids}
+    assert clustered == {node.node_id for node in nodes}
+
+
+def test_small_level_uses_umap_gmm():
+    pytest.importorskip("umap")
+    nodes = _nodes(50)
+    clustering, clusters = _cluster(nodes, fast_path_min_nodes=2000)
+
+    assert clustering.last_method == "umap+gmm"
+    assert len(clusters) > 1
+    _assert_covers(nodes, clusters)
+
+
+def test_large_level_uses_fast_path():
+    nodes = _nodes(300)
+    clustering, clusters = _cluster(nodes, fast_path_min_nodes=200)
+
+    assert clustering.last_method == "pca+gmm_diag"
+    assert len(clusters) > 1
+    _assert_covers(nodes, clusters)
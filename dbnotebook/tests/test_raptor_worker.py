@@ -0,0 +1,45 @@
+"""Tests for RAPTOR tree storage."""
+
+import pytest
+
+worker = pytest.importorskip("dbnotebook.core.raptor.worker")
+schema = pytest.importorskip("llama_index.core.schema")
+
+
+class FakeVectorStore:
+    """Records replace_tree_nodes calls; optionally fails like a DB error."""
+
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.calls = []
+
+    def replace_tree_nodes(self, nodes_by_level, notebook_id, source_id, tree_root_id=None):
+        if self.fail:
+            raise RuntimeError("connection reset")
+        self.calls.append((nodes_by_level, notebook_id, source_id, tree_root_id))
+        return sum(len(nodes) for nodes in nodes_by_level.values())
+
+
+def _summary(node_id, level, root="root"):
+    return schema.TextNode(
+        id_=node_id, text="same summary text",
+        metadata={"tree_level": level, "tree_root_id": root},
+    )
+
+
+def test_store_replaces_whole_tree_in_one_call():
+    store = FakeVectorStore()
+    nodes = [_summary("a", 1), _summary("b", 1), _summary("root", 2)]
+
+    assert worker._store_tree_nodes(store, nodes, "nb", "src") == 3
+    nodes_by_level, notebook_id, source_id, tree_root_id = store.calls[0]
+    assert len(store.calls) == 1
+    assert {level: [n.node_id for n in ns] for level, ns in nodes_by_level.items()} == {
+        1: ["a", "b"], 2: ["root"],
+    }
+    assert (notebook_id, source_id, tree_root_id) == ("nb", "src", "root")
+
+
+def test_store_failure_propagates():
+    with pytest.raises(RuntimeError):
+        worker._store_tree_nodes(FakeVectorStore(fail=True), [_summary("a", 1)], "nb", "src")
@@ -0,0 +1,39 @@
+"""Tests for routing LocalRetriever through server-side hybrid retrieval."""
+
+import types
+
+import pytest
+
+retriever_module = pytest.importorskip("dbnotebook.core.engine.retriever")
+
+
+class FakeVectorStore:
+    def __init__(self, supports_hybrid_search):
+        self.supports_hybrid_search = supports_hybrid_search
+
+
+def _retriever(server_side_hybrid):
+    instance = object.__new__(retriever_module.LocalRetriever)
+    instance._setting = types.SimpleNamespace(
+        retriever=types.SimpleNamespace(server_side_hybrid=server_side_hybrid)
+    )
+    instance.get_server_side_retriever = lambda llm, vector_store, notebook_id: ("pg", notebook_id)
+    instance._get_notebook_index = lambda *args, **kwargs: pytest.fail("nodes were indexed")
+    return instance
+
+
+def test_unfiltered_notebook_retrieval_runs_server_side():
+    instance = _retriever(server_side_hybrid=True)
+
+    retriever = instance.get_retrievers(
+        llm=None, language="eng", nodes=[],
+        vector_store=FakeVectorStore(True), notebook_id="nb",
+    )
+    assert retriever == ("pg", "nb")
+
+
+def test_missing_text_search_column_keeps_node_retrieval():
+    instance = _retriever(server_side_hybrid=True)
+
+    assert not instance.supports_server_side(FakeVectorStore(False))
+    assert not _retriever(server_side_hybrid=False).supports_server_side(FakeVectorStore(True))
@@ -0,0 +1,78 @@
+"""Tests for SchemaLinker embedding failure handling."""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+schema_linker = pytest.importorskip("dbnotebook.core.sql_chat.schema_linker")
+
+from dbnotebook.core.sql_chat.types import ColumnInfo, SchemaInfo, TableInfo  # noqa: E402
+
+SchemaLinker = schema_linker.SchemaLinker
+
+WORDS = ["orders", "customers", "invoices", "shipments"]
+
+
+class FlakyEmbedding:
+    """Bag-of-words embedding over WORDS that can be switched to fail."""
+
+    model_name = "flaky"
+
+    def __init__(self):
+        self.failing = False
+        self.batch_calls = 0
+
+    def _embed(self, text):
+        return [float(word in text.lower()) + 0.01 for word in WORDS]
+
+    def get_text_embedding(self, text):
+        if self.failing:
+            raise RuntimeError("embedding service unavailable")
+        return self._embed(text)
+
+    def get_text_embedding_batch(self, texts):
+        self.batch_calls += 1
+        if self.failing:
+            raise RuntimeError("embedding service unavailable")
+        return [self._embed(t) for t in texts]
+
+
+def _schema():
+    return SchemaInfo(tables=[
+        TableInfo(name=name, columns=[ColumnInfo(name="id", type="integer")])
+        for name in WORDS
+    ])
+
+
+def test_failed_embedding_degrades_then_recovers():
+    embed = FlakyEmbedding()
+    linker = SchemaLinker(embed, top_k=2, column_embeddings=False)
+    schema = _schema()
+
+    # Embedding service down: no error, every table scores 0
+    embed.failing = True
+    for _ in range(2):
+        scores = linker.get_table_scores("show invoices", schema, connection_id="c1")
+        assert all(score == 0.0 for _, score in scores)
+        assert linker.link_tables("show invoices", schema, connection_id="c1", expand_with_fk=False)
+
+    # Service back: the missing descriptions are embedded on the next call
+    embed.failing = False
+    calls_before = embed.batch_calls
+    selected = linker.link_tables("show invoices", schema, connection_id="c1", expand_with_fk=False)
+    assert embed.batch_calls == calls_before + 1
+    assert selected[0] == "invoices"
+
+    # Complete index is cached: no further embedding
+    linker.link_tables("show orders", schema, connection_id="c1", expand_with_fk=False)
+    assert embed.batch_calls == calls_before + 1
+
+
+def test_query_dimension_mismatch_scores_zero():
+    embed = FlakyEmbedding()
+    linker = SchemaLinker(embed, top_k=2, column_embeddings=False)
+    schema = _schema()
+    linker.link_tables("orders", schema, connection_id="c1", expand_with_fk=False)
+
+    embed.get_text_embedding = lambda text: list(np.ones(8))
+    scores = linker.get_table_scores("orders", schema, connection_id="c1")
+    assert all(score == 0.0 for _, score in scores)
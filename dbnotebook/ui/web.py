@@ -1523,15 +1523,17 @@ Output ONLY valid JSON, nothing else."""
                 transformation_worker = None
                 if hasattr(self._pipeline, 'transformation_worker'):
                     transformation_worker = self._pipeline.transformation_worker
+                job_queue = getattr(self._pipeline, 'job_queue', None)
 
                 create_transformation_routes(
                     self._app,
                     self._db_manager,
-                    transformation_worker=transformation_worker
+                    transformation_worker=transformation_worker,
+                    job_queue=job_queue
                 )
                 logger.info("Transformation API routes registered")
-                if transformation_worker:
-                    logger.info("Transformation retry enabled via TransformationWorker")
+                if transformation_worker or job_queue:
+                    logger.info("Transformation retry enabled via job queue")
         except Exception as e:
             logger.warning(f"Transformation API routes not available: {e}")
 
@@ -1981,6 +1983,9 @@ Output ONLY valid JSON, nothing else."""
                     if not pgvector_success:
                         logger.warning(f"pgvector deletion failed for document {source_id}, but PostgreSQL deletion succeeded")
 
+                    # Drop the deleted nodes from cached notebook indexes
+                    self._pipeline.refresh_node_cache(notebook_id)
+
                 logger.info(f"Deleted document {source_id} from notebook {notebook_id}")
 
                 return jsonify({
@@ -2023,6 +2028,10 @@ Output ONLY valid JSON, nothing else."""
                         "error": "Document not found"
                     }), 404
 
+                # Hide/show the source's nodes in cached notebook indexes
+                if self._pipeline:
+                    self._pipeline.refresh_node_cache(notebook_id)
+
                 return jsonify({
                     "success": True,
                     "document": {
@@ -0,0 +1,77 @@
+"""Standalone background worker process.
+
+Runs the RAPTOR and transformation workers outside the web process. Jobs
+are leased from the Postgres job queue with FOR UPDATE SKIP LOCKED, so any
+number of these processes (on any host) can run alongside web servers
+started with DISABLE_BACKGROUND_WORKERS=true.
+
+Usage:
+    DATABASE_URL=postgresql://... python -m dbnotebook.worker
+    python -m dbnotebook.worker --host host.docker.internal --log-level DEBUG
+"""
+
+import argparse
+import logging
+import os
+import signal
+import sys
+import threading
+
+# Set threading env vars BEFORE importing libraries that use them
+os.environ["OMP_NUM_THREADS"] = "1"
+os.environ["TOKENIZERS_PARALLELISM"] = "false"
+
+# Allow nested event loops (fixes LlamaIndex asyncio + threading conflicts)
+import nest_asyncio
+nest_asyncio.apply()
+
+from .__main__ import setup_logging
+from .pipeline import LocalRAGPipeline
+
+logger = logging.getLogger(__name__)
+
+
+def main():
+    """Run background workers until SIGINT/SIGTERM."""
+    parser = argparse.ArgumentParser(description="DBNotebook background worker")
+    parser.add_argument(
+        "--host",
+        type=str,
+        default="localhost",
+        help="Host for Ollama server (localhost or host.docker.internal)"
+    )
+    parser.add_argument(
+        "--log-level",
+        type=str,
+        default="INFO",
+        choices=["DEBUG", "INFO", "WARNING", "ERROR"],
+        help="Logging level"
+    )
+    args = parser.parse_args()
+
+    setup_logging(args.log_level)
+
+    database_url = os.getenv("DATABASE_URL")
+    if not database_url:
+        logger.error("DATABASE_URL is required to run background workers")
+        sys.exit(1)
+
+    logger.info(f"Starting background worker - Host: {args.host}")
+    pipeline = LocalRAGPipeline(host=args.host, database_url=database_url, start_workers=True)
+
+    stop_event = threading.Event()
+
+    def _handle_signal(signum, frame):
+        logger.info(f"Received signal {signum}, shutting down")
+        stop_event.set()
+
+    signal.signal(signal.SIGINT, _handle_signal)
+    signal.signal(signal.SIGTERM, _handle_signal)
+
+    logger.info(f"Background worker running; job stats: {pipeline.job_queue.get_stats()}")
+    stop_event.wait()
+    pipeline.shutdown()
+
+
+if __name__ == "__main__":
+    main()